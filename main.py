@@ -168,6 +168,8 @@ def _runtime_health_payload() -> dict:
             from src.nadobro.venue.gateway_budget import snapshot as gateway_snapshot
             from src.nadobro.venue.ws_health import snapshot as ws_snapshot
             from src.nadobro.venue.market_feed import snapshot as market_snapshot
+            from src.nadobro.venue.market_ws import market_stream_stats
+            from src.nadobro.venue.nado_sync import last_sync_tick_stats
             from src.nadobro.core.async_utils import pool_stats
             from src.nadobro.core.user_circuit import snapshot as circuit_snapshot
             from src.nadobro.core.feature_flags import strategy_scheduler_enabled
@@ -176,8 +178,13 @@ def _runtime_health_payload() -> dict:
             payload["gateway"] = gateway_snapshot()
             payload["ws_health"] = ws_snapshot()
             payload["market_feed"] = market_snapshot()
+            payload["market_ws"] = market_stream_stats()
+            payload["portfolio_sync"] = last_sync_tick_stats()
             payload["thread_pools"] = pool_stats()
             payload["user_circuit"] = circuit_snapshot()
+            from src.nadobro.notify.telegram_sender import get_sender
+
+            payload["telegram_sender"] = get_sender().stats()
             if strategy_scheduler_enabled():
                 payload["strategy_scheduler"] = get_scheduler().stats()
         except Exception:
@@ -312,6 +319,7 @@ async def run_bot():
         start_runtime_supervisor,
         stop_runtime_supervisor,
     )
+    from src.nadobro.portfolio.pnl_card_renderer import shutdown_card_renderer, start_card_renderer
     from src.nadobro.runtime.scheduler import handle_alert_job
     from src.nadobro.trading.execution_queue import register_handlers, start_workers, stop_workers
     from src.nadobro.trading.copy_service import set_copy_bot_app
@@ -343,6 +351,7 @@ async def run_bot():
         alert_workers=env_int("NADO_ALERT_WORKERS", 1),
     )
     start_runtime_supervisor()
+    start_card_renderer()
     from src.nadobro.runtime.runtime_supervisor import runtime_mode
     from src.nadobro.trading.execution_queue import get_queue_diagnostics
 
@@ -378,6 +387,12 @@ async def run_bot():
 
         bind_fetcher(alert_client.get_all_market_prices)
         logger.info("Alert price-check client initialized (network=%s)", alert_network)
+        from src.nadobro.core.feature_flags import market_ws_enabled
+
+        if market_ws_enabled():
+            from src.nadobro.venue.market_ws import start_market_streams
+
+            start_market_streams()
     except Exception as e:
         logger.warning(f"Alert price-check client failed to initialize: {e}")
 
@@ -454,6 +469,17 @@ async def run_bot():
     await bot_app.initialize()
     await bot_app.start()
 
+    from src.nadobro.core.feature_flags import telegram_sender_enabled
+
+    if telegram_sender_enabled():
+        from src.nadobro.notify.telegram_outbox import outbox_store_from_env
+        from src.nadobro.notify.telegram_sender import get_sender
+
+        sender = get_sender()
+        sender.bind(bot_app.bot.send_message)
+        sender.bind_store(outbox_store_from_env())
+        await sender.start()
+
     # bot_data is process memory: restore any LOWIQPTS points refresh that was
     # in flight before this process (re)started so the user's flow resumes
     # instead of silently dropping their pending request.
@@ -619,13 +645,26 @@ async def run_bot():
         if strategy_scheduler_enabled():
             await get_scheduler().stop()
         await portfolio_ws.stop()
+        from src.nadobro.venue.market_ws import stop_market_streams
+
+        await stop_market_streams()
         await stop_copy_polling()
+        from src.nadobro.notify.telegram_sender import get_sender
+
+        # Anything still queued stays in the outbox for the next start.
+        await get_sender().stop()
         stop_runtime()
         stop_runtime_supervisor()
+        shutdown_card_renderer()
         await stop_workers()
         await bot_app.updater.stop()
         await bot_app.stop()
         await bot_app.shutdown()
+        from src.nadobro.core.http_async import close_async_clients
+        from src.nadobro.db_async import close_async_pool
+
+        await close_async_clients()
+        await close_async_pool()
         logger.info("Bot stopped cleanly")
 
 
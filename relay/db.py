@@ -31,6 +31,14 @@ async def close_db() -> None:
         logger.info("Database pool closed")
 
 
+async def connect_listener() -> "asyncpg.Connection":
+    """Dedicated connection for LISTEN (a pooled one would be reset on release)."""
+    dsn = _dsn()
+    if not dsn:
+        raise RuntimeError("DATABASE_URL is not set")
+    return await asyncpg.connect(dsn)
+
+
 def get_pool() -> asyncpg.Pool:
     if _pool is None:
         raise RuntimeError("Database not initialised – call init_db() first")
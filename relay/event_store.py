@@ -1,12 +1,26 @@
+import asyncio
 import base64
 import logging
 import json
-from typing import Optional
+import os
+from typing import Iterable, Optional
 
-from relay.db import get_pool
+from relay.db import connect_listener, get_pool
 
 logger = logging.getLogger("relay.events")
 
+# store_event NOTIFYs this channel with the session id so held batch polls wake
+# as soon as an event lands instead of on their next re-check.
+EVENTS_CHANNEL = "relay_events"
+# Upper bound on how long one batch poll may be held open.
+LONG_POLL_MAX_SECONDS = 25.0
+# Without a live LISTEN connection a held poll re-queries this often.
+_FALLBACK_RECHECK_SECONDS = 1.0
+# Delay between attempts to re-establish a dropped LISTEN connection.
+_LISTEN_RECONNECT_SECONDS = 5.0
+# Sessions one batch poll may cover.
+MAX_BATCH_SESSIONS = 200
+
 
 async def store_event(
     session_id: str,
@@ -51,6 +65,7 @@ async def store_event(
             "UPDATE relay_sessions SET updated_at = now() WHERE id = $1",
             session_id,
         )
+        await conn.execute("SELECT pg_notify($1, $2)", EVENTS_CHANNEL, session_id)
 
     logger.debug("Stored event cursor_id=%s for session %s", cursor_id, session_id)
     return cursor_id
@@ -58,12 +73,7 @@ async def store_event(
 
 async def poll_events(session_id: str, cursor: Optional[str] = None, limit: int = 25) -> dict:
     pool = get_pool()
-    after_cursor = 0
-    if cursor:
-        try:
-            after_cursor = int(cursor)
-        except (TypeError, ValueError):
-            after_cursor = 0
+    after_cursor = _parse_cursor(cursor)
 
     async with pool.acquire() as conn:
         rows = await conn.fetch(
@@ -93,6 +103,27 @@ async def poll_events(session_id: str, cursor: Optional[str] = None, limit: int
             str(session_id),
         )
 
+    events, next_cursor = _event_items(rows, inline_photos=True)
+
+    return {
+        "ok": True,
+        "events": events,
+        "next_cursor": next_cursor,
+        "session_status": (status_row["status"] if status_row else "not_found"),
+    }
+
+
+def _parse_cursor(cursor: Optional[str]) -> int:
+    if not cursor:
+        return 0
+    try:
+        return int(cursor)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _event_items(rows, *, inline_photos: bool) -> tuple[list[dict], Optional[str]]:
+    """Shape event rows for the bot; photos inline (base64) or by reference."""
     events = []
     next_cursor = None
     for row in rows:
@@ -112,27 +143,242 @@ async def poll_events(session_id: str, cursor: Optional[str] = None, limit: int
             "text": row["text"],
             "created_at": row["created_at"].isoformat(),
         }
-        pb = row.get("photo_bytes")
-        if pb:
-            try:
-                event_item["photo_base64"] = base64.b64encode(bytes(pb)).decode("ascii")
-                pm = row.get("photo_mime") or "image/jpeg"
-                event_item["photo_mime"] = str(pm)
-            except Exception:
-                logger.warning("relay event cursor=%s: failed to encode photo", row["cursor_id"], exc_info=True)
+        if inline_photos:
+            pb = row.get("photo_bytes")
+            if pb:
+                try:
+                    event_item["photo_base64"] = base64.b64encode(bytes(pb)).decode("ascii")
+                    pm = row.get("photo_mime") or "image/jpeg"
+                    event_item["photo_mime"] = str(pm)
+                except Exception:
+                    logger.warning("relay event cursor=%s: failed to encode photo", row["cursor_id"], exc_info=True)
+        elif row.get("has_photo"):
+            # Fetched separately via GET /events/{id}/photo.
+            event_item["photo_ref"] = int(row["cursor_id"])
+            event_item["photo_mime"] = str(row.get("photo_mime") or "image/jpeg")
         if options:
             event_item["options"] = options
         if row.get("source_message_id"):
             event_item["source_message_id"] = int(row["source_message_id"])
         events.append(event_item)
         next_cursor = str(row["cursor_id"])
+    return events, next_cursor
 
-    return {
-        "ok": True,
-        "events": events,
-        "next_cursor": next_cursor,
-        "session_status": (status_row["status"] if status_row else "not_found"),
-    }
+
+class _EventListener:
+    """One LISTEN connection fanning NOTIFYs out to held batch polls."""
+
+    def __init__(self) -> None:
+        self._conn = None
+        self._waiters: dict[str, set[asyncio.Event]] = {}
+        # Set by start_event_listener; a dropped or never-opened connection is
+        # then re-established in the background until stop().
+        self._wanted = False
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def start(self) -> None:
+        self._wanted = True
+        if self.running:
+            return
+        conn = await connect_listener()
+        await conn.add_listener(EVENTS_CHANNEL, self._on_notify)
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+
+    async def stop(self) -> None:
+        self._wanted = False
+        task, self._reconnect_task = self._reconnect_task, None
+        if task is not None and not task.done():
+            task.cancel()
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            conn.remove_termination_listener(self._on_terminated)
+            await conn.remove_listener(EVENTS_CHANNEL, self._on_notify)
+        finally:
+            await conn.close()
+        self.wake_all()
+
+    def _on_terminated(self, _conn) -> None:
+        logger.warning("Event LISTEN connection lost; reconnecting")
+        self._conn = None
+        # Held polls are waiting on NOTIFYs that will not come: send them
+        # back to their loop, which re-checks on the fallback interval.
+        self.wake_all()
+        self.ensure_running()
+
+    def ensure_running(self) -> None:
+        """Schedule a reconnect when the listener is wanted but down."""
+        if not self._wanted or self.running:
+            return
+        if self._reconnect_task is not None and not self._reconnect_task.done():
+            return
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while self._wanted and not self.running:
+            try:
+                await self.start()
+                logger.info("Event LISTEN on %s re-established", EVENTS_CHANNEL)
+            except Exception as exc:
+                logger.warning("Event LISTEN reconnect failed: %s", exc)
+                await asyncio.sleep(_LISTEN_RECONNECT_SECONDS)
+
+    def _on_notify(self, _conn, _pid, _channel, payload) -> None:
+        for waiter in self._waiters.get(str(payload), ()):
+            waiter.set()
+
+    def wake_all(self) -> None:
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                waiter.set()
+
+    def register(self, session_ids: Iterable[str]) -> asyncio.Event:
+        waiter = asyncio.Event()
+        for sid in session_ids:
+            self._waiters.setdefault(sid, set()).add(waiter)
+        return waiter
+
+    def unregister(self, session_ids: Iterable[str], waiter: asyncio.Event) -> None:
+        for sid in session_ids:
+            waiters = self._waiters.get(sid)
+            if waiters is None:
+                continue
+            waiters.discard(waiter)
+            if not waiters:
+                del self._waiters[sid]
+
+
+_listener = _EventListener()
+
+
+async def start_event_listener() -> None:
+    try:
+        await _listener.start()
+        logger.info("Listening on %s for batch poll wakeups", EVENTS_CHANNEL)
+    except Exception:
+        logger.warning("Event LISTEN unavailable; held polls will re-check every %.0fs "
+                       "until it reconnects", _FALLBACK_RECHECK_SECONDS, exc_info=True)
+        _listener.ensure_running()
+
+
+async def stop_event_listener() -> None:
+    await _listener.stop()
+
+
+def long_poll_max_seconds() -> float:
+    raw = (os.environ.get("RELAY_LONG_POLL_MAX_SECONDS") or str(LONG_POLL_MAX_SECONDS)).strip()
+    try:
+        return max(0.0, min(120.0, float(raw)))
+    except ValueError:
+        return LONG_POLL_MAX_SECONDS
+
+
+async def poll_events_batch(
+    cursors: Iterable[tuple[str, Optional[str]]],
+    limit: int = 25,
+    wait_seconds: float = 0.0,
+) -> dict:
+    """Poll many sessions at once, holding the request until one has events.
+
+    Per call this issues one set-based ``UPDATE ... RETURNING`` (liveness for
+    every session plus their statuses) and one ``SELECT`` per wake-up, instead
+    of three statements per session. Photos are returned by reference
+    (``photo_ref``) and fetched through :func:`fetch_event_photo`.
+    """
+    after: dict[str, int] = {}
+    for session_id, cursor in cursors:
+        sid = str(session_id or "").strip()
+        if sid and sid not in after and len(after) < MAX_BATCH_SESSIONS:
+            after[sid] = _parse_cursor(cursor)
+    if not after:
+        return {"ok": True, "sessions": {}}
+    ids = list(after)
+    cursor_values = [after[sid] for sid in ids]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max(0.0, min(float(wait_seconds or 0.0), long_poll_max_seconds()))
+    pool = get_pool()
+
+    async with pool.acquire() as conn:
+        status_rows = await conn.fetch(
+            """
+            UPDATE relay_sessions SET last_polled_at = now()
+            WHERE id = ANY($1::text[])
+            RETURNING id, status
+            """,
+            ids,
+        )
+    statuses = {row["id"]: row["status"] for row in status_rows}
+    live = [sid for sid in ids if statuses.get(sid) == "active"]
+    _listener.ensure_running()
+
+    while True:
+        # Register before querying so a NOTIFY racing the SELECT is not lost.
+        waiter = _listener.register(live)
+        try:
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT e.cursor_id, e.session_id, e.text, e.options_json, e.source_message_id,
+                           e.has_photo, e.photo_mime, e.created_at
+                    FROM unnest($1::text[], $2::bigint[]) AS r(session_id, after_cursor)
+                    CROSS JOIN LATERAL (
+                        SELECT cursor_id, session_id, text, options_json, source_message_id,
+                               photo_bytes IS NOT NULL AS has_photo, photo_mime, created_at
+                        FROM relay_events
+                        WHERE session_id = r.session_id AND cursor_id > r.after_cursor
+                        ORDER BY cursor_id ASC
+                        LIMIT $3
+                    ) e
+                    ORDER BY e.cursor_id ASC
+                    """,
+                    ids, cursor_values, limit,
+                )
+            remaining = deadline - loop.time()
+            if rows or len(live) < len(ids) or remaining <= 0:
+                break
+            timeout = remaining if _listener.running else min(remaining, _FALLBACK_RECHECK_SECONDS)
+            try:
+                await asyncio.wait_for(waiter.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            _listener.unregister(live, waiter)
+
+    by_session: dict[str, list] = {sid: [] for sid in ids}
+    for row in rows:
+        by_session.setdefault(row["session_id"], []).append(row)
+    sessions = {}
+    for sid in ids:
+        events, next_cursor = _event_items(by_session[sid], inline_photos=False)
+        sessions[sid] = {
+            "ok": True,
+            "events": events,
+            "next_cursor": next_cursor,
+            "session_status": statuses.get(sid, "not_found"),
+        }
+    return {"ok": True, "sessions": sessions}
+
+
+async def fetch_event_photo(session_id: str, cursor_id: int) -> Optional[tuple[bytes, str]]:
+    """Photo bytes for one event, scoped to its session."""
+    pool = get_pool()
+    async with pool.acquire() as conn:
+        row = await conn.fetchrow(
+            """
+            SELECT photo_bytes, photo_mime FROM relay_events
+            WHERE cursor_id = $1 AND session_id = $2
+            """,
+            int(cursor_id), str(session_id),
+        )
+    if not row or not row["photo_bytes"]:
+        return None
+    return bytes(row["photo_bytes"]), str(row["photo_mime"] or "image/jpeg")
 
 
 async def find_session_for_incoming(sender_id: int) -> Optional[str]:
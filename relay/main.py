@@ -6,15 +6,20 @@ import re
 from contextlib import asynccontextmanager
 from typing import Optional
 
-from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from relay.db import close_db, init_db
 from relay.event_store import (
+    MAX_BATCH_SESSIONS,
+    fetch_event_photo,
     find_session_for_incoming,
     poll_events,
+    poll_events_batch,
     purge_old_relay_events,
+    start_event_listener,
+    stop_event_listener,
     store_event,
 )
 from relay.session_manager import (
@@ -83,6 +88,7 @@ async def _on_lowiqpts_message(
 async def lifespan(app: FastAPI):
     global _cleanup_task
     await init_db()
+    await start_event_listener()
     set_message_callback(_on_lowiqpts_message)
     await start_client()
     _cleanup_task = asyncio.create_task(_periodic_cleanup())
@@ -95,6 +101,7 @@ async def lifespan(app: FastAPI):
         except asyncio.CancelledError:
             pass
     await stop_client()
+    await stop_event_listener()
     await close_db()
     logger.info("Relay service stopped")
 
@@ -145,6 +152,19 @@ class CloseRequest(BaseModel):
     reason: Optional[str] = None
 
 
+class PollCursor(BaseModel):
+    session_id: str = Field(..., min_length=1)
+    cursor: Optional[str] = None
+
+
+class PollBatchRequest(BaseModel):
+    sessions: list[PollCursor] = Field(..., max_length=MAX_BATCH_SESSIONS)
+    limit: int = Field(default=25, ge=1, le=100)
+    # Hold the request up to this long until any session has events (capped
+    # server-side by RELAY_LONG_POLL_MAX_SECONDS).
+    wait_seconds: float = Field(default=0.0, ge=0.0, le=120.0)
+
+
 class ReplyOptionRequest(BaseModel):
     session_id: str
     option_text: str
@@ -199,6 +219,31 @@ async def poll_events_endpoint(
     return await poll_events(session_id=session_id, cursor=cursor, limit=limit)
 
 
+@app.post("/events/poll_batch")
+async def poll_events_batch_endpoint(
+    body: PollBatchRequest,
+    _auth: None = Depends(verify_auth),
+):
+    return await poll_events_batch(
+        [(item.session_id, item.cursor) for item in body.sessions],
+        limit=body.limit,
+        wait_seconds=body.wait_seconds,
+    )
+
+
+@app.get("/events/{event_id}/photo")
+async def event_photo_endpoint(
+    event_id: int,
+    session_id: str = Query(..., min_length=1),
+    _auth: None = Depends(verify_auth),
+):
+    photo = await fetch_event_photo(session_id, event_id)
+    if photo is None:
+        raise HTTPException(status_code=404, detail="photo_not_found")
+    content, mime = photo
+    return Response(content=content, media_type=mime)
+
+
 @app.post("/sessions/close")
 async def close_session_endpoint(
     body: CloseRequest,
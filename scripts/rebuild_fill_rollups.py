@@ -0,0 +1,40 @@
+"""Rebuild the per-day analytics rollups (``user_fill_rollups``) from ``trades_<network>``.
+
+The rollups are derived data: nado_sync advances them as fills are ingested
+and rebuilds a user on its own when folded-in fills change. Run this after
+applying migrations/0021_user_fill_rollups.sql (the backfill), after a bulk
+repair of ``trades_<network>`` rows, or to clear a suspected drift. Each user
+is replayed from scratch, so re-running is safe.
+
+Usage:
+    # every user with fills, both networks
+    DATABASE_URL=... python scripts/rebuild_fill_rollups.py
+
+    # one network / specific users
+    DATABASE_URL=... python scripts/rebuild_fill_rollups.py --network mainnet --user-id 123 --user-id 456
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from src.nadobro.models.database import rebuild_fill_rollups
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--network", choices=("mainnet", "testnet", "both"), default="both")
+    ap.add_argument("--user-id", type=int, action="append", dest="user_ids",
+                    help="rebuild only this user (repeatable)")
+    args = ap.parse_args()
+
+    networks = ("mainnet", "testnet") if args.network == "both" else (args.network,)
+    for network in networks:
+        started = time.perf_counter()
+        rebuilt = rebuild_fill_rollups(network, args.user_ids)
+        print(f"[{network}] rebuilt fill rollups for {rebuilt} user(s) "
+              f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
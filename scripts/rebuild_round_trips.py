@@ -0,0 +1,41 @@
+"""Re-pair the persisted History round trips (``round_trips``) from ``trades_<network>``.
+
+The ledger is derived data: nado_sync and the History view advance it as
+manual fills are synced, and a user is re-paired on its own when paired
+fills change or NADO_HISTORY_EPOCH moves. Run this after applying
+migrations/0022_round_trip_ledger.sql (the backfill), after a bulk repair of
+``trades_<network>`` rows, or to clear a suspected drift. Each user is
+re-paired from scratch, so re-running is safe.
+
+Usage:
+    # every user with manual fills, both networks
+    DATABASE_URL=... python scripts/rebuild_round_trips.py
+
+    # one network / specific users
+    DATABASE_URL=... python scripts/rebuild_round_trips.py --network mainnet --user-id 123 --user-id 456
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from src.nadobro.models.database import rebuild_round_trips
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--network", choices=("mainnet", "testnet", "both"), default="both")
+    ap.add_argument("--user-id", type=int, action="append", dest="user_ids",
+                    help="rebuild only this user (repeatable)")
+    args = ap.parse_args()
+
+    networks = ("mainnet", "testnet") if args.network == "both" else (args.network,)
+    for network in networks:
+        started = time.perf_counter()
+        rebuilt = rebuild_round_trips(network, args.user_ids)
+        print(f"[{network}] re-paired round trips for {rebuilt} user(s) "
+              f"in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
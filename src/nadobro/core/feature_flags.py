@@ -89,6 +89,168 @@ def portfolio_sync_users_per_tick() -> int:
         return 8
 
 
+def portfolio_sync_concurrency() -> int:
+    """Users synced in parallel per portfolio tick (1 = legacy sequential walk).
+
+    Above 1 the tick ranks the whole active set by staleness (running
+    strategies first) and syncs up to ``users_per_tick × concurrency`` users,
+    admitting each only while the gateway budget has headroom.
+    """
+    raw = (os.environ.get("NADO_PORTFOLIO_SYNC_CONCURRENCY") or "4").strip()
+    try:
+        return max(1, min(32, int(float(raw))))
+    except ValueError:
+        return 4
+
+
+def strategy_state_store_enabled() -> bool:
+    """Serve strategy bot state from the in-process store (single-process mode)."""
+    return env_flag("NADO_STRATEGY_STATE_STORE", True)
+
+
+def strategy_state_writeback_seconds() -> float:
+    """Coalescing interval for non-lifecycle strategy state writes."""
+    raw = (os.environ.get("NADO_STRATEGY_STATE_WRITEBACK_SECONDS") or "2").strip()
+    try:
+        return max(0.2, min(30.0, float(raw)))
+    except ValueError:
+        return 2.0
+
+
+def engine_write_behind_enabled() -> bool:
+    """Keep engine inventory in memory and persist holds/fills off the tick path."""
+    return env_flag("NADO_ENGINE_WRITE_BEHIND", True)
+
+
+def engine_write_behind_seconds() -> float:
+    """Upper bound on how long an engine fill waits before it reaches Postgres."""
+    raw = (os.environ.get("NADO_ENGINE_WRITE_BEHIND_SECONDS") or "0.5").strip()
+    try:
+        return max(0.05, min(5.0, float(raw)))
+    except ValueError:
+        return 0.5
+
+
+def async_db_enabled() -> bool:
+    """Run ``db_async`` statements on the native async pool (off = psycopg2 via threads)."""
+    return env_flag("NADO_ASYNC_DB", True)
+
+
+def async_http_enabled() -> bool:
+    """Serve the async Nado read variants over the HTTP/2 client (off = SDK thread pool)."""
+    return env_flag("NADO_ASYNC_HTTP", True)
+
+
+def market_ws_enabled() -> bool:
+    """Stream best-bid/offer quotes into ``market_feed`` (off = REST polling only)."""
+    return env_flag("NADO_MARKET_WS", True)
+
+
+def single_flight_enabled() -> bool:
+    """Let concurrent identical Nado reads share one in-flight gateway call."""
+    return env_flag("NADO_SINGLE_FLIGHT", True)
+
+
+def telegram_sender_enabled() -> bool:
+    """Route background notifications through the laned, durable ``TelegramSender``."""
+    return env_flag("NADO_TELEGRAM_SENDER", True)
+
+
+def pnl_card_workers() -> int:
+    """Processes rendering PnL share cards (0 = render on the misc thread pool)."""
+    raw = (os.environ.get("NADO_PNL_CARD_WORKERS") or "2").strip()
+    try:
+        return max(0, min(8, int(float(raw))))
+    except ValueError:
+        return 2
+
+
+def pnl_card_queue_size() -> int:
+    """Card renders allowed to wait behind busy workers before callers get 'busy'."""
+    raw = (os.environ.get("NADO_PNL_CARD_QUEUE") or "16").strip()
+    try:
+        return max(0, min(256, int(float(raw))))
+    except ValueError:
+        return 16
+
+
+def pnl_card_format() -> str:
+    """Upload encoding for share cards: ``jpeg`` (fast, default) or ``png``."""
+    raw = (os.environ.get("NADO_PNL_CARD_FORMAT") or "jpeg").strip().lower()
+    return "png" if raw == "png" else "jpeg"
+
+
+def session_pnl_accumulator_enabled() -> bool:
+    """Advance session realized PnL incrementally instead of replaying every fill."""
+    return env_flag("NADO_SESSION_PNL_ACCUMULATOR", True)
+
+
+def session_pnl_verify_every() -> int:
+    """Cross-check the accumulator against a full replay every N reads (0 = never)."""
+    raw = (os.environ.get("NADO_SESSION_PNL_VERIFY_EVERY") or "25").strip()
+    try:
+        return max(0, int(float(raw)))
+    except ValueError:
+        return 25
+
+
+def fill_rollups_enabled() -> bool:
+    """Serve analytics windows from the per-day fill rollups instead of replaying the ledger."""
+    return env_flag("NADO_FILL_ROLLUPS", True)
+
+
+def round_trip_ledger_enabled() -> bool:
+    """Serve History round trips from the persisted FIFO ledger instead of re-pairing every fill."""
+    return env_flag("NADO_ROUND_TRIP_LEDGER", True)
+
+
+def alert_index_enabled() -> bool:
+    """Evaluate alerts from the in-memory threshold index instead of a DB scan per tick."""
+    return env_flag("NADO_ALERT_INDEX", True)
+
+
+def alert_index_resync_seconds() -> float:
+    """Reload the alert index from the DB this often (picks up other processes' edits)."""
+    raw = (os.environ.get("NADO_ALERT_INDEX_RESYNC_SECONDS") or "60").strip()
+    try:
+        return max(5.0, float(raw))
+    except ValueError:
+        return 60.0
+
+
+def streaming_indicators_enabled() -> bool:
+    """Serve market_features from per-timeframe streaming indicator state."""
+    return env_flag("NADO_STREAMING_INDICATORS", True)
+
+
+def candle_store_enabled() -> bool:
+    """Serve get_candlesticks from the shared ring-buffer candle store."""
+    return env_flag("NADO_CANDLE_STORE", True)
+
+
+def catalog_background_refresh_enabled() -> bool:
+    """Serve an expired product catalog while it rebuilds on a background thread."""
+    return env_flag("NADO_CATALOG_BACKGROUND_REFRESH", True)
+
+
+def copy_poll_leader_concurrency() -> int:
+    """Leader portfolios read in parallel per copy poll (1 = one at a time)."""
+    raw = (os.environ.get("NADO_COPY_LEADER_CONCURRENCY") or "4").strip()
+    try:
+        return max(1, min(32, int(float(raw))))
+    except ValueError:
+        return 4
+
+
+def copy_poll_follower_concurrency() -> int:
+    """Follower mirrors synced in parallel per copy poll (1 = one at a time)."""
+    raw = (os.environ.get("NADO_COPY_FOLLOWER_CONCURRENCY") or "8").strip()
+    try:
+        return max(1, min(64, int(float(raw))))
+    except ValueError:
+        return 8
+
+
 def portfolio_poll_cache_seconds() -> int:
     """Skip re-fetching a user during background poll if synced within this window."""
     raw = (os.environ.get("NADO_PORTFOLIO_POLL_CACHE_SECONDS") or "45").strip()
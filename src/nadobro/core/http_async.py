@@ -0,0 +1,150 @@
+"""Async HTTP/2 client pool for Nado gateway and archive reads.
+
+The sync path (``http_session.SESSION``) runs one blocking ``requests`` call
+per thread, so reads in flight are capped by the SDK pool size and each thread
+mostly waits on a socket. This module keeps one ``httpx.AsyncClient`` per
+(event loop, host):
+
+- HTTP/2 when ``h2`` is importable. Many requests multiplex over a few
+  keep-alive connections, so concurrency is bounded by the gateway budget,
+  not by threads;
+- the same browser-like headers as the sync session;
+- the same per-host weight bucket (``http_session``). Waiting for tokens uses
+  ``asyncio.sleep`` so a starved bucket never blocks the loop.
+
+Budget admission (``gateway_budget.try_acquire_async``), retries and response
+parsing stay with the callers, as on the sync path.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import weakref
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from src.nadobro.core.http_session import _HTTP_BUCKET_MAX_WAIT_SECONDS, _acquire_token, browser_headers
+from src.nadobro.core.ipv4_egress import httpx_transport_kwargs
+from src.nadobro.utils.env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+_MAX_CONNECTIONS_PER_HOST = env_int("NADO_HTTP2_MAX_CONNECTIONS", 8)
+_MAX_KEEPALIVE_PER_HOST = env_int("NADO_HTTP2_MAX_KEEPALIVE", 8)
+_KEEPALIVE_EXPIRY_SECONDS = env_float("NADO_HTTP2_KEEPALIVE_EXPIRY_SECONDS", 30.0)
+
+try:  # pragma: no cover - exercised implicitly by the client build
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - h2 ships with httpx[http2]
+    _HTTP2_AVAILABLE = False
+
+# Tests swap in an ``httpx.MockTransport``; production builds a real one.
+_transport_override: Optional[httpx.AsyncBaseTransport] = None
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+_stats = {"requests": 0, "errors": 0, "clients_built": 0, "throttled": 0}
+
+
+def _host(url: str) -> str:
+    try:
+        return urlsplit(url).netloc.lower()
+    except Exception:
+        return ""
+
+
+def _build_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=max(1, _MAX_CONNECTIONS_PER_HOST),
+        max_keepalive_connections=max(1, _MAX_KEEPALIVE_PER_HOST),
+        keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    transport = _transport_override or httpx.AsyncHTTPTransport(
+        http2=_HTTP2_AVAILABLE, limits=limits, **httpx_transport_kwargs()
+    )
+    _stats["clients_built"] += 1
+    return httpx.AsyncClient(
+        headers=browser_headers(),
+        http2=_HTTP2_AVAILABLE,
+        limits=limits,
+        transport=transport,
+    )
+
+
+def get_async_client(url: str) -> httpx.AsyncClient:
+    """The running loop's keep-alive client for ``url``'s host."""
+    loop = asyncio.get_running_loop()
+    per_loop = _clients.get(loop)
+    if per_loop is None:
+        per_loop = {}
+        _clients[loop] = per_loop
+    host = _host(url)
+    client = per_loop.get(host)
+    if client is None or client.is_closed:
+        client = _build_client()
+        per_loop[host] = client
+    return client
+
+
+async def throttle_host_async(url: str, *, cost: float = 1.0, max_wait: float | None = None) -> bool:
+    """``http_session.throttle_host`` that waits with ``asyncio.sleep``."""
+    host = _host(url)
+    budget = float(max_wait if max_wait is not None else _HTTP_BUCKET_MAX_WAIT_SECONDS)
+    deadline = time.monotonic() + budget
+    while True:
+        if _acquire_token(host, cost=cost, max_wait=0.0):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            _stats["throttled"] += 1
+            return False
+        await asyncio.sleep(min(0.05, remaining))
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    timeout: float,
+    params: dict | None = None,
+    json_body: Any = None,
+    headers: dict | None = None,
+) -> httpx.Response:
+    """One request on the host's shared client; transport errors propagate."""
+    client = get_async_client(url)
+    try:
+        resp = await client.request(
+            method.upper(), url, params=params, json=json_body, headers=headers, timeout=timeout
+        )
+    except httpx.HTTPError:
+        _stats["errors"] += 1
+        raise
+    _stats["requests"] += 1
+    return resp
+
+
+async def close_async_clients() -> None:
+    """Close the running loop's clients (shutdown, tests)."""
+    per_loop = _clients.pop(asyncio.get_running_loop(), None) or {}
+    for client in per_loop.values():
+        try:
+            await client.aclose()
+        except Exception:  # policy: degrade-ok(closing a dead client is best-effort)
+            pass
+
+
+def async_http_stats() -> dict[str, Any]:
+    out: dict[str, Any] = dict(_stats)
+    out["http2"] = _HTTP2_AVAILABLE
+    try:
+        per_loop = _clients.get(asyncio.get_running_loop()) or {}
+    except RuntimeError:
+        per_loop = {}
+    out["hosts"] = sorted(per_loop)
+    return out
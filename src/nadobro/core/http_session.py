@@ -107,30 +107,37 @@ def _supported_accept_encoding() -> str:
     return ", ".join(parts)
 
 
-def _build_session() -> requests.Session:
-    sess = requests.Session()
+def browser_headers() -> dict[str, str]:
+    """Browser-like request headers shared by the sync and async clients.
+
+    ``Accept-Encoding`` is left to each client: it must list only what that
+    client can decode.
+    """
     # Look like a real desktop Chrome request. Cloudflare's lightweight bot
     # check ignores well-formed User-Agent + Accept-Language combos.
-    sess.headers.update(
-        {
-            "User-Agent": os.environ.get(
-                "NADO_HTTP_USER_AGENT",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0.0.0 Safari/537.36",
-            ),
-            "Accept": "application/json, text/plain, */*",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": _supported_accept_encoding(),
-            "Sec-Fetch-Site": "same-site",
-            "Sec-Fetch-Mode": "cors",
-            "Sec-Fetch-Dest": "empty",
-            "Origin": "https://app.nado.xyz",
-            "Referer": "https://app.nado.xyz/",
-            "Cache-Control": "no-cache",
-            "Pragma": "no-cache",
-        }
-    )
+    return {
+        "User-Agent": os.environ.get(
+            "NADO_HTTP_USER_AGENT",
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/124.0.0.0 Safari/537.36",
+        ),
+        "Accept": "application/json, text/plain, */*",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Sec-Fetch-Site": "same-site",
+        "Sec-Fetch-Mode": "cors",
+        "Sec-Fetch-Dest": "empty",
+        "Origin": "https://app.nado.xyz",
+        "Referer": "https://app.nado.xyz/",
+        "Cache-Control": "no-cache",
+        "Pragma": "no-cache",
+    }
+
+
+def _build_session() -> requests.Session:
+    sess = requests.Session()
+    sess.headers.update(browser_headers())
+    sess.headers["Accept-Encoding"] = _supported_accept_encoding()
     adapter = HTTPAdapter(
         pool_connections=max(8, _HTTP_POOL_CONNECTIONS),
         pool_maxsize=max(8, _HTTP_POOL_MAXSIZE),
@@ -206,6 +213,23 @@ def _acquire_token(host: str, *, cost: float = 1.0, max_wait: float | None = Non
         time.sleep(min(wait, 0.25))
 
 
+def available_tokens(url: str) -> float:
+    """Weight currently available in ``url``'s host bucket, without consuming.
+
+    Admission probe for schedulers that want to defer work rather than block
+    in :func:`throttle_host`. An untouched host reports a full burst.
+    """
+    host = _host(url)
+    if not host or _HTTP_RPS_PER_HOST <= 0:
+        return float("inf")
+    with _bucket_lock:
+        state = _buckets.get(host)
+        if state is None:
+            return _HTTP_BURST_PER_HOST
+        elapsed = max(0.0, time.monotonic() - state.last_refill)
+        return min(_HTTP_BURST_PER_HOST, state.tokens + elapsed * _HTTP_RPS_PER_HOST)
+
+
 def bucket_snapshot() -> dict[str, dict[str, float]]:
     """Diagnostic snapshot of per-host token buckets."""
     with _bucket_lock:
@@ -46,3 +46,11 @@ def websocket_connect_kwargs() -> dict:
     if force_ipv4_enabled():
         return {"family": socket.AF_INET}
     return {}
+
+
+def httpx_transport_kwargs() -> dict:
+    """Extra kwargs for ``httpx.AsyncHTTPTransport`` when IPv4 egress is forced."""
+    if force_ipv4_enabled():
+        # Binding the IPv4 wildcard makes httpcore open AF_INET sockets only.
+        return {"local_address": "0.0.0.0"}
+    return {}
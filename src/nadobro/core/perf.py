@@ -75,6 +75,11 @@ def _percentile(values: list[float], p: float) -> float:
     return values[lo] * (1 - frac) + values[hi] * frac
 
 
+def percentile(values: list[float], p: float) -> float:
+    """Interpolated percentile of ``values`` (sorted ascending inside)."""
+    return _percentile(sorted(values), p)
+
+
 def snapshot() -> dict[str, dict]:
     out = {}
     with _lock:
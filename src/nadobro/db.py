@@ -71,6 +71,28 @@ def _resolve_host_ipv4(url: str) -> str:
         return url
 
 
+def database_url() -> tuple[str, str]:
+    """The libpq DSN both pools connect with, plus a log label."""
+    url = os.environ.get("SUPABASE_DATABASE_URL") or os.environ.get("DATABASE_URL")
+    if not url:
+        raise RuntimeError("Neither SUPABASE_DATABASE_URL nor DATABASE_URL environment variable is set.")
+    db_label = "Supabase" if os.environ.get("SUPABASE_DATABASE_URL") else "default"
+    url = _prepare_db_url(url)
+    # Only force the DB host to IPv4 when IPv4-only egress is explicitly
+    # requested. By default we stay dual-stack: Supabase's direct host often
+    # publishes only AAAA (IPv6) records, so forcing an A lookup logged
+    # "No address associated with hostname" and fell back to the hostname
+    # anyway. Letting psycopg2/libpq resolve dual-stack is simpler and works.
+    if db_label == "Supabase":
+        try:
+            from src.nadobro.core.ipv4_egress import force_ipv4_enabled
+        except Exception:  # pragma: no cover - keep DB init resilient
+            force_ipv4_enabled = lambda: False  # noqa: E731
+        if force_ipv4_enabled():
+            url = _resolve_host_ipv4(url)
+    return url, db_label
+
+
 def get_pool():
     global _pool, _pool_pid
     current_pid = os.getpid()
@@ -83,23 +105,7 @@ def get_pool():
         _pool_pid = None
 
     if _pool is None:
-        url = os.environ.get("SUPABASE_DATABASE_URL") or os.environ.get("DATABASE_URL")
-        if not url:
-            raise RuntimeError("Neither SUPABASE_DATABASE_URL nor DATABASE_URL environment variable is set.")
-        db_label = "Supabase" if os.environ.get("SUPABASE_DATABASE_URL") else "default"
-        url = _prepare_db_url(url)
-        # Only force the DB host to IPv4 when IPv4-only egress is explicitly
-        # requested. By default we stay dual-stack: Supabase's direct host often
-        # publishes only AAAA (IPv6) records, so forcing an A lookup logged
-        # "No address associated with hostname" and fell back to the hostname
-        # anyway. Letting psycopg2/libpq resolve dual-stack is simpler and works.
-        if db_label == "Supabase":
-            try:
-                from src.nadobro.core.ipv4_egress import force_ipv4_enabled
-            except Exception:  # pragma: no cover - keep DB init resilient
-                force_ipv4_enabled = lambda: False  # noqa: E731
-            if force_ipv4_enabled():
-                url = _resolve_host_ipv4(url)
+        url, db_label = database_url()
         _pool = psycopg2.pool.ThreadedConnectionPool(
             _DB_POOL_MIN, _DB_POOL_MAX, url, **_DB_CONNECT_KWARGS
         )
@@ -210,6 +216,16 @@ def execute_returning(sql, params=None):
     )
 
 
+def execute_returning_all(sql, params=None):
+    """Run one write and return every ``RETURNING`` row (no disconnect retry)."""
+    def _consume(cur):
+        return [dict(r) for r in cur.fetchall()]
+
+    return _run_statement(
+        sql, params, _consume, cursor_factory=psycopg2.extras.RealDictCursor,
+    )
+
+
 def run_transaction(work):
     """Run related read/write statements in one short database transaction.
 
@@ -997,6 +1013,245 @@ def init_db():
             conn.commit()
             logger.info("overlay_signals table verified/created")
 
+        # --- session_pnl_accumulators (migrations/0019_session_pnl_accumulators.sql) ---
+        # Incremental session realized-PnL state (derived; safe to truncate).
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS session_pnl_accumulators (
+                    session_id     INTEGER NOT NULL,
+                    network        TEXT NOT NULL,
+                    positions      JSONB NOT NULL DEFAULT '{}',
+                    net_base       NUMERIC NOT NULL DEFAULT 0,
+                    realized       NUMERIC NOT NULL DEFAULT 0,
+                    fees           NUMERIC NOT NULL DEFAULT 0,
+                    fills          INTEGER NOT NULL DEFAULT 0,
+                    last_fill_id   BIGINT NOT NULL DEFAULT 0,
+                    last_fill_at   TIMESTAMPTZ,
+                    fill_revision  BIGINT,
+                    price_lo       DOUBLE PRECISION,
+                    price_hi       DOUBLE PRECISION,
+                    base_traded    DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    updated_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    PRIMARY KEY (session_id, network)
+                );
+                ALTER TABLE session_pnl_accumulators ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
+                ALTER TABLE session_pnl_accumulators ADD COLUMN IF NOT EXISTS price_lo DOUBLE PRECISION;
+                ALTER TABLE session_pnl_accumulators ADD COLUMN IF NOT EXISTS price_hi DOUBLE PRECISION;
+                ALTER TABLE session_pnl_accumulators
+                    ADD COLUMN IF NOT EXISTS base_traded DOUBLE PRECISION NOT NULL DEFAULT 0;
+            """)
+            conn.commit()
+            logger.info("session_pnl_accumulators table verified/created")
+
+        # --- telegram_outbox (migrations/0020_telegram_outbox.sql) ---
+        # Pending Telegram envelopes; replayed by TelegramSender on startup.
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS telegram_outbox (
+                    id           TEXT PRIMARY KEY,
+                    chat_id      BIGINT NOT NULL,
+                    lane         TEXT NOT NULL,
+                    text         TEXT NOT NULL,
+                    kwargs       JSONB NOT NULL DEFAULT '{}',
+                    dedupe_key   TEXT,
+                    created_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+                );
+                CREATE INDEX IF NOT EXISTS idx_telegram_outbox_created
+                    ON telegram_outbox (created_at);
+            """)
+            conn.commit()
+            logger.info("telegram_outbox table verified/created")
+
+        # --- user_fill_rollups (migrations/0021_user_fill_rollups.sql) ---
+        # Per-day analytics rollups + their ingest state (derived; safe to truncate).
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS user_fill_rollups (
+                    user_id           BIGINT NOT NULL,
+                    network           TEXT NOT NULL,
+                    product_id        INTEGER NOT NULL,
+                    day               DATE NOT NULL,
+                    product_name      TEXT NOT NULL DEFAULT '',
+                    perp_usd          NUMERIC NOT NULL DEFAULT 0,
+                    spot_usd          NUMERIC NOT NULL DEFAULT 0,
+                    nadobro_perp_usd  NUMERIC NOT NULL DEFAULT 0,
+                    nadobro_spot_usd  NUMERIC NOT NULL DEFAULT 0,
+                    fees              NUMERIC NOT NULL DEFAULT 0,
+                    funding           NUMERIC NOT NULL DEFAULT 0,
+                    realized          NUMERIC NOT NULL DEFAULT 0,
+                    win_pnl           NUMERIC NOT NULL DEFAULT 0,
+                    loss_pnl          NUMERIC NOT NULL DEFAULT 0,
+                    fills             INTEGER NOT NULL DEFAULT 0,
+                    nadobro_fills     INTEGER NOT NULL DEFAULT 0,
+                    wins              INTEGER NOT NULL DEFAULT 0,
+                    losses            INTEGER NOT NULL DEFAULT 0,
+                    eod_positions     JSONB,
+                    updated_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    PRIMARY KEY (user_id, network, product_id, day)
+                );
+                CREATE INDEX IF NOT EXISTS idx_user_fill_rollups_day
+                    ON user_fill_rollups (user_id, network, day);
+                CREATE TABLE IF NOT EXISTS fill_rollup_state (
+                    user_id              BIGINT NOT NULL,
+                    network              TEXT NOT NULL,
+                    positions            JSONB NOT NULL DEFAULT '{}',
+                    fills                INTEGER NOT NULL DEFAULT 0,
+                    last_submission_idx  NUMERIC(78,0) NOT NULL DEFAULT -1,
+                    last_fill_at         TIMESTAMPTZ,
+                    last_funding_id      BIGINT NOT NULL DEFAULT 0,
+                    fill_revision        BIGINT,
+                    updated_at           TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    PRIMARY KEY (user_id, network)
+                );
+                ALTER TABLE fill_rollup_state ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
+            """)
+            for net in ("mainnet", "testnet"):
+                cur.execute(f"""
+                    CREATE INDEX IF NOT EXISTS idx_trades_{net}_user_fill_ts
+                        ON trades_{net} (user_id, (COALESCE(filled_at, created_at)))
+                        WHERE submission_idx IS NOT NULL;
+                """)
+            conn.commit()
+            logger.info("user_fill_rollups tables verified/created")
+
+        # --- round_trips (migrations/0022_round_trip_ledger.sql) ---
+        # Persisted History round trips + their open-lot state (derived; safe to truncate).
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS round_trips (
+                    user_id          BIGINT NOT NULL,
+                    network          TEXT NOT NULL,
+                    trip_key         TEXT NOT NULL,
+                    close_trade_id   BIGINT NOT NULL,
+                    product_id       INTEGER NOT NULL,
+                    product_name     TEXT NOT NULL DEFAULT '',
+                    isolated         BOOLEAN NOT NULL DEFAULT false,
+                    side             TEXT NOT NULL,
+                    size             DOUBLE PRECISION NOT NULL,
+                    leverage         DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    avg_open_price   DOUBLE PRECISION NOT NULL,
+                    avg_close_price  DOUBLE PRECISION NOT NULL,
+                    open_ts          TIMESTAMPTZ,
+                    close_ts         TIMESTAMPTZ,
+                    fees             DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    funding_paid     DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    realized_pnl     DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    volume_usd       DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    PRIMARY KEY (user_id, network, trip_key)
+                );
+                CREATE INDEX IF NOT EXISTS idx_round_trips_close
+                    ON round_trips (user_id, network, close_ts DESC, close_trade_id);
+                CREATE TABLE IF NOT EXISTS round_trip_state (
+                    user_id              BIGINT NOT NULL,
+                    network              TEXT NOT NULL,
+                    inventory            JSONB NOT NULL DEFAULT '{}',
+                    fills                INTEGER NOT NULL DEFAULT 0,
+                    last_submission_idx  NUMERIC(78,0) NOT NULL DEFAULT -1,
+                    last_fill_at         TIMESTAMPTZ,
+                    last_fill_id         BIGINT NOT NULL DEFAULT 0,
+                    epoch                TEXT,
+                    fill_revision        BIGINT,
+                    updated_at           TIMESTAMPTZ NOT NULL DEFAULT now(),
+                    PRIMARY KEY (user_id, network)
+                );
+                ALTER TABLE round_trip_state ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
+            """)
+            conn.commit()
+            logger.info("round_trips tables verified/created")
+
+        # --- fill_revisions (migrations/0024_fill_revisions.sql) ---
+        # Commit-ordered per-user change counter stamped onto trades_<net>
+        # rows; the derived fill ledgers advance from it instead of
+        # re-aggregating their folded fills.
+        _FILL_REVISION_COLUMNS = (
+            "user_id", "product_id", "product_name", "order_type", "side", "size", "price",
+            "leverage", "fees", "created_at", "filled_at", "fill_price", "fill_size", "fill_fee",
+            "builder_fee", "source", "strategy_session_id", "funding_paid", "submission_idx",
+            "isolated", "fee_x18", "base_filled_x18", "quote_filled_x18", "via_nadobro",
+        )
+        _FILL_STATUSES = "('filled', 'closed', 'partially_filled')"
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                CREATE TABLE IF NOT EXISTS fill_revisions (
+                    network            TEXT NOT NULL,
+                    user_id            BIGINT NOT NULL,
+                    revision           BIGINT NOT NULL DEFAULT 0,
+                    reshaped_revision  BIGINT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (network, user_id)
+                );
+                CREATE OR REPLACE FUNCTION stamp_fill_revision() RETURNS trigger AS $$
+                DECLARE
+                  net TEXT := CASE WHEN TG_TABLE_NAME = 'trades_testnet' THEN 'testnet' ELSE 'mainnet' END;
+                  reshaped BOOLEAN := false;
+                  rev BIGINT;
+                BEGIN
+                  IF TG_OP = 'DELETE' THEN
+                    reshaped := OLD.status IN {_FILL_STATUSES};
+                  ELSIF TG_OP = 'UPDATE' AND OLD.status IN {_FILL_STATUSES} THEN
+                    reshaped := NEW.status IS NULL
+                      OR NEW.status NOT IN {_FILL_STATUSES}
+                      OR (NEW.user_id, NEW.strategy_session_id, NEW.source)
+                           IS DISTINCT FROM (OLD.user_id, OLD.strategy_session_id, OLD.source)
+                      OR (OLD.submission_idx IS NOT NULL AND NEW.submission_idx IS DISTINCT FROM OLD.submission_idx)
+                      OR (COALESCE(OLD.product_id, 0) <> 0 AND NEW.product_id IS DISTINCT FROM OLD.product_id)
+                      OR COALESCE(NEW.filled_at, NEW.created_at) < COALESCE(OLD.filled_at, OLD.created_at);
+                  END IF;
+                  IF reshaped AND OLD.user_id IS NOT NULL THEN
+                    INSERT INTO fill_revisions AS f (network, user_id, revision, reshaped_revision)
+                    VALUES (net, OLD.user_id, 1, 1)
+                    ON CONFLICT (network, user_id) DO UPDATE
+                      SET revision = f.revision + 1, reshaped_revision = f.revision + 1;
+                  END IF;
+                  IF TG_OP = 'DELETE' THEN
+                    RETURN OLD;
+                  END IF;
+                  IF NEW.user_id IS NOT NULL THEN
+                    INSERT INTO fill_revisions AS f (network, user_id, revision)
+                    VALUES (net, NEW.user_id, 1)
+                    ON CONFLICT (network, user_id) DO UPDATE SET revision = f.revision + 1
+                    RETURNING f.revision INTO rev;
+                    NEW.fill_revision := rev;
+                  END IF;
+                  RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql;
+            """)
+            old_row = ", ".join(f"OLD.{col}" for col in _FILL_REVISION_COLUMNS)
+            new_row = ", ".join(f"NEW.{col}" for col in _FILL_REVISION_COLUMNS)
+            for net in ("mainnet", "testnet"):
+                cur.execute(f"""
+                    ALTER TABLE trades_{net} ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
+                    CREATE INDEX IF NOT EXISTS idx_trades_{net}_user_fill_revision
+                        ON trades_{net} (user_id, fill_revision) WHERE fill_revision IS NOT NULL;
+                """)
+                # Created only when missing: DROP/CREATE TRIGGER takes an
+                # exclusive lock on the trades table on every boot otherwise.
+                cur.execute(f"""
+                    DO $$ BEGIN
+                      IF NOT EXISTS (
+                        SELECT 1 FROM pg_trigger WHERE tgname = 'trades_{net}_fill_revision_ins'
+                      ) THEN
+                        CREATE TRIGGER trades_{net}_fill_revision_ins
+                            BEFORE INSERT OR DELETE ON trades_{net}
+                            FOR EACH ROW EXECUTE FUNCTION stamp_fill_revision();
+                      END IF;
+                      IF NOT EXISTS (
+                        SELECT 1 FROM pg_trigger WHERE tgname = 'trades_{net}_fill_revision_upd'
+                      ) THEN
+                        CREATE TRIGGER trades_{net}_fill_revision_upd
+                            BEFORE UPDATE ON trades_{net}
+                            FOR EACH ROW WHEN ((
+                              {old_row}, OLD.status IN {_FILL_STATUSES}
+                            ) IS DISTINCT FROM (
+                              {new_row}, NEW.status IN {_FILL_STATUSES}
+                            ))
+                            EXECUTE FUNCTION stamp_fill_revision();
+                      END IF;
+                    END $$;
+                """)
+            conn.commit()
+            logger.info("fill_revisions table and triggers verified/created")
+
         # --- Engine v2 tables (migrations/0007_engine_v2_tables.sql) ---
         with conn.cursor() as cur:
             cur.execute("""
@@ -1107,6 +1362,63 @@ def init_db():
             conn.commit()
             logger.info("engine v2 tables verified/created")
 
+        # --- Portfolio history tiers (migrations/0023_portfolio_history_rollups.sql) ---
+        # 1h / 1d last-sample rollups beside the raw 1m sampler table.
+        with conn.cursor() as cur:
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS engine_portfolio_history_1h (
+                    user_id           BIGINT NOT NULL,
+                    network           TEXT NOT NULL DEFAULT 'mainnet',
+                    bucket            TIMESTAMPTZ NOT NULL,
+                    ts                TIMESTAMPTZ NOT NULL,
+                    total_value_quote NUMERIC(38,18) NOT NULL,
+                    by_account_json   JSONB NOT NULL,
+                    by_asset_json     JSONB NOT NULL,
+                    PRIMARY KEY (user_id, network, bucket)
+                );
+
+                CREATE TABLE IF NOT EXISTS engine_portfolio_history_1d (
+                    user_id           BIGINT NOT NULL,
+                    network           TEXT NOT NULL DEFAULT 'mainnet',
+                    bucket            TIMESTAMPTZ NOT NULL,
+                    ts                TIMESTAMPTZ NOT NULL,
+                    total_value_quote NUMERIC(38,18) NOT NULL,
+                    by_account_json   JSONB NOT NULL,
+                    by_asset_json     JSONB NOT NULL,
+                    PRIMARY KEY (user_id, network, bucket)
+                );
+
+                -- Retention DELETEs range-scan ts across every user.
+                CREATE INDEX IF NOT EXISTS idx_engine_portfolio_history_ts
+                    ON engine_portfolio_history (ts);
+                CREATE INDEX IF NOT EXISTS idx_engine_portfolio_history_1h_bucket
+                    ON engine_portfolio_history_1h (bucket);
+                CREATE INDEX IF NOT EXISTS idx_engine_portfolio_history_1d_bucket
+                    ON engine_portfolio_history_1d (bucket);
+
+                INSERT INTO engine_portfolio_history_1h
+                    (user_id, network, bucket, ts, total_value_quote, by_account_json, by_asset_json)
+                SELECT DISTINCT ON (user_id, network, date_trunc('hour', ts AT TIME ZONE 'UTC'))
+                       user_id, network, date_trunc('hour', ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                       ts, total_value_quote, by_account_json, by_asset_json
+                FROM engine_portfolio_history
+                WHERE NOT EXISTS (SELECT 1 FROM engine_portfolio_history_1h)
+                ORDER BY user_id, network, date_trunc('hour', ts AT TIME ZONE 'UTC'), ts DESC
+                ON CONFLICT (user_id, network, bucket) DO NOTHING;
+
+                INSERT INTO engine_portfolio_history_1d
+                    (user_id, network, bucket, ts, total_value_quote, by_account_json, by_asset_json)
+                SELECT DISTINCT ON (user_id, network, date_trunc('day', ts AT TIME ZONE 'UTC'))
+                       user_id, network, date_trunc('day', ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+                       ts, total_value_quote, by_account_json, by_asset_json
+                FROM engine_portfolio_history
+                WHERE NOT EXISTS (SELECT 1 FROM engine_portfolio_history_1d)
+                ORDER BY user_id, network, date_trunc('day', ts AT TIME ZONE 'UTC'), ts DESC
+                ON CONFLICT (user_id, network, bucket) DO NOTHING;
+            """)
+            conn.commit()
+            logger.info("portfolio history rollup tables verified/created")
+
         # --- fill_sync_queue table ---
         # --- Product database design tables: strategy configs, positions, orders, points, and analytics ---
         with conn.cursor() as cur:
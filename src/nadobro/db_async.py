@@ -0,0 +1,275 @@
+"""Async-native Postgres access (psycopg 3 ``AsyncConnectionPool``).
+
+``db.py`` runs every statement on a psycopg2 connection from a thread in the
+``run_blocking_db`` pool, so a query costs a thread hop plus GIL handoffs and
+DB concurrency is capped by worker threads, not connections. This module is
+the coroutine-side equivalent for hot async callers:
+
+- ``aquery_one`` / ``aquery_all`` / ``aexecute`` / ``aexecute_returning`` take
+  the same ``%s`` SQL and parameters as their ``db`` counterparts and return
+  the same dict rows;
+- ``atransaction(work)`` mirrors ``db.run_transaction``. ``work`` is an async
+  callable that receives the cursor;
+- disconnect hygiene matches ``db._run_statement``. A connection that raised a
+  disconnect-class error is closed (the pool drops it), reads retry ONCE on a
+  fresh connection, and writes and transactions are never retried.
+
+A pool belongs to the event loop that opened it. ``NADO_ASYNC_DB=0`` routes
+every call back through ``run_blocking_db`` and the psycopg2 pool.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import asyncio
+
+import psycopg
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool, PoolTimeout
+
+from src.nadobro.db import _DB_CONNECT_KWARGS, database_url
+from src.nadobro.utils.env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+_ASYNC_POOL_MIN = env_int("DB_ASYNC_POOL_MIN", 1)
+_ASYNC_POOL_MAX = env_int("DB_ASYNC_POOL_MAX", 20)
+_ASYNC_POOL_TIMEOUT = env_float("DB_ASYNC_POOL_TIMEOUT_SECONDS", 15.0)
+
+# Same contract as ``db._DISCONNECT_ERRORS``. ``PoolTimeout`` subclasses
+# OperationalError but means "no free connection", not "dead link".
+_DISCONNECT_ERRORS = (psycopg.OperationalError, psycopg.InterfaceError)
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[AsyncConnectionPool, asyncio.Task]]" = (
+    weakref.WeakKeyDictionary()
+)
+_pools_pid = os.getpid()
+_stats = {"statements": 0, "retries": 0, "discarded": 0, "fallback_statements": 0}
+
+T = TypeVar("T")
+
+
+def _enabled() -> bool:
+    from src.nadobro.core.feature_flags import async_db_enabled
+
+    return async_db_enabled()
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """The running loop's pool, opened on first use."""
+    global _pools_pid
+    if _pools_pid != os.getpid():
+        _pools.clear()
+        _pools_pid = os.getpid()
+    loop = asyncio.get_running_loop()
+    entry = _pools.get(loop)
+    if entry is None:
+        url, db_label = database_url()
+        pool = AsyncConnectionPool(
+            url,
+            min_size=max(0, _ASYNC_POOL_MIN),
+            max_size=max(1, _ASYNC_POOL_MAX, _ASYNC_POOL_MIN),
+            timeout=_ASYNC_POOL_TIMEOUT,
+            kwargs={"row_factory": dict_row, **_DB_CONNECT_KWARGS},
+            open=False,
+            name="nadobro-async",
+        )
+        # Registered before the first await so concurrent callers share it.
+        entry = (pool, loop.create_task(pool.open()))
+        _pools[loop] = entry
+        logger.info(
+            "Async PostgreSQL pool initialized (%s) min=%s max=%s",
+            db_label, _ASYNC_POOL_MIN, _ASYNC_POOL_MAX,
+        )
+    pool, opening = entry
+    if not opening.done():
+        await asyncio.shield(opening)
+    else:
+        opening.result()
+    return pool
+
+
+async def close_async_pool() -> None:
+    """Close the running loop's pool (shutdown, tests)."""
+    entry = _pools.pop(asyncio.get_running_loop(), None)
+    if entry is not None:
+        await entry[0].close()
+
+
+def async_pool_stats() -> dict[str, Any]:
+    out: dict[str, Any] = dict(_stats)
+    out.update({"min": _ASYNC_POOL_MIN, "max": _ASYNC_POOL_MAX, "enabled": _enabled()})
+    try:
+        entry = _pools.get(asyncio.get_running_loop())
+    except RuntimeError:
+        entry = None
+    if entry is not None:
+        out["pool"] = entry[0].get_stats()
+    return out
+
+
+async def _run(
+    sql: Any,
+    params: Any,
+    consume: Callable[[psycopg.AsyncCursor], Awaitable[T]],
+    *,
+    retry_disconnect: bool = False,
+) -> T:
+    attempts = 2 if retry_disconnect else 1
+    for attempt in range(attempts):
+        pool = await get_async_pool()
+        try:
+            async with pool.connection() as conn:
+                try:
+                    async with conn.cursor() as cur:
+                        await cur.execute(sql, params)
+                        result = await consume(cur)
+                except PoolTimeout:
+                    raise
+                except _DISCONNECT_ERRORS:
+                    # A closed connection is dropped by the pool, not reused.
+                    _stats["discarded"] += 1
+                    await conn.close()
+                    raise
+            _stats["statements"] += 1
+            return result
+        except PoolTimeout:
+            raise
+        except _DISCONNECT_ERRORS as e:
+            if attempt + 1 < attempts:
+                _stats["retries"] += 1
+                logger.warning(
+                    "Async DB connection failed (%s); retrying once on a fresh connection",
+                    str(e).strip().splitlines()[0][:160] if str(e).strip() else type(e).__name__,
+                )
+                continue
+            raise
+    raise RuntimeError("unreachable")  # pragma: no cover - loop always returns or raises
+
+
+async def _fallback(func: Callable[..., T], *args: Any) -> T:
+    from src.nadobro.core.async_utils import run_blocking_db
+
+    _stats["fallback_statements"] += 1
+    return await run_blocking_db(func, *args)
+
+
+async def _fetchone(cur: psycopg.AsyncCursor) -> Optional[dict]:
+    row = await cur.fetchone()
+    return dict(row) if row else None
+
+
+async def _fetchall(cur: psycopg.AsyncCursor) -> list[dict]:
+    return [dict(r) for r in await cur.fetchall()]
+
+
+async def _nothing(cur: psycopg.AsyncCursor) -> None:
+    return None
+
+
+async def aquery_one(sql, params=None) -> Optional[dict]:
+    if not _enabled():
+        from src.nadobro.db import query_one
+
+        return await _fallback(query_one, sql, params)
+    return await _run(sql, params, _fetchone, retry_disconnect=True)
+
+
+async def aquery_all(sql, params=None) -> list[dict]:
+    if not _enabled():
+        from src.nadobro.db import query_all
+
+        return await _fallback(query_all, sql, params)
+    return await _run(sql, params, _fetchall, retry_disconnect=True)
+
+
+async def aexecute(sql, params=None) -> None:
+    # No disconnect retry: the statement may have reached the server before
+    # the link died, and replaying a non-idempotent write could double-apply.
+    if not _enabled():
+        from src.nadobro.db import execute
+
+        return await _fallback(execute, sql, params)
+    await _run(sql, params, _nothing)
+
+
+async def aexecute_returning(sql, params=None) -> Optional[dict]:
+    if not _enabled():
+        from src.nadobro.db import execute_returning
+
+        return await _fallback(execute_returning, sql, params)
+    return await _run(sql, params, _fetchone)
+
+
+class _ThreadCursor:
+    """Async face over a psycopg2 cursor for the ``NADO_ASYNC_DB=0`` path."""
+
+    def __init__(self, cur) -> None:
+        self._cur = cur
+
+    async def execute(self, sql, params=None) -> None:
+        await _fallback(self._cur.execute, sql, params)
+
+    async def fetchone(self):
+        row = self._cur.fetchone()
+        return dict(row) if row else None
+
+    async def fetchall(self):
+        return [dict(r) for r in self._cur.fetchall()]
+
+    @property
+    def rowcount(self) -> int:
+        return self._cur.rowcount
+
+
+async def atransaction(work: Callable[[Any], Awaitable[T]]) -> T:
+    """Run ``await work(cur)`` in one short transaction; commit on return.
+
+    Never retried, like ``db.run_transaction``: replaying a state transition
+    after a disconnect could duplicate a write.
+    """
+    if not _enabled():
+        from src.nadobro.db import get_db, put_db
+
+        import psycopg2.extras
+
+        conn = await _fallback(get_db)
+        broken = False
+        try:
+            with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+                result = await work(_ThreadCursor(cur))
+            conn.commit()
+            return result
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            raise
+        finally:
+            put_db(conn, close=broken)
+
+    pool = await get_async_pool()
+    started = time.perf_counter()
+    async with pool.connection() as conn:
+        try:
+            async with conn.cursor() as cur:
+                result = await work(cur)
+        except PoolTimeout:
+            raise
+        except _DISCONNECT_ERRORS:
+            _stats["discarded"] += 1
+            await conn.close()
+            raise
+    _stats["statements"] += 1
+    from src.nadobro.core.perf import record_metric
+
+    record_metric("db.async.transaction", (time.perf_counter() - started) * 1000.0)
+    return result
@@ -14,7 +14,7 @@ import abc
 from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum
-from typing import AsyncIterator, List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Sequence
 
 from src.nadobro.engine.types import OrderType, TradeType
 
@@ -108,6 +108,12 @@ class NadoAdapterBase(abc.ABC):
     """
 
     connector_name: str = "nado"
+    # True when ``order_statuses`` resolves a batch with per-product venue
+    # reads rather than one ``order_status`` per id (the default below).
+    batched_order_status: bool = False
+    # Ids the last ``order_statuses`` call read from the venue; the rest were
+    # served from a cached snapshot. Set before it returns.
+    last_status_batch_polled: int = 0
 
     @abc.abstractmethod
     async def place_order(
@@ -132,6 +138,22 @@ class NadoAdapterBase(abc.ABC):
     async def order_status(self, order_id: str) -> NadoOrder:
         ...
 
+    async def order_statuses(self, order_ids: Sequence[str]) -> Dict[str, NadoOrder]:
+        """Status of several orders at once, keyed by id.
+
+        Best-effort: an id whose status could not be read is left out and the
+        caller falls back to :meth:`order_status` for it (with its retry
+        policy). The default resolves ids one by one.
+        """
+        out: Dict[str, NadoOrder] = {}
+        for order_id in order_ids:
+            try:
+                out[order_id] = await self.order_status(order_id)
+            except AdapterError:
+                continue
+        self.last_status_batch_polled = len(out)
+        return out
+
     @abc.abstractmethod
     def fill_stream(self, trading_pair: str) -> AsyncIterator[Fill]:
         """Async generator yielding fills for ``trading_pair`` in order."""
@@ -224,8 +224,35 @@ def _client_call_succeeded(resp: Any) -> tuple[bool, str]:
     return True, ""
 
 
+def _resting_filled_base(resting: Dict[str, Any]) -> Decimal:
+    return abs(_match_dec(_first(resting, _OPEN_FILLED_KEYS)))
+
+
+def _sum_fills(matches: Optional[Iterable[Any]], digest: str) -> tuple[Decimal, Decimal, Decimal]:
+    """(base, quote, fee) filled for ``digest`` across a matches page."""
+    fb = fq = fee = Decimal(0)
+    for m in matches or []:
+        if str(_first(m, _DIGEST_KEYS, "")) != digest:
+            continue
+        # Use the per-match FILL fields (base_filled / quote_filled), not
+        # ``amount`` (the order's total, which over-counts on multi-match),
+        # and convert from x18 to human units (_match_dec). Take abs because
+        # the indexer signs them by direction.
+        base = abs(_match_dec(_first(m, ("base_filled", "base_filled_x18", "amount", "size", "filled_base"))))
+        quote = abs(_match_dec(_first(m, ("quote_filled", "quote_filled_x18"))))
+        if quote <= 0:
+            # Older shapes without quote_filled: derive from price × base.
+            px = _match_dec(_first(m, ("priceX18", "price_x18", *(_PRICE_KEYS))))
+            quote = base * px
+        fb += base
+        fq += quote
+        fee += abs(_match_dec(_first(m, _MATCH_FEE_KEYS)))
+    return fb, fq, fee
+
+
 class NadoAdapter(NadoAdapterBase):
     connector_name = "nado"
+    batched_order_status = True
 
     def __init__(
         self,
@@ -628,6 +655,77 @@ class NadoAdapter(NadoAdapterBase):
         self._status_cache[order_id] = (order, lc.seq if lc is not None else -1)
         return order
 
+    async def order_statuses(self, order_ids: Sequence[str]) -> Dict[str, NadoOrder]:
+        """Resolve a tick's orders from one open-orders read per product.
+
+        Same answers as :meth:`order_status` per id, but: snapshots the WS
+        lifecycle proves current (terminal, or fresh with an unchanged seq) cost
+        nothing; the rest share ONE ``get_open_orders`` per product and at most
+        ONE ``get_matches`` per product, which is only needed for orders that
+        left the book or whose resting fill grew since the last snapshot. Ids
+        that are unknown or whose product read fails are left out — the caller's
+        ``order_status`` fallback reconciles them.
+        """
+        out: Dict[str, NadoOrder] = {}
+        polled = 0
+        by_product: Dict[int, list] = {}
+        for order_id in order_ids:
+            ref = self._orders.get(order_id) or self._registry.lookup(order_id)
+            if ref is None:
+                continue
+            self._orders[order_id] = ref
+            lc = order_lifecycle.get(order_id)
+            cached = self._status_cache.get(order_id)
+            if cached is not None:
+                snap, seen_seq = cached
+                if snap.state.is_terminal or (lc is not None and lc.fresh and lc.seq == seen_seq):
+                    out[order_id] = snap
+                    continue
+            by_product.setdefault(int(ref.product_id), []).append(
+                (order_id, ref, lc.seq if lc is not None else -1)
+            )
+
+        for product_id, items in by_product.items():
+            try:
+                open_orders = list(
+                    await asyncio.to_thread(self._client.get_open_orders, product_id, True) or []
+                )
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("batched status: get_open_orders failed for product %s: %s", product_id, exc)
+                continue
+            self._open_orders_snap[product_id] = (time.monotonic(), open_orders)
+            resting_by_digest = {
+                str(_first(o, _DIGEST_KEYS, "")): o for o in open_orders if isinstance(o, dict)
+            }
+            matches: Optional[list] = None
+            for order_id, ref, seq in items:
+                resting = resting_by_digest.get(order_id)
+                fills = None
+                if resting is None or _resting_filled_base(resting) > 0:
+                    cached = self._status_cache.get(order_id)
+                    if (
+                        resting is not None and cached is not None
+                        and cached[0].filled_base > 0
+                        and cached[0].filled_base == _resting_filled_base(resting)
+                    ):
+                        # Resting fill unchanged since the last snapshot: its
+                        # quote/fee totals are too.
+                        fills = (cached[0].filled_base, cached[0].filled_quote, cached[0].fee_quote)
+                    else:
+                        if matches is None:
+                            try:
+                                matches = list(await self._client.get_matches(product_ids=[product_id]) or [])
+                            except Exception as exc:  # noqa: BLE001
+                                logger.debug("batched status: get_matches failed for product %s: %s", product_id, exc)
+                                break
+                        fills = _sum_fills(matches, order_id)
+                order = self._status_from(order_id, ref, resting, fills)
+                self._status_cache[order_id] = (order, seq)
+                out[order_id] = order
+                polled += 1
+        self.last_status_batch_polled = polled
+        return out
+
     async def _open_orders_coalesced(self, product_id: int) -> list:
         """get_open_orders(product_id) with a short intra-tick TTL so N per-level
         order_status polls in one tick share ONE gateway (query_orders) call.
@@ -650,10 +748,24 @@ class NadoAdapter(NadoAdapterBase):
             raise AdapterError(f"order_status failed: {exc}") from exc
 
         resting = self._find_open(open_orders, order_id)
+        fills = None
+        if resting is None or _resting_filled_base(resting) > 0:
+            fills = await self._fills_for(ref.product_id, order_id)
+        return self._status_from(order_id, ref, resting, fills)
+
+    def _status_from(
+        self,
+        order_id: str,
+        ref: _OrderRef,
+        resting: Optional[Dict[str, Any]],
+        fills: Optional[tuple[Decimal, Decimal, Decimal]],
+    ) -> NadoOrder:
+        """Build the status from the open-book row (if still resting) and the
+        digest's match aggregate (required unless resting with no fill)."""
         if resting is not None:
             # x18-scaled on the gateway open-orders feed — convert to human so a
             # resting/partial fill isn't recorded 1e18× too large.
-            filled_base = abs(_match_dec(_first(resting, _OPEN_FILLED_KEYS)))
+            filled_base = _resting_filled_base(resting)
             state = OrderState.PARTIALLY_FILLED if filled_base > 0 else OrderState.OPEN
             # AUDIT-FIX-2: pull real quote and fees from the match aggregate.
             # Previously this used filled_base * ref.price, which assumes every
@@ -662,7 +774,7 @@ class NadoAdapter(NadoAdapterBase):
             # ticks. With this fix the executor records the true quote / fee
             # delta into Inventory.
             if filled_base > 0:
-                fb, fq, fee = await self._fills_for(ref.product_id, order_id)
+                fb, fq, fee = fills if fills is not None else (Decimal(0), Decimal(0), Decimal(0))
                 if fb > 0:
                     # The matches feed should agree with what's in the book; if
                     # there's drift, trust the matches feed (it's the source of
@@ -676,7 +788,7 @@ class NadoAdapter(NadoAdapterBase):
             return self._mk_order(order_id, ref, state, filled_base, Decimal(0), Decimal(0))
 
         # No longer resting -> aggregate fills for this digest.
-        filled_base, filled_quote, fee = await self._fills_for(ref.product_id, order_id)
+        filled_base, filled_quote, fee = fills if fills is not None else (Decimal(0), Decimal(0), Decimal(0))
         lot = self._meta(ref.trading_pair).lot_size
         unfilled = ref.amount_base - filled_base
         if unfilled <= lot:
@@ -747,24 +859,7 @@ class NadoAdapter(NadoAdapterBase):
             matches = await self._client.get_matches(product_ids=[product_id])
         except Exception as exc:  # noqa: BLE001
             raise AdapterError(f"order_status fills failed: {exc}") from exc
-        fb = fq = fee = Decimal(0)
-        for m in matches or []:
-            if str(_first(m, _DIGEST_KEYS, "")) != digest:
-                continue
-            # Use the per-match FILL fields (base_filled / quote_filled), not
-            # ``amount`` (the order's total, which over-counts on multi-match),
-            # and convert from x18 to human units (_match_dec). Take abs because
-            # the indexer signs them by direction.
-            base = abs(_match_dec(_first(m, ("base_filled", "base_filled_x18", "amount", "size", "filled_base"))))
-            quote = abs(_match_dec(_first(m, ("quote_filled", "quote_filled_x18"))))
-            if quote <= 0:
-                # Older shapes without quote_filled: derive from price × base.
-                px = _match_dec(_first(m, ("priceX18", "price_x18", *(_PRICE_KEYS))))
-                quote = base * px
-            fb += base
-            fq += quote
-            fee += abs(_match_dec(_first(m, _MATCH_FEE_KEYS)))
-        return fb, fq, fee
+        return _sum_fills(matches, digest)
 
     async def fill_stream(self, trading_pair: str) -> AsyncIterator[Fill]:
         meta = self._meta(trading_pair)
@@ -8,6 +8,7 @@ Public API::
         Candle, candles_from_prices, candles_from_ohlc, resample_trades_csv,
         SimCosts, SimMeta, SimNadoAdapter,
         run_backtest, BacktestEngine, BacktestReport,
+        run_sweep, SweepResult, format_sweep_table,
     )
 
 Implemented in Phase 5.
@@ -21,6 +22,7 @@ from src.nadobro.engine.backtester.candle_ingest import (
 from src.nadobro.engine.backtester.engine import BacktestEngine, run_backtest
 from src.nadobro.engine.backtester.executor_sim import SimCosts, SimMeta, SimNadoAdapter
 from src.nadobro.engine.backtester.report import BacktestReport
+from src.nadobro.engine.backtester.sweep import SweepResult, format_sweep_table, run_sweep
 
 __all__ = [
     "Candle",
@@ -33,4 +35,7 @@ __all__ = [
     "run_backtest",
     "BacktestEngine",
     "BacktestReport",
+    "run_sweep",
+    "SweepResult",
+    "format_sweep_table",
 ]
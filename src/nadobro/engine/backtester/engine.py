@@ -10,6 +10,12 @@ bar (orders placed on a prior bar) → tick the controller (it reacts, places/ca
 polls fills) → accrue one bar of funding → snapshot equity. Orders placed during a
 tick therefore cannot fill earlier than the next bar.
 
+Candle history is converted to dicts once up front; the controller's
+``candle_provider`` gets a slice of that list ending at the current bar, so a
+run is linear in bars rather than rebuilding the history every tick. Pass
+``candle_window`` (the live provider serves 200 bars) to also bound the slice —
+that is the high-throughput mode :func:`run_sweep` uses.
+
 Usage::
 
     from src.nadobro.engine.backtester import run_backtest, SimCosts
@@ -69,11 +75,15 @@ class BacktestEngine:
         controller_id: str = "bt",
         limits: Optional[RiskLimits] = None,
         meta: Optional[Dict[str, SimMeta]] = None,
+        candle_window: Optional[int] = None,
     ) -> None:
         if not candles:
             raise ValueError("backtest requires at least one candle")
         self.strategy = strategy
         self.candles = list(candles)
+        # Shared, read-only bar dicts; the provider hands out slices of this.
+        self._candle_rows = [_candle_to_dict(c) for c in self.candles]
+        self.candle_window = int(candle_window) if candle_window else None
         self.user_id = user_id
         self.controller_id = controller_id
         self.adapter = SimNadoAdapter(costs=costs, meta=meta)
@@ -97,7 +107,9 @@ class BacktestEngine:
         )
 
     def _candle_provider(self, _pair: str) -> List[dict]:
-        return [_candle_to_dict(c) for c in self.candles[: self._idx + 1]]
+        stop = self._idx + 1
+        start = max(0, stop - self.candle_window) if self.candle_window else 0
+        return self._candle_rows[start:stop]
 
     def _equity(self, mark: Decimal) -> Decimal:
         holds = self.inventory.list_for_controller(self.user_id, self.controller_id)
@@ -128,6 +140,9 @@ class BacktestEngine:
                     i, len(self.candles), getattr(candle, "ts", None),
                     self.controller.id, exc_info=True,
                 )
+            # Nothing consumes executor events in a backtest; drop them so
+            # the bounded queue doesn't overflow (and log) every bar.
+            self.orchestrator.drain_events()
             self.adapter.accrue_funding()
             equity.append(self._equity(candle.close))
 
@@ -159,10 +174,12 @@ def run_backtest(
     controller_id: str = "bt",
     limits: Optional[RiskLimits] = None,
     meta: Optional[Dict[str, SimMeta]] = None,
+    candle_window: Optional[int] = None,
 ) -> BacktestReport:
     """Build the strategy's real controller, run it against ``candles`` through
     the cost-aware sim, and return a :class:`BacktestReport`."""
     return BacktestEngine(
         strategy, configs, candles, costs=costs, user_id=user_id,
         controller_id=controller_id, limits=limits, meta=meta,
+        candle_window=candle_window,
     ).run()
@@ -11,11 +11,16 @@ Fill model (no look-ahead): resting LIMIT/LIMIT_MAKER orders fill only when a
 :meth:`match_resting` once per bar BEFORE ticking the controller). MARKET orders
 fill immediately at the current mid adjusted for slippage.
 
+Resting orders are indexed by price (bids and asks each kept sorted), so a bar
+only visits the orders its range actually crosses instead of the whole book.
+Crossed orders fill in placement order, exactly as a full scan would.
+
 Implemented in Phase 5 (backtester).
 """
 from __future__ import annotations
 
 import copy
+from bisect import bisect_left, bisect_right, insort
 from dataclasses import dataclass
 from decimal import Decimal
 from typing import AsyncIterator, Dict, List, Optional
@@ -78,6 +83,11 @@ class SimNadoAdapter(NadoAdapterBase):
         self._default_meta = default_meta or SimMeta()
         self._orders: Dict[str, NadoOrder] = {}
         self._counter = 0
+        # Resting limit orders as sorted (price, seq, order_id) keys. Entries for
+        # orders that went terminal some other way are skipped when crossed.
+        self._bids: List[tuple] = []
+        self._asks: List[tuple] = []
+        self._book_keys: Dict[str, tuple] = {}
         self._fills: List[Fill] = []
         self._candle: Optional[Candle] = None
         # Per-pair running net base (signed) from fills — drives funding accrual.
@@ -128,22 +138,26 @@ class SimNadoAdapter(NadoAdapterBase):
         if c is None:
             return
         maker = self.costs.maker_fee
-        for order in list(self._orders.values()):
-            if order.state.is_terminal or order.order_type is OrderType.MARKET:
-                continue
-            if order.price is None:
+        # Bids priced at/above the low and asks at/below the high were crossed.
+        lo = bisect_left(self._bids, (c.low,))
+        hi = bisect_right(self._asks, (c.high, float("inf")))
+        crossed = self._bids[lo:] + self._asks[:hi]
+        if not crossed:
+            return
+        del self._bids[lo:]
+        del self._asks[:hi]
+        crossed.sort(key=lambda key: key[1])
+        for _price, _seq, oid in crossed:
+            self._book_keys.pop(oid, None)
+            order = self._orders[oid]
+            if order.state.is_terminal:
                 continue
             remaining = order.amount_base - order.filled_base
-            if remaining <= 0:
-                continue
-            crossed = (
-                (order.side is TradeType.BUY and c.low <= order.price)
-                or (order.side is TradeType.SELL and c.high >= order.price)
-            )
-            if not crossed:
+            price = order.price
+            if remaining <= 0 or price is None:
                 continue
-            fee = remaining * order.price * maker
-            self._record_fill(order, remaining, order.price, fee)
+            fee = remaining * price * maker
+            self._record_fill(order, remaining, price, fee)
 
     def accrue_funding(self) -> None:
         """Accrue one bar of funding on each held position. Received-positive: a
@@ -178,6 +192,10 @@ class SimNadoAdapter(NadoAdapterBase):
             amount_base=_dec(amount_base), price=_dec(price) if price is not None else None,
         )
         self._orders[oid] = order
+        if order_type is not OrderType.MARKET and order.price is not None:
+            key = (order.price, self._counter, oid)
+            insort(self._bids if side is TradeType.BUY else self._asks, key)
+            self._book_keys[oid] = key
         if order_type is OrderType.MARKET:
             mid = self._candle.close if self._candle is not None else (order.price or Decimal(0))
             slip = self.costs.slippage_pct
@@ -191,6 +209,12 @@ class SimNadoAdapter(NadoAdapterBase):
         if order is None or order.state.is_terminal:
             return False
         order.state = OrderState.CANCELLED
+        key = self._book_keys.pop(order_id, None)
+        if key is not None:
+            book = self._bids if order.side is TradeType.BUY else self._asks
+            i = bisect_left(book, key)
+            if i < len(book) and book[i] == key:
+                del book[i]
         return True
 
     async def order_status(self, order_id: str) -> NadoOrder:
@@ -0,0 +1,177 @@
+"""Parameter sweep — run one strategy over a grid of configs across processes.
+
+Each grid point is an independent :func:`run_backtest` over the same candles,
+so the sweep fans the points out over a :class:`ProcessPoolExecutor` (one
+controller per worker at a time; the candles are shipped once per worker via the
+pool initializer, not once per point). Results come back as a ranked list of
+:class:`SweepResult` rows — scalar report metrics only, so 200 points over a
+month of 1m bars don't ship 200 equity curves back to the parent.
+
+Usage::
+
+    from src.nadobro.engine.backtester import run_sweep
+    rows = run_sweep("grid", {"step_pct": [Decimal("0.002"), Decimal("0.004")],
+                              "levels_count": [4, 8]}, candles, base_configs=cfg)
+    print(format_sweep_table(rows))
+
+Sweeps default to the high-throughput engine mode: the candle provider serves
+the last ``candle_window`` bars (200, what the live provider fetches).
+"""
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Union
+
+from src.nadobro.engine.backtester.candle_ingest import Candle
+from src.nadobro.engine.backtester.engine import run_backtest
+from src.nadobro.engine.backtester.executor_sim import SimCosts, SimMeta
+from src.nadobro.engine.backtester.report import BacktestReport
+
+logger = logging.getLogger(__name__)
+
+ParamGrid = Union[Mapping[str, Sequence[Any]], Sequence[Mapping[str, Any]]]
+
+_RANK_KEYS = ("net_pnl", "gross_pnl", "realized_pnl", "fills")
+
+
+@dataclass
+class SweepResult:
+    """One grid point's :class:`BacktestReport` summary (``rank`` is 1-based)."""
+
+    params: Dict[str, Any]
+    rank: int = 0
+    net_pnl: Decimal = Decimal(0)
+    gross_pnl: Decimal = Decimal(0)
+    realized_pnl: Decimal = Decimal(0)
+    fees: Decimal = Decimal(0)
+    funding: Decimal = Decimal(0)
+    max_drawdown: Decimal = Decimal(0)
+    fills: int = 0
+    orders_placed: int = 0
+    bars: int = 0
+    error: Optional[str] = field(default=None)
+
+    @classmethod
+    def from_report(cls, params: Dict[str, Any], rep: BacktestReport) -> "SweepResult":
+        return cls(
+            params=params,
+            net_pnl=rep.net_pnl,
+            gross_pnl=rep.gross_pnl,
+            realized_pnl=rep.realized_pnl,
+            fees=rep.fees,
+            funding=rep.funding,
+            max_drawdown=rep.max_drawdown,
+            fills=rep.fills,
+            orders_placed=rep.orders_placed,
+            bars=rep.bars,
+        )
+
+
+def expand_grid(param_grid: ParamGrid) -> List[Dict[str, Any]]:
+    """``{"a": [1, 2], "b": [3]}`` -> ``[{"a": 1, "b": 3}, {"a": 2, "b": 3}]``.
+
+    A sequence of dicts is taken as the explicit list of points."""
+    if isinstance(param_grid, Mapping):
+        names = list(param_grid)
+        return [
+            dict(zip(names, values))
+            for values in itertools.product(*(list(param_grid[n]) for n in names))
+        ]
+    return [dict(point) for point in param_grid]
+
+
+# Per-worker job context, set once by the pool initializer.
+_JOB: Dict[str, Any] = {}
+
+
+def _init_worker(job: Dict[str, Any]) -> None:
+    _JOB.clear()
+    _JOB.update(job)
+    # A sweep point's per-tick warnings would flood the parent's stderr.
+    logging.getLogger("src.nadobro").setLevel(logging.ERROR)
+
+
+def _run_point(params: Dict[str, Any]) -> SweepResult:
+    configs = {**_JOB["base_configs"], **params}
+    try:
+        rep = run_backtest(
+            _JOB["strategy"], configs, _JOB["candles"], costs=_JOB["costs"],
+            meta=_JOB["meta"], candle_window=_JOB["candle_window"],
+        )
+    except Exception as exc:  # noqa: BLE001 - one bad point must not sink the sweep
+        return SweepResult(params=params, error=f"{type(exc).__name__}: {exc}")
+    return SweepResult.from_report(params, rep)
+
+
+def run_sweep(
+    strategy: str,
+    param_grid: ParamGrid,
+    candles: Sequence[Candle],
+    *,
+    base_configs: Optional[Dict[str, Any]] = None,
+    costs: Optional[SimCosts] = None,
+    meta: Optional[Dict[str, SimMeta]] = None,
+    processes: Optional[int] = None,
+    rank_by: str = "net_pnl",
+    candle_window: Optional[int] = 200,
+) -> List[SweepResult]:
+    """Backtest ``strategy`` at every point of ``param_grid`` and rank the results.
+
+    Each point's params are layered over ``base_configs``. ``processes`` defaults
+    to every core; 1 (or a single point) runs inline. Rows are sorted by
+    ``rank_by`` descending with failed points last.
+    """
+    if rank_by not in _RANK_KEYS:
+        raise ValueError(f"rank_by must be one of {_RANK_KEYS}, got {rank_by!r}")
+    if not candles:
+        raise ValueError("sweep requires at least one candle")
+    points = expand_grid(param_grid)
+    job = {
+        "strategy": strategy,
+        "base_configs": dict(base_configs or {}),
+        "candles": list(candles),
+        "costs": costs,
+        "meta": meta,
+        "candle_window": candle_window,
+    }
+    workers = max(1, min(int(processes or os.cpu_count() or 1), len(points)))
+    if workers == 1:
+        saved = dict(_JOB)
+        _JOB.update(job)
+        try:
+            results = [_run_point(p) for p in points]
+        finally:
+            _JOB.clear()
+            _JOB.update(saved)
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(job,),
+        ) as pool:
+            results = list(pool.map(_run_point, points, chunksize=1))
+
+    for row in results:
+        if row.error:
+            logger.warning("sweep point failed params=%s: %s", row.params, row.error)
+    results.sort(key=lambda r: (r.error is None, getattr(r, rank_by)), reverse=True)
+    for rank, row in enumerate(results, start=1):
+        row.rank = rank
+    return results
+
+
+def format_sweep_table(rows: Sequence[SweepResult], top_n: Optional[int] = None) -> str:
+    """Plain-text ranked table, one line per point."""
+    lines = [f"{'#':>3}  {'net':>12}  {'fees':>10}  {'maxDD':>10}  {'fills':>6}  params"]
+    for row in rows[:top_n] if top_n else rows:
+        if row.error:
+            lines.append(f"{row.rank:>3}  {'ERROR':>12}  {'':>10}  {'':>10}  {'':>6}  {row.params}  {row.error}")
+            continue
+        lines.append(
+            f"{row.rank:>3}  {row.net_pnl:>+12.4f}  {row.fees:>10.4f}  "
+            f"{row.max_drawdown:>10.4f}  {row.fills:>6}  {row.params}"
+        )
+    return "\n".join(lines)
@@ -142,12 +142,16 @@ class Controller(abc.ABC):
         this worker's lifetime. The engine cycle result carries no per-order
         count, so this is how /status and the per-cycle log get a true placed/
         filled/cancelled figure instead of 0."""
-        placed = filled = cancelled = 0
+        placed = filled = cancelled = saved = 0
         for ex in self.my_executors(active_only=False):
             placed += int(getattr(ex, "orders_placed", 0) or 0)
             filled += int(getattr(ex, "orders_filled", 0) or 0)
             cancelled += int(getattr(ex, "orders_cancelled", 0) or 0)
-        return {"orders_placed": placed, "orders_filled": filled, "orders_cancelled": cancelled}
+            saved += int(getattr(ex, "status_calls_saved", 0) or 0)
+        return {
+            "orders_placed": placed, "orders_filled": filled, "orders_cancelled": cancelled,
+            "status_calls_saved": saved,
+        }
 
     def cfg(self, key: str, default: Any = None) -> Any:
         return self.configs.get(key, default)
@@ -20,11 +20,11 @@ import time
 from dataclasses import dataclass, field
 from decimal import Decimal
 from enum import Enum
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
-from src.nadobro.engine.adapter.base import Fill, NadoAdapterBase, NadoOrder, OrderState
+from src.nadobro.engine.adapter.base import AdapterError, Fill, NadoAdapterBase, NadoOrder, OrderState
 from src.nadobro.engine.executor_base import Executor
 from src.nadobro.engine.inventory import InventoryRepository
 from src.nadobro.engine.types import (
@@ -176,6 +176,10 @@ class GridExecutor(Executor):
         self.orders_placed = 0
         self.orders_filled = 0
         self.orders_cancelled = 0
+        # Per-level order_status calls replaced by the batched per-tick
+        # snapshot (cumulative, and for the most recent tick).
+        self.status_calls_saved = 0
+        self.last_tick_status_calls_saved = 0
 
     @property
     def open_side(self) -> TradeType:
@@ -473,8 +477,9 @@ class GridExecutor(Executor):
             # flattens the position to lock the gain.
             await self._stop_out(CloseType.TAKE_PROFIT)
             return
+        statuses = await self._tick_statuses()
         for level in self.levels:
-            await self._process_level(level, mid)
+            await self._process_level(level, mid, statuses)
         if self.config.recycle_levels:
             # Continuous grid: re-arm round-tripped levels so the band keeps
             # working. New entries still pass through _maybe_place_opens, which
@@ -542,11 +547,53 @@ class GridExecutor(Executor):
         quote = sum((lv.filled_quote for lv in self.levels), Decimal(0))
         return (quote / base) if base > 0 else None
 
-    async def _process_level(self, level: GridLevel, mid: Decimal) -> None:
+    async def _tick_statuses(self) -> Dict[str, NadoOrder]:
+        """Every working order's status for this tick in one adapter call.
+
+        Only used when the adapter batches (one open-orders snapshot per
+        product, WS-proven snapshots for free); a level missing from the result
+        falls back to its own ``order_status`` under the retry policy. A failed
+        batch is not an executor failure — the per-level path takes over.
+        """
+        self.last_tick_status_calls_saved = 0
+        if not getattr(self.adapter, "batched_order_status", False):
+            return {}
+        ids = [
+            oid for lv in self.levels
+            for oid in (
+                lv.open_order_id if lv.state is GridLevelState.OPEN_ORDER_PLACED else None,
+                lv.close_order_id if lv.state is GridLevelState.CLOSE_ORDER_PLACED else None,
+            )
+            if oid is not None
+        ]
+        if len(ids) < 2:
+            return {}
+        try:
+            statuses = await self.adapter.order_statuses(ids)
+        except AdapterError as exc:
+            logger.debug("grid %s: batched status failed, polling per level: %s", self.id, exc)
+            return {}
+        # Only ids the adapter read from the venue would have cost a poll
+        # each; snapshots it served from the WS cache were free either way.
+        polled = min(len(statuses), int(getattr(self.adapter, "last_status_batch_polled", 0)))
+        saved = max(0, polled - 1)
+        self.last_tick_status_calls_saved = saved
+        self.status_calls_saved += saved
+        return statuses
+
+    async def _process_level(
+        self, level: GridLevel, mid: Decimal, statuses: Optional[Dict[str, NadoOrder]] = None,
+    ) -> None:
+        statuses = statuses or {}
         if level.state is GridLevelState.OPEN_ORDER_PLACED:
             assert level.open_order_id is not None
             oid = level.open_order_id
-            order = await self._guard(lambda: self.adapter.order_status(oid), label="grid_open_status")
+            order = statuses.get(oid)
+            if order is None:
+                # Not in the tick's batched snapshot: poll this level alone.
+                order = await self._guard(
+                    lambda: self.adapter.order_status(oid), label="grid_open_status",
+                )
             # Always ingest any partial fills first so we don't lose inventory
             # records when the order is about to be cancelled (BUG-GR-1) or
             # was externally cancelled/rejected (BUG-GR-2).
@@ -598,7 +645,12 @@ class GridExecutor(Executor):
         elif level.state is GridLevelState.CLOSE_ORDER_PLACED:
             assert level.close_order_id is not None
             cid = level.close_order_id
-            order = await self._guard(lambda: self.adapter.order_status(cid), label="grid_close_status")
+            order = statuses.get(cid)
+            if order is None:
+                # Not in the tick's batched snapshot: poll this level alone.
+                order = await self._guard(
+                    lambda: self.adapter.order_status(cid), label="grid_close_status",
+                )
             self._ingest(level, order, self.close_side, opening=False)
             if order.state is OrderState.FILLED:
                 level.state = GridLevelState.COMPLETE
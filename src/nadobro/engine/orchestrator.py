@@ -117,6 +117,11 @@ class ExecutorOrchestrator:
         # executor/controller constructor needs to thread it. ``None`` in tests.
         self._trade_recorder = trade_recorder
         self._executors: Dict[str, Executor] = {}
+        # Executors not yet seen TERMINATED, in spawn order. Termination is
+        # final, so active-only listing scans (and prunes) this instead of every
+        # executor ever spawned — a long run/backtest keeps thousands of those.
+        self._live: Dict[str, Executor] = {}
+        self._live_synced = 0  # len(_executors) that ``_live`` reflects
         self._controllers: Dict[str, "Controller"] = {}
         # Bounded queue: when full, oldest events are dropped (with a log).
         self._queue: "asyncio.Queue[ExecutorEvent]" = asyncio.Queue(
@@ -170,11 +175,19 @@ class ExecutorOrchestrator:
     def list(
         self, controller_id: Optional[str] = None, active_only: bool = False
     ) -> List[Executor]:
-        vals = list(self._executors.values())
+        if active_only:
+            if len(self._executors) != self._live_synced:
+                # Registered outside spawn() (tests/rehydration): re-derive.
+                self._live = dict(self._executors)
+                self._live_synced = len(self._executors)
+            done = [k for k, e in self._live.items() if e.is_terminated]
+            for k in done:
+                del self._live[k]
+            vals = list(self._live.values())
+        else:
+            vals = list(self._executors.values())
         if controller_id is not None:
             vals = [e for e in vals if e.controller_id == controller_id]
-        if active_only:
-            vals = [e for e in vals if not e.is_terminated]
         return vals
 
     def get(self, executor_id: str) -> Optional[Executor]:
@@ -224,7 +237,11 @@ class ExecutorOrchestrator:
                     )
                 )
                 return False
+        in_sync = len(self._executors) == self._live_synced
         self._executors[executor.id] = executor
+        self._live[executor.id] = executor
+        if in_sync:
+            self._live_synced = len(self._executors)
         # Stamp the trade recorder before on_create() — the entry order can
         # fill synchronously inside on_create(), and that first fill must be
         # recorded too.
@@ -126,6 +126,14 @@ class PortfolioHistoryRepository(abc.ABC):
     def prune(self, now: Optional[datetime] = None) -> int:
         ...
 
+    def record_many(self, rows: List[PortfolioHistoryRow]) -> int:
+        """Write a sampler tick's rows; returns rows written. Non-abstract so
+        existing repositories keep working; DB-backed ones override it with
+        one bulk statement."""
+        for row in rows:
+            self.record(row)
+        return len(rows)
+
 
 class InMemoryAccountProvider(AccountProvider):
     def __init__(self) -> None:
@@ -286,14 +294,21 @@ class Portfolio:
         return self.history_repo.fetch(user_id, since=since, until=now, network=network)
 
     async def sample(self, user_id: int, now: Optional[datetime] = None) -> PortfolioHistoryRow:
-        """Capture one history row from the current state (used by the sampler)."""
+        """Capture one history row from the current state and record it."""
+        row = await self.capture(user_id, now)
+        self.history_repo.record(row)
+        return row
+
+    async def capture(self, user_id: int, now: Optional[datetime] = None) -> PortfolioHistoryRow:
+        """Build one history row from the current state without recording it
+        (the sampler batches a tick's rows into one ``record_many``)."""
         accounts = await self.accounts_provider.accounts(user_id)
         by_account = {acct: _account_value(tokens) for acct, tokens in accounts.items()}
         by_asset: Dict[str, Decimal] = {}
         for tokens in accounts.values():
             for token, fields_ in tokens.items():
                 by_asset[token] = by_asset.get(token, Decimal(0)) + _value_of(fields_)
-        row = PortfolioHistoryRow(
+        return PortfolioHistoryRow(
             user_id=user_id,
             ts=now or datetime.now(timezone.utc),
             total_value_quote=_total_value(accounts),
@@ -301,8 +316,6 @@ class Portfolio:
             by_asset=by_asset,
             network=await self.accounts_provider.network(user_id),
         )
-        self.history_repo.record(row)
-        return row
 
 
 # --------------------------------------------------------------------------
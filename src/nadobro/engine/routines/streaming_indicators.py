@@ -0,0 +1,397 @@
+"""Streaming indicator state — the ``market_features`` feature dict, kept up to
+date per candle instead of recomputed from the whole series on every read.
+
+``compute_tf_features`` re-derives EMA / RSI / ATR / MACD / Bollinger / the
+variance ratio from the full candle list (200 bars) for every product x
+timeframe on every call. :class:`IndicatorState` holds the same window and
+advances in O(1) per candle: a new closed bar is one push, a revised forming
+bar one in-place replace, and the feature dict is cached until the next change.
+
+Equivalence with the windowed functions in ``technical_analysis``: each of
+them is an SMA-seeded exponential average over the *window*, so sliding the
+window moves the seed. Every track therefore runs an infinite-history EMA and
+converts it to the windowed value with the closed-form seed correction
+
+    EMA_window(end) = EMA_inf(end) + r**(end - seed_end) * (SMA(seed) - EMA_inf(seed_end))
+
+(both satisfy the same recursion after ``seed_end``). The MACD signal line is
+an EMA of window-relative MACD values, so it carries that correction through
+one more EMA; the geometric terms that produces only depend on the window
+length and are cached. Results match the list functions to float rounding —
+``tests/engine/routines/test_streaming_indicators.py`` is the golden check.
+
+Pure Python: numpy is not a runtime dependency of the bot.
+"""
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from src.nadobro.engine.routines import technical_analysis as ta
+
+Candle = Mapping[str, float]
+
+# Periods compute_tf_features uses.
+EMA_FAST, EMA_SLOW = 9, 21
+RSI_PERIOD = 14
+ATR_PERIOD = 14
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+BB_PERIOD = 20
+VR_SHORT, VR_LONG = 4, 12
+DRIFT_BARS = 13
+
+
+class _Ring:
+    """Fixed-capacity buffer addressed by global (ever-increasing) index."""
+
+    __slots__ = ("_buf", "_cap", "end")
+
+    def __init__(self, capacity: int) -> None:
+        self._buf: List[float] = [0.0] * capacity
+        self._cap = capacity
+        self.end = 0  # one past the last global index
+
+    def append(self, value: float) -> None:
+        self._buf[self.end % self._cap] = value
+        self.end += 1
+
+    def set_last(self, value: float) -> None:
+        self._buf[(self.end - 1) % self._cap] = value
+
+    def __getitem__(self, g: int) -> float:
+        return self._buf[g % self._cap]
+
+    def span(self, start: int, stop: int) -> List[float]:
+        return [self._buf[g % self._cap] for g in range(start, stop)]
+
+
+class _EmaTrack:
+    """Inputs, their infinite-history EMA and a running nonzero count, so the
+    SMA-seeded EMA of any retained trailing window is O(period)."""
+
+    __slots__ = ("period", "k", "r", "x", "e", "nonzero")
+
+    def __init__(self, period: int, k: float, capacity: int) -> None:
+        self.period = period
+        self.k = k
+        self.r = 1.0 - k
+        self.x = _Ring(capacity)
+        self.e = _Ring(capacity)
+        # Cumulative count of nonzero inputs (lets an all-zero window return an
+        # exact 0.0 — RSI's ``avg_loss == 0`` branch depends on it).
+        self.nonzero = _Ring(capacity)
+
+    def _ema_at(self, g: int, value: float) -> float:
+        return value if g == 0 else self.k * value + self.r * self.e[g - 1]
+
+    def _nz_at(self, g: int, value: float) -> float:
+        return (self.nonzero[g - 1] if g else 0) + (1 if value != 0 else 0)
+
+    def push(self, value: float) -> None:
+        g = self.x.end
+        self.x.append(value)
+        self.e.append(self._ema_at(g, value))
+        self.nonzero.append(self._nz_at(g, value))
+
+    def replace_last(self, value: float) -> None:
+        g = self.x.end - 1
+        self.x.set_last(value)
+        self.e.set_last(self._ema_at(g, value))
+        self.nonzero.set_last(self._nz_at(g, value))
+
+    def window(self, start: int, end: int) -> Optional[float]:
+        """What ``technical_analysis.ema`` (or Wilder's smoothing) returns for
+        the inputs at global indexes ``start..end`` inclusive."""
+        p = self.period
+        if end - start + 1 < p:
+            return None
+        before = self.nonzero[start - 1] if start else 0
+        if self.nonzero[end] == before:
+            return 0.0
+        seed_end = start + p - 1
+        sma = sum(self.x.span(start, seed_end + 1)) / p
+        return self.e[end] + self.r ** (end - seed_end) * (sma - self.e[seed_end])
+
+
+@lru_cache(maxsize=256)
+def _macd_geometric(valid_len: int) -> tuple[float, float]:
+    """Signal-line EMA of the fast/slow seed-correction sequences over a MACD
+    window of ``valid_len`` values (depends on nothing but that length)."""
+    rf = 1.0 - 2.0 / (MACD_FAST + 1)
+    rs = 1.0 - 2.0 / (MACD_SLOW + 1)
+    lag = MACD_SLOW - MACD_FAST  # slow seed point sits this far after the fast one
+    g_fast = ta.ema([rf ** (lag + j) for j in range(valid_len)], MACD_SIGNAL)
+    g_slow = ta.ema([rs ** j for j in range(valid_len)], MACD_SIGNAL)
+    return float(g_fast or 0.0), float(g_slow or 0.0)
+
+
+def _ts(candle: Candle) -> int:
+    try:
+        return int(candle.get("time") or 0)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return 0
+
+
+class IndicatorState:
+    """Streaming ``compute_tf_features`` for one (network, product, timeframe).
+
+    Feed it each fetched candle list with :meth:`features`; a list that only
+    revises the forming bar and/or appends new bars is applied incrementally,
+    anything else (gap, reorder, history rewrite) rebuilds from that list.
+    """
+
+    def __init__(self, capacity: int = 200) -> None:
+        self.capacity = max(int(capacity), MACD_SLOW + MACD_SIGNAL)
+        self.rebuilds = 0
+        self.pushes = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        # Rings retain one full window past the live one so seeds never wrap.
+        cap = self.capacity * 2 + 2
+        self._times = _Ring(cap)
+        self._close = _Ring(cap)
+        self._ema_fast = _EmaTrack(EMA_FAST, 2.0 / (EMA_FAST + 1), cap)
+        self._ema_slow = _EmaTrack(EMA_SLOW, 2.0 / (EMA_SLOW + 1), cap)
+        self._macd_fast = _EmaTrack(MACD_FAST, 2.0 / (MACD_FAST + 1), cap)
+        self._macd_slow = _EmaTrack(MACD_SLOW, 2.0 / (MACD_SLOW + 1), cap)
+        self._macd_sig = _EmaTrack(MACD_SIGNAL, 2.0 / (MACD_SIGNAL + 1), cap)
+        self._gain = _EmaTrack(RSI_PERIOD, 1.0 / RSI_PERIOD, cap)
+        self._loss = _EmaTrack(RSI_PERIOD, 1.0 / RSI_PERIOD, cap)
+        self._tr = _EmaTrack(ATR_PERIOD, 1.0 / ATR_PERIOD, cap)
+        # Per horizon: cumulative sum of squared log returns and cumulative
+        # count of valid (both prices > 0) returns, so a window sum is O(1).
+        self._vr: Dict[int, tuple[_Ring, _Ring]] = {
+            h: (_Ring(cap), _Ring(cap)) for h in (VR_SHORT, VR_LONG)
+        }
+        self._n = 0            # candles in the live window
+        self._features: Optional[Dict[str, object]] = None
+        self._synced: Optional[Sequence[Candle]] = None
+
+    # -- feeding -------------------------------------------------------------
+
+    def _derived(
+        self, g: int, high: float, low: float, close: float,
+    ) -> tuple[Dict[str, float], Dict[int, tuple[float, float]]]:
+        """Per-candle track inputs (tr/gain/loss) and, per VR horizon, the
+        (squared log return, valid-count) increments."""
+        prev = self._close[g - 1] if g else None
+        out = {"tr": 0.0, "gain": 0.0, "loss": 0.0}
+        if prev is not None:
+            d = close - prev
+            out["gain"] = max(d, 0.0)
+            out["loss"] = max(-d, 0.0)
+            out["tr"] = max(high - low, abs(high - prev), abs(low - prev))
+        vr: Dict[int, tuple[float, float]] = {}
+        for h in (VR_SHORT, VR_LONG):
+            a = self._close[g - h] if g >= h else 0.0
+            ok = g >= h and a > 0 and close > 0
+            vr[h] = (math.log(close / a) ** 2, 1.0) if ok else (0.0, 0.0)
+        return out, vr
+
+    def _push(self, candle: Candle) -> None:
+        close = float(candle["close"])
+        high = float(candle.get("high", candle["close"]))
+        low = float(candle.get("low", candle["close"]))
+        g = self._close.end
+        self._times.append(_ts(candle))
+        self._close.append(close)
+        d, vr = self._derived(g, high, low, close)
+        for track, value in (
+            (self._ema_fast, close), (self._ema_slow, close),
+            (self._macd_fast, close), (self._macd_slow, close),
+            (self._gain, d["gain"]), (self._loss, d["loss"]), (self._tr, d["tr"]),
+        ):
+            track.push(value)
+        self._macd_sig.push(self._macd_fast.e[g] - self._macd_slow.e[g])
+        for h, (cum_sq, cum_ok) in self._vr.items():
+            cum_sq.append((cum_sq[g - 1] if g else 0.0) + vr[h][0])
+            cum_ok.append((cum_ok[g - 1] if g else 0.0) + vr[h][1])
+        self.pushes += 1
+
+    def _replace_last(self, candle: Candle) -> None:
+        close = float(candle["close"])
+        high = float(candle.get("high", candle["close"]))
+        low = float(candle.get("low", candle["close"]))
+        g = self._close.end - 1
+        self._close.set_last(close)
+        d, vr = self._derived(g, high, low, close)
+        for track, value in (
+            (self._ema_fast, close), (self._ema_slow, close),
+            (self._macd_fast, close), (self._macd_slow, close),
+            (self._gain, d["gain"]), (self._loss, d["loss"]), (self._tr, d["tr"]),
+        ):
+            track.replace_last(value)
+        self._macd_sig.replace_last(self._macd_fast.e[g] - self._macd_slow.e[g])
+        for h, (cum_sq, cum_ok) in self._vr.items():
+            cum_sq.set_last((cum_sq[g - 1] if g else 0.0) + vr[h][0])
+            cum_ok.set_last((cum_ok[g - 1] if g else 0.0) + vr[h][1])
+
+    def _rebuild(self, candles: Sequence[Candle]) -> None:
+        self._reset()
+        self.rebuilds += 1
+        for c in candles:
+            self._push(c)
+
+    def _locate(self, candles: Sequence[Candle]) -> Optional[int]:
+        """Index in ``candles`` of the state's newest bar, when ``candles``
+        continues the state (no gap, enough shared history)."""
+        end = self._close.end
+        if not end:
+            return None
+        last_t = self._times[end - 1]
+        if not last_t:
+            return None
+        for i in range(len(candles) - 1, -1, -1):
+            t = _ts(candles[i])
+            if t == last_t:
+                # Everything before it must already be retained in the state,
+                # bar for bar (a hole earlier in the list is a rewrite too).
+                if i >= end:
+                    return None
+                base = end - 1 - i
+                for k in range(i):
+                    if self._times[base + k] != _ts(candles[k]):
+                        return None
+                return i
+            if t < last_t:
+                return None
+        return None
+
+    def sync(self, candles: Sequence[Candle]) -> None:
+        """Bring the state in line with ``candles`` (a fetched list, any order)."""
+        candles = ta.chronological(candles)
+        n = len(candles)
+        if n > self.capacity:
+            self.capacity = n
+            self._reset()
+        j = self._locate(candles)
+        if j is None:
+            self._rebuild(candles)
+        else:
+            # The previously-forming bar may have moved or closed since.
+            self._replace_last(candles[j])
+            for c in candles[j + 1:]:
+                self._push(c)
+        # The live window is the fetched list, exactly as the list functions see it.
+        self._n = n
+        self._features = None
+
+    # -- reads ---------------------------------------------------------------
+
+    def features(self, candles: Optional[Sequence[Candle]] = None) -> Dict[str, object]:
+        """Feature dict (same keys/values as ``compute_tf_features``).
+
+        Pass the latest fetched candles to sync first; handing back the very
+        list object already synced (a TTL cache hit) is a plain lookup.
+        """
+        if candles is not None and candles is not self._synced:
+            self.sync(candles)
+            self._synced = candles
+        if self._features is None:
+            self._features = self._compute()
+        return self._features
+
+    def _compute(self) -> Dict[str, object]:
+        n = self._n
+        end = self._close.end - 1
+        start = end - n + 1
+        closes_tail = self._close.span(max(start, end - max(BB_PERIOD, DRIFT_BARS) + 1), end + 1)
+        last = closes_tail[-1] if n else 0.0
+
+        ema_fast = self._ema_fast.window(start, end) if n else None
+        ema_slow = self._ema_slow.window(start, end) if n else None
+        if ema_fast is None or ema_slow is None:
+            trend = "flat"
+        elif ema_fast > ema_slow:
+            trend = "up"
+        elif ema_fast < ema_slow:
+            trend = "down"
+        else:
+            trend = "flat"
+
+        a = self._wilder_over_diffs(self._tr, start, end, ATR_PERIOD + 1)
+        atr_pct = (a / last) if (a is not None and last) else None
+        m = self._macd(start, end)
+        bb = ta.bollinger(closes_tail) if n >= BB_PERIOD else None
+        drift = None
+        if n >= DRIFT_BARS:
+            seg = closes_tail[-DRIFT_BARS:]
+            k = max(2, len(seg) // 3)
+            older = sum(seg[:k]) / k
+            recent = sum(seg[-k:]) / k
+            drift = ((recent - older) / older) if older > 0 else 0.0
+        return {
+            "candles": n,
+            "trend": trend,
+            "rsi": self._rsi(start, end),
+            "macd_hist": ((m["histogram"] / last) if (m and last) else None),
+            "macd_cross": (1.0 if (m and m["macd"] > m["signal"]) else (-1.0 if m else None)),
+            "bb_pct_b": (bb["pct_b"] if bb else None),
+            "bb_bandwidth": (bb["bandwidth"] if bb else None),
+            "atr_pct": atr_pct,
+            "variance_ratio": self._variance_ratio(start, end) if n >= 14 else None,
+            "drift": drift,
+        }
+
+    @staticmethod
+    def _wilder_over_diffs(track: _EmaTrack, start: int, end: int, need: int) -> Optional[float]:
+        # Per-bar diffs (TR / gain / loss) exist from the window's second bar.
+        if end - start + 1 < need:
+            return None
+        return track.window(start + 1, end)
+
+    def _rsi(self, start: int, end: int) -> Optional[float]:
+        if end - start + 1 <= RSI_PERIOD:
+            return None
+        avg_gain = self._gain.window(start + 1, end)
+        avg_loss = self._loss.window(start + 1, end)
+        if avg_gain is None or avg_loss is None:
+            return None
+        if avg_loss == 0:
+            return 100.0
+        rs = avg_gain / avg_loss
+        return 100.0 - (100.0 / (1.0 + rs))
+
+    def _macd(self, start: int, end: int) -> Optional[Dict[str, float]]:
+        if end - start + 1 < MACD_SLOW + MACD_SIGNAL:
+            return None
+        fast, slow, sig = self._macd_fast, self._macd_slow, self._macd_sig
+        fast_seed = start + MACD_FAST - 1
+        slow_seed = start + MACD_SLOW - 1
+        # Window-relative MACD = infinite-history MACD + decaying seed terms.
+        a = sum(fast.x.span(start, fast_seed + 1)) / MACD_FAST - fast.e[fast_seed]
+        b = sum(slow.x.span(start, slow_seed + 1)) / MACD_SLOW - slow.e[slow_seed]
+        macd_val = (
+            fast.e[end] - slow.e[end]
+            + a * fast.r ** (end - fast_seed)
+            - b * slow.r ** (end - slow_seed)
+        )
+        # Signal: EMA_9 over the valid window-relative MACD values.
+        valid_len = end - slow_seed + 1
+        base = self._signal_over_inf(slow_seed, end)
+        g_fast, g_slow = _macd_geometric(valid_len)
+        signal = base + a * g_fast - b * g_slow
+        return {"macd": macd_val, "signal": signal, "histogram": macd_val - signal}
+
+    def _signal_over_inf(self, start: int, end: int) -> float:
+        sig = self._macd_sig
+        seed_end = start + MACD_SIGNAL - 1
+        sma = sum(sig.x.span(start, seed_end + 1)) / MACD_SIGNAL
+        return sig.e[end] + sig.r ** (end - seed_end) * (sma - sig.e[seed_end])
+
+    def _variance_ratio(self, start: int, end: int) -> Optional[float]:
+        moments = []
+        for h in (VR_SHORT, VR_LONG):
+            cum_sq, cum_ok = self._vr[h]
+            lo = start + h  # first bar with a full h-bar return inside the window
+            count = cum_ok[end] - cum_ok[lo - 1]
+            if count < 2:
+                return None
+            total = cum_sq[end] - cum_sq[lo - 1]
+            moments.append((total / count) / h)
+        m_short, m_long = moments
+        if m_short <= 0:
+            return None
+        return m_long / m_short
@@ -34,8 +34,14 @@ def chronological(candles: Sequence[Candle]) -> Sequence[Candle]:
             return 0
 
     try:
-        if any(_ts(c) for c in candles):
-            return sorted(candles, key=_ts)
+        stamps = [_ts(c) for c in candles]
+        if not any(stamps):
+            return candles
+        # Already oldest-first (the normalized venue feed): no sort, no copy.
+        if all(a <= b for a, b in zip(stamps, stamps[1:])):
+            return candles
+        order = sorted(range(len(stamps)), key=stamps.__getitem__)
+        return [candles[i] for i in order]
     except Exception:  # noqa: BLE001  # policy: degrade-ok(unsortable candle feed keeps input order; consumers stay fail-open)
         pass
     return candles
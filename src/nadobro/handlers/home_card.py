@@ -31,7 +31,7 @@ from src.nadobro.handlers.keyboards import (
 from src.nadobro.users.points_ui import points_scope_kb
 from src.nadobro.handlers.wallet_view import build_wallet_view_payload
 from src.nadobro.users.settings_service import get_user_settings
-from src.nadobro.users.user_service import get_user, get_user_readonly_client, get_user_wallet_info
+from src.nadobro.users.user_service import aget_user, get_user, get_user_readonly_client, get_user_wallet_info
 from src.nadobro.users.points_service import get_points_dashboard
 from src.nadobro.users.referral_service import get_referral_dashboard
 from src.nadobro.core.async_utils import run_blocking, run_blocking_sdk_capped
@@ -50,6 +50,7 @@ logger = logging.getLogger(__name__)
 
 HOME_CARD_KEY = "home_card_message"
 KEYBOARD_REMOVED_KEY = "dual_mode_keyboard_removed"
+_USER_NOT_FOUND_TEXT = "⚠️ User not found\\. Use /start first\\."
 
 # Dedupe in-flight balance warms so rapid taps during the refresh window don't
 # pile redundant gateway fetches onto the SDK pool. {subaccount_hex: ts}.
@@ -64,7 +65,7 @@ _WARM_DEDUPE_SECONDS = 10.0
 def build_home_card_text(telegram_id: int) -> str:
     user = get_user(telegram_id)
     if not user:
-        return "⚠️ User not found\\. Use /start first\\."
+        return _USER_NOT_FOUND_TEXT
 
     network = user.network_mode.value
     balance_str = "N/A"
@@ -125,6 +126,10 @@ def _safe_warm_balance(client, key: str) -> None:
 
 async def build_home_card_text_async(telegram_id: int) -> str:
     with timed_metric("card.home.build"):
+        # The user row is read on the async pool and lands in the user cache,
+        # so the thread hop below only touches in-process caches.
+        if not await aget_user(telegram_id):
+            return _USER_NOT_FOUND_TEXT
         return await run_blocking(build_home_card_text, telegram_id)
 
 
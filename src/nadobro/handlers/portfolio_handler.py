@@ -444,8 +444,7 @@ async def _handle_portfolio(query, data, telegram_id):
         #   ``portfolio:share_pnl:{sid}``           — a strategy session
         import io as _io
 
-        from src.nadobro.portfolio.pnl_card_type_a import generate_type_a_card
-        from src.nadobro.portfolio.pnl_card_type_b import generate_type_b_card
+        from src.nadobro.portfolio.pnl_card_renderer import CardRenderBusy, render_card_async
         from src.nadobro.portfolio.pnl_card_builder import (
             build_type_b_card_data,
             build_round_trip_card_data,
@@ -490,25 +489,28 @@ async def _handle_portfolio(query, data, telegram_id):
                 await query.answer(msg, show_alert=True)
                 return
             if data is not None:  # Type A per-trade card
-                png_bytes = await run_blocking(generate_type_a_card, data)
+                card_bytes = await render_card_async("a", data)
             else:  # Type B strategy-session card
                 data = await run_blocking(build_type_b_card_data, telegram_id, network, session_id)
-                png_bytes = await run_blocking(generate_type_b_card, data)
+                card_bytes = await render_card_async("b", data)
+        except CardRenderBusy:
+            await query.answer("Lots of cards being made right now — try again in a few seconds.", show_alert=True)
+            return
         except Exception as e:
             logger.warning("portfolio_share_pnl_failed user=%s err=%s", telegram_id, e)
             await query.answer("Could not generate PnL card.", show_alert=True)
             return
         # Acknowledge the tap immediately so it never looks like nothing happened,
-        # then upload the full-quality PNG. The ~1.5MB card upload was tripping
-        # the default 5s write timeout (err=Timed out) — give it media-sized
-        # timeouts instead of downscaling the image.
+        # then upload the full-resolution card. The old ~1.5MB PNG upload was
+        # tripping the default 5s write timeout (err=Timed out) — keep
+        # media-sized timeouts instead of downscaling the image.
         try:
             await query.answer()
         except Exception:  # noqa: BLE001 - the send below is what matters
             pass
         try:
             await query.message.reply_photo(
-                photo=_io.BytesIO(png_bytes),
+                photo=_io.BytesIO(card_bytes),
                 caption=(
                     "📊 *Your PnL Card*\n"
                     "Share your performance on Nado."
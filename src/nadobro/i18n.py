@@ -1,9 +1,14 @@
 import contextlib
 import contextvars
 import logging
+import threading
+import time
+from collections import OrderedDict
 from typing import Callable, Optional
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 
+from src.nadobro.utils.env import env_float
+
 _log = logging.getLogger(__name__)
 
 SUPPORTED_LANGS = {"en", "zh", "fr", "ar", "ru", "ko"}
@@ -58,6 +63,7 @@ def register_auto_translator(fn: Optional[Callable[[str, str], Optional[str]]])
     """
     global _AUTO_TRANSLATOR
     _AUTO_TRANSLATOR = fn
+    clear_localized_markup_cache()
 
 
 def get_missing_translations() -> list[tuple[str, str]]:
@@ -67,6 +73,8 @@ def get_missing_translations() -> list[tuple[str, str]]:
 
 def clear_missing_translations() -> None:
     _MISSING_TRANSLATIONS.clear()
+    # Memoized keyboards would otherwise never report their misses again.
+    clear_localized_markup_cache()
 
 
 def _record_missing(lang: str, text: str) -> None:
@@ -91,11 +99,42 @@ def _resolve_missing(base: str, lang: str) -> str:
     return base
 
 
+# Per-user language, cached briefly. Handlers resolve it on every update and
+# the user-row cache only lives 10s, so without this most taps paid a DB round
+# trip just to pick a language. ``update_user_language`` invalidates this
+# process only; another replica picks the change up when its entry expires,
+# so the TTL bounds how long a switch can look stale there.
+_USER_LANG_TTL_SECONDS = env_float("NADO_USER_LANG_TTL_SECONDS", 60.0)
+_USER_LANG_MAX = 20000
+_USER_LANG: dict[int, tuple[str, float]] = {}
+_USER_LANG_LOCK = threading.Lock()
+
+
 def get_user_language(telegram_id: int) -> str:
+    now = time.monotonic()
+    with _USER_LANG_LOCK:
+        entry = _USER_LANG.get(telegram_id)
+    if entry is not None and now - entry[1] < _USER_LANG_TTL_SECONDS:
+        return entry[0]
     # Lazy import avoids circular imports.
     from src.nadobro.users.user_service import get_user
     user = get_user(telegram_id)
-    return normalize_lang(getattr(user, "language", "en"))
+    lang = normalize_lang(getattr(user, "language", "en"))
+    if user is not None:
+        with _USER_LANG_LOCK:
+            if len(_USER_LANG) >= _USER_LANG_MAX:
+                _USER_LANG.clear()
+            _USER_LANG[telegram_id] = (lang, now)
+    return lang
+
+
+def invalidate_user_language(telegram_id: int | None = None) -> None:
+    """Drop the cached language for one user (or everyone when ``None``)."""
+    with _USER_LANG_LOCK:
+        if telegram_id is None:
+            _USER_LANG.clear()
+        else:
+            _USER_LANG.pop(telegram_id, None)
 
 
 LANGUAGE_LABELS = {
@@ -3711,34 +3750,119 @@ _TEXTS = {
 }
 
 
-def _translate_lookup(source: dict[str, dict[str, str]], text: str, lang: str) -> str:
+def _compile(source: dict[str, dict[str, str]]) -> dict[str, dict[str, str]]:
+    """``{english: {lang: text}}`` -> ``{lang: {english: text}}`` — one flat
+    dict probe per lookup instead of two nested ones."""
+    compiled: dict[str, dict[str, str]] = {lang: {} for lang in SUPPORTED_LANGS if lang != "en"}
+    for base, entry in source.items():
+        for lang, translated in entry.items():
+            if lang in compiled:
+                compiled[lang][base] = translated
+    return compiled
+
+
+_LABEL_TABLES = _compile(_LABELS)
+_TEXT_TABLES = _compile(_TEXTS)
+
+
+def _translate_lookup(tables: dict[str, dict[str, str]], text: str, lang: str) -> str:
     if lang == "en":
         return text
     has_check = text.endswith(" ✅")
     base = text[:-2] if has_check else text
-    entry = source.get(base)
-    if entry is not None and lang in entry:
-        translated = entry[lang]
-    else:
+    translated = tables[lang].get(base)
+    if translated is None:
         translated = _resolve_missing(base, lang)
     return f"{translated} ✅" if has_check else translated
 
 
 def localize_label(text: str, lang: str | None = None) -> str:
-    return _translate_lookup(_LABELS, text, normalize_lang(lang))
+    return _translate_lookup(_LABEL_TABLES, text, normalize_lang(lang))
 
 
 def localize_text(text: str, lang: str | None = None) -> str:
     selected = normalize_lang(lang if lang is not None else get_active_language())
     if selected == "en" or not text:
         return text
-    return _translate_lookup(_TEXTS, text, selected)
+    return _translate_lookup(_TEXT_TABLES, text, selected)
+
+
+# Localized keyboards, memoized per (language, keyboard content). Keyboards are
+# rebuilt on every tap but come from a small set of builders, so the same few
+# hundred layouts repeat; PTB markups are immutable, so sharing one is safe.
+_MARKUP_MEMO_MAX = 2048
+_MARKUP_MEMO: "OrderedDict[tuple, object]" = OrderedDict()
+_MARKUP_MEMO_LOCK = threading.Lock()
+_MARKUP_MEMO_STATS = {"hits": 0, "misses": 0, "uncacheable": 0}
+
+
+def clear_localized_markup_cache() -> None:
+    with _MARKUP_MEMO_LOCK:
+        _MARKUP_MEMO.clear()
+
+
+def get_localized_markup_cache_stats() -> dict[str, int]:
+    with _MARKUP_MEMO_LOCK:
+        return {**_MARKUP_MEMO_STATS, "size": len(_MARKUP_MEMO)}
+
+
+def _markup_key(markup, lang: str) -> Optional[tuple]:
+    """Everything ``_localize_markup`` reads, or ``None`` when a button carries
+    something we won't hash (dict callback data, web apps, login URLs, ...)."""
+    if isinstance(markup, InlineKeyboardMarkup):
+        rows = []
+        for row in markup.inline_keyboard:
+            keys = []
+            for btn in row:
+                if (
+                    btn.callback_game is not None or btn.pay is not None
+                    or btn.login_url is not None or btn.web_app is not None
+                    or btn.switch_inline_query_chosen_chat is not None
+                    or btn.copy_text is not None
+                    or not isinstance(btn.callback_data, (str, type(None)))
+                ):
+                    return None
+                keys.append((
+                    btn.text, btn.callback_data, btn.url,
+                    btn.switch_inline_query, btn.switch_inline_query_current_chat,
+                ))
+            rows.append(tuple(keys))
+        return (lang, "inline", tuple(rows))
+    if isinstance(markup, ReplyKeyboardMarkup):
+        return (
+            lang, "reply",
+            tuple(tuple(btn.text for btn in row) for row in markup.keyboard),
+            markup.resize_keyboard, markup.one_time_keyboard, markup.selective,
+            markup.input_field_placeholder, markup.is_persistent,
+        )
+    return None
 
 
 def localize_markup(markup, lang: str | None = None):
     selected = normalize_lang(lang)
     if selected == "en" or markup is None:
         return markup
+    key = _markup_key(markup, selected)
+    if key is None:
+        with _MARKUP_MEMO_LOCK:
+            _MARKUP_MEMO_STATS["uncacheable"] += 1
+        return _localize_markup(markup, selected)
+    with _MARKUP_MEMO_LOCK:
+        cached = _MARKUP_MEMO.get(key)
+        if cached is not None:
+            _MARKUP_MEMO.move_to_end(key)
+            _MARKUP_MEMO_STATS["hits"] += 1
+            return cached
+        _MARKUP_MEMO_STATS["misses"] += 1
+    localized = _localize_markup(markup, selected)
+    with _MARKUP_MEMO_LOCK:
+        _MARKUP_MEMO[key] = localized
+        while len(_MARKUP_MEMO) > _MARKUP_MEMO_MAX:
+            _MARKUP_MEMO.popitem(last=False)
+    return localized
+
+
+def _localize_markup(markup, selected: str):
     if isinstance(markup, InlineKeyboardMarkup):
         rows = []
         for row in markup.inline_keyboard:
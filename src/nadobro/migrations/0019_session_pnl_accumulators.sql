@@ -0,0 +1,32 @@
+-- Per-session realized-PnL accumulator: the running position state a full
+-- replay of the session's fills would end at, plus the last fill folded in.
+-- get_session_live_metrics advances it with fills newer than last_fill_id so
+-- the SL/TP rail costs O(new fills) instead of a replay of the whole run.
+-- ``fill_revision`` is the owner's fill revision (0024_fill_revisions.sql)
+-- it was last advanced at; a folded-in row restamped since (enriched,
+-- retagged or deleted) forces a rebuild. ``price_lo`` / ``price_hi`` /
+-- ``base_traded`` bound the realized PnL the folded fills can produce.
+-- Derived data — safe to TRUNCATE at any time. Idempotent.
+
+CREATE TABLE IF NOT EXISTS session_pnl_accumulators (
+  session_id     INTEGER NOT NULL,
+  network        TEXT NOT NULL,
+  positions      JSONB NOT NULL DEFAULT '{}',
+  net_base       NUMERIC NOT NULL DEFAULT 0,
+  realized       NUMERIC NOT NULL DEFAULT 0,
+  fees           NUMERIC NOT NULL DEFAULT 0,
+  fills          INTEGER NOT NULL DEFAULT 0,
+  last_fill_id   BIGINT NOT NULL DEFAULT 0,
+  last_fill_at   TIMESTAMPTZ,
+  fill_revision  BIGINT,
+  price_lo       DOUBLE PRECISION,
+  price_hi       DOUBLE PRECISION,
+  base_traded    DOUBLE PRECISION NOT NULL DEFAULT 0,
+  updated_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (session_id, network)
+);
+
+ALTER TABLE session_pnl_accumulators ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
+ALTER TABLE session_pnl_accumulators ADD COLUMN IF NOT EXISTS price_lo DOUBLE PRECISION;
+ALTER TABLE session_pnl_accumulators ADD COLUMN IF NOT EXISTS price_hi DOUBLE PRECISION;
+ALTER TABLE session_pnl_accumulators ADD COLUMN IF NOT EXISTS base_traded DOUBLE PRECISION NOT NULL DEFAULT 0;
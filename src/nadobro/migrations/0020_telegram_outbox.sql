@@ -0,0 +1,16 @@
+-- Durable Telegram outbox: envelopes accepted by TelegramSender but not yet
+-- delivered. Rows are deleted once a send reaches a terminal outcome; rows
+-- still present at startup are replayed in created_at order. Idempotent.
+
+CREATE TABLE IF NOT EXISTS telegram_outbox (
+  id           TEXT PRIMARY KEY,
+  chat_id      BIGINT NOT NULL,
+  lane         TEXT NOT NULL,
+  text         TEXT NOT NULL,
+  kwargs       JSONB NOT NULL DEFAULT '{}',
+  dedupe_key   TEXT,
+  created_at   TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_telegram_outbox_created
+  ON telegram_outbox (created_at);
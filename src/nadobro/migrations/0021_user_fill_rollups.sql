@@ -0,0 +1,61 @@
+-- Per-(user, network, product, UTC day) fill rollups behind the Performance
+-- and Portfolio analytics windows, plus the per-(user, network) state that
+-- advances them at fill-ingest time (database.advance_fill_rollups).
+-- ``eod_positions`` is the product's position state after its last fill that
+-- day; a window's partial start day is replayed from the previous row's.
+-- ``last_submission_idx`` / ``last_funding_id`` mark what is folded in, and
+-- ``fill_revision`` is the owner's fill revision (0024_fill_revisions.sql)
+-- it was advanced at; a folded-in fill restamped since forces a rebuild.
+-- Derived data — safe to TRUNCATE; scripts/rebuild_fill_rollups.py
+-- backfills from trades_<network>. Idempotent.
+
+CREATE TABLE IF NOT EXISTS user_fill_rollups (
+  user_id           BIGINT NOT NULL,
+  network           TEXT NOT NULL,
+  product_id        INTEGER NOT NULL,
+  day               DATE NOT NULL,
+  product_name      TEXT NOT NULL DEFAULT '',
+  perp_usd          NUMERIC NOT NULL DEFAULT 0,
+  spot_usd          NUMERIC NOT NULL DEFAULT 0,
+  nadobro_perp_usd  NUMERIC NOT NULL DEFAULT 0,
+  nadobro_spot_usd  NUMERIC NOT NULL DEFAULT 0,
+  fees              NUMERIC NOT NULL DEFAULT 0,
+  funding           NUMERIC NOT NULL DEFAULT 0,
+  realized          NUMERIC NOT NULL DEFAULT 0,
+  win_pnl           NUMERIC NOT NULL DEFAULT 0,
+  loss_pnl          NUMERIC NOT NULL DEFAULT 0,
+  fills             INTEGER NOT NULL DEFAULT 0,
+  nadobro_fills     INTEGER NOT NULL DEFAULT 0,
+  wins              INTEGER NOT NULL DEFAULT 0,
+  losses            INTEGER NOT NULL DEFAULT 0,
+  eod_positions     JSONB,
+  updated_at        TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (user_id, network, product_id, day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_fill_rollups_day
+  ON user_fill_rollups (user_id, network, day);
+
+CREATE TABLE IF NOT EXISTS fill_rollup_state (
+  user_id              BIGINT NOT NULL,
+  network              TEXT NOT NULL,
+  positions            JSONB NOT NULL DEFAULT '{}',
+  fills                INTEGER NOT NULL DEFAULT 0,
+  last_submission_idx  NUMERIC(78,0) NOT NULL DEFAULT -1,
+  last_fill_at         TIMESTAMPTZ,
+  last_funding_id      BIGINT NOT NULL DEFAULT 0,
+  fill_revision        BIGINT,
+  updated_at           TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (user_id, network)
+);
+
+ALTER TABLE fill_rollup_state ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
+
+-- The start day of a rolling window is replayed from raw fills; keep that a
+-- bounded range read.
+CREATE INDEX IF NOT EXISTS idx_trades_mainnet_user_fill_ts
+  ON trades_mainnet (user_id, (COALESCE(filled_at, created_at)))
+  WHERE submission_idx IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_trades_testnet_user_fill_ts
+  ON trades_testnet (user_id, (COALESCE(filled_at, created_at)))
+  WHERE submission_idx IS NOT NULL;
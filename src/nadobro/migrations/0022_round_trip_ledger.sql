@@ -0,0 +1,52 @@
+-- Persisted FIFO round trips behind the History tab and the Share-PnL
+-- callback, plus the per-(user, network) open-lot state that advances them
+-- with newly synced manual fills (database.advance_round_trips).
+-- ``trip_key`` is the close trade id (the ``portfolio:share_pnl:rt:{key}``
+-- callback key); ``close_trade_id`` is the same id as a number for keyset
+-- pagination by ``close_ts``. ``last_submission_idx`` marks what is paired,
+-- ``epoch`` is the history epoch it was paired under and ``fill_revision``
+-- the owner's fill revision (0024_fill_revisions.sql) it was advanced at; a
+-- paired fill restamped since, or an epoch change, forces a rebuild.
+-- Derived data — safe to TRUNCATE; scripts/rebuild_round_trips.py
+-- re-pairs from trades_<network>. Idempotent.
+
+CREATE TABLE IF NOT EXISTS round_trips (
+  user_id          BIGINT NOT NULL,
+  network          TEXT NOT NULL,
+  trip_key         TEXT NOT NULL,
+  close_trade_id   BIGINT NOT NULL,
+  product_id       INTEGER NOT NULL,
+  product_name     TEXT NOT NULL DEFAULT '',
+  isolated         BOOLEAN NOT NULL DEFAULT false,
+  side             TEXT NOT NULL,
+  size             DOUBLE PRECISION NOT NULL,
+  leverage         DOUBLE PRECISION NOT NULL DEFAULT 0,
+  avg_open_price   DOUBLE PRECISION NOT NULL,
+  avg_close_price  DOUBLE PRECISION NOT NULL,
+  open_ts          TIMESTAMPTZ,
+  close_ts         TIMESTAMPTZ,
+  fees             DOUBLE PRECISION NOT NULL DEFAULT 0,
+  funding_paid     DOUBLE PRECISION NOT NULL DEFAULT 0,
+  realized_pnl     DOUBLE PRECISION NOT NULL DEFAULT 0,
+  volume_usd       DOUBLE PRECISION NOT NULL DEFAULT 0,
+  PRIMARY KEY (user_id, network, trip_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_round_trips_close
+  ON round_trips (user_id, network, close_ts DESC, close_trade_id);
+
+CREATE TABLE IF NOT EXISTS round_trip_state (
+  user_id              BIGINT NOT NULL,
+  network              TEXT NOT NULL,
+  inventory            JSONB NOT NULL DEFAULT '{}',
+  fills                INTEGER NOT NULL DEFAULT 0,
+  last_submission_idx  NUMERIC(78,0) NOT NULL DEFAULT -1,
+  last_fill_at         TIMESTAMPTZ,
+  last_fill_id         BIGINT NOT NULL DEFAULT 0,
+  epoch                TEXT,
+  fill_revision        BIGINT,
+  updated_at           TIMESTAMPTZ NOT NULL DEFAULT now(),
+  PRIMARY KEY (user_id, network)
+);
+
+ALTER TABLE round_trip_state ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
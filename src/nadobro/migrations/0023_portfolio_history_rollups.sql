@@ -0,0 +1,59 @@
+-- Portfolio history resolution tiers. engine_portfolio_history holds the raw
+-- sampler rows (one per user per 60s tick: the 1m tier, kept 7d); these hold
+-- the last sample of every (user, network, hour) for 30d and of every
+-- (user, network, UTC day) for 1y. The sampler upserts all three in one
+-- transaction per tick and chart range reads go straight to the tier that
+-- matches the range, so retention is three range DELETEs instead of a
+-- per-bucket downsample of the raw table.
+-- ``bucket`` is the truncated hour/day; ``ts`` is the surviving sample's own
+-- timestamp. Backfilled from the raw table when empty. Idempotent.
+
+CREATE TABLE IF NOT EXISTS engine_portfolio_history_1h (
+    user_id           BIGINT NOT NULL,
+    network           TEXT NOT NULL DEFAULT 'mainnet',
+    bucket            TIMESTAMPTZ NOT NULL,
+    ts                TIMESTAMPTZ NOT NULL,
+    total_value_quote NUMERIC(38,18) NOT NULL,
+    by_account_json   JSONB NOT NULL,
+    by_asset_json     JSONB NOT NULL,
+    PRIMARY KEY (user_id, network, bucket)
+);
+
+CREATE TABLE IF NOT EXISTS engine_portfolio_history_1d (
+    user_id           BIGINT NOT NULL,
+    network           TEXT NOT NULL DEFAULT 'mainnet',
+    bucket            TIMESTAMPTZ NOT NULL,
+    ts                TIMESTAMPTZ NOT NULL,
+    total_value_quote NUMERIC(38,18) NOT NULL,
+    by_account_json   JSONB NOT NULL,
+    by_asset_json     JSONB NOT NULL,
+    PRIMARY KEY (user_id, network, bucket)
+);
+
+-- Retention DELETEs range-scan ts across every user.
+CREATE INDEX IF NOT EXISTS idx_engine_portfolio_history_ts
+    ON engine_portfolio_history (ts);
+CREATE INDEX IF NOT EXISTS idx_engine_portfolio_history_1h_bucket
+    ON engine_portfolio_history_1h (bucket);
+CREATE INDEX IF NOT EXISTS idx_engine_portfolio_history_1d_bucket
+    ON engine_portfolio_history_1d (bucket);
+
+INSERT INTO engine_portfolio_history_1h
+    (user_id, network, bucket, ts, total_value_quote, by_account_json, by_asset_json)
+SELECT DISTINCT ON (user_id, network, date_trunc('hour', ts AT TIME ZONE 'UTC'))
+       user_id, network, date_trunc('hour', ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+       ts, total_value_quote, by_account_json, by_asset_json
+FROM engine_portfolio_history
+WHERE NOT EXISTS (SELECT 1 FROM engine_portfolio_history_1h)
+ORDER BY user_id, network, date_trunc('hour', ts AT TIME ZONE 'UTC'), ts DESC
+ON CONFLICT (user_id, network, bucket) DO NOTHING;
+
+INSERT INTO engine_portfolio_history_1d
+    (user_id, network, bucket, ts, total_value_quote, by_account_json, by_asset_json)
+SELECT DISTINCT ON (user_id, network, date_trunc('day', ts AT TIME ZONE 'UTC'))
+       user_id, network, date_trunc('day', ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC',
+       ts, total_value_quote, by_account_json, by_asset_json
+FROM engine_portfolio_history
+WHERE NOT EXISTS (SELECT 1 FROM engine_portfolio_history_1d)
+ORDER BY user_id, network, date_trunc('day', ts AT TIME ZONE 'UTC'), ts DESC
+ON CONFLICT (user_id, network, bucket) DO NOTHING;
@@ -0,0 +1,118 @@
+-- Per-user fill revisions: a commit-ordered change counter for trades_<net>.
+--
+-- The derived fill ledgers (session_pnl_accumulators, fill_rollup_state,
+-- round_trip_state) detected edits to fills they had already folded in by
+-- re-aggregating every such fill on each advance — O(ledger) per read. A
+-- BEFORE trigger now stamps every inserted or materially updated row with
+-- the next value of its owner's counter in ``fill_revisions``. The counter
+-- row stays locked until the writing transaction commits, so revisions
+-- commit in order: a reader that sees revision R also sees every row stamped
+-- <= R. A ledger compares the revision it last folded at with the counter
+-- (one primary-key read) and re-reads only the rows stamped since.
+--
+-- ``reshaped_revision`` is the last revision at which a fill was deleted or
+-- moved out of the ledgers' filters (owner, session, source, fill status,
+-- venue id, product, or an earlier timestamp) — a change no stamped row can
+-- show. A ledger folded before it rebuilds. Idempotent.
+
+CREATE TABLE IF NOT EXISTS fill_revisions (
+  network            TEXT NOT NULL,
+  user_id            BIGINT NOT NULL,
+  revision           BIGINT NOT NULL DEFAULT 0,
+  reshaped_revision  BIGINT NOT NULL DEFAULT 0,
+  PRIMARY KEY (network, user_id)
+);
+
+ALTER TABLE trades_mainnet ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
+ALTER TABLE trades_testnet ADD COLUMN IF NOT EXISTS fill_revision BIGINT;
+CREATE INDEX IF NOT EXISTS idx_trades_mainnet_user_fill_revision
+  ON trades_mainnet (user_id, fill_revision) WHERE fill_revision IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_trades_testnet_user_fill_revision
+  ON trades_testnet (user_id, fill_revision) WHERE fill_revision IS NOT NULL;
+
+CREATE OR REPLACE FUNCTION stamp_fill_revision() RETURNS trigger AS $$
+DECLARE
+  net TEXT := CASE WHEN TG_TABLE_NAME = 'trades_testnet' THEN 'testnet' ELSE 'mainnet' END;
+  reshaped BOOLEAN := false;
+  rev BIGINT;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    reshaped := OLD.status IN ('filled', 'closed', 'partially_filled');
+  ELSIF TG_OP = 'UPDATE' AND OLD.status IN ('filled', 'closed', 'partially_filled') THEN
+    reshaped := NEW.status IS NULL
+      OR NEW.status NOT IN ('filled', 'closed', 'partially_filled')
+      OR (NEW.user_id, NEW.strategy_session_id, NEW.source)
+           IS DISTINCT FROM (OLD.user_id, OLD.strategy_session_id, OLD.source)
+      OR (OLD.submission_idx IS NOT NULL AND NEW.submission_idx IS DISTINCT FROM OLD.submission_idx)
+      OR (COALESCE(OLD.product_id, 0) <> 0 AND NEW.product_id IS DISTINCT FROM OLD.product_id)
+      OR COALESCE(NEW.filled_at, NEW.created_at) < COALESCE(OLD.filled_at, OLD.created_at);
+  END IF;
+  IF reshaped AND OLD.user_id IS NOT NULL THEN
+    INSERT INTO fill_revisions AS f (network, user_id, revision, reshaped_revision)
+    VALUES (net, OLD.user_id, 1, 1)
+    ON CONFLICT (network, user_id) DO UPDATE
+      SET revision = f.revision + 1, reshaped_revision = f.revision + 1;
+  END IF;
+  IF TG_OP = 'DELETE' THEN
+    RETURN OLD;
+  END IF;
+  IF NEW.user_id IS NOT NULL THEN
+    INSERT INTO fill_revisions AS f (network, user_id, revision)
+    VALUES (net, NEW.user_id, 1)
+    ON CONFLICT (network, user_id) DO UPDATE SET revision = f.revision + 1
+    RETURNING f.revision INTO rev;
+    NEW.fill_revision := rev;
+  END IF;
+  RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+-- Only columns a ledger reads re-stamp a row; status moves WITHIN the fill
+-- set (filled -> closed) do not.
+DROP TRIGGER IF EXISTS trades_mainnet_fill_revision_ins ON trades_mainnet;
+CREATE TRIGGER trades_mainnet_fill_revision_ins
+  BEFORE INSERT OR DELETE ON trades_mainnet
+  FOR EACH ROW EXECUTE FUNCTION stamp_fill_revision();
+DROP TRIGGER IF EXISTS trades_mainnet_fill_revision_upd ON trades_mainnet;
+CREATE TRIGGER trades_mainnet_fill_revision_upd
+  BEFORE UPDATE ON trades_mainnet
+  FOR EACH ROW WHEN ((
+    OLD.user_id, OLD.product_id, OLD.product_name, OLD.order_type, OLD.side,
+    OLD.size, OLD.price, OLD.leverage, OLD.fees, OLD.created_at, OLD.filled_at,
+    OLD.fill_price, OLD.fill_size, OLD.fill_fee, OLD.builder_fee, OLD.source,
+    OLD.strategy_session_id, OLD.funding_paid, OLD.submission_idx, OLD.isolated,
+    OLD.fee_x18, OLD.base_filled_x18, OLD.quote_filled_x18, OLD.via_nadobro,
+    OLD.status IN ('filled', 'closed', 'partially_filled')
+  ) IS DISTINCT FROM (
+    NEW.user_id, NEW.product_id, NEW.product_name, NEW.order_type, NEW.side,
+    NEW.size, NEW.price, NEW.leverage, NEW.fees, NEW.created_at, NEW.filled_at,
+    NEW.fill_price, NEW.fill_size, NEW.fill_fee, NEW.builder_fee, NEW.source,
+    NEW.strategy_session_id, NEW.funding_paid, NEW.submission_idx, NEW.isolated,
+    NEW.fee_x18, NEW.base_filled_x18, NEW.quote_filled_x18, NEW.via_nadobro,
+    NEW.status IN ('filled', 'closed', 'partially_filled')
+  ))
+  EXECUTE FUNCTION stamp_fill_revision();
+
+DROP TRIGGER IF EXISTS trades_testnet_fill_revision_ins ON trades_testnet;
+CREATE TRIGGER trades_testnet_fill_revision_ins
+  BEFORE INSERT OR DELETE ON trades_testnet
+  FOR EACH ROW EXECUTE FUNCTION stamp_fill_revision();
+DROP TRIGGER IF EXISTS trades_testnet_fill_revision_upd ON trades_testnet;
+CREATE TRIGGER trades_testnet_fill_revision_upd
+  BEFORE UPDATE ON trades_testnet
+  FOR EACH ROW WHEN ((
+    OLD.user_id, OLD.product_id, OLD.product_name, OLD.order_type, OLD.side,
+    OLD.size, OLD.price, OLD.leverage, OLD.fees, OLD.created_at, OLD.filled_at,
+    OLD.fill_price, OLD.fill_size, OLD.fill_fee, OLD.builder_fee, OLD.source,
+    OLD.strategy_session_id, OLD.funding_paid, OLD.submission_idx, OLD.isolated,
+    OLD.fee_x18, OLD.base_filled_x18, OLD.quote_filled_x18, OLD.via_nadobro,
+    OLD.status IN ('filled', 'closed', 'partially_filled')
+  ) IS DISTINCT FROM (
+    NEW.user_id, NEW.product_id, NEW.product_name, NEW.order_type, NEW.side,
+    NEW.size, NEW.price, NEW.leverage, NEW.fees, NEW.created_at, NEW.filled_at,
+    NEW.fill_price, NEW.fill_size, NEW.fill_fee, NEW.builder_fee, NEW.source,
+    NEW.strategy_session_id, NEW.funding_paid, NEW.submission_idx, NEW.isolated,
+    NEW.fee_x18, NEW.base_filled_x18, NEW.quote_filled_x18, NEW.via_nadobro,
+    NEW.status IN ('filled', 'closed', 'partially_filled')
+  ))
+  EXECUTE FUNCTION stamp_fill_revision();
@@ -7,6 +7,7 @@ from typing import Optional, TypeAlias
 
 from psycopg2 import sql as pgsql
 from src.nadobro.db import query_one, query_all, execute, execute_returning, query_count, run_transaction
+from src.nadobro.db_async import aexecute, aquery_all, aquery_one
 
 logger = logging.getLogger(__name__)
 
@@ -71,8 +72,12 @@ def init_db():
     _init()
 
 
-def get_bot_state(key: str) -> Optional[dict]:
-    row = query_one("SELECT value FROM bot_state WHERE key = %s", (key,))
+_BOT_STATE_SELECT = "SELECT value FROM bot_state WHERE key = %s"
+_BOT_STATE_UPSERT = """INSERT INTO bot_state (key, value, updated_at) VALUES (%s, %s, %s)
+           ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at"""
+
+
+def _decode_bot_state(row: Optional[dict]) -> Optional[dict]:
     if not row:
         return None
     raw = row.get("value")
@@ -84,14 +89,25 @@ def get_bot_state(key: str) -> Optional[dict]:
         return None
 
 
-def set_bot_state(key: str, value: JsonSerializable):
+def _bot_state_params(key: str, value: JsonSerializable) -> tuple:
     payload = json.dumps(value) if not isinstance(value, str) else value
-    now = datetime.now(timezone.utc).isoformat()
-    execute(
-        """INSERT INTO bot_state (key, value, updated_at) VALUES (%s, %s, %s)
-           ON CONFLICT (key) DO UPDATE SET value = EXCLUDED.value, updated_at = EXCLUDED.updated_at""",
-        (key, payload, now),
-    )
+    return (key, payload, datetime.now(timezone.utc).isoformat())
+
+
+def get_bot_state(key: str) -> Optional[dict]:
+    return _decode_bot_state(query_one(_BOT_STATE_SELECT, (key,)))
+
+
+def set_bot_state(key: str, value: JsonSerializable):
+    execute(_BOT_STATE_UPSERT, _bot_state_params(key, value))
+
+
+async def aget_bot_state(key: str) -> Optional[dict]:
+    return _decode_bot_state(await aquery_one(_BOT_STATE_SELECT, (key,)))
+
+
+async def aset_bot_state(key: str, value: JsonSerializable):
+    await aexecute(_BOT_STATE_UPSERT, _bot_state_params(key, value))
 
 
 def get_bot_state_raw(key: str) -> Optional[str]:
@@ -101,6 +117,49 @@ def get_bot_state_raw(key: str) -> Optional[str]:
     return row.get("value")
 
 
+# --- telegram_outbox (notify/telegram_outbox.DbOutboxStore) ---
+
+async def aput_telegram_outbox(records: list[dict]) -> None:
+    """Insert pending Telegram envelopes in one statement (ids are idempotent)."""
+    await aexecute(
+        """
+        INSERT INTO telegram_outbox (id, chat_id, lane, text, kwargs, dedupe_key, created_at)
+        SELECT id, chat_id, lane, text, kwargs::jsonb, dedupe_key, to_timestamp(created_at)
+        FROM unnest(%s::text[], %s::bigint[], %s::text[], %s::text[], %s::text[], %s::text[], %s::float8[])
+          AS t(id, chat_id, lane, text, kwargs, dedupe_key, created_at)
+        ON CONFLICT (id) DO NOTHING
+        """,
+        (
+            [str(r["id"]) for r in records],
+            [int(r["chat_id"]) for r in records],
+            [str(r["lane"]) for r in records],
+            [str(r["text"]) for r in records],
+            [json.dumps(r.get("kwargs") or {}) for r in records],
+            [r.get("dedupe_key") for r in records],
+            [float(r["created_at"]) for r in records],
+        ),
+    )
+
+
+async def aack_telegram_outbox(entry_ids: list[str]) -> None:
+    await aexecute("DELETE FROM telegram_outbox WHERE id = ANY(%s)", ([str(i) for i in entry_ids],))
+
+
+async def alist_telegram_outbox(limit: int = 50000) -> list[dict]:
+    rows = await aquery_all(
+        """
+        SELECT id, chat_id, lane, text, kwargs, dedupe_key,
+               EXTRACT(EPOCH FROM created_at)::float8 AS created_at
+        FROM telegram_outbox ORDER BY created_at, id LIMIT %s
+        """,
+        (int(limit),),
+    )
+    for row in rows:
+        if isinstance(row.get("kwargs"), str):
+            row["kwargs"] = json.loads(row["kwargs"])
+    return rows
+
+
 _TRADE_INSERT_ALLOWED_COLS = frozenset({
     "user_id", "product_id", "product_name", "order_type", "side",
     "size", "price", "leverage", "status", "order_digest", "pnl",
@@ -244,6 +303,11 @@ def get_trade_by_id(trade_id: int, network: str = "mainnet") -> Optional[dict]:
     return query_one(f"SELECT * FROM {table} WHERE id = %s LIMIT 1", (trade_id,))
 
 
+async def aget_trade_by_id(trade_id: int, network: str = "mainnet") -> Optional[dict]:
+    table = _trades_table(network)
+    return await aquery_one(f"SELECT * FROM {table} WHERE id = %s LIMIT 1", (trade_id,))
+
+
 _ALERT_INSERT_ALLOWED_COLS = frozenset({
     "user_id", "product_id", "product_name", "condition",
     "target_value", "is_active", "created_at",
@@ -305,12 +369,25 @@ def get_all_active_alerts(network: str = None) -> list:
     return testnet_alerts + mainnet_alerts
 
 
-def update_alert_triggered(alert_id: int, network: str = "mainnet"):
+async def aget_all_active_alerts(network: str = None) -> list:
+    if network:
+        table = _alerts_table(network)
+        return await aquery_all(f"SELECT * FROM {table} WHERE is_active = true")
+    testnet_alerts = await aquery_all("SELECT *, 'testnet' AS network FROM alerts_testnet WHERE is_active = true")
+    mainnet_alerts = await aquery_all("SELECT *, 'mainnet' AS network FROM alerts_mainnet WHERE is_active = true")
+    return testnet_alerts + mainnet_alerts
+
+
+def update_alert_triggered(alert_id: int, network: str = "mainnet") -> bool:
+    """Mark an active alert triggered; False when it was already inactive
+    (deleted or fired by another worker), so the caller must not notify."""
     table = _alerts_table(network)
-    execute(
-        f"UPDATE {table} SET is_active = false, triggered_at = %s WHERE id = %s",
+    row = execute_returning(
+        f"UPDATE {table} SET is_active = false, triggered_at = %s "
+        f"WHERE id = %s AND is_active = true RETURNING id",
         (datetime.now(timezone.utc).isoformat(), alert_id),
     )
+    return row is not None
 
 
 def insert_admin_log(data: dict):
@@ -1364,6 +1441,201 @@ def _derive_session_realized_pnl(
     return realized
 
 
+# Per-(network, session) read counter driving the periodic full-replay check.
+_SESSION_PNL_READS: dict[tuple[str, int], int] = {}
+
+# The owner's commit-ordered fill counter (migrations/0024_fill_revisions.sql).
+_FILL_REVISION_SQL = (
+    "SELECT revision, reshaped_revision FROM fill_revisions WHERE network = %s AND user_id = %s"
+)
+
+
+def _fill_revision(row: Optional[dict]) -> tuple[int, int]:
+    """``(revision, reshaped_revision)`` of a ``fill_revisions`` row; zeros when absent."""
+    row = row or {}
+    return int(row.get("revision") or 0), int(row.get("reshaped_revision") or 0)
+
+
+def _session_fill_guard_sql(where: str) -> str:
+    """The fill filter ``_derive_session_realized_pnl`` replays, incl. the started_at pin."""
+    return f"""
+        WHERE {where}
+          AND status IN ('filled', 'closed', 'partially_filled')
+          AND COALESCE(filled_at, created_at) >= COALESCE(
+                (SELECT started_at FROM strategy_sessions WHERE id = %s),
+                '-infinity'::timestamptz)
+    """
+
+
+def _session_fills_after(
+    table: str, where: str, params: list, session_id: int, after_id: int, upto_revision: int
+) -> list:
+    return query_all(
+        f"""
+        SELECT
+          id,
+          COALESCE(NULLIF(product_id, 0), (
+            SELECT product_id FROM strategy_sessions WHERE id = %s
+          )) AS product_id,
+          side, fill_size, size, fill_price, price, isolated, source,
+          submission_idx, base_filled_x18, quote_filled_x18,
+          COALESCE(NULLIF(fee_x18, 0) / 1e18,
+                   COALESCE(fill_fee, fees, 0) + COALESCE(builder_fee, 0)) AS fee,
+          COALESCE(filled_at, created_at) AS filled_at
+        FROM {table}
+        {_session_fill_guard_sql(where)}
+          AND id > %s
+          AND COALESCE(fill_revision, 0) <= %s
+        ORDER BY COALESCE(filled_at, created_at), id
+        """,
+        (int(session_id), *tuple(params), int(session_id), int(after_id), int(upto_revision)),
+    )
+
+
+def _decode_accumulator_positions(raw) -> dict:
+    if isinstance(raw, str):
+        raw = json.loads(raw or "{}")
+    positions: dict[tuple[int, bool], tuple[Decimal, Decimal]] = {}
+    for key, (pos, entry) in (raw or {}).items():
+        pid, iso = str(key).split(":", 1)
+        positions[(int(pid), iso == "1")] = (Decimal(str(pos)), Decimal(str(entry)))
+    return positions
+
+
+def _encode_accumulator_positions(positions: dict) -> str:
+    return json.dumps({
+        f"{pid}:{1 if iso else 0}": [str(pos), str(entry)]
+        for (pid, iso), (pos, entry) in positions.items()
+    })
+
+
+def _accumulated_session_realized_pnl(
+    table: str,
+    where: str,
+    params: list,
+    session_id: int,
+    user_id: Optional[int] = None,
+) -> float:
+    """Session realized PnL from the persisted accumulator, advanced by new fills.
+
+    Equivalent to ``_derive_session_realized_pnl`` but O(new fills): the
+    accumulator carries the replay's ``(product, isolated) -> (signed_pos,
+    avg_entry)`` map, realized total, fees and the last fill folded in, plus
+    the owner's fill revision it was advanced at. A read at an unchanged
+    revision is one primary-key lookup per table; otherwise only rows stamped
+    since are read. It is rebuilt from scratch when one of those is a fill
+    already folded in, a fill was deleted or moved out of the session
+    (``reshaped_revision``), or a new fill sorts before the last one processed
+    (a late, backdated sync). Each advance checks the total against the folded
+    fills' price-range bound and dumps the rows on a breach; every
+    ``NADO_SESSION_PNL_VERIFY_EVERY`` reads it is also cross-checked against
+    the full replay; drift is logged and the replay wins.
+    """
+    from src.nadobro.core.feature_flags import session_pnl_verify_every
+    from src.nadobro.core.perf import increment_counter
+    from src.nadobro.quant.portfolio_calculator import advance_realized_pnl
+
+    network = "testnet" if str(table).lower().endswith("testnet") else "mainnet"
+    sid = int(session_id)
+    uid = int(user_id) if user_id is not None else _resolve_session_user_id(sid)
+    if uid is None:
+        return float(_derive_session_realized_pnl(table, where, params, sid) or 0)
+    revision, reshaped = _fill_revision(query_one(_FILL_REVISION_SQL, (network, uid)))
+    acc = query_one(
+        "SELECT positions, realized, fees, fills, last_fill_id, last_fill_at, fill_revision, "
+        "price_lo, price_hi, base_traded "
+        "FROM session_pnl_accumulators WHERE session_id = %s AND network = %s",
+        (sid, network),
+    )
+    seen = acc.get("fill_revision") if acc else None
+    if acc and seen != revision:
+        changed = seen is None or reshaped > int(seen) or bool(query_one(
+            f"""
+            SELECT id FROM {table}
+            {_session_fill_guard_sql(where)}
+              AND fill_revision > %s AND fill_revision <= %s AND id <= %s
+            LIMIT 1
+            """,
+            (*tuple(params), sid, int(seen), revision, int(acc.get("last_fill_id") or 0)),
+        ))
+        if changed:
+            logger.info("session pnl accumulator rebuild session=%s: folded-in fills changed", sid)
+            increment_counter("session_pnl.rebuilds")
+            acc = None
+    rows: list = []
+    if not acc or seen != revision:
+        rows = _session_fills_after(
+            table, where, params, sid, int(acc["last_fill_id"]) if acc else 0, revision,
+        )
+    if acc and rows and acc.get("last_fill_at") is not None and rows[0].get("filled_at") is not None \
+            and rows[0]["filled_at"] < acc["last_fill_at"]:
+        logger.info("session pnl accumulator rebuild session=%s: backdated fill id=%s", sid, rows[0].get("id"))
+        increment_counter("session_pnl.rebuilds")
+        acc = None
+        rows = _session_fills_after(table, where, params, sid, 0, revision)
+
+    positions = _decode_accumulator_positions(acc.get("positions")) if acc else {}
+    realized = Decimal(str(acc.get("realized") or 0)) if acc else Decimal(0)
+    if not acc or seen != revision:
+        realized += advance_realized_pnl(positions, rows)
+        fees = (Decimal(str(acc.get("fees") or 0)) if acc else Decimal(0)) + sum(
+            (Decimal(str(r.get("fee") or 0)) for r in rows), Decimal(0)
+        )
+        last_id = max([int(acc["last_fill_id"]) if acc else 0, *(int(r["id"]) for r in rows)])
+        last_at = rows[-1].get("filled_at") if rows else (acc.get("last_fill_at") if acc else None)
+        lo, hi, base = _replay_price_range(rows)
+        if acc:
+            lo = min((p for p in (lo, acc.get("price_lo")) if p is not None), default=None)
+            hi = max((p for p in (hi, acc.get("price_hi")) if p is not None), default=None)
+            base += float(acc.get("base_traded") or 0)
+        execute(
+            """
+            INSERT INTO session_pnl_accumulators (
+              session_id, network, positions, net_base, realized, fees, fills,
+              last_fill_id, last_fill_at, fill_revision, price_lo, price_hi,
+              base_traded, updated_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now())
+            ON CONFLICT (session_id, network) DO UPDATE SET
+              positions = EXCLUDED.positions, net_base = EXCLUDED.net_base,
+              realized = EXCLUDED.realized, fees = EXCLUDED.fees, fills = EXCLUDED.fills,
+              last_fill_id = EXCLUDED.last_fill_id, last_fill_at = EXCLUDED.last_fill_at,
+              fill_revision = EXCLUDED.fill_revision, price_lo = EXCLUDED.price_lo,
+              price_hi = EXCLUDED.price_hi, base_traded = EXCLUDED.base_traded,
+              updated_at = now()
+            """,
+            (
+                sid, network, _encode_accumulator_positions(positions),
+                str(sum((pos for pos, _entry in positions.values()), Decimal(0))),
+                str(realized), str(fees),
+                (int(acc.get("fills") or 0) if acc else 0) + len(rows),
+                last_id, last_at, revision, lo, hi, base,
+            ),
+        )
+        increment_counter("session_pnl.fills_folded", len(rows))
+        if rows and _session_pnl_bound_exceeded(lo, hi, base, float(realized)):
+            # Same contamination dump the full replay logs; the replay wins.
+            return float(_derive_session_realized_pnl(table, where, params, sid) or 0)
+
+    every = session_pnl_verify_every()
+    if every > 0:
+        reads = _SESSION_PNL_READS.get((network, sid), 0) + 1
+        _SESSION_PNL_READS[(network, sid)] = reads
+        if reads % every == 0:
+            replayed = float(_derive_session_realized_pnl(table, where, params, sid) or 0)
+            if abs(replayed - float(realized)) > 1e-6:
+                logger.warning(
+                    "SESSION-PNL-DRIFT session=%s network=%s accumulator=%.8f replay=%.8f — rebuilding",
+                    sid, network, float(realized), replayed,
+                )
+                increment_counter("session_pnl.drift")
+                execute(
+                    "DELETE FROM session_pnl_accumulators WHERE session_id = %s AND network = %s",
+                    (sid, network),
+                )
+                return replayed
+    return float(realized)
+
+
 # Realized PnL beyond this multiple of the session's own price range x traded
 # base is mathematically impossible from its own fills — it means foreign rows
 # are in the replay. Logged (never silently swallowed) so the contaminating row
@@ -1371,6 +1643,29 @@ def _derive_session_realized_pnl(
 _SESSION_PNL_SANITY_SLACK = 1.5
 
 
+def _replay_price_range(rows: list) -> tuple[Optional[float], Optional[float], float]:
+    """``(min_price, max_price, total_base)`` over replay rows (prices > 0 only)."""
+    lo: Optional[float] = None
+    hi: Optional[float] = None
+    base = 0.0
+    for r in rows:
+        px = float(r.get("fill_price") or r.get("price") or 0)
+        if px > 0:
+            lo = px if lo is None else min(lo, px)
+            hi = px if hi is None else max(hi, px)
+        base += abs(float(r.get("fill_size") or r.get("size") or 0))
+    return lo, hi, base
+
+
+def _session_pnl_bound_exceeded(
+    lo: Optional[float], hi: Optional[float], base: float, realized: float
+) -> bool:
+    """|realized| <= (max_price - min_price) * total_base_traded, with slack."""
+    if lo is None or hi is None or base <= 0:
+        return False
+    return abs(realized) > (hi - lo) * base * _SESSION_PNL_SANITY_SLACK + 1e-9
+
+
 def _log_session_replay_diagnostics(session_id: int, rows: list, realized: float) -> None:
     """Dump the exact rows a session replay consumed when its realized PnL is
     not achievable from those rows' own price range.
@@ -1381,22 +1676,14 @@ def _log_session_replay_diagnostics(session_id: int, rows: list, realized: float
     try:
         if not rows:
             return
-        prices, base = [], 0.0
-        for r in rows:
-            px = float(r.get("fill_price") or r.get("price") or 0)
-            sz = abs(float(r.get("fill_size") or r.get("size") or 0))
-            if px > 0:
-                prices.append(px)
-            base += sz
-        if len(prices) < 2 or base <= 0:
-            return
-        bound = (max(prices) - min(prices)) * base * _SESSION_PNL_SANITY_SLACK
-        if abs(realized) <= bound + 1e-9:
+        lo, hi, base = _replay_price_range(rows)
+        if lo is None or hi is None or not _session_pnl_bound_exceeded(lo, hi, base, realized):
             return
+        bound = (hi - lo) * base * _SESSION_PNL_SANITY_SLACK
         logger.error(
             "SESSION-PNL-CONTAMINATION session=%s realized=%.4f exceeds bound=%.4f "
             "(price range %.2f-%.2f, base %.6f over %d fills) — dumping rows",
-            session_id, realized, bound, min(prices), max(prices), base, len(rows),
+            session_id, realized, bound, lo, hi, base, len(rows),
         )
         for r in rows:
             logger.error(
@@ -1504,7 +1791,18 @@ def get_session_live_metrics(
     # fails, keep the previous safe flat-only fallback rather than surfacing raw
     # cash spent as realized PnL.
     try:
-        replayed = _derive_session_realized_pnl(table, where, params, int(session_id))
+        from src.nadobro.core.feature_flags import session_pnl_accumulator_enabled
+
+        if session_pnl_accumulator_enabled():
+            try:
+                replayed = _accumulated_session_realized_pnl(
+                    table, where, params, int(session_id), user_id,
+                )
+            except Exception:  # policy: degrade-ok(accumulator is derived; the full replay is authoritative)
+                logger.debug("session pnl accumulator failed session=%s", session_id, exc_info=True)
+                replayed = _derive_session_realized_pnl(table, where, params, int(session_id))
+        else:
+            replayed = _derive_session_realized_pnl(table, where, params, int(session_id))
         realized = float(replayed or 0)
     except Exception:
         realized = float(row.get("signed_cash") or 0) if is_flat else 0.0
@@ -1569,9 +1867,14 @@ def get_account_realized_pnl_windows(user_id: int, network: str, now=None) -> di
     The old ``source <> 'manual'`` filter targeted those same synthetic rows but
     ALSO dropped every REAL manual fill (unlinked venue fills default to
     source='manual'), so a manual trader's account PnL read ~0 — removed.
+    Served from the per-day rollups (``get_fill_rollup_analytics``) once they
+    exist for the user; the full replay below is the fallback.
     Returns an empty dict on any error so the display path never raises."""
     from src.nadobro.quant.portfolio_calculator import realized_pnl_windows_from_rows
 
+    rolled = get_fill_rollup_analytics(user_id, network, now=now)
+    if rolled is not None:
+        return rolled["realized"]
     table = "trades_testnet" if str(network).lower() == "testnet" else "trades_mainnet"
     try:
         rows = query_all(
@@ -1630,6 +1933,618 @@ def get_analytics_fills(user_id: int, network: str) -> list[dict]:
         return []
 
 
+# ---------------------------------------------------------------------------
+# Per-day fill rollups (migrations/0021_user_fill_rollups.sql)
+# ---------------------------------------------------------------------------
+# The analytics ledger: every venue-confirmed fill (submission_idx is unique
+# per match), with the columns both the volume/fee split and the
+# position-aware PnL replay read.
+_FILL_LEDGER_COLUMNS = """
+    product_id, product_name, side, fill_size, size, fill_price, price, isolated,
+    base_filled_x18, quote_filled_x18, fee_x18, fill_fee, fees, builder_fee,
+    via_nadobro, submission_idx, COALESCE(filled_at, created_at) AS filled_at
+"""
+_FILL_LEDGER_WHERE = """
+    user_id = %s
+    AND submission_idx IS NOT NULL
+    AND COALESCE(product_id, 0) <> 0
+    AND status IN ('filled', 'closed', 'partially_filled')
+"""
+
+
+def _fill_rollup_tables(network: str) -> tuple[str, str, str]:
+    net = "testnet" if str(network).lower() == "testnet" else "mainnet"
+    return net, f"trades_{net}", f"funding_payments_{net}"
+
+
+def _upsert_fill_rollup_days(cur, user_id: int, network: str, days: dict) -> None:
+    from src.nadobro.quant.fill_rollups import COUNT_COLUMNS, SUM_COLUMNS
+
+    columns = ("user_id", "network", "product_id", "day", "product_name", *SUM_COLUMNS, *COUNT_COLUMNS)
+    row_sql = "(" + ", ".join(["%s"] * len(columns)) + ", %s::jsonb)"
+    items = sorted(days.items())
+    for offset in range(0, len(items), 500):
+        chunk = items[offset:offset + 500]
+        params: list = []
+        for (product_id, day), bucket in chunk:
+            params.extend([int(user_id), network, int(product_id), day, bucket["product_name"]])
+            params.extend(str(bucket[col]) for col in SUM_COLUMNS)
+            params.extend(int(bucket[col]) for col in COUNT_COLUMNS)
+            params.append(json.dumps(bucket["eod"]) if bucket["eod"] is not None else None)
+        additive = ", ".join(
+            f"{col} = user_fill_rollups.{col} + EXCLUDED.{col}" for col in (*SUM_COLUMNS, *COUNT_COLUMNS)
+        )
+        cur.execute(
+            f"""
+            INSERT INTO user_fill_rollups ({", ".join(columns)}, eod_positions)
+            VALUES {", ".join([row_sql] * len(chunk))}
+            ON CONFLICT (user_id, network, product_id, day) DO UPDATE SET
+              {additive},
+              product_name = COALESCE(NULLIF(EXCLUDED.product_name, ''), user_fill_rollups.product_name),
+              eod_positions = COALESCE(EXCLUDED.eod_positions, user_fill_rollups.eod_positions),
+              updated_at = now()
+            """,
+            tuple(params),
+        )
+
+
+def advance_fill_rollups(user_id: int, network: str, *, rebuild: bool = False) -> dict:
+    """Fold fills and funding ingested since the last call into ``user_fill_rollups``.
+
+    Called by nado_sync right after it writes a snapshot's matches and
+    funding. The carried ``(product, isolated) -> (pos, avg_entry, cycle)``
+    map makes the incremental fold equal a full replay. Change detection runs
+    on the owner's fill revision (migrations/0024_fill_revisions.sql): an
+    unchanged revision is one primary-key read and no ledger scan; otherwise
+    only the rows stamped since are read, bounded by the revision so a fill
+    committing mid-advance is left whole for the next call. The user's
+    rollups are rebuilt from ``trades_<network>`` when ``rebuild`` is set, on
+    the first call, when a folded-in fill was restamped, deleted or moved out
+    of the ledger, or when a new fill sorts before the last one folded in (a
+    late, backdated sync). One transaction, serialized per (user, network) by
+    an advisory lock.
+
+    Returns ``{"folded": fills, "funding": payments, "rebuilt": reason|None}``.
+    """
+    from src.nadobro.core.perf import increment_counter
+    from src.nadobro.quant import fill_rollups as fr
+
+    uid = int(user_id)
+    net, table, funding_table = _fill_rollup_tables(network)
+
+    def _ledger_after(cur, after_idx, upto_revision: int) -> list:
+        cur.execute(
+            f"""
+            SELECT {_FILL_LEDGER_COLUMNS}
+            FROM {table}
+            WHERE {_FILL_LEDGER_WHERE} AND submission_idx > %s
+              AND COALESCE(fill_revision, 0) <= %s
+            ORDER BY COALESCE(filled_at, created_at), submission_idx
+            """,
+            (uid, after_idx, upto_revision),
+        )
+        return list(cur.fetchall())
+
+    def _work(cur):
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"fill_rollups:{uid}:{net}",))
+        cur.execute(_FILL_REVISION_SQL, (net, uid))
+        revision, reshaped = _fill_revision(cur.fetchone())
+        cur.execute(
+            "SELECT positions, fills, last_submission_idx, last_fill_at, last_funding_id, fill_revision "
+            "FROM fill_rollup_state WHERE user_id = %s AND network = %s",
+            (uid, net),
+        )
+        state = cur.fetchone()
+        reason = "requested" if rebuild else (None if state else "initial")
+        seen = state.get("fill_revision") if state else None
+        if reason is None and seen != revision:
+            if seen is None or reshaped > int(seen):
+                reason = "fills changed"
+            else:
+                cur.execute(
+                    f"""
+                    SELECT 1 FROM {table}
+                    WHERE {_FILL_LEDGER_WHERE}
+                      AND fill_revision > %s AND fill_revision <= %s AND submission_idx <= %s
+                    LIMIT 1
+                    """,
+                    (uid, int(seen), revision, state["last_submission_idx"]),
+                )
+                if cur.fetchone():
+                    reason = "fills changed"
+        rows: list = []
+        if reason or seen != revision:
+            rows = _ledger_after(cur, -1 if reason else state["last_submission_idx"], revision)
+        if reason is None and rows and state.get("last_fill_at") is not None \
+                and rows[0]["filled_at"] < state["last_fill_at"]:
+            reason = "backdated fill"
+            rows = _ledger_after(cur, -1, revision)
+
+        if reason:
+            cur.execute("DELETE FROM user_fill_rollups WHERE user_id = %s AND network = %s", (uid, net))
+            positions: dict = {}
+            fills, last_idx, last_at, funding_after = 0, -1, None, 0
+        else:
+            positions = fr.decode_positions(state.get("positions"))
+            fills = int(state.get("fills") or 0)
+            last_idx, last_at = state["last_submission_idx"], state.get("last_fill_at")
+            funding_after = int(state.get("last_funding_id") or 0)
+        cur.execute(
+            f"SELECT id, product_id, amount_x18, paid_at FROM {funding_table} "
+            "WHERE user_id = %s AND id > %s ORDER BY id",
+            (uid, funding_after),
+        )
+        funding = list(cur.fetchall())
+        if not reason and not rows and not funding:
+            if seen != revision:
+                cur.execute(
+                    "UPDATE fill_rollup_state SET fill_revision = %s WHERE user_id = %s AND network = %s",
+                    (revision, uid, net),
+                )
+            return {"folded": 0, "funding": 0, "rebuilt": None}
+
+        events = fr.fill_events(rows, positions)
+        _upsert_fill_rollup_days(cur, uid, net, fr.fold_days(events, funding))
+        if rows:
+            last_idx = max(int(last_idx), *(int(r["submission_idx"]) for r in rows))
+            last_at = rows[-1]["filled_at"]
+        if funding:
+            funding_after = max(int(p["id"]) for p in funding)
+        cur.execute(
+            """
+            INSERT INTO fill_rollup_state (
+              user_id, network, positions, fills, last_submission_idx,
+              last_fill_at, last_funding_id, fill_revision, updated_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, now())
+            ON CONFLICT (user_id, network) DO UPDATE SET
+              positions = EXCLUDED.positions, fills = EXCLUDED.fills,
+              last_submission_idx = EXCLUDED.last_submission_idx,
+              last_fill_at = EXCLUDED.last_fill_at,
+              last_funding_id = EXCLUDED.last_funding_id,
+              fill_revision = EXCLUDED.fill_revision, updated_at = now()
+            """,
+            (
+                uid, net, json.dumps(fr.encode_positions(positions)), fills + len(rows),
+                last_idx, last_at, funding_after, revision,
+            ),
+        )
+        return {"folded": len(rows), "funding": len(funding), "rebuilt": reason}
+
+    result = run_transaction(_work)
+    increment_counter("fill_rollups.fills_folded", result["folded"])
+    if result["rebuilt"] and result["rebuilt"] != "initial":
+        logger.info("fill rollups rebuilt user=%s network=%s: %s", uid, net, result["rebuilt"])
+        increment_counter("fill_rollups.rebuilds")
+    return result
+
+
+def rebuild_fill_rollups(network: str, user_ids: list[int] | None = None) -> int:
+    """Backfill ``user_fill_rollups`` from ``trades_<network>``; returns users rebuilt.
+
+    ``user_ids=None`` rebuilds every user with a ledger fill or a funding
+    payment on the network. Idempotent — each user is replayed from scratch.
+    """
+    net, table, funding_table = _fill_rollup_tables(network)
+    if user_ids is None:
+        rows = query_all(
+            f"""
+            SELECT DISTINCT user_id FROM {table} WHERE submission_idx IS NOT NULL
+            UNION
+            SELECT DISTINCT user_id FROM {funding_table}
+            ORDER BY user_id
+            """
+        )
+        user_ids = [int(r["user_id"]) for r in rows]
+    rebuilt = 0
+    for uid in user_ids:
+        try:
+            advance_fill_rollups(int(uid), net, rebuild=True)
+            rebuilt += 1
+        except Exception:
+            logger.warning("fill rollup rebuild failed user=%s network=%s", uid, net, exc_info=True)
+    return rebuilt
+
+
+def _fill_rollup_window_totals(user_id: int, network: str, now=None) -> dict | None:
+    """Per-window totals from the rollups, or ``None`` when the user has none yet.
+
+    Whole days after each window's start day are one grouped range sum; the
+    start day itself is replayed from its raw fills (capped at the folded-in
+    watermark) beginning at the previous row's end-of-day positions, so the
+    rolling windows are exact rather than day-aligned.
+    """
+    from src.nadobro.quant import fill_rollups as fr
+
+    now = now or datetime.now(timezone.utc)
+    if now.tzinfo is None:
+        now = now.replace(tzinfo=timezone.utc)
+    uid = int(user_id)
+    net, table, funding_table = _fill_rollup_tables(network)
+    state = query_one(
+        "SELECT last_submission_idx, last_funding_id FROM fill_rollup_state "
+        "WHERE user_id = %s AND network = %s",
+        (uid, net),
+    )
+    if not state:
+        return None
+    start_days = {w: ts.date() for w, ts in fr.window_starts(now).items()}
+    cols = (*fr.SUM_COLUMNS, *fr.COUNT_COLUMNS)
+    selects = [f"COALESCE(SUM({c}), 0) AS all__{c}" for c in cols]
+    params: list = []
+    for window, day in start_days.items():
+        key = window.replace("24h", "d1").replace("7d", "d7").replace("30d", "d30")
+        selects.extend(f"COALESCE(SUM({c}) FILTER (WHERE day > %s), 0) AS {key}__{c}" for c in cols)
+        params.extend([day] * len(cols))
+    sums_row = query_one(
+        f"SELECT {', '.join(selects)} FROM user_fill_rollups WHERE user_id = %s AND network = %s",
+        (*params, uid, net),
+    ) or {}
+    day_sums: dict[str, dict] = {}
+    for key, value in sums_row.items():
+        prefix, col = key.split("__", 1)
+        window = {"all": "all", "d1": "24h", "d7": "7d", "d30": "30d"}[prefix]
+        day_sums.setdefault(window, {})[col] = value
+
+    boundary_events: dict[str, list] = {}
+    boundary_funding: dict[str, list] = {}
+    for day in sorted(set(start_days.values())):
+        eod_rows = query_all(
+            """
+            SELECT DISTINCT ON (product_id) product_id, eod_positions
+            FROM user_fill_rollups
+            WHERE user_id = %s AND network = %s AND day < %s AND eod_positions IS NOT NULL
+            ORDER BY product_id, day DESC
+            """,
+            (uid, net, day),
+        )
+        positions: dict = {}
+        for r in eod_rows:
+            raw = r.get("eod_positions")
+            raw = json.loads(raw) if isinstance(raw, str) else (raw or {})
+            positions.update(fr.decode_positions({f"{r['product_id']}:{iso}": s for iso, s in raw.items()}))
+        fills = query_all(
+            f"""
+            SELECT {_FILL_LEDGER_COLUMNS}
+            FROM {table}
+            WHERE {_FILL_LEDGER_WHERE}
+              AND submission_idx <= %s
+              AND COALESCE(filled_at, created_at) >= %s
+              AND COALESCE(filled_at, created_at) < %s
+            ORDER BY COALESCE(filled_at, created_at), submission_idx
+            """,
+            (uid, state["last_submission_idx"], *_utc_day_bounds(day)),
+        )
+        funding = query_all(
+            f"SELECT product_id, amount_x18, paid_at FROM {funding_table} "
+            "WHERE user_id = %s AND id <= %s AND paid_at >= %s AND paid_at < %s",
+            (uid, int(state["last_funding_id"] or 0), *_utc_day_bounds(day)),
+        )
+        events = fr.fill_events(fills, positions)
+        for window, start_day in start_days.items():
+            if start_day == day:
+                boundary_events[window] = events
+                boundary_funding[window] = funding
+    return fr.window_totals(day_sums, boundary_events, boundary_funding, now)
+
+
+def _utc_day_bounds(day) -> tuple[datetime, datetime]:
+    from datetime import timedelta
+
+    start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def get_fill_rollup_analytics(user_id: int, network: str, now=None) -> dict | None:
+    """The portfolio analytics payload (``aggregate_user_analytics`` shape) plus
+    the realized-PnL windows (``realized_pnl_windows_from_rows`` shape), read
+    from the rollups: ``{"analytics", "realized", "fills"}``.
+
+    ``None`` when rollups are disabled, not built for this user yet, or the
+    read failed — callers fall back to the full-ledger path.
+    """
+    from src.nadobro.core.feature_flags import fill_rollups_enabled
+    from src.nadobro.quant import fill_rollups as fr
+
+    if not fill_rollups_enabled():
+        return None
+    try:
+        totals = _fill_rollup_window_totals(user_id, network, now=now)
+    except Exception:
+        logger.debug("fill rollup read failed user=%s network=%s", user_id, network, exc_info=True)
+        return None
+    if totals is None:
+        return None
+    return {
+        "analytics": fr.analytics_from_totals(totals),
+        "realized": fr.realized_from_totals(totals),
+        "fills": int(totals["all"]["fills"]),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Round-trip ledger (migrations/0022_round_trip_ledger.sql)
+# ---------------------------------------------------------------------------
+# The History tab's ledger: manual (non-strategy) venue fills since the
+# history epoch, in FIFO pairing order.
+_ROUND_TRIP_FILL_COLUMNS = """
+    id, submission_idx, product_id, product_name, side, status,
+    COALESCE(fill_size, size, 0) AS sz,
+    COALESCE(NULLIF(fill_price, 0), price, 0) AS px,
+    COALESCE(fill_fee, fees, 0) + COALESCE(builder_fee, 0) AS fee,
+    COALESCE(realized_pnl, pnl, 0) AS realized_pnl,
+    COALESCE(funding_paid, 0) AS funding_paid,
+    COALESCE(isolated, false) AS isolated,
+    COALESCE(leverage, 0) AS leverage,
+    order_type,
+    COALESCE(filled_at, created_at) AS ts
+"""
+_ROUND_TRIP_FILL_WHERE = """
+    user_id = %s
+    AND strategy_session_id IS NULL
+    AND COALESCE(source, 'manual') = 'manual'
+    AND status IN ('filled', 'closed', 'partially_filled')
+    -- Authoritative venue fills only. submission_idx is UNIQUE (dedup
+    -- index) so each real fill appears once, and the bot's synthetic
+    -- ``MARKET_CLOSE`` rows (account-wide, no submission_idx) are excluded
+    -- so they can't double-count or over-close the FIFO inventory.
+    AND submission_idx IS NOT NULL
+    -- Product-less venue fills (product_id 0 — this indexer's match feed
+    -- carries no product_id) can't be paired per product without mixing
+    -- BTC with ETH, so they're excluded rather than shown WRONG. The
+    -- recording fix (resolve product_id at insert) lands separately.
+    AND COALESCE(product_id, 0) <> 0
+    -- History epoch: before 2026-07-09 the manual stream has PROVABLE
+    -- holes (desk fills unrecorded, ~500 unattributable product_id=0
+    -- legs), so FIFO pairings crossing that era fabricate multi-day
+    -- holds (an old lot whose real close is invisible gets "closed"
+    -- by a much later fill). Pair only the complete-recording era.
+    AND COALESCE(filled_at, created_at) >= %s::timestamptz
+"""
+_ROUND_TRIP_FILL_ORDER = "COALESCE(filled_at, created_at) ASC, id ASC"
+
+
+def round_trip_history_epoch() -> str:
+    """First fill timestamp the History tab pairs (ISO text).
+
+    Override with NADO_HISTORY_EPOCH if pre-fix rows are ever repaired enough
+    to extend the window backwards; the ledger rebuilds when it changes.
+    """
+    from src.nadobro.utils.env import env_str
+
+    return env_str("NADO_HISTORY_EPOCH", "2026-07-09T00:00:00+00:00")
+
+
+def _insert_round_trips(cur, user_id: int, network: str, trips: list[dict]) -> None:
+    from src.nadobro.quant.round_trips import TRIP_COLUMNS
+
+    columns = ("user_id", "network", "close_trade_id", *TRIP_COLUMNS)
+    row_sql = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    for offset in range(0, len(trips), 500):
+        chunk = trips[offset:offset + 500]
+        params: list = []
+        for trip in chunk:
+            params.extend([int(user_id), network, int(trip["trip_key"])])
+            params.extend(trip[col] for col in TRIP_COLUMNS)
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in TRIP_COLUMNS if col != "trip_key")
+        cur.execute(
+            f"""
+            INSERT INTO round_trips ({", ".join(columns)})
+            VALUES {", ".join([row_sql] * len(chunk))}
+            ON CONFLICT (user_id, network, trip_key) DO UPDATE SET {updates}
+            """,
+            tuple(params),
+        )
+
+
+def advance_round_trips(user_id: int, network: str, *, rebuild: bool = False) -> dict:
+    """Pair manual fills synced since the last call into ``round_trips``.
+
+    Called by nado_sync at fill ingest; History reads never advance it. The
+    open FIFO lots per ``(product_id, isolated)`` are carried in
+    ``round_trip_state``, so a full pass never repeats. Change detection runs
+    on the owner's fill revision (migrations/0024_fill_revisions.sql): an
+    unchanged revision is one primary-key read; otherwise only rows stamped
+    since are read, bounded by the revision. The user's trips are re-paired
+    from ``trades_<network>`` when ``rebuild`` is set, on the first call,
+    when the history epoch changed, when a paired fill was restamped, deleted
+    or moved out of the manual stream, or when a new fill sorts before the
+    last one paired (a late, backdated sync). One transaction, serialized per
+    (user, network) by an advisory lock.
+
+    Returns ``{"folded": fills, "trips": new trips, "rebuilt": reason|None}``.
+    """
+    from src.nadobro.core.perf import increment_counter
+    from src.nadobro.quant import round_trips as rt
+
+    uid = int(user_id)
+    net, table, _funding = _fill_rollup_tables(network)
+    epoch = round_trip_history_epoch()
+
+    def _fills_after(cur, after_idx, upto_revision: int) -> list:
+        cur.execute(
+            f"""
+            SELECT {_ROUND_TRIP_FILL_COLUMNS}
+            FROM {table}
+            WHERE {_ROUND_TRIP_FILL_WHERE} AND submission_idx > %s
+              AND COALESCE(fill_revision, 0) <= %s
+            ORDER BY {_ROUND_TRIP_FILL_ORDER}
+            """,
+            (uid, epoch, after_idx, upto_revision),
+        )
+        return list(cur.fetchall())
+
+    def _work(cur):
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"round_trips:{uid}:{net}",))
+        cur.execute(_FILL_REVISION_SQL, (net, uid))
+        revision, reshaped = _fill_revision(cur.fetchone())
+        cur.execute(
+            "SELECT inventory, fills, last_submission_idx, last_fill_at, last_fill_id, epoch, fill_revision "
+            "FROM round_trip_state WHERE user_id = %s AND network = %s",
+            (uid, net),
+        )
+        state = cur.fetchone()
+        reason = "requested" if rebuild else (None if state else "initial")
+        if reason is None and state.get("epoch") != epoch:
+            reason = "epoch changed"
+        seen = state.get("fill_revision") if state else None
+        if reason is None and seen != revision:
+            if seen is None or reshaped > int(seen):
+                reason = "fills changed"
+            else:
+                cur.execute(
+                    f"""
+                    SELECT 1 FROM {table}
+                    WHERE {_ROUND_TRIP_FILL_WHERE}
+                      AND fill_revision > %s AND fill_revision <= %s AND submission_idx <= %s
+                    LIMIT 1
+                    """,
+                    (uid, epoch, int(seen), revision, state["last_submission_idx"]),
+                )
+                if cur.fetchone():
+                    reason = "fills changed"
+        rows: list = []
+        if reason or seen != revision:
+            rows = _fills_after(cur, -1 if reason else state["last_submission_idx"], revision)
+        if reason is None and rows and state.get("last_fill_at") is not None \
+                and (rows[0]["ts"], int(rows[0]["id"])) < (state["last_fill_at"], int(state.get("last_fill_id") or 0)):
+            reason = "backdated fill"
+            rows = _fills_after(cur, -1, revision)
+        if reason is None and not rows:
+            if seen != revision:
+                cur.execute(
+                    "UPDATE round_trip_state SET fill_revision = %s WHERE user_id = %s AND network = %s",
+                    (revision, uid, net),
+                )
+            return {"folded": 0, "trips": 0, "rebuilt": None}
+
+        if reason:
+            cur.execute("DELETE FROM round_trips WHERE user_id = %s AND network = %s", (uid, net))
+            inventory: dict = {}
+            fills, last_idx, last_at, last_id = 0, -1, None, 0
+        else:
+            inventory = rt.decode_inventory(state.get("inventory"))
+            fills = int(state.get("fills") or 0)
+            last_idx, last_at = state["last_submission_idx"], state.get("last_fill_at")
+            last_id = int(state.get("last_fill_id") or 0)
+
+        trips = rt.fold_round_trips(rows, inventory)
+        _insert_round_trips(cur, uid, net, trips)
+        if rows:
+            last_idx = max(int(last_idx), *(int(r["submission_idx"]) for r in rows))
+            last_at, last_id = rows[-1]["ts"], int(rows[-1]["id"])
+        cur.execute(
+            """
+            INSERT INTO round_trip_state (
+              user_id, network, inventory, fills, last_submission_idx,
+              last_fill_at, last_fill_id, epoch, fill_revision, updated_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, now())
+            ON CONFLICT (user_id, network) DO UPDATE SET
+              inventory = EXCLUDED.inventory, fills = EXCLUDED.fills,
+              last_submission_idx = EXCLUDED.last_submission_idx,
+              last_fill_at = EXCLUDED.last_fill_at,
+              last_fill_id = EXCLUDED.last_fill_id,
+              epoch = EXCLUDED.epoch,
+              fill_revision = EXCLUDED.fill_revision, updated_at = now()
+            """,
+            (
+                uid, net, json.dumps(rt.encode_inventory(inventory)), fills + len(rows),
+                last_idx, last_at, last_id, epoch, revision,
+            ),
+        )
+        return {"folded": len(rows), "trips": len(trips), "rebuilt": reason}
+
+    result = run_transaction(_work)
+    increment_counter("round_trips.fills_folded", result["folded"])
+    if result["rebuilt"] and result["rebuilt"] != "initial":
+        logger.info("round trips rebuilt user=%s network=%s: %s", uid, net, result["rebuilt"])
+        increment_counter("round_trips.rebuilds")
+    return result
+
+
+def rebuild_round_trips(network: str, user_ids: list[int] | None = None) -> int:
+    """Re-pair ``round_trips`` from ``trades_<network>``; returns users rebuilt.
+
+    ``user_ids=None`` rebuilds every user with a manual venue fill on the
+    network. Idempotent — each user is re-paired from scratch.
+    """
+    net, table, _funding = _fill_rollup_tables(network)
+    if user_ids is None:
+        rows = query_all(
+            f"""
+            SELECT DISTINCT user_id FROM {table}
+            WHERE submission_idx IS NOT NULL AND strategy_session_id IS NULL
+            ORDER BY user_id
+            """
+        )
+        user_ids = [int(r["user_id"]) for r in rows]
+    rebuilt = 0
+    for uid in user_ids:
+        try:
+            advance_round_trips(int(uid), net, rebuild=True)
+            rebuilt += 1
+        except Exception:
+            logger.warning("round trip rebuild failed user=%s network=%s", uid, net, exc_info=True)
+    return rebuilt
+
+
+_ROUND_TRIP_SELECT = """
+    trip_key, product_id, product_name, product_name AS pair, isolated, side, size,
+    leverage, avg_open_price, avg_close_price, open_ts, close_ts, fees,
+    funding_paid, realized_pnl, volume_usd
+"""
+
+
+def get_round_trips_page(
+    user_id: int,
+    network: str,
+    *,
+    limit: int = 100,
+    before: tuple | None = None,
+) -> list[dict]:
+    """One History page, newest ``close_ts`` first.
+
+    ``before`` is the ``(close_ts, trip_key)`` of the previous page's last
+    trip; the page continues strictly after it (keyset — no OFFSET scan).
+    """
+    net, _table, _funding = _fill_rollup_tables(network)
+    params: list = [int(user_id), net]
+    after = ""
+    if before is not None:
+        close_ts, trip_key = before
+        after = "AND (close_ts < %s OR (close_ts = %s AND close_trade_id > %s))"
+        params.extend([close_ts, close_ts, int(trip_key)])
+    params.append(max(1, int(limit)))
+    return query_all(
+        f"""
+        SELECT {_ROUND_TRIP_SELECT}
+        FROM round_trips
+        WHERE user_id = %s AND network = %s {after}
+        ORDER BY close_ts DESC, close_trade_id ASC
+        LIMIT %s
+        """,
+        tuple(params),
+    )
+
+
+def has_round_trip_state(user_id: int, network: str) -> bool:
+    """True once ``advance_round_trips`` has paired this user's fills at least once."""
+    net, _table, _funding = _fill_rollup_tables(network)
+    return query_one(
+        "SELECT 1 AS present FROM round_trip_state WHERE user_id = %s AND network = %s",
+        (int(user_id), net),
+    ) is not None
+
+
+def get_round_trip(user_id: int, network: str, trip_key: str) -> dict | None:
+    """The persisted round-trip closed by trade ``trip_key`` (primary-key read)."""
+    net, _table, _funding = _fill_rollup_tables(network)
+    return query_one(
+        f"SELECT {_ROUND_TRIP_SELECT} FROM round_trips "
+        "WHERE user_id = %s AND network = %s AND trip_key = %s",
+        (int(user_id), net, str(trip_key)),
+    )
+
+
 def backfill_via_nadobro(network: str, limit: int = 5000) -> int:
     """Stamp ``via_nadobro`` on historical fills by matching their
     ``order_digest`` against ``order_intents`` (the registry every bot-placed
@@ -2096,25 +3011,33 @@ def claim_pending_fill_syncs(limit: int = 100, stale_after_minutes: int = 10) ->
     )
 
 
+_FILL_SYNC_RELEASE = "UPDATE fill_sync_queue SET status = 'pending', claimed_at = NULL WHERE id = %s AND status = 'processing'"
+_FILL_SYNC_RESOLVE = "UPDATE fill_sync_queue SET status = 'resolved', claimed_at = NULL, resolved_at = %s WHERE id = %s"
+_FILL_SYNC_EXPIRE = "UPDATE fill_sync_queue SET status = 'expired', claimed_at = NULL, resolved_at = %s WHERE id = %s"
+
+
 def release_fill_sync(sync_id: int):
-    execute(
-        "UPDATE fill_sync_queue SET status = 'pending', claimed_at = NULL WHERE id = %s AND status = 'processing'",
-        (sync_id,),
-    )
+    execute(_FILL_SYNC_RELEASE, (sync_id,))
 
 
 def resolve_fill_sync(sync_id: int):
-    execute(
-        "UPDATE fill_sync_queue SET status = 'resolved', claimed_at = NULL, resolved_at = %s WHERE id = %s",
-        (datetime.now(timezone.utc).isoformat(), sync_id),
-    )
+    execute(_FILL_SYNC_RESOLVE, (datetime.now(timezone.utc).isoformat(), sync_id))
 
 
 def expire_fill_sync(sync_id: int):
-    execute(
-        "UPDATE fill_sync_queue SET status = 'expired', claimed_at = NULL, resolved_at = %s WHERE id = %s",
-        (datetime.now(timezone.utc).isoformat(), sync_id),
-    )
+    execute(_FILL_SYNC_EXPIRE, (datetime.now(timezone.utc).isoformat(), sync_id))
+
+
+async def arelease_fill_sync(sync_id: int):
+    await aexecute(_FILL_SYNC_RELEASE, (sync_id,))
+
+
+async def aresolve_fill_sync(sync_id: int):
+    await aexecute(_FILL_SYNC_RESOLVE, (datetime.now(timezone.utc).isoformat(), sync_id))
+
+
+async def aexpire_fill_sync(sync_id: int):
+    await aexecute(_FILL_SYNC_EXPIRE, (datetime.now(timezone.utc).isoformat(), sync_id))
 
 
 def increment_fill_sync_attempts(sync_id: int):
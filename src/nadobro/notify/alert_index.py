@@ -0,0 +1,281 @@
+"""In-memory threshold index behind ``get_triggered_alerts``.
+
+The alert worker ticks every 5s. Loading every active alert from the DB and
+testing each one against the price dict made each tick O(alerts) in both DB
+rows and Python work, even when nothing fired. The index keeps the active
+alerts of one network as sorted target arrays per key:
+
+* price / funding alerts — keyed by product ("BTC", not "BTC-PERP");
+* PnL alerts — keyed by ``(user_id, product)``, since the value is per user.
+
+An ``above`` alert fires once the value is ``>= target``, so the alerts a tick
+fires are exactly the prefix of the ascending ``above`` array up to
+``bisect_right(value)``; ``below`` alerts are the suffix from
+``bisect_left(value)``. Fired alerts leave the index, so everything still in it
+is uncrossed and a quiet tick is a couple of bisects per product with no DB I/O.
+
+The index is kept in sync by ``add``/``remove`` (create, delete, trigger) and
+reloaded from the DB every ``resync_seconds`` to pick up edits made by other
+processes. Edits that land while a reload is reading the DB are journaled and
+replayed on top of it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+PRICE_CONDITIONS = ("above", "below")
+FUNDING_CONDITIONS = ("funding_above", "funding_below")
+PNL_CONDITIONS = ("pnl_above", "pnl_below")
+
+
+def product_key(product_name: Any) -> str:
+    return str(product_name or "").replace("-PERP", "")
+
+
+class _Thresholds:
+    """Alert ids sorted by ascending target."""
+
+    __slots__ = ("targets", "ids")
+
+    def __init__(self) -> None:
+        self.targets: list[float] = []
+        self.ids: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, target: float, alert_id: int) -> None:
+        i = bisect_right(self.targets, target)
+        self.targets.insert(i, target)
+        self.ids.insert(i, alert_id)
+
+    def remove(self, target: float, alert_id: int) -> bool:
+        i = bisect_left(self.targets, target)
+        while i < len(self.targets) and self.targets[i] == target:
+            if self.ids[i] == alert_id:
+                del self.targets[i]
+                del self.ids[i]
+                return True
+            i += 1
+        return False
+
+    def at_or_below(self, value: float) -> list[int]:
+        return self.ids[: bisect_right(self.targets, value)]
+
+    def at_or_above(self, value: float) -> list[int]:
+        return self.ids[bisect_left(self.targets, value):]
+
+
+@dataclass
+class _Book:
+    """One network's alerts: ``(above, below)`` threshold pairs per key."""
+
+    alerts: dict[int, dict] = field(default_factory=dict)
+    price: dict[str, tuple[_Thresholds, _Thresholds]] = field(default_factory=dict)
+    funding: dict[str, tuple[_Thresholds, _Thresholds]] = field(default_factory=dict)
+    pnl: dict[tuple[int, str], tuple[_Thresholds, _Thresholds]] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    def _slot(self, alert: dict) -> tuple[_Thresholds, _Thresholds] | None:
+        cond = alert.get("condition")
+        product = product_key(alert.get("product_name"))
+        if cond in PRICE_CONDITIONS:
+            table, key = self.price, product
+        elif cond in FUNDING_CONDITIONS:
+            table, key = self.funding, product
+        elif cond in PNL_CONDITIONS:
+            try:
+                table, key = self.pnl, (int(alert.get("user_id")), product)
+            except (TypeError, ValueError):
+                return None
+        else:
+            return None
+        pair = table.get(key)
+        if pair is None:
+            pair = table[key] = (_Thresholds(), _Thresholds())
+        return pair
+
+    def add(self, alert: dict) -> bool:
+        try:
+            alert_id = int(alert["id"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        if alert_id in self.alerts:
+            return False
+        pair = self._slot(alert)
+        if pair is None:
+            return False
+        target = float(alert.get("target_value") or 0)
+        entry = dict(alert, id=alert_id, target_value=target)
+        self.alerts[alert_id] = entry
+        pair[0 if _is_above(entry["condition"]) else 1].add(target, alert_id)
+        return True
+
+    def remove(self, alert_id: int) -> dict | None:
+        entry = self.alerts.pop(int(alert_id), None)
+        if entry is None:
+            return None
+        pair = self._slot(entry)
+        if pair is not None:
+            pair[0 if _is_above(entry["condition"]) else 1].remove(entry["target_value"], entry["id"])
+        return entry
+
+
+def _is_above(condition: str) -> bool:
+    return str(condition).endswith("above")
+
+
+def _crossed(pair: tuple[_Thresholds, _Thresholds] | None, value: float) -> list[int]:
+    if pair is None:
+        return []
+    above, below = pair
+    return above.at_or_below(value) + below.at_or_above(value)
+
+
+class AlertIndex:
+    def __init__(
+        self,
+        *,
+        load: Callable[[str], Iterable[dict]],
+        resync_seconds: Callable[[], float] | float = 60.0,
+    ) -> None:
+        self._load = load
+        self._resync_seconds = resync_seconds
+        self._books: dict[str, _Book] = {}
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()
+        # network -> edits made while that network's reload is reading the DB.
+        self._journals: dict[str, list[tuple[str, Any]]] = {}
+        self._stats = {"reloads": 0, "scans": 0, "candidates": 0}
+
+    def _resync_after(self) -> float:
+        value = self._resync_seconds
+        return float(value() if callable(value) else value)
+
+    # -- sync ----------------------------------------------------------------
+
+    def _book(self, network: str) -> _Book:
+        with self._lock:
+            book = self._books.get(network)
+            if book is not None and time.monotonic() - book.loaded_at < self._resync_after():
+                return book
+        self.reload(network)
+        with self._lock:
+            return self._books[network]
+
+    def reload(self, network: str) -> None:
+        """Rebuild ``network``'s book from the DB."""
+        with self._reload_lock:
+            with self._lock:
+                self._journals[network] = []
+            try:
+                rows = list(self._load(network) or [])
+            except Exception:
+                with self._lock:
+                    self._journals.pop(network, None)
+                raise
+            book = _Book()
+            for row in rows:
+                book.add(row)
+            with self._lock:
+                for op, arg in self._journals.pop(network, []):
+                    if op == "add":
+                        book.add(arg)
+                    else:
+                        book.remove(arg)
+                book.loaded_at = time.monotonic()
+                self._books[network] = book
+                self._stats["reloads"] += 1
+
+    def add(self, network: str, alert: dict) -> None:
+        """Index a newly created alert (no-op until the network is first loaded)."""
+        with self._lock:
+            if network in self._journals:
+                self._journals[network].append(("add", dict(alert)))
+            book = self._books.get(network)
+            if book is not None:
+                book.add(alert)
+
+    def remove(self, network: str, alert_id: int) -> None:
+        """Drop a deleted or triggered alert."""
+        with self._lock:
+            if network in self._journals:
+                self._journals[network].append(("remove", int(alert_id)))
+            book = self._books.get(network)
+            if book is not None:
+                book.remove(alert_id)
+
+    def invalidate(self, network: str | None = None) -> None:
+        with self._lock:
+            if network is None:
+                self._books.clear()
+            else:
+                self._books.pop(network, None)
+
+    # -- evaluation ----------------------------------------------------------
+
+    def candidates(
+        self,
+        network: str,
+        prices: dict,
+        funding_rates: dict | None = None,
+        positions_by_user: dict | None = None,
+    ) -> list[tuple[dict, float]]:
+        """``(alert, current_value)`` for every indexed alert the inputs cross.
+
+        Read-only: the caller removes an alert once it has recorded the trigger.
+        """
+        book = self._book(network)
+        out: list[tuple[dict, float]] = []
+        with self._lock:
+            alerts = book.alerts
+            for product, pair in book.price.items():
+                quote = prices.get(product)
+                if not quote:
+                    continue
+                value = quote.get("mid", 0)
+                if value == 0:
+                    continue
+                out.extend((alerts[i], value) for i in _crossed(pair, value))
+            if funding_rates:
+                for product, pair in book.funding.items():
+                    if product not in funding_rates:
+                        continue
+                    value = funding_rates[product]
+                    out.extend((alerts[i], value) for i in _crossed(pair, value))
+            if positions_by_user and book.pnl:
+                for (user_id, product), pair in book.pnl.items():
+                    value = _position_pnl(positions_by_user.get(user_id, []), product)
+                    if value is None:
+                        continue
+                    out.extend((alerts[i], value) for i in _crossed(pair, value))
+            self._stats["scans"] += 1
+            self._stats["candidates"] += len(out)
+        return out
+
+    def context_keys(self, network: str) -> tuple[set[str], set[int]]:
+        """Products with funding alerts and users with PnL alerts, for the tick's fetches."""
+        book = self._book(network)
+        with self._lock:
+            funding = {product for product, (a, b) in book.funding.items() if len(a) or len(b)}
+            users = {user_id for (user_id, _p), (a, b) in book.pnl.items() if len(a) or len(b)}
+        return funding, users
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["alerts"] = sum(len(b.alerts) for b in self._books.values())
+        return out
+
+
+def _position_pnl(positions: list, product: str) -> float | None:
+    for pos in positions:
+        if product_key(pos.get("product_name")) == product:
+            pnl = pos.get("unrealized_pnl")
+            return float(pnl) if pnl is not None else None
+    return None
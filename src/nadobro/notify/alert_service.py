@@ -1,12 +1,24 @@
 import logging
+import time
 from datetime import datetime
+from src.nadobro.models import database as _database
 from src.nadobro.models.database import AlertCondition, insert_alert, get_alerts_by_user, get_alert_by_id_and_user, update_alert, get_all_active_alerts, update_alert_triggered
 from src.nadobro.config import get_product_id, get_product_name
+from src.nadobro.core.feature_flags import alert_index_enabled, alert_index_resync_seconds
+from src.nadobro.core.perf import record_metric
+from src.nadobro.notify.alert_index import AlertIndex, FUNDING_CONDITIONS, PNL_CONDITIONS
 from src.nadobro.users.user_service import get_user
 from src.nadobro.i18n import get_active_language, localize_text
 
 logger = logging.getLogger(__name__)
 
+# Active alerts per network as sorted thresholds; see notify/alert_index.py.
+# The loader resolves through the module so tests can patch the DB read.
+_ALERT_INDEX = AlertIndex(
+    load=lambda network: _database.get_all_active_alerts(network=network),
+    resync_seconds=alert_index_resync_seconds,
+)
+
 
 def _loc(text):
     return localize_text(text, get_active_language())
@@ -55,6 +67,13 @@ def create_alert(telegram_id: int, product: str, condition: str, target_value: f
         return {"success": False, "error": _loc("Database error. Please try again.")}
     if not alert_id:
         return {"success": False, "error": _loc("Failed to create alert.")}
+    _ALERT_INDEX.add(network, {
+        "id": alert_id,
+        "user_id": telegram_id,
+        "product_name": get_product_name(product_id, network=network),
+        "condition": alert_cond,
+        "target_value": target_value,
+    })
 
     return {
         "success": True,
@@ -118,14 +137,70 @@ def delete_alert(telegram_id: int, alert_id: int) -> dict:
     if not alert:
         return {"success": False, "error": _loc("Alert not found.")}
     update_alert(alert_id, is_active=False, network=network)
+    _ALERT_INDEX.remove(network, alert_id)
     return {"success": True, "message": _loc("Alert #{alert_id} deleted.").format(alert_id=alert_id)}
 
 
+def _triggered_row(alert: dict, current_value) -> dict:
+    cond = alert.get("condition")
+    if cond in FUNDING_CONDITIONS:
+        value_type = "funding_rate"
+    elif cond in PNL_CONDITIONS:
+        value_type = "pnl"
+    else:
+        value_type = "price"
+    return {
+        "user_id": alert.get("user_id"),
+        "product": alert.get("product_name"),
+        "condition": cond,
+        "target": float(alert.get("target_value") or 0),
+        "value_type": value_type,
+        "current_value": current_value,
+        # Backwards compatibility for older callers that still read this key.
+        "current_price": current_value,
+    }
+
+
 def get_triggered_alerts(
     prices: dict,
     funding_rates: dict = None,
     positions_by_user: dict = None,
     network: str = None,
+) -> list:
+    """Alerts the current prices / funding / PnL cross, marked triggered in the DB.
+
+    Served from the in-memory threshold index: a tick touches the DB only to
+    mark the alerts that fire (and for the periodic index resync).
+    """
+    if not alert_index_enabled():
+        return _scan_triggered_alerts(prices, funding_rates, positions_by_user, network)
+    started = time.perf_counter()
+    triggered = []
+    for alert_network in ((network,) if network else ("testnet", "mainnet")):
+        candidates = _ALERT_INDEX.candidates(alert_network, prices, funding_rates, positions_by_user)
+        for alert, current_value in candidates:
+            fired = update_alert_triggered(alert["id"], network=alert_network)
+            _ALERT_INDEX.remove(alert_network, alert["id"])
+            if fired:
+                triggered.append(_triggered_row(alert, current_value))
+    record_metric("alerts.scan", (time.perf_counter() - started) * 1000.0)
+    return triggered
+
+
+def get_alert_context_keys(network: str) -> tuple[set[str], set[int]]:
+    """Products with funding alerts and users with PnL alerts in ``network``."""
+    return _ALERT_INDEX.context_keys(network)
+
+
+def get_alert_index_stats() -> dict:
+    return _ALERT_INDEX.stats()
+
+
+def _scan_triggered_alerts(
+    prices: dict,
+    funding_rates: dict = None,
+    positions_by_user: dict = None,
+    network: str = None,
 ) -> list:
     # When `network` is provided, evaluate only alerts in that network's
     # table and use it as the source-of-truth for `update_alert_triggered`.
@@ -191,21 +266,6 @@ def get_triggered_alerts(
             # network table without a `network` column — use the param as
             # source-of-truth so we update the right table.
             alert_network = network or alert.get("network") or "mainnet"
-            update_alert_triggered(alert["id"], network=alert_network)
-            if cond in (AlertCondition.FUNDING_ABOVE.value, AlertCondition.FUNDING_BELOW.value):
-                value_type = "funding_rate"
-            elif cond in (AlertCondition.PNL_ABOVE.value, AlertCondition.PNL_BELOW.value):
-                value_type = "pnl"
-            else:
-                value_type = "price"
-            triggered.append({
-                "user_id": alert.get("user_id"),
-                "product": alert.get("product_name"),
-                "condition": cond,
-                "target": target,
-                "value_type": value_type,
-                "current_value": current_value,
-                # Backwards compatibility for older callers that still read this key.
-                "current_price": current_value,
-            })
+            if update_alert_triggered(alert["id"], network=alert_network):
+                triggered.append(_triggered_row(alert, current_value))
     return triggered
@@ -0,0 +1,158 @@
+"""Durable storage for pending Telegram envelopes.
+
+``TelegramSender`` keeps its lanes in memory. Without a store, anything
+still queued at a deploy or crash is lost. With one bound
+(``TelegramSender.bind_store``):
+
+* each durable envelope is written before ``send_text`` accepts it;
+* it is acked once it reaches a terminal outcome (sent, refused, dropped);
+* whatever is still pending at the next ``start()`` is replayed, in
+  enqueue order.
+
+Delivery is at-least-once: a crash between the Telegram call and the ack
+re-sends that one message.
+
+Two stores share one small async interface (``put`` / ``ack`` / ``pending``):
+
+* :class:`DbOutboxStore` — the ``telegram_outbox`` table. It survives
+  redeploys onto a fresh machine (the default).
+* :class:`OutboxLog` — an append-only JSONL file of ``put`` / ``ack``
+  records, compacted on replay. Local runs only: a Fly machine's disk does
+  not survive a deploy.
+
+``TELEGRAM_OUTBOX`` selects ``db`` / ``file`` / ``off``. Envelopes older than
+``TELEGRAM_OUTBOX_MAX_AGE_SECONDS`` are acked instead of replayed, so a long
+outage does not flush hours-old price alerts.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, Optional, Protocol
+
+from src.nadobro.utils.env import env_float, env_str
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_OUTBOX_MAX_AGE_SECONDS = env_float("TELEGRAM_OUTBOX_MAX_AGE_SECONDS", 6 * 3600.0)
+
+
+class OutboxStore(Protocol):
+    async def put(self, records: list[dict[str, Any]]) -> None: ...
+
+    async def ack(self, entry_ids: list[str]) -> None: ...
+
+    async def pending(self) -> list[dict[str, Any]]: ...
+
+
+def encode_kwargs(kwargs: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """JSON-safe copy of ``send_message`` kwargs, or ``None`` when not persistable.
+
+    ``reply_markup`` objects are stored as their Bot API dict and rebuilt by
+    :func:`decode_kwargs`.
+    """
+    out: dict[str, Any] = {}
+    for key, value in kwargs.items():
+        if key == "reply_markup" and value is not None and hasattr(value, "to_dict"):
+            out[key] = {"__markup__": type(value).__name__, "data": value.to_dict()}
+        else:
+            out[key] = value
+    try:
+        json.dumps(out)
+    except (TypeError, ValueError):
+        return None
+    return out
+
+
+def decode_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+    out = dict(kwargs or {})
+    markup = out.get("reply_markup")
+    if isinstance(markup, dict) and "__markup__" in markup:
+        import telegram
+
+        cls = getattr(telegram, str(markup["__markup__"]), None)
+        out["reply_markup"] = cls.de_json(markup.get("data") or {}, None) if cls is not None else None
+    return out
+
+
+class OutboxLog:
+    """Append-only JSONL outbox; ``pending()`` folds the log and compacts it."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self.appended = 0
+
+    def _append(self, lines: list[dict[str, Any]]) -> None:
+        payload = "".join(json.dumps(line, separators=(",", ":")) + "\n" for line in lines)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(payload)
+            self.appended += len(lines)
+
+    async def put(self, records: list[dict[str, Any]]) -> None:
+        if records:
+            self._append([{"op": "put", **r} for r in records])
+
+    async def ack(self, entry_ids: list[str]) -> None:
+        if entry_ids:
+            self._append([{"op": "ack", "id": i} for i in entry_ids])
+
+    async def pending(self) -> list[dict[str, Any]]:
+        return await asyncio.to_thread(self._fold_and_compact)
+
+    def _fold_and_compact(self) -> list[dict[str, Any]]:
+        with self._lock:
+            if not os.path.exists(self.path):
+                return []
+            live: dict[str, dict[str, Any]] = {}
+            with open(self.path, encoding="utf-8") as fh:
+                for raw in fh:
+                    try:
+                        line = json.loads(raw)
+                    except ValueError:
+                        continue  # torn tail from a crash mid-write
+                    if line.get("op") == "put":
+                        line.pop("op", None)
+                        live[str(line.get("id"))] = line
+                    elif line.get("op") == "ack":
+                        live.pop(str(line.get("id")), None)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                for rec in live.values():
+                    fh.write(json.dumps({"op": "put", **rec}, separators=(",", ":")) + "\n")
+            os.replace(tmp, self.path)
+            return sorted(live.values(), key=lambda r: float(r.get("created_at") or 0))
+
+
+class DbOutboxStore:
+    """``telegram_outbox`` table (migrations/0020_telegram_outbox.sql)."""
+
+    async def put(self, records: list[dict[str, Any]]) -> None:
+        from src.nadobro.models.database import aput_telegram_outbox
+
+        if records:
+            await aput_telegram_outbox(records)
+
+    async def ack(self, entry_ids: list[str]) -> None:
+        from src.nadobro.models.database import aack_telegram_outbox
+
+        if entry_ids:
+            await aack_telegram_outbox(entry_ids)
+
+    async def pending(self) -> list[dict[str, Any]]:
+        from src.nadobro.models.database import alist_telegram_outbox
+
+        return await alist_telegram_outbox()
+
+
+def outbox_store_from_env() -> Optional[OutboxStore]:
+    mode = (env_str("TELEGRAM_OUTBOX", "db") or "db").strip().lower()
+    if mode in ("off", "0", "false", "none", ""):
+        return None
+    if mode == "file":
+        return OutboxLog(env_str("TELEGRAM_OUTBOX_PATH", "telegram_outbox.jsonl") or "telegram_outbox.jsonl")
+    return DbOutboxStore()
@@ -40,11 +40,42 @@ Callers that must not duplicate a message (e.g. order-confirm) can pass
 pending. This is a process-local guard intended for "near-simultaneous"
 duplicates (same lane, same key, within ~30s).
 
+Concurrency
+-----------
+
+:data:`TELEGRAM_SENDER_WORKERS` dispatch tasks drain the lanes together,
+so one slow ``send_message`` round-trip no longer gates every other chat.
+A chat has at most one message in flight, and a worker picks the first
+envelope of a lane whose chat is idle and has a token. Messages for one
+chat therefore leave in lane order while different chats go out in
+parallel, all under the global and per-chat buckets. A 429 keeps its chat
+held until the retry is re-queued, so later messages cannot overtake it.
+
+Durability
+----------
+
+With an outbox store bound (:meth:`TelegramSender.bind_store`, see
+``notify/telegram_outbox``), envelopes on the :data:`TELEGRAM_OUTBOX_LANES`
+lanes are persisted before they are accepted. Each is acked on a terminal
+outcome, and whatever is still pending is replayed by the next
+:meth:`TelegramSender.start`. USER_REPLY stays memory-only: a reply to a
+command typed before a restart is stale by the time it would be replayed.
+
+Broadcasts
+----------
+
+:meth:`TelegramSender.broadcast` enqueues one text for many chats with a
+single outbox write. It waits for lane room instead of evicting, so
+thousands of recipients drain at the global rate rather than serially.
+
 Observability
 -------------
 
-The sender records SLI samples ``telegram.send`` per (lane, outcome)
-and counters ``telegram.dropped`` per lane when items are evicted.
+The sender records SLI samples ``telegram.send`` per (lane, outcome) and
+``telegram.queue_age`` per lane (enqueue to dispatch). It also keeps
+counters ``telegram.sent`` and ``telegram.dropped`` per lane.
+:meth:`TelegramSender.stats` reports per-lane depth, oldest-item age and
+60-second throughput.
 """
 from __future__ import annotations
 
@@ -52,13 +83,20 @@ import asyncio
 import enum
 import logging
 import time
+import uuid
 from collections import deque
 from dataclasses import dataclass, field
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Iterable, Optional
 
-from src.nadobro.utils.env import env_float, env_int
+from src.nadobro.utils.env import env_float, env_int, env_str
 from src.nadobro.core import sli
 from src.nadobro.core.bounded_cache import LRUCache
+from src.nadobro.notify.telegram_outbox import (
+    TELEGRAM_OUTBOX_MAX_AGE_SECONDS,
+    OutboxStore,
+    decode_kwargs,
+    encode_kwargs,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +117,13 @@ TELEGRAM_LANE_CAPACITY: dict[str, int] = {
 TELEGRAM_PER_CHAT_BUCKETS_MAX = env_int("TELEGRAM_PER_CHAT_BUCKETS_MAX", 8192)
 TELEGRAM_DEDUPE_TTL_SECONDS = env_float("TELEGRAM_DEDUPE_TTL_SECONDS", 30.0)
 TELEGRAM_MAX_RETRY_AFTER = env_float("TELEGRAM_MAX_RETRY_AFTER", 20.0)
+TELEGRAM_SENDER_WORKERS = max(1, env_int("TELEGRAM_SENDER_WORKERS", 8))
+# How far past a lane's head a worker looks for an idle chat.
+TELEGRAM_SCAN_DEPTH = max(1, env_int("TELEGRAM_SCAN_DEPTH", 256))
+TELEGRAM_OUTBOX_LANES = frozenset(
+    part.strip() for part in (env_str("TELEGRAM_OUTBOX_LANES", "order,alert,info") or "").split(",") if part.strip()
+)
+_THROUGHPUT_WINDOW_SECONDS = 60.0
 
 
 class Lane(str, enum.Enum):
@@ -128,6 +173,15 @@ class _TokenBucket:
         needed = n - self.tokens
         return False, needed / self.rps if self.rps > 0 else 1.0
 
+    def peek(self, n: float = 1.0) -> tuple[bool, float]:
+        """``try_consume`` without spending: can ``n`` tokens go out now?"""
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= n:
+            return True, 0.0
+        needed = n - self.tokens
+        return False, needed / self.rps if self.rps > 0 else 1.0
+
 
 # ---------------------------------------------------------------------------
 # Pending message envelope.
@@ -141,6 +195,23 @@ class _Envelope:
     kwargs: dict[str, Any]
     dedupe_key: Optional[str] = None
     future: Optional["asyncio.Future[bool]"] = None
+    # Set once the envelope is persisted in the outbox; acked on a terminal outcome.
+    entry_id: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+
+    def outbox_record(self) -> Optional[dict[str, Any]]:
+        kwargs = encode_kwargs(self.kwargs)
+        if kwargs is None:
+            return None
+        return {
+            "id": self.entry_id,
+            "chat_id": self.chat_id,
+            "lane": self.lane.value,
+            "text": self.text,
+            "kwargs": kwargs,
+            "dedupe_key": self.dedupe_key,
+            "created_at": self.created_at,
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -149,7 +220,7 @@ class _Envelope:
 class TelegramSender:
     """Singleton-style sender. Use :func:`get_sender` to access."""
 
-    def __init__(self) -> None:
+    def __init__(self, workers: int = TELEGRAM_SENDER_WORKERS) -> None:
         self._lanes: dict[Lane, deque[_Envelope]] = {lane: deque() for lane in Lane}
         self._lane_caps: dict[Lane, int] = {
             lane: TELEGRAM_LANE_CAPACITY.get(lane.value, 1000) for lane in Lane
@@ -163,14 +234,25 @@ class TelegramSender:
         )
         self._cv = asyncio.Condition()
         self._bot_callable: Optional[Callable[..., Any]] = None
-        self._worker_task: Optional[asyncio.Task[None]] = None
+        self._store: Optional[OutboxStore] = None
+        self._workers = max(1, int(workers))
+        self._worker_tasks: list[asyncio.Task[None]] = []
+        # Pending 429 re-queues (sleeping out ``retry_after``); cancelled on stop.
+        self._retry_tasks: set[asyncio.Task[None]] = set()
+        self._inflight_chats: set[int] = set()
         self._running = False
         self._stats = {
             "sent": 0,
             "dropped": 0,
             "retried": 0,
             "failed": 0,
+            "replayed": 0,
+            "outbox_errors": 0,
         }
+        self._lane_stats: dict[Lane, dict[str, int]] = {
+            lane: {"sent": 0, "failed": 0, "dropped": 0, "retried": 0} for lane in Lane
+        }
+        self._lane_sent_at: dict[Lane, deque[float]] = {lane: deque() for lane in Lane}
 
     def bind(self, bot_callable: Callable[..., Any]) -> None:
         """Bind the PTB ``bot.send_message`` (or compatible) callable.
@@ -179,26 +261,40 @@ class TelegramSender:
         """
         self._bot_callable = bot_callable
 
+    def bind_store(self, store: Optional[OutboxStore]) -> None:
+        """Bind the durable outbox; must happen before :meth:`start` to replay."""
+        self._store = store
+
     def is_bound(self) -> bool:
         return self._bot_callable is not None
 
+    def is_running(self) -> bool:
+        return self._running
+
     async def start(self) -> None:
         if self._running:
             return
         if not self._bot_callable:
             raise RuntimeError("TelegramSender.bind() must be called before start()")
         self._running = True
-        self._worker_task = asyncio.create_task(self._worker_loop(), name="telegram-sender")
+        await self._replay()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker_loop(i), name=f"telegram-sender-{i}")
+            for i in range(self._workers)
+        ]
 
     async def stop(self) -> None:
         self._running = False
         async with self._cv:
             self._cv.notify_all()
-        if self._worker_task is not None:
-            try:
-                await asyncio.wait_for(self._worker_task, timeout=5.0)
-            except asyncio.TimeoutError:
-                self._worker_task.cancel()
+        for retry in list(self._retry_tasks):
+            retry.cancel()
+        tasks, self._worker_tasks = self._worker_tasks, []
+        if not tasks:
+            return
+        _done, pending = await asyncio.wait(tasks, timeout=5.0)
+        for task in pending:
+            task.cancel()
 
     # -- Public send API ---------------------------------------------------
 
@@ -222,8 +318,12 @@ class TelegramSender:
         """
         if not text:
             return False
-        if dedupe_key and self._dedupe.get(dedupe_key) is not None:
-            return False
+        if dedupe_key:
+            if self._dedupe.get(dedupe_key) is not None:
+                return False
+            # Reserve the key before the first await so concurrent sends with
+            # the same key cannot all pass the check; released if refused.
+            self._dedupe.set(dedupe_key, time.monotonic())
         env = _Envelope(
             chat_id=int(chat_id),
             text=text,
@@ -234,41 +334,169 @@ class TelegramSender:
         )
         if await_result:
             env.future = asyncio.get_running_loop().create_future()
-        async with self._cv:
-            cap = self._lane_caps[lane]
-            queue = self._lanes[lane]
-            if len(queue) >= cap:
-                # Drop oldest INFO/ALERT; refuse USER_REPLY/ORDER.
-                if lane in (Lane.INFO, Lane.ALERT):
-                    dropped = queue.popleft()
-                    self._stats["dropped"] += 1
-                    sli.increment("telegram.dropped", lane=lane.value)
-                    if dropped.future and not dropped.future.done():
-                        dropped.future.set_result(False)
-                else:
-                    self._stats["dropped"] += 1
-                    sli.increment("telegram.dropped", lane=lane.value)
-                    if env.future is not None:
-                        env.future.set_result(False)
-                    return False
-            queue.append(env)
+        try:
+            await self._persist([env])
+            async with self._cv:
+                accepted, evicted = self._enqueue_locked(env)
+        except BaseException:
             if dedupe_key:
-                self._dedupe.set(dedupe_key, time.monotonic())
-            self._cv.notify()
+                self._dedupe.pop(dedupe_key)
+            raise
+        if not accepted and dedupe_key:
+            self._dedupe.pop(dedupe_key)
+        await self._ack(evicted if accepted else [*evicted, env])
+        if not accepted:
+            return False
         if env.future is None:
             return True
         return await env.future
 
+    async def broadcast(
+        self,
+        chat_ids: Iterable[int],
+        text: str,
+        *,
+        lane: Lane = Lane.INFO,
+        **kwargs: Any,
+    ) -> int:
+        """Enqueue ``text`` once per distinct chat; returns how many were accepted.
+
+        One outbox write covers the whole batch. When the lane is full this
+        waits for the workers to make room instead of evicting queued items.
+        """
+        if not text:
+            return 0
+        now = time.monotonic()
+        envs = [
+            _Envelope(chat_id=cid, text=text, lane=lane, enqueued_at=now, kwargs=dict(kwargs))
+            for cid in dict.fromkeys(int(c) for c in chat_ids)
+        ]
+        await self._persist(envs)
+        accepted = 0
+        evicted: list[_Envelope] = []
+        queue = self._lanes[lane]
+        cap = self._lane_caps[lane]
+        for env in envs:
+            async with self._cv:
+                while self._running and self._worker_tasks and len(queue) >= cap:
+                    await self._cv.wait()
+                ok, dropped = self._enqueue_locked(env)
+            evicted.extend(dropped if ok else [*dropped, env])
+            accepted += int(ok)
+        await self._ack(evicted)
+        return accepted
+
+    def _enqueue_locked(self, env: _Envelope) -> tuple[bool, list[_Envelope]]:
+        """Append ``env`` to its lane; returns ``(accepted, evicted)``."""
+        lane = env.lane
+        queue = self._lanes[lane]
+        evicted: list[_Envelope] = []
+        if len(queue) >= self._lane_caps[lane]:
+            # Drop oldest INFO/ALERT; refuse USER_REPLY/ORDER.
+            self._stats["dropped"] += 1
+            self._lane_stats[lane]["dropped"] += 1
+            sli.increment("telegram.dropped", lane=lane.value)
+            if lane in (Lane.INFO, Lane.ALERT):
+                dropped = queue.popleft()
+                evicted.append(dropped)
+                if dropped.future and not dropped.future.done():
+                    dropped.future.set_result(False)
+            else:
+                if env.future is not None:
+                    env.future.set_result(False)
+                return False, evicted
+        queue.append(env)
+        self._cv.notify_all()
+        return True, evicted
+
+    # -- Outbox ------------------------------------------------------------
+
+    async def _persist(self, envs: list[_Envelope]) -> None:
+        if self._store is None:
+            return
+        records = []
+        for env in envs:
+            if env.lane.value not in TELEGRAM_OUTBOX_LANES:
+                continue
+            env.entry_id = uuid.uuid4().hex
+            record = env.outbox_record()
+            if record is None:
+                env.entry_id = None
+                continue
+            records.append(record)
+        if not records:
+            return
+        try:
+            await self._store.put(records)
+        except Exception as exc:  # noqa: BLE001 - an outbox outage must not stop delivery
+            self._stats["outbox_errors"] += 1
+            logger.warning("telegram outbox write failed (%d envelope(s) memory-only): %s", len(records), exc)
+            for env in envs:
+                env.entry_id = None
+
+    async def _ack(self, envs: list[_Envelope]) -> None:
+        ids = [env.entry_id for env in envs if env.entry_id]
+        if self._store is None or not ids:
+            return
+        try:
+            await self._store.ack(ids)
+        except Exception as exc:  # noqa: BLE001 - worst case the envelope is replayed once
+            self._stats["outbox_errors"] += 1
+            logger.warning("telegram outbox ack failed for %d envelope(s): %s", len(ids), exc)
+
+    async def _replay(self) -> None:
+        if self._store is None:
+            return
+        try:
+            rows = await self._store.pending()
+        except Exception as exc:  # noqa: BLE001
+            self._stats["outbox_errors"] += 1
+            logger.warning("telegram outbox replay failed: %s", exc)
+            return
+        now_wall, now_mono = time.time(), time.monotonic()
+        stale: list[_Envelope] = []
+        replayed = 0
+        for row in rows:
+            created = float(row.get("created_at") or now_wall)
+            try:
+                env = _Envelope(
+                    chat_id=int(row["chat_id"]),
+                    text=str(row["text"]),
+                    lane=Lane(str(row["lane"])),
+                    enqueued_at=now_mono - max(0.0, now_wall - created),
+                    kwargs=decode_kwargs(row.get("kwargs") or {}),
+                    dedupe_key=row.get("dedupe_key"),
+                    entry_id=str(row["id"]),
+                    created_at=created,
+                )
+            except Exception as exc:  # noqa: BLE001 - one bad row must not block the rest
+                logger.warning("telegram outbox row %s unreadable, discarding: %s", row.get("id"), exc)
+                stale.append(_Envelope(0, "", Lane.INFO, now_mono, {}, entry_id=str(row.get("id"))))
+                continue
+            if now_wall - created > TELEGRAM_OUTBOX_MAX_AGE_SECONDS:
+                stale.append(env)
+                continue
+            async with self._cv:
+                ok, evicted = self._enqueue_locked(env)
+            stale.extend(evicted if ok else [*evicted, env])
+            replayed += int(ok)
+        await self._ack(stale)
+        self._stats["replayed"] += replayed
+        if rows:
+            logger.info("telegram outbox replayed %d envelope(s), discarded %d", replayed, len(stale))
+
     # -- Worker loop -------------------------------------------------------
 
-    async def _worker_loop(self) -> None:
-        logger.info(
-            "TelegramSender started global=%.1f rps burst=%.1f per_chat=%.1f rps burst=%.1f",
-            TELEGRAM_GLOBAL_RPS,
-            TELEGRAM_GLOBAL_BURST,
-            TELEGRAM_CHAT_RPS,
-            TELEGRAM_CHAT_BURST,
-        )
+    async def _worker_loop(self, index: int = 0) -> None:
+        if index == 0:
+            logger.info(
+                "TelegramSender started workers=%d global=%.1f rps burst=%.1f per_chat=%.1f rps burst=%.1f",
+                self._workers,
+                TELEGRAM_GLOBAL_RPS,
+                TELEGRAM_GLOBAL_BURST,
+                TELEGRAM_CHAT_RPS,
+                TELEGRAM_CHAT_BURST,
+            )
         while self._running:
             env = await self._next_eligible()
             if env is None:
@@ -283,7 +511,7 @@ class TelegramSender:
                 if env is not None:
                     return env
                 if wait_for is None:
-                    # Nothing queued.
+                    # Nothing queued, or every queued chat already has a send in flight.
                     await self._cv.wait()
                     continue
                 # Throttled — sleep outside the lock so producers can enqueue.
@@ -294,46 +522,64 @@ class TelegramSender:
                     continue
         return None
 
+    def _chat_bucket(self, chat_id: int) -> _TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = _TokenBucket(rps=TELEGRAM_CHAT_RPS, burst=TELEGRAM_CHAT_BURST)
+            self._chat_buckets.set(chat_id, bucket)
+        return bucket
+
     def _pick_eligible_locked(self) -> tuple[Optional[_Envelope], Optional[float]]:
-        """Find the highest-priority message whose chat bucket has tokens.
+        """Find the highest-priority message whose chat is idle and has a token.
 
-        If no message is eligible, return the shortest required wait time
-        across the candidate messages so the caller can sleep efficiently.
+        Within a lane, a chat whose earlier envelope was passed over (busy or
+        throttled) is held for the rest of the scan, so its messages never
+        overtake each other. If nothing is eligible, return the shortest
+        token wait so the caller can sleep efficiently (``None`` when only
+        in-flight chats are blocking; their completion wakes the workers).
         """
         min_wait: Optional[float] = None
-        any_queued = False
         for lane in (Lane.USER_REPLY, Lane.ORDER, Lane.ALERT, Lane.INFO):
             queue = self._lanes[lane]
             if not queue:
                 continue
-            any_queued = True
-            env = queue[0]
-            # Check global bucket.
-            ok_g, wait_g = self._global.try_consume(0.0)
-            # Pre-check chat bucket without consuming.
-            chat_bucket = self._chat_buckets.get(env.chat_id)
-            if chat_bucket is None:
-                chat_bucket = _TokenBucket(rps=TELEGRAM_CHAT_RPS, burst=TELEGRAM_CHAT_BURST)
-                self._chat_buckets.set(env.chat_id, chat_bucket)
-            # Actual consume only if both buckets have headroom.
-            chat_ok, chat_wait = chat_bucket.try_consume(0.0)
-            ok_g, wait_g = self._global.try_consume(1.0) if chat_ok else (False, wait_g)
-            if ok_g and chat_ok:
-                # We "spent" a global token; spend the chat token too.
-                chat_bucket.try_consume(1.0)
-                queue.popleft()
+            held: set[int] = set()
+            for idx, env in enumerate(queue):
+                if idx >= TELEGRAM_SCAN_DEPTH:
+                    break
+                chat = env.chat_id
+                if chat in held or chat in self._inflight_chats:
+                    held.add(chat)
+                    continue
+                bucket = self._chat_bucket(chat)
+                chat_ok, chat_wait = bucket.peek()
+                if not chat_ok:
+                    held.add(chat)
+                    min_wait = chat_wait if min_wait is None else min(min_wait, chat_wait)
+                    continue
+                ok_g, wait_g = self._global.try_consume(1.0)
+                if not ok_g:
+                    # The global budget is spent: nothing else can go out either.
+                    return None, wait_g if min_wait is None else min(min_wait, wait_g)
+                bucket.try_consume(1.0)
+                del queue[idx]
+                self._inflight_chats.add(chat)
                 return env, None
-            # Roll back the global token if chat starved us.
-            if ok_g and not chat_ok:
-                self._global.tokens = min(self._global.burst, self._global.tokens + 1.0)
-            candidate_wait = max(wait_g, chat_wait)
-            min_wait = candidate_wait if min_wait is None else min(min_wait, candidate_wait)
-        if not any_queued:
-            return None, None
         return None, min_wait
 
+    async def _release(self, chat_id: int, requeue: Optional[_Envelope] = None) -> None:
+        async with self._cv:
+            if requeue is not None:
+                self._lanes[requeue.lane].appendleft(requeue)
+            self._inflight_chats.discard(chat_id)
+            self._cv.notify_all()
+
     async def _dispatch(self, env: _Envelope) -> None:
         started = time.perf_counter()
+        lane = env.lane
+        sli.record_latency(
+            "telegram.queue_age", (time.monotonic() - env.enqueued_at) * 1000.0, lane=lane.value
+        )
         delivered = False
         outcome = "ok"
         retried = False
@@ -341,47 +587,79 @@ class TelegramSender:
             assert self._bot_callable is not None
             await self._bot_callable(chat_id=env.chat_id, text=env.text, **env.kwargs)
             self._stats["sent"] += 1
+            self._lane_stats[lane]["sent"] += 1
+            self._note_sent(lane)
+            sli.increment("telegram.sent", lane=lane.value)
             delivered = True
         except Exception as exc:
             outcome = "error"
             retry_after = _extract_retry_after(exc)
             if retry_after is not None and retry_after <= TELEGRAM_MAX_RETRY_AFTER:
                 self._stats["retried"] += 1
+                self._lane_stats[lane]["retried"] += 1
                 retried = True
                 logger.warning(
                     "telegram 429 chat=%s lane=%s retry_after=%.2fs",
-                    env.chat_id, env.lane.value, retry_after,
+                    env.chat_id, lane.value, retry_after,
                 )
 
                 async def _requeue() -> None:
+                    # The chat stays in flight until the retry is back at the
+                    # head of its lane, so later messages cannot overtake it.
                     await asyncio.sleep(retry_after)
-                    async with self._cv:
-                        self._lanes[env.lane].appendleft(env)
-                        self._cv.notify()
+                    await self._release(env.chat_id, requeue=env)
 
-                asyncio.create_task(_requeue())
+                task = asyncio.create_task(_requeue())
+                self._retry_tasks.add(task)
+                task.add_done_callback(self._retry_tasks.discard)
             else:
                 self._stats["failed"] += 1
+                self._lane_stats[lane]["failed"] += 1
                 logger.warning(
                     "telegram send failed chat=%s lane=%s err=%s",
-                    env.chat_id, env.lane.value, exc,
+                    env.chat_id, lane.value, exc,
                 )
         finally:
             elapsed_ms = (time.perf_counter() - started) * 1000.0
-            sli.record_latency("telegram.send", elapsed_ms, lane=env.lane.value, outcome=outcome)
+            sli.record_latency("telegram.send", elapsed_ms, lane=lane.value, outcome=outcome)
             # Only finalize the caller's future on terminal outcomes
             # (success or non-retryable failure). Retried envelopes will
             # be re-dispatched and may still succeed.
-            if not retried and env.future is not None and not env.future.done():
-                env.future.set_result(delivered)
+            if not retried:
+                await self._release(env.chat_id)
+                await self._ack([env])
+                if env.future is not None and not env.future.done():
+                    env.future.set_result(delivered)
 
     # -- Diagnostics -------------------------------------------------------
 
+    def _note_sent(self, lane: Lane) -> None:
+        now = time.monotonic()
+        sent_at = self._lane_sent_at[lane]
+        sent_at.append(now)
+        while sent_at and now - sent_at[0] > _THROUGHPUT_WINDOW_SECONDS:
+            sent_at.popleft()
+
     def stats(self) -> dict[str, Any]:
+        now = time.monotonic()
         lanes = {lane.value: len(queue) for lane, queue in self._lanes.items()}
+        lane_metrics = {}
+        for lane, queue in self._lanes.items():
+            sent_at = self._lane_sent_at[lane]
+            recent = sum(1 for t in sent_at if now - t <= _THROUGHPUT_WINDOW_SECONDS)
+            lane_metrics[lane.value] = {
+                "depth": len(queue),
+                "oldest_age_s": round(now - min(e.enqueued_at for e in queue), 2) if queue else 0.0,
+                "throughput_per_s": round(recent / _THROUGHPUT_WINDOW_SECONDS, 3),
+                **self._lane_stats[lane],
+            }
         return {
             "lanes": lanes,
+            "lane_metrics": lane_metrics,
             **self._stats,
+            "workers": len(self._worker_tasks),
+            "inflight_chats": len(self._inflight_chats),
+            "durable": self._store is not None,
             "global_tokens": round(self._global.tokens, 2),
             "chat_buckets": self._chat_buckets.stats(),
         }
@@ -422,10 +700,29 @@ async def send_priority(chat_id: int, text: str, lane: Lane, **kwargs: Any) -> b
     return await get_sender().send_text(chat_id, text, lane=lane, **kwargs)
 
 
+async def broadcast(chat_ids: Iterable[int], text: str, *, lane: Lane = Lane.INFO, **kwargs: Any) -> int:
+    return await get_sender().broadcast(chat_ids, text, lane=lane, **kwargs)
+
+
+async def deliver(bot: Any, chat_id: int, text: str, *, lane: Lane, **kwargs: Any) -> bool:
+    """Queue through the sender when it is running, else call ``bot.send_message``.
+
+    Background notifiers use this, so they keep working in processes (and
+    tests) that never started the sender.
+    """
+    sender = get_sender()
+    if sender.is_running():
+        return await sender.send_text(chat_id, text, lane=lane, **kwargs)
+    await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+    return True
+
+
 __all__ = (
     "Lane",
     "TelegramSender",
     "get_sender",
     "send_text",
     "send_priority",
+    "broadcast",
+    "deliver",
 )
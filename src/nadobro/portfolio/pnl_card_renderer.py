@@ -0,0 +1,199 @@
+"""Off-loop PnL card rendering.
+
+Rendering a share card is CPU work (compositing plus image encoding). Run on
+the misc thread pool it held the GIL for most of a second per card and stalled
+the event loop for every other user. This service renders in a dedicated
+process pool instead:
+
+- each worker pre-builds the static card layers and fonts once, in the pool
+  initializer, so a render only draws the trade's own numbers;
+- cards are encoded as high-quality JPEG by default. Telegram recompresses
+  uploaded photos to JPEG anyway, and PNG encoding was most of the old cost.
+  ``NADO_PNL_CARD_FORMAT=png`` restores the lossless upload;
+- admission is bounded. Once ``workers + NADO_PNL_CARD_QUEUE`` cards are in
+  flight, ``render_card_async`` raises ``CardRenderBusy`` so the handler can ask
+  the user to retry instead of queueing unbounded CPU work.
+
+``NADO_PNL_CARD_WORKERS=0`` renders on the misc thread pool (same output, no
+child processes). A broken pool falls back to that path for the call and is
+rebuilt on the next one.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from src.nadobro.core.async_utils import run_blocking
+from src.nadobro.core.feature_flags import (
+    pnl_card_format,
+    pnl_card_queue_size,
+    pnl_card_workers,
+)
+from src.nadobro.core.perf import increment_counter, record_metric
+
+logger = logging.getLogger(__name__)
+
+CARD_KINDS = ("a", "b")
+
+
+class CardRenderBusy(RuntimeError):
+    """Raised when the render queue is full; the caller should ask for a retry."""
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_inflight = 0
+_stats: Dict[str, int] = {
+    "rendered": 0,
+    "rejected": 0,
+    "fallbacks": 0,
+    "pool_starts": 0,
+}
+
+
+# -- worker side --------------------------------------------------------------
+
+
+def _renderer(kind: str):
+    if kind == "a":
+        from src.nadobro.portfolio.pnl_card_type_a import render_type_a
+
+        return render_type_a
+    if kind == "b":
+        from src.nadobro.portfolio.pnl_card_type_b import render_type_b
+
+        return render_type_b
+    raise ValueError(f"unknown PnL card kind: {kind!r}")
+
+
+def _warm() -> None:
+    """Pool initializer: build both static layers of both card types."""
+    from src.nadobro.portfolio import pnl_card_type_a, pnl_card_type_b
+
+    for positive in (True, False):
+        pnl_card_type_a._static_layer(positive)
+        pnl_card_type_b._static_layer(positive)
+
+
+def _ping() -> bool:
+    return True
+
+
+def render_card(kind: str, data: dict, fmt: str = "jpeg") -> Tuple[bytes, float]:
+    """Render one card to encoded bytes; returns ``(bytes, render_ms)``.
+
+    Runs inside a pool worker (or the misc thread pool when workers are off).
+    """
+    started = time.perf_counter()
+    image = _renderer(kind)(data).convert("RGB")
+    out = io.BytesIO()
+    if fmt == "png":
+        image.save(out, format="PNG")
+    else:
+        image.save(out, format="JPEG", quality=95, subsampling=0)
+    return out.getvalue(), (time.perf_counter() - started) * 1000.0
+
+
+# -- service side -------------------------------------------------------------
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    workers = pnl_card_workers()
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # Spawn, not fork: the bot process runs many threads (DB pools,
+            # write-behind flushers) and forking it is not safe.
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm,
+            )
+            _stats["pool_starts"] += 1
+        return _pool
+
+
+def start_card_renderer() -> None:
+    """Start the worker pool and warm every worker in the background."""
+    pool = _get_pool()
+    if pool is None:
+        logger.info("PnL card renderer running in-thread (NADO_PNL_CARD_WORKERS=0)")
+        return
+    for _ in range(pnl_card_workers()):
+        pool.submit(_ping)
+    logger.info("PnL card renderer started with %s workers", pnl_card_workers())
+
+
+def shutdown_card_renderer() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def render_card_async(kind: str, data: dict) -> bytes:
+    """Render a card off the event loop; raises ``CardRenderBusy`` when full."""
+    global _inflight
+    if kind not in CARD_KINDS:
+        raise ValueError(f"unknown PnL card kind: {kind!r}")
+    capacity = max(1, pnl_card_workers()) + pnl_card_queue_size()
+    with _pool_lock:
+        if _inflight >= capacity:
+            _stats["rejected"] += 1
+            increment_counter("pnl_card.rejected")
+            raise CardRenderBusy(f"{_inflight} PnL cards already rendering")
+        _inflight += 1
+    started = time.perf_counter()
+    fmt = pnl_card_format()
+    try:
+        pool = _get_pool()
+        if pool is None:
+            payload, render_ms = await run_blocking(render_card, kind, data, fmt)
+        else:
+            try:
+                payload, render_ms = await asyncio.wrap_future(pool.submit(render_card, kind, data, fmt))
+            except BrokenProcessPool:
+                logger.warning("PnL card pool broke; rendering in-thread and rebuilding", exc_info=True)
+                _discard_pool(pool)
+                with _pool_lock:
+                    _stats["fallbacks"] += 1
+                payload, render_ms = await run_blocking(render_card, kind, data, fmt)
+    finally:
+        with _pool_lock:
+            _inflight -= 1
+    total_ms = (time.perf_counter() - started) * 1000.0
+    record_metric("pnl_card.render", total_ms)
+    record_metric(f"pnl_card.render.type_{kind}", render_ms)
+    record_metric("pnl_card.queue_wait", max(0.0, total_ms - render_ms))
+    with _pool_lock:
+        _stats["rendered"] += 1
+    return payload
+
+
+def card_renderer_stats() -> Dict[str, Any]:
+    with _pool_lock:
+        out: Dict[str, Any] = dict(_stats)
+        out["inflight"] = _inflight
+        out["pool_running"] = _pool is not None
+    out["workers"] = pnl_card_workers()
+    out["queue_size"] = pnl_card_queue_size()
+    out["format"] = pnl_card_format()
+    return out
@@ -5,13 +5,17 @@ onto the master Type A artwork (miner background for a loss, trophy for a
 gain), matching ``assets/cards/Master {positive,negative} pnl.png`` exactly.
 
 Type B (strategy sessions) is a separate renderer — this module only handles
-the per-trade History cards.
+the per-trade History cards. Everything that does not depend on the trade
+(background, border, header, labels, divider) is composited once per sign by
+``_static_layer``; fonts and token icons are LRU-cached. ``pnl_card_renderer``
+is the off-loop service the bot calls.
 """
 from __future__ import annotations
 
 import io
 import logging
 from decimal import Decimal
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -73,6 +77,7 @@ _REG_CHAIN = (
 )
 
 
+@lru_cache(maxsize=32)
 def _font(size: int, bold: bool = True, semibold: bool = False) -> ImageFont.FreeTypeFont:
     chain = _SEMIBOLD_CHAIN if semibold else (_BOLD_CHAIN if bold else _REG_CHAIN)
     for p in chain:
@@ -90,6 +95,7 @@ def _text_w(draw: ImageDraw.ImageDraw, text: str, font) -> int:
 
 # ── helpers ─────────────────────────────────────────────────────
 
+@lru_cache(maxsize=4)
 def _load_logo(px: int) -> Optional[Image.Image]:
     for cand in _LOGO_CANDIDATES:
         if not cand.exists():
@@ -107,7 +113,9 @@ def _load_logo(px: int) -> Optional[Image.Image]:
     return None
 
 
+@lru_cache(maxsize=128)
 def _load_icon(symbol: str, px: int) -> Optional[Image.Image]:
+    """Shared, read-only: callers only ever ``alpha_composite`` it."""
     if not symbol:
         return None
     cand = _ICONS / f"{symbol.upper()}.png"
@@ -181,18 +189,16 @@ def _gift_icon(
 
 # ── main ────────────────────────────────────────────────────────
 
-def generate_type_a_card(data: dict) -> bytes:
-    """Render a Type A PnL card to PNG bytes.
+_PROW_Y0, _PROW_Y1 = 274, 366
+_STAT_COLUMNS = ((95, "Entry Price"), (402, "Exit Price"), (712, "Size"))
 
-    Expected ``data`` keys: badge, product, base_symbol, side, leverage, pnl
-    (signed float), entry_price, exit_price, size (base float), referral_code.
-    """
-    pnl = float(data.get("pnl") or 0.0)
-    positive = pnl >= 0
-    accent = _GREEN if positive else _RED
 
-    bg_path = _BG[positive]
-    canvas = Image.open(bg_path).convert("RGBA")
+@lru_cache(maxsize=2)
+def _static_layer(positive: bool) -> Image.Image:
+    """Background + every trade-independent element for one sign. Treat as
+    read-only; ``render_type_a`` draws on a copy."""
+    accent = _GREEN if positive else _RED
+    canvas = Image.open(_BG[positive]).convert("RGBA")
     W, H = canvas.size
     draw = ImageDraw.Draw(canvas)
 
@@ -216,6 +222,34 @@ def generate_type_a_card(data: dict) -> bytes:
         draw.text((wx, wy), ch, font=word_font, fill=_WHITE)
         wx += _text_w(draw, ch, word_font) + 8
 
+    # ── product row outline (icon/symbol drawn per trade) ───────
+    draw.rounded_rectangle((76, _PROW_Y0, 690, _PROW_Y1), radius=22,
+                           outline=_BOX_OUTLINE, width=2)
+
+    # ── Realized PnL label ──────────────────────────────────────
+    draw.text((92, 396), "Realized PnL", font=_font(36, bold=False), fill=_MUTED)
+
+    # ── divider ─────────────────────────────────────────────────
+    dy = 606
+    draw.line((95, dy, 858, dy), fill=accent, width=4)
+    draw.ellipse((858, dy - 7, 872, dy + 7), fill=accent)
+
+    # ── stat labels ─────────────────────────────────────────────
+    lbl_font = _font(30, bold=False)
+    for cx, label in _STAT_COLUMNS:
+        draw.text((cx, 634), label, font=lbl_font, fill=_MUTED)
+    return canvas
+
+
+def render_type_a(data: dict) -> Image.Image:
+    """Draw one trade's stats onto a copy of the cached static layer (RGBA)."""
+    pnl = float(data.get("pnl") or 0.0)
+    positive = pnl >= 0
+    accent = _GREEN if positive else _RED
+
+    canvas = _static_layer(positive).copy()
+    draw = ImageDraw.Draw(canvas)
+
     # ── badge pill (COPY TRADE / DESK TRADE) ────────────────────
     badge = str(data.get("badge") or "TRADE").upper()
     badge_font = _font(34, bold=True)
@@ -226,11 +260,9 @@ def generate_type_a_card(data: dict) -> bytes:
     _bt = _RED_TEXT if not positive else _GREEN_TEXT
     draw.text((88 + bpad_x, by + (bh - 34) // 2 - 2), badge, font=badge_font, fill=_bt)
 
-    # ── product row: outlined box + token icon + symbol ─────────
-    prow_y0, prow_y1 = 274, 366
-    draw.rounded_rectangle((76, prow_y0, 690, prow_y1), radius=22,
-                           outline=_BOX_OUTLINE, width=2)
-    icon = _load_icon(str(data.get("base_symbol") or ""), 66)
+    # ── product row: token icon + symbol ────────────────────────
+    prow_y0, prow_y1 = _PROW_Y0, _PROW_Y1
+    icon = _load_icon(str(data.get("base_symbol") or "").upper(), 66)
     sym_x = 112
     if icon is not None:
         canvas.alpha_composite(icon, (110, prow_y0 + (prow_y1 - prow_y0 - 66) // 2))
@@ -249,7 +281,6 @@ def generate_type_a_card(data: dict) -> bytes:
         pill_x0, pill_x1 = 716, 940
         draw.rounded_rectangle((pill_x0, prow_y0 + 2, pill_x1, prow_y1 - 2),
                                radius=24, outline=accent, width=2)
-        inner = side + ("  " + lev if lev else "")
         tw = _text_w(draw, side, side_font) + (_text_w(draw, "  " + lev, lev_font) if lev else 0)
         tx = pill_x0 + ((pill_x1 - pill_x0) - tw) // 2
         ty = prow_y0 + (prow_y1 - prow_y0 - 40) // 2 - 2
@@ -259,26 +290,17 @@ def generate_type_a_card(data: dict) -> bytes:
                        ty + 6), lev, font=lev_font, fill=_WHITE)
 
     # ── Realized PnL ────────────────────────────────────────────
-    draw.text((92, 396), "Realized PnL", font=_font(36, bold=False), fill=_MUTED)
     pnl_font = _font(118, bold=True)
     draw.text((88, 446), _fmt_signed_dollar(pnl), font=pnl_font, fill=accent)
 
-    # ── divider ─────────────────────────────────────────────────
-    dy = 606
-    draw.line((95, dy, 858, dy), fill=accent, width=4)
-    draw.ellipse((858, dy - 7, 872, dy + 7), fill=accent)
-
     # ── stats: Entry / Exit / Size ──────────────────────────────
-    lbl_font = _font(30, bold=False)
     val_font = _font(48, bold=True)
-    cols = [
-        (95, "Entry Price", _fmt_money(float(data.get("entry_price") or 0.0))),
-        (402, "Exit Price", _fmt_money(float(data.get("exit_price") or 0.0))),
-        (712, "Size", _fmt_size(float(data.get("size") or 0.0),
-                                str(data.get("base_symbol") or ""))),
-    ]
-    for cx, label, value in cols:
-        draw.text((cx, 634), label, font=lbl_font, fill=_MUTED)
+    values = (
+        _fmt_money(float(data.get("entry_price") or 0.0)),
+        _fmt_money(float(data.get("exit_price") or 0.0)),
+        _fmt_size(float(data.get("size") or 0.0), str(data.get("base_symbol") or "")),
+    )
+    for (cx, _label), value in zip(_STAT_COLUMNS, values):
         draw.text((cx, 672), value, font=val_font, fill=_WHITE)
 
     # ── referral box ────────────────────────────────────────────
@@ -296,9 +318,17 @@ def generate_type_a_card(data: dict) -> bytes:
         draw.line((div_x, rb_y0 + 26, div_x, rb_y1 - 26), fill=_BOX_OUTLINE, width=2)
         draw.text((div_x + 40, rb_y0 + (rb_y1 - rb_y0 - 40) // 2), ref,
                   font=rc_font, fill=accent)
+    return canvas
+
 
+def generate_type_a_card(data: dict) -> bytes:
+    """Render a Type A PnL card to PNG bytes.
+
+    Expected ``data`` keys: badge, product, base_symbol, side, leverage, pnl
+    (signed float), entry_price, exit_price, size (base float), referral_code.
+    """
     out = io.BytesIO()
-    canvas.convert("RGB").save(out, format="PNG")
+    render_type_a(data).convert("RGB").save(out, format="PNG")
     return out.getvalue()
 
 
@@ -6,12 +6,15 @@ stats onto the master Type B artwork (trophy background for a gain, sad-miner
 for a loss), matching ``assets/cards/Master {Positive,Negative} PnL Type B.png``.
 
 Type A (per-trade desk/copy cards) is a separate renderer — this module only
-handles the strategy-session cards surfaced from the Performance view.
+handles the strategy-session cards surfaced from the Performance view. The
+header, labels and Nado mark are composited once per sign by ``_static_layer``;
+fonts and brand assets are LRU-cached.
 """
 from __future__ import annotations
 
 import io
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -113,6 +116,7 @@ _REG_CHAIN = (
 )
 
 
+@lru_cache(maxsize=32)
 def _font(size: int, bold: bool = True, semibold: bool = False) -> ImageFont.FreeTypeFont:
     chain = _SEMIBOLD_CHAIN if semibold else (_BOLD_CHAIN if bold else _REG_CHAIN)
     for p in chain:
@@ -138,6 +142,7 @@ def _draw_vcenter(draw: ImageDraw.ImageDraw, x: int, cy: int, text: str, font, f
 
 # ── asset helpers ───────────────────────────────────────────────
 
+@lru_cache(maxsize=4)
 def _load_logo(px: int) -> Optional[Image.Image]:
     for cand in _LOGO_CANDIDATES:
         if not cand.exists():
@@ -155,6 +160,7 @@ def _load_logo(px: int) -> Optional[Image.Image]:
     return None
 
 
+@lru_cache(maxsize=4)
 def _load_wordmark(px_height: int) -> Optional[Image.Image]:
     """The official NADOBRO wordmark scaled to ``px_height`` tall."""
     for cand in _WORDMARK_CANDIDATES:
@@ -173,7 +179,9 @@ def _load_wordmark(px_height: int) -> Optional[Image.Image]:
     return None
 
 
+@lru_cache(maxsize=128)
 def _load_icon(symbol: str, px: int) -> Optional[Image.Image]:
+    """Shared, read-only: callers only ever ``alpha_composite`` it."""
     if not symbol:
         return None
     cand = _ICONS / f"{symbol.upper()}.png"
@@ -186,6 +194,7 @@ def _load_icon(symbol: str, px: int) -> Optional[Image.Image]:
         return None
 
 
+@lru_cache(maxsize=4)
 def _nado_plane(px: int) -> Optional[Image.Image]:
     """The original Nado mark scaled to fit ``px`` — the SAME in every variant,
     never tinted. The source is a white plane on black, so its luminance becomes
@@ -230,23 +239,16 @@ def _fmt_pnl(v: float) -> str:
 
 # ── main ────────────────────────────────────────────────────────
 
-def generate_type_b_card(data: dict) -> bytes:
-    """Render a Type B strategy-session card to PNG bytes.
+_MODE_CY = 855
 
-    Expected ``data`` keys: strategy (raw key), product, base_symbol, volume
-    (float), net_fees (float magnitude), pnl (signed float), referral_code.
-    """
-    pnl = float(data.get("pnl") or 0.0)
-    positive = pnl >= 0
-    accent = _POS_ACCENT if positive else _NEG_ACCENT
-    pnl_col = _POS_PNL if positive else _NEG_PNL
 
+@lru_cache(maxsize=2)
+def _static_layer(positive: bool) -> Image.Image:
+    """Background + every session-independent element for one sign. Treat as
+    read-only; ``render_type_b`` draws on a copy."""
     canvas = Image.open(_BG[positive]).convert("RGBA")
-    W, H = canvas.size
     draw = ImageDraw.Draw(canvas)
 
-    skey = _strategy_key(data.get("strategy"))
-
     # ── header: monogram + official NADOBRO wordmark ────────────
     logo = _load_logo(82)
     lx = 76
@@ -264,9 +266,45 @@ def generate_type_b_card(data: dict) -> bytes:
         for ch in "NADOBRO":
             wx += _draw_vcenter(draw, wx, 112, ch, word_font, _WHITE) + 8
 
+    _draw_vcenter(draw, 76, 393, "Volume", _font(30, bold=False), _MUTED)
+
+    # ── "On [nado] Nado" — the original Nado mark, identical in every variant ──
+    on_cy = 552
+    on_font = _font(34, bold=False)
+    nado_font = _font(34, bold=True, semibold=True)
+    on_w = _draw_vcenter(draw, 76, on_cy, "On", on_font, _MUTED)
+    mark_x = 76 + on_w + 18
+    plane = _nado_plane(46)
+    if plane is not None:
+        canvas.alpha_composite(plane, (mark_x, on_cy - plane.height // 2))
+        next_x = mark_x + plane.width + 16
+    else:
+        next_x = mark_x
+    _draw_vcenter(draw, next_x, on_cy, "Nado", nado_font, _WHITE)
+
+    lbl_font = _font(30, bold=False)
+    _draw_vcenter(draw, 76, 670, "Net Fees", lbl_font, _MUTED)
+    _draw_vcenter(draw, 512, 670, "PnL", lbl_font, _MUTED)
+    _draw_vcenter(draw, 76, _MODE_CY, "Mode: ", _font(32, bold=False), _MUTED)
+    return canvas
+
+
+def render_type_b(data: dict) -> Image.Image:
+    """Draw one session's stats onto a copy of the cached static layer (RGBA)."""
+    pnl = float(data.get("pnl") or 0.0)
+    positive = pnl >= 0
+    accent = _POS_ACCENT if positive else _NEG_ACCENT
+    pnl_col = _POS_PNL if positive else _NEG_PNL
+
+    canvas = _static_layer(positive).copy()
+    W, H = canvas.size
+    draw = ImageDraw.Draw(canvas)
+
+    skey = _strategy_key(data.get("strategy"))
+
     # ── product row: token icon + symbol + strategy badge ───────
     row_cy = 270
-    icon = _load_icon(str(data.get("base_symbol") or ""), 80)
+    icon = _load_icon(str(data.get("base_symbol") or "").upper(), 80)
     sym_x = 76
     if icon is not None:
         canvas.alpha_composite(icon, (76, row_cy - 40))
@@ -285,7 +323,6 @@ def generate_type_b_card(data: dict) -> bytes:
     _draw_vcenter(draw, bx0 + pad_x, row_cy, badge, badge_font, accent)
 
     # ── Volume (headline) ───────────────────────────────────────
-    _draw_vcenter(draw, 76, 393, "Volume", _font(30, bold=False), _MUTED)
     vol_text = _fmt_volume(float(data.get("volume") or 0.0))
     vsize = 100
     vol_font = _font(vsize, bold=True)
@@ -294,35 +331,16 @@ def generate_type_b_card(data: dict) -> bytes:
         vol_font = _font(vsize, bold=True)
     _draw_vcenter(draw, 76, 476, vol_text, vol_font, _WHITE)
 
-    # ── "On [nado] Nado" — the original Nado mark, identical in every variant ──
-    on_cy = 552
-    on_font = _font(34, bold=False)
-    nado_font = _font(34, bold=True, semibold=True)
-    on_w = _draw_vcenter(draw, 76, on_cy, "On", on_font, _MUTED)
-    mark_x = 76 + on_w + 18
-    plane = _nado_plane(46)
-    if plane is not None:
-        canvas.alpha_composite(plane, (mark_x, on_cy - plane.height // 2))
-        next_x = mark_x + plane.width + 16
-    else:
-        next_x = mark_x
-    _draw_vcenter(draw, next_x, on_cy, "Nado", nado_font, _WHITE)
-
     # ── Net Fees / PnL ──────────────────────────────────────────
-    lbl_font = _font(30, bold=False)
     val_font = _font(55, bold=True)
-    _draw_vcenter(draw, 76, 670, "Net Fees", lbl_font, _MUTED)
     _draw_vcenter(draw, 76, 722, _fmt_fees(float(data.get("net_fees") or 0.0)),
                   val_font, _WHITE)
-    _draw_vcenter(draw, 512, 670, "PnL", lbl_font, _MUTED)
     _draw_vcenter(draw, 512, 722, _fmt_pnl(pnl), val_font, pnl_col)
 
     # ── Mode line ───────────────────────────────────────────────
     mode_font = _font(32, bold=True, semibold=True)
-    mlabel_font = _font(32, bold=False)
-    mode_cy = 855
-    mlabel_w = _draw_vcenter(draw, 76, mode_cy, "Mode: ", mlabel_font, _MUTED)
-    _draw_vcenter(draw, 76 + mlabel_w, mode_cy, _MODE_LABEL.get(skey, "Grid"),
+    mlabel_w = _text_w(draw, "Mode: ", _font(32, bold=False))
+    _draw_vcenter(draw, 76 + mlabel_w, _MODE_CY, _MODE_LABEL.get(skey, "Grid"),
                   mode_font, accent)
 
     # ── Referral code (bottom-right) ────────────────────────────
@@ -338,9 +356,17 @@ def generate_type_b_card(data: dict) -> bytes:
         rx = W - 24 - total
         _draw_vcenter(draw, rx, ref_cy, label, rl_font, _MUTED)
         _draw_vcenter(draw, rx + label_w + gap, ref_cy, ref, rc_font, _WHITE)
+    return canvas
+
+
+def generate_type_b_card(data: dict) -> bytes:
+    """Render a Type B strategy-session card to PNG bytes.
 
+    Expected ``data`` keys: strategy (raw key), product, base_symbol, volume
+    (float), net_fees (float magnitude), pnl (signed float), referral_code.
+    """
     out = io.BytesIO()
-    canvas.convert("RGB").save(out, format="PNG")
+    render_type_b(data).convert("RGB").save(out, format="PNG")
     return out.getvalue()
 
 
@@ -1,8 +1,11 @@
 """Portfolio history sampler + retention worker (Engine v2 Phase 2).
 
-- Sampler: every 60s, snapshot each active user's portfolio into
-  ``engine_portfolio_history``.
-- Retention: daily, downsample to 1m/7d, 1h/30d, 1d/1y (older rows dropped).
+- Sampler: every 60s, capture every active user's portfolio concurrently from
+  the shared nado_sync snapshot cache (no gateway calls) and write the whole
+  tick in ONE statement: the raw 1m rows into ``engine_portfolio_history``
+  plus the last-sample-per-bucket upserts into the ``_1h`` / ``_1d`` tiers.
+- Retention: daily, one range DELETE per tier (1m/7d, 1h/30d, 1d/1y).
+- Chart range reads go straight to the tier matching the range.
 
 Pure helpers (``run_sampler_once`` / ``run_retention_once``) are unit-tested
 with in-memory repos; the loop wiring + DB-backed repos are integration glue
@@ -16,7 +19,7 @@ import json
 import logging
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from src.nadobro.engine.portfolio import (
     Accounts,
@@ -25,13 +28,24 @@ from src.nadobro.engine.portfolio import (
     Portfolio,
     PortfolioHistoryRepository,
     PortfolioHistoryRow,
+    RETENTION_DAILY_DAYS,
+    RETENTION_FINE_DAYS,
+    RETENTION_HOURLY_DAYS,
 )
 from src.nadobro.engine.types import _dec
+from src.nadobro.utils.env import env_int
 
 logger = logging.getLogger(__name__)
 
 SAMPLER_INTERVAL_SECONDS = 60
 RETENTION_INTERVAL_SECONDS = 24 * 3600
+# Users captured at once per tick. Cache-backed captures never leave the
+# process, so this only bounds the user-row misses hitting the async DB pool.
+SAMPLER_CONCURRENCY = env_int("NADO_PORTFOLIO_SAMPLER_CONCURRENCY", 64)
+# A synced snapshot older than this many portfolio sync intervals is skipped
+# rather than sampled: the user has dropped out of the sync (or its syncs keep
+# failing), and re-recording the last holdings would draw a flat line.
+SAMPLER_MAX_SYNC_INTERVALS = env_int("NADO_PORTFOLIO_SAMPLER_MAX_SYNC_INTERVALS", 5)
 
 
 # --------------------------------------------------------------------------
@@ -40,22 +54,35 @@ RETENTION_INTERVAL_SECONDS = 24 * 3600
 async def run_sampler_once(
     portfolio: Portfolio, user_ids: List[int], now: Optional[datetime] = None
 ) -> int:
-    """Snapshot each user once. Returns the number of rows written."""
+    """Snapshot every user once and write the tick in one ``record_many``.
+
+    Captures run concurrently (bounded by ``SAMPLER_CONCURRENCY``) and share
+    one timestamp, so the tick lands in the same 1h / 1d bucket for everyone.
+    Returns the number of rows written.
+    """
+    from src.nadobro.core.async_utils import run_blocking_db
     from src.nadobro.portfolio.portfolio_service import PortfolioSnapshotUnavailable
 
-    written = 0
-    for uid in user_ids:
-        try:
-            await portfolio.sample(uid, now)
-            written += 1
-        except PortfolioSnapshotUnavailable as e:
-            # Expected for users who haven't linked / funded a wallet yet.
-            # Logging a full traceback every 60s for each such user is what
-            # turns the logs into noise — keep it to a single debug line.
-            logger.debug("portfolio sample skipped for user %s: %s", uid, e)
-        except Exception:  # noqa: BLE001 - one bad user shouldn't kill the loop
-            logger.warning("portfolio sample failed for user %s", uid, exc_info=True)
-    return written
+    now = now or datetime.now(timezone.utc)
+    gate = asyncio.Semaphore(max(1, SAMPLER_CONCURRENCY))
+
+    async def _capture(uid: int) -> Optional[PortfolioHistoryRow]:
+        async with gate:
+            try:
+                return await portfolio.capture(uid, now)
+            except PortfolioSnapshotUnavailable as e:
+                # Expected for users who haven't linked / funded a wallet yet.
+                # Logging a full traceback every 60s for each such user is what
+                # turns the logs into noise — keep it to a single debug line.
+                logger.debug("portfolio sample skipped for user %s: %s", uid, e)
+            except Exception:  # noqa: BLE001 - one bad user shouldn't kill the loop
+                logger.warning("portfolio sample failed for user %s", uid, exc_info=True)
+            return None
+
+    rows = [r for r in await asyncio.gather(*(_capture(uid) for uid in user_ids)) if r is not None]
+    if not rows:
+        return 0
+    return await run_blocking_db(portfolio.history_repo.record_many, rows)
 
 
 async def run_retention_once(
@@ -77,7 +104,9 @@ async def sampler_loop(
 ) -> None:
     while stop_event is None or not stop_event.is_set():
         try:
-            await run_sampler_once(portfolio_factory(), list_users())
+            # Listing pages through the DB: keep it off the event loop.
+            users = await asyncio.to_thread(list_users)
+            await run_sampler_once(portfolio_factory(), users)
         except Exception:  # noqa: BLE001
             logger.warning("portfolio sampler tick failed", exc_info=True)
         await asyncio.sleep(interval)
@@ -100,7 +129,9 @@ async def retention_loop(
 def start_portfolio_history_worker() -> List["asyncio.Task[None]"]:
     """Spawn the sampler + retention loops on the running event loop."""
     tasks = [
-        asyncio.create_task(sampler_loop(build_db_portfolio, list_active_user_ids)),
+        asyncio.create_task(
+            sampler_loop(lambda: build_db_portfolio(shared_cache_only=True), list_active_user_ids)
+        ),
         asyncio.create_task(retention_loop(lambda: DbPortfolioHistoryRepository())),
     ]
     logger.info("portfolio history worker started")
@@ -114,29 +145,101 @@ def _json(obj: Dict[str, Decimal]) -> str:
     return json.dumps({k: str(v) for k, v in obj.items()})
 
 
+# Resolution tiers: (table, bucket unit, retention days). The raw sampler
+# table is the 1m tier; the others keep the last sample of each bucket.
+_HISTORY_TIERS = {
+    "1m": ("engine_portfolio_history", None, RETENTION_FINE_DAYS),
+    "1h": ("engine_portfolio_history_1h", "hour", RETENTION_HOURLY_DAYS),
+    "1d": ("engine_portfolio_history_1d", "day", RETENTION_DAILY_DAYS),
+}
+
+
+def history_tier(
+    since: Optional[datetime], until: Optional[datetime] = None, now: Optional[datetime] = None
+) -> str:
+    """Tier a chart range reads: the finest one still retained at ``since``
+    whose density suits the span (1m up to a day, 1h up to its 30d retention,
+    else 1d). An unbounded read is the 1d series."""
+    if since is None:
+        return "1d"
+    now = now or datetime.now(timezone.utc)
+    age = now - since
+    span = (until or now) - since
+    if age <= timedelta(days=RETENTION_FINE_DAYS) and span <= timedelta(days=1):
+        return "1m"
+    if age <= timedelta(days=RETENTION_HOURLY_DAYS):
+        return "1h"
+    return "1d"
+
+
+def _tier_upsert(tier: str) -> str:
+    """CTE that folds the ``batch`` rows into one rollup tier, keeping the
+    latest sample per (user, network, bucket)."""
+    table, unit, _days = _HISTORY_TIERS[tier]
+    bucket = f"date_trunc('{unit}', ts AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'"
+    return f"""
+        tier_{tier} AS (
+            INSERT INTO {table} AS t
+                (user_id, network, bucket, ts, total_value_quote, by_account_json, by_asset_json)
+            SELECT DISTINCT ON (user_id, network, {bucket})
+                   user_id, network, {bucket}, ts, total_value_quote, by_account_json, by_asset_json
+            FROM batch
+            ORDER BY user_id, network, {bucket}, ts DESC
+            ON CONFLICT (user_id, network, bucket) DO UPDATE SET
+                ts = EXCLUDED.ts,
+                total_value_quote = EXCLUDED.total_value_quote,
+                by_account_json = EXCLUDED.by_account_json,
+                by_asset_json = EXCLUDED.by_asset_json
+            WHERE EXCLUDED.ts > t.ts
+            RETURNING 1
+        )"""
+
+
 class DbPortfolioHistoryRepository(PortfolioHistoryRepository):
     def record(self, row: PortfolioHistoryRow) -> None:
-        from src.nadobro.db import execute
-
-        execute(
-            """
-            INSERT INTO engine_portfolio_history
-                (user_id, network, ts, total_value_quote, by_account_json, by_asset_json)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            ON CONFLICT (user_id, network, ts) DO NOTHING
-            """,
-            (
-                row.user_id, row.network, row.ts, str(row.total_value_quote),
+        self.record_many([row])
+
+    def record_many(self, rows: List[PortfolioHistoryRow]) -> int:
+        """One statement per tick: the raw rows plus both rollup tiers, via
+        data-modifying CTEs over a single VALUES batch. Duplicate
+        ``(user, network, ts)`` samples are no-ops, as before."""
+        from src.nadobro.db import execute_returning
+
+        if not rows:
+            return 0
+        params: List[object] = []
+        for row in rows:
+            params.extend((
+                int(row.user_id), row.network, row.ts, str(row.total_value_quote),
                 _json(row.by_account), _json(row.by_asset),
+            ))
+        values = ", ".join(["(%s, %s, %s::timestamptz, %s::numeric, %s::jsonb, %s::jsonb)"] * len(rows))
+        result = execute_returning(
+            f"""
+            WITH batch (user_id, network, ts, total_value_quote, by_account_json, by_asset_json) AS (
+                VALUES {values}
             ),
+            raw AS (
+                INSERT INTO engine_portfolio_history
+                    (user_id, network, ts, total_value_quote, by_account_json, by_asset_json)
+                SELECT * FROM batch
+                ON CONFLICT (user_id, network, ts) DO NOTHING
+                RETURNING 1
+            ),{_tier_upsert("1h")},{_tier_upsert("1d")}
+            SELECT (SELECT COUNT(*) FROM raw) AS written
+            """,
+            tuple(params),
         )
+        return int((result or {}).get("written") or 0)
 
     def fetch(
         self, user_id: int, since: Optional[datetime] = None, until: Optional[datetime] = None,
         network: Optional[str] = None,
     ) -> List[PortfolioHistoryRow]:
+        """Range read from the tier :func:`history_tier` picks for it."""
         from src.nadobro.db import query_all
 
+        table = _HISTORY_TIERS[history_tier(since, until)][0]
         clauses = ["user_id = %s"]
         params: List[object] = [user_id]
         if network is not None:
@@ -150,7 +253,7 @@ class DbPortfolioHistoryRepository(PortfolioHistoryRepository):
             params.append(until)
         rows = query_all(
             f"SELECT user_id, network, ts, total_value_quote, by_account_json, by_asset_json "
-            f"FROM engine_portfolio_history WHERE {' AND '.join(clauses)} ORDER BY ts",
+            f"FROM {table} WHERE {' AND '.join(clauses)} ORDER BY ts",
             tuple(params),
         )
         out: List[PortfolioHistoryRow] = []
@@ -168,78 +271,23 @@ class DbPortfolioHistoryRepository(PortfolioHistoryRepository):
         return out
 
     def prune(self, now: Optional[datetime] = None) -> int:
-        """Atomically run the three retention DELETEs in a single transaction
-        (BUG-PHW-2) and return the total row count removed (BUG-PHW-3).
-        Uses a CTE-driven SELECT to identify rows to delete; this is O(N)
-        per band instead of the previous O(N²) correlated-subquery form
-        (BUG-PHW-4).
-        """
-        from src.nadobro.db import get_db, put_db
+        """Drop what each tier no longer retains: one range DELETE per tier,
+        in a single transaction (BUG-PHW-2), returning the total row count
+        removed (BUG-PHW-3). The downsampled survivors already live in the
+        1h / 1d tiers, written at sample time."""
+        from src.nadobro.db import run_transaction
 
         now = now or datetime.now(timezone.utc)
-        d7 = now - timedelta(days=7)
-        d30 = now - timedelta(days=30)
-        d365 = now - timedelta(days=365)
-        conn = get_db()
-        removed = 0
-        try:
-            with conn.cursor() as cur:
-                # Drop rows older than 1y.
-                cur.execute(
-                    "DELETE FROM engine_portfolio_history WHERE ts < %s",
-                    (d365,),
-                )
-                removed += cur.rowcount or 0
-                # 30d..1y: keep one per (user, network, day). Pick the row
-                # with max(ts) per bucket via DISTINCT ON (CTE pattern, O(N)).
-                # Bucketing by network keeps each mode's series intact — one
-                # survivor per network per day, never one across both.
-                cur.execute(
-                    """
-                    WITH keep AS (
-                        SELECT DISTINCT ON (user_id, network, date_trunc('day', ts))
-                               user_id, network, ts
-                        FROM engine_portfolio_history
-                        WHERE ts >= %s AND ts < %s
-                        ORDER BY user_id, network, date_trunc('day', ts), ts DESC
-                    )
-                    DELETE FROM engine_portfolio_history h
-                    WHERE h.ts >= %s AND h.ts < %s
-                      AND NOT EXISTS (
-                        SELECT 1 FROM keep k
-                        WHERE k.user_id = h.user_id AND k.network = h.network AND k.ts = h.ts
-                      )
-                    """,
-                    (d365, d30, d365, d30),
-                )
-                removed += cur.rowcount or 0
-                # 7d..30d: keep one per (user, network, hour).
-                cur.execute(
-                    """
-                    WITH keep AS (
-                        SELECT DISTINCT ON (user_id, network, date_trunc('hour', ts))
-                               user_id, network, ts
-                        FROM engine_portfolio_history
-                        WHERE ts >= %s AND ts < %s
-                        ORDER BY user_id, network, date_trunc('hour', ts), ts DESC
-                    )
-                    DELETE FROM engine_portfolio_history h
-                    WHERE h.ts >= %s AND h.ts < %s
-                      AND NOT EXISTS (
-                        SELECT 1 FROM keep k
-                        WHERE k.user_id = h.user_id AND k.network = h.network AND k.ts = h.ts
-                      )
-                    """,
-                    (d30, d7, d30, d7),
-                )
+
+        def _work(cur) -> int:
+            removed = 0
+            for table, unit, days in _HISTORY_TIERS.values():
+                column = "ts" if unit is None else "bucket"
+                cur.execute(f"DELETE FROM {table} WHERE {column} < %s", (now - timedelta(days=days),))
                 removed += cur.rowcount or 0
-            conn.commit()
             return removed
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            put_db(conn)
+
+        return run_transaction(_work)
 
 
 class DbExecutorsRepository(ExecutorsRepository):
@@ -257,7 +305,7 @@ class SnapshotAccountProvider(AccountProvider):
     """Sources normalized accounts + marks from the existing portfolio
     snapshot, so portfolio v2 reuses the live Nado data path."""
 
-    def __init__(self, network: str | None = None) -> None:
+    def __init__(self, network: str | None = None, *, shared_cache_only: bool = False) -> None:
         # None = follow each user's ACTIVE network (matches the perp snapshot
         # path, which samples via get_portfolio_snapshot on the user's current
         # mode). Pinning "mainnet" here while the perp leg followed the user's
@@ -265,10 +313,16 @@ class SnapshotAccountProvider(AccountProvider):
         # Stored under ``_network``: a plain ``self.network`` attribute would
         # shadow the ``network()`` accessor inherited from AccountProvider.
         self._network = network
+        # The history sampler reads ONLY the snapshot nado_sync already keeps
+        # current (positions + spot balances, no gateway call per user); the
+        # live path below stays for on-demand portfolio state.
+        self._shared_cache_only = shared_cache_only
 
     async def accounts(self, user_id: int) -> Accounts:
         from src.nadobro.core.async_utils import run_blocking
 
+        if self._shared_cache_only:
+            return self._accounts_from_holdings(await self._cached_holdings(user_id))
         snapshot = await run_blocking(self._snapshot, user_id)
         accounts: Accounts = {"nado_perps": {}, "nado_spot": {}, "nado_vault": {}}
         for pos in getattr(snapshot, "positions", None) or []:
@@ -332,11 +386,73 @@ class SnapshotAccountProvider(AccountProvider):
         2s snapshot cache keeps the two calls coherent)."""
         if self._network is not None:
             return str(self._network)
+        if self._shared_cache_only:
+            return str((await self._cached_holdings(user_id))["network"])
         from src.nadobro.core.async_utils import run_blocking
 
         snapshot = await run_blocking(self._snapshot, user_id)
         return str(getattr(snapshot, "network", None) or "mainnet")
 
+    async def _cached_holdings(self, user_id: int) -> Dict[str, Any]:
+        from src.nadobro.core.feature_flags import portfolio_sync_interval_seconds
+        from src.nadobro.portfolio.portfolio_service import PortfolioSnapshotUnavailable
+        from src.nadobro.users.user_service import aget_user
+        from src.nadobro.venue.nado_sync import get_cached_holdings
+
+        network = self._network
+        if network is None:
+            user = await aget_user(user_id)
+            network = user.network_mode.value if user else "mainnet"
+        holdings = get_cached_holdings(user_id, network)
+        if holdings is None:
+            raise PortfolioSnapshotUnavailable("no synced portfolio snapshot yet")
+        last_sync = holdings.get("last_sync")
+        max_age = timedelta(seconds=SAMPLER_MAX_SYNC_INTERVALS * portfolio_sync_interval_seconds())
+        if not isinstance(last_sync, datetime) or datetime.now(timezone.utc) - last_sync > max_age:
+            raise PortfolioSnapshotUnavailable(f"synced portfolio snapshot is stale (last sync {last_sync})")
+        return holdings
+
+    def _accounts_from_holdings(self, holdings: Dict[str, Any]) -> Accounts:
+        """Same account shape as the live path, from a synced snapshot's
+        normalized positions (``symbol`` / signed ``amount`` /
+        ``notional_value``), spot balances and spot oracle prices."""
+        from src.nadobro.portfolio.portfolio_service import PortfolioSnapshotUnavailable
+
+        accounts: Accounts = {"nado_perps": {}, "nado_spot": {}, "nado_vault": {}}
+        for pos in holdings.get("positions") or []:
+            pair = str(pos.get("symbol") or pos.get("product_name") or "")
+            if not pair:
+                continue
+            units = _dec(pos.get("amount", 0))
+            slot = accounts["nado_perps"].setdefault(
+                pair, {"units": Decimal(0), "mark": Decimal(0), "value": Decimal(0)}
+            )
+            # The venue prices notional at the oracle (|amount| * oracle), so
+            # every leg of a pair carries the same mark; the slot is the net
+            # position valued at it, as the live path values one position.
+            if units != 0:
+                slot["mark"] = abs(_dec(pos.get("notional_value", 0))) / abs(units)
+            slot["units"] += units
+            slot["value"] = abs(slot["units"]) * slot["mark"]
+        prices = holdings.get("spot_prices") or {}
+        for product_id, amount in (holdings.get("spot_balances") or {}).items():
+            if not amount:
+                continue
+            if int(product_id) == 0:
+                mark = Decimal(1)   # the USDC quote leg
+            elif int(product_id) in prices:
+                mark = _dec(prices[int(product_id)])
+            else:
+                # A token amount is not dollars: skip the sample rather than
+                # record it at a wrong total.
+                raise PortfolioSnapshotUnavailable(f"no oracle price for spot product {product_id}")
+            accounts["nado_spot"][f"spot:{product_id}"] = {
+                "units": _dec(amount),
+                "mark": mark,
+                "value": _dec(amount) * mark,
+            }
+        return accounts
+
     def _snapshot(self, user_id: int) -> object:
         from src.nadobro.portfolio.portfolio_service import get_portfolio_snapshot
 
@@ -384,28 +500,21 @@ def _loads(value: object) -> Dict[str, object]:
     return {}
 
 
-def build_db_portfolio() -> Portfolio:
+def build_db_portfolio(*, shared_cache_only: bool = False) -> Portfolio:
     from src.nadobro.trading.engine_persistence import DbInventoryRepository
 
     return Portfolio(
         inventory=DbInventoryRepository(),
-        accounts_provider=SnapshotAccountProvider(),
+        accounts_provider=SnapshotAccountProvider(shared_cache_only=shared_cache_only),
         executors=DbExecutorsRepository(),
         history=DbPortfolioHistoryRepository(),
     )
 
 
-def list_active_user_ids(days: int = 1) -> List[int]:
-    from src.nadobro.db import query_all
+def list_active_user_ids() -> List[int]:
+    """The users the portfolio sync keeps current — active in the last hour,
+    or holding positions, open orders or a running strategy, with a linked
+    wallet. Sampling anyone else only found no (or a stale) synced snapshot."""
+    from src.nadobro.venue.nado_sync import active_user_ids
 
-    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-    # Only sample users who actually have a linked wallet. Sampling wallet-less
-    # users just raised PortfolioSnapshotUnavailable every 60s (one burned
-    # snapshot + one log line per user); filtering at the source removes both
-    # the wasted SDK-pool work and the log noise.
-    rows = query_all(
-        "SELECT telegram_id FROM users "
-        "WHERE last_active >= %s AND main_address IS NOT NULL AND main_address <> ''",
-        (cutoff,),
-    )
-    return [r["telegram_id"] for r in rows or []]
+    return active_user_ids()
@@ -0,0 +1,253 @@
+"""Per-day fill rollups — PURE folding behind ``user_fill_rollups``.
+
+``aggregate_user_analytics`` and ``realized_pnl_windows_from_rows`` re-read a
+user's whole ledger on every view. The rollup keeps one row per
+``(user, network, product, UTC day)`` instead, advanced at fill-ingest time
+(``database.advance_fill_rollups``), so a window read is a small range sum.
+
+Rolling windows do not start on a day boundary. Days strictly after the
+window's start day are summed from the rollup. The start day itself is
+replayed from its raw fills, beginning at the previous row's end-of-day
+position state (``eod``), and only the part inside the window is kept. With
+that, the figures match a full replay exactly, not to within a day.
+
+Everything here shares the arithmetic of the full-ledger functions:
+
+* ``_apply_fill`` for position math;
+* round-trip win/loss decided on the closing fill;
+* ``_fill_notional`` / ``_fill_fee`` / ``is_perp_fill`` for volume and fees.
+
+Pure: no DB, no network.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Iterable, Mapping
+
+from src.nadobro.quant.portfolio_calculator import (
+    ZERO,
+    _EPOCH0,
+    _apply_fill,
+    _fill_signed_base_price_ts,
+    _row_time,
+    funding_payment_amount,
+)
+from src.nadobro.quant.user_analytics import (
+    WINDOW_SECONDS,
+    WINDOWS,
+    _empty_bucket,
+    _fill_fee,
+    _fill_notional,
+    is_perp_fill,
+)
+
+# (product_id, isolated) -> [signed_pos, avg_entry, realized in the open cycle]
+Positions = dict[tuple[int, bool], list[Decimal]]
+
+# Additive columns of one rollup row, in storage order.
+SUM_COLUMNS: tuple[str, ...] = (
+    "perp_usd", "spot_usd", "nadobro_perp_usd", "nadobro_spot_usd",
+    "fees", "funding", "realized", "win_pnl", "loss_pnl",
+)
+COUNT_COLUMNS: tuple[str, ...] = ("fills", "nadobro_fills", "wins", "losses")
+
+
+def encode_positions(positions: Positions) -> dict[str, list[str]]:
+    return {
+        f"{pid}:{1 if iso else 0}": [str(v) for v in state]
+        for (pid, iso), state in positions.items()
+    }
+
+
+def decode_positions(raw: Mapping[str, Any] | None) -> Positions:
+    out: Positions = {}
+    for key, state in (raw or {}).items():
+        pid, iso = str(key).split(":", 1)
+        values = [Decimal(str(v)) for v in state] + [ZERO] * (3 - len(state))
+        out[(int(pid), iso == "1")] = values[:3]
+    return out
+
+
+def _day_of(ts: datetime | None) -> date:
+    return (ts or _EPOCH0).astimezone(timezone.utc).date()
+
+
+def fill_events(rows: Iterable[Mapping[str, Any]] | None, positions: Positions) -> list[dict[str, Any]]:
+    """Fold ``rows`` (chronological) into ``positions`` in place; one event per fill.
+
+    Each event carries the fill's volume / fee split, the PnL it realized, the
+    round-trip outcome it closed (``+1`` win, ``-1`` loss, ``0`` none) and the
+    product's end state after it (``eod``). A row with no usable base / price /
+    side still counts toward volume and fees, exactly as in
+    ``aggregate_user_analytics``.
+    """
+    norm = []
+    for row in rows or []:
+        norm.append((_row_time(row), row))
+    norm.sort(key=lambda c: c[0] or _EPOCH0)
+
+    events: list[dict[str, Any]] = []
+    for ts, row in norm:
+        pid = int(row.get("product_id") or 0)
+        realized = ZERO
+        outcome, outcome_pnl = 0, ZERO
+        c = _fill_signed_base_price_ts(row)
+        if c is not None:
+            pid, signed_qty, price, _ts = c
+            key = (pid, bool(row.get("isolated")))
+            pos, entry, cycle = positions.get(key, [ZERO, ZERO, ZERO])
+            pos, entry, realized, reduced, flipped = _apply_fill(pos, entry, signed_qty, price)
+            cycle += realized
+            if reduced and (pos == ZERO or flipped):
+                if cycle != ZERO:
+                    outcome, outcome_pnl = (1 if cycle > ZERO else -1), cycle
+                cycle = ZERO
+            positions[key] = [pos, entry, cycle]
+        events.append({
+            "product_id": pid,
+            "product_name": str(row.get("product_name") or ""),
+            "ts": ts,
+            "day": _day_of(ts),
+            "perp": is_perp_fill(row),
+            "via_nadobro": bool(row.get("via_nadobro")),
+            "notional": _fill_notional(row),
+            "fee": _fill_fee(row),
+            "realized": realized,
+            "outcome": outcome,
+            "outcome_pnl": outcome_pnl,
+            "eod": {
+                ("1" if iso else "0"): [str(v) for v in state]
+                for (p, iso), state in positions.items() if p == pid
+            },
+        })
+    return events
+
+
+def _empty_day() -> dict[str, Any]:
+    out: dict[str, Any] = {col: ZERO for col in SUM_COLUMNS}
+    out.update({col: 0 for col in COUNT_COLUMNS})
+    out.update({"product_name": "", "eod": None})
+    return out
+
+
+def _add_event(bucket: dict[str, Any], event: Mapping[str, Any]) -> None:
+    notional = event["notional"]
+    side = "perp_usd" if event["perp"] else "spot_usd"
+    bucket[side] += notional
+    bucket["fills"] += 1
+    if event["via_nadobro"]:
+        bucket[f"nadobro_{side}"] += notional
+        bucket["nadobro_fills"] += 1
+    bucket["fees"] += event["fee"]
+    bucket["realized"] += event["realized"]
+    if event["outcome"] > 0:
+        bucket["wins"] += 1
+        bucket["win_pnl"] += event["outcome_pnl"]
+    elif event["outcome"] < 0:
+        bucket["losses"] += 1
+        bucket["loss_pnl"] += event["outcome_pnl"]
+
+
+def fold_days(
+    events: Iterable[Mapping[str, Any]],
+    funding_payments: Iterable[Mapping[str, Any]] | None = None,
+) -> dict[tuple[int, date], dict[str, Any]]:
+    """Sum fill events and funding payments into ``(product_id, day)`` deltas.
+
+    ``eod`` is the product's position state after its last fill that day
+    (``None`` on a funding-only row, which must not overwrite a stored one).
+    """
+    days: dict[tuple[int, date], dict[str, Any]] = {}
+    for event in events:
+        bucket = days.setdefault((int(event["product_id"]), event["day"]), _empty_day())
+        _add_event(bucket, event)
+        bucket["eod"] = event["eod"]
+        if event.get("product_name"):
+            bucket["product_name"] = event["product_name"]
+    for payment in funding_payments or []:
+        bucket = days.setdefault(
+            (int(payment.get("product_id") or 0), _day_of(_row_time(dict(payment)))), _empty_day()
+        )
+        bucket["funding"] += funding_payment_amount(dict(payment))
+    return days
+
+
+def window_starts(now: datetime) -> dict[str, datetime]:
+    """Inclusive start of every bounded window (``age <= window`` in the replay)."""
+    return {w: now - timedelta(seconds=s) for w, s in WINDOW_SECONDS.items()}
+
+
+def window_totals(
+    day_sums: Mapping[str, Mapping[str, Any]],
+    boundary_events: Mapping[str, Iterable[Mapping[str, Any]]],
+    boundary_funding: Mapping[str, Iterable[Mapping[str, Any]]],
+    now: datetime,
+) -> dict[str, dict[str, Any]]:
+    """Per-window totals: whole-day sums plus the in-window part of the start day.
+
+    ``day_sums[w]`` sums the rollup rows strictly after window ``w``'s start
+    day (``all``: every row). ``boundary_events[w]`` / ``boundary_funding[w]``
+    are the start day's replayed fills and raw funding payments.
+    """
+    starts = window_starts(now)
+    out: dict[str, dict[str, Any]] = {}
+    for window in WINDOWS:
+        bucket = _empty_day()
+        for col in SUM_COLUMNS:
+            bucket[col] += Decimal(str((day_sums.get(window) or {}).get(col) or 0))
+        for col in COUNT_COLUMNS:
+            bucket[col] += int((day_sums.get(window) or {}).get(col) or 0)
+        start = starts.get(window)
+        if start is not None:
+            for event in boundary_events.get(window) or ():
+                if event["ts"] is not None and event["ts"] >= start:
+                    _add_event(bucket, event)
+            for payment in boundary_funding.get(window) or ():
+                ts = _row_time(dict(payment))
+                if ts is not None and ts >= start:
+                    bucket["funding"] += funding_payment_amount(dict(payment))
+        out[window] = bucket
+    return out
+
+
+def analytics_from_totals(totals: Mapping[str, Mapping[str, Any]]) -> dict[str, Any]:
+    """Window totals in the ``aggregate_user_analytics`` payload shape."""
+    nado = {w: _empty_bucket() for w in WINDOWS}
+    nadobro = {w: _empty_bucket() for w in WINDOWS}
+    for window in WINDOWS:
+        t = totals[window]
+        for bucket, prefix, fills in ((nado, "", "fills"), (nadobro, "nadobro_", "nadobro_fills")):
+            slot = bucket[window]
+            slot["perp_usd"] = t[f"{prefix}perp_usd"]
+            slot["spot_usd"] = t[f"{prefix}spot_usd"]
+            slot["total_usd"] = t[f"{prefix}perp_usd"] + t[f"{prefix}spot_usd"]
+            slot["fills"] = int(t[fills])
+    return {
+        "nado_volume": nado,
+        "nadobro_volume": nadobro,
+        "fees": {w: totals[w]["fees"] for w in WINDOWS},
+        "funding": {w: totals[w]["funding"] for w in WINDOWS},
+        "realized_pnl": {w: totals[w]["realized"] for w in WINDOWS},
+        "wins": {w: int(totals[w]["wins"]) for w in WINDOWS},
+        "losses": {w: int(totals[w]["losses"]) for w in WINDOWS},
+    }
+
+
+def realized_from_totals(totals: Mapping[str, Mapping[str, Any]]) -> dict[str, Any]:
+    """Window totals in the ``realized_pnl_windows_from_rows`` result shape."""
+    wins = int(totals["all"]["wins"])
+    losses = int(totals["all"]["losses"])
+    decisive = wins + losses
+    pnl_windows = {w: totals[w]["realized"] for w in WINDOWS}
+    return {
+        "pnl_windows": pnl_windows,
+        "total_pnl": pnl_windows["all"],
+        "wins": wins,
+        "losses": losses,
+        "win_rate": (Decimal(wins) / Decimal(decisive) * Decimal(100)) if decisive else ZERO,
+        "wins_windows": {w: int(totals[w]["wins"]) for w in WINDOWS},
+        "losses_windows": {w: int(totals[w]["losses"]) for w in WINDOWS},
+        "win_pnl_windows": {w: totals[w]["win_pnl"] for w in WINDOWS},
+        "loss_pnl_windows": {w: totals[w]["loss_pnl"] for w in WINDOWS},
+    }
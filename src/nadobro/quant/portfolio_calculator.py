@@ -374,6 +374,68 @@ def _fill_signed_base_price_ts(
     return pid, signed, price, _row_time(row)
 
 
+def _apply_fill(
+    pos: Decimal, entry: Decimal, signed_qty: Decimal, price: Decimal
+) -> tuple[Decimal, Decimal, Decimal, bool, bool]:
+    """One fill against a running ``(signed_pos, avg_entry)``.
+
+    Returns ``(pos, entry, realized, reduced, flipped)``. Adding in the same
+    direction re-weights the average entry; an opposing fill realizes PnL on
+    the closed portion and, if it overshoots, opens the remainder at ``price``.
+    """
+    realized = ZERO
+    reduced = flipped = False
+    if pos == ZERO or (pos > ZERO) == (signed_qty > ZERO):
+        # Opening or adding in the same direction: update the average entry.
+        new_abs = abs(pos) + abs(signed_qty)
+        entry = (entry * abs(pos) + price * abs(signed_qty)) / new_abs
+        pos = pos + signed_qty
+    else:
+        # Reducing / closing / flipping: realize PnL on the closed portion.
+        reduced = True
+        closing = min(abs(pos), abs(signed_qty))
+        realized = (price - entry) * closing if pos > ZERO else (entry - price) * closing
+        if abs(signed_qty) < abs(pos):
+            pos = pos + signed_qty  # move toward flat; entry unchanged
+        elif abs(signed_qty) == abs(pos):
+            pos, entry = ZERO, ZERO
+        else:
+            remaining = abs(signed_qty) - abs(pos)  # flip: open the remainder
+            pos = remaining if signed_qty > ZERO else -remaining
+            entry = price
+            flipped = True
+    return pos, entry, realized, reduced, flipped
+
+
+def advance_realized_pnl(
+    positions: dict[tuple[int, bool], tuple[Decimal, Decimal]],
+    rows: list[dict[str, Any]] | None,
+) -> Decimal:
+    """Fold ``rows`` into ``positions`` in place; return the realized PnL they add.
+
+    The incremental form of :func:`realized_pnl_windows_from_rows`: same row
+    normalization, same chronological order, same per-fill arithmetic — so
+    advancing a carried ``(product_id, isolated) -> (signed_pos, avg_entry)``
+    map with the fills that arrived since gives exactly the total a full
+    replay of every fill would.
+    """
+    norm: list[tuple[tuple[int, bool], Decimal, Decimal, datetime | None]] = []
+    for r in (rows or []):
+        c = _fill_signed_base_price_ts(r)
+        if c is None:
+            continue
+        pid, signed_qty, price, ts = c
+        norm.append(((pid, bool(r.get("isolated"))), signed_qty, price, ts))
+    norm.sort(key=lambda c: c[3] or _EPOCH0)
+    total = ZERO
+    for key, signed_qty, price, _ts in norm:
+        pos, entry = positions.get(key, (ZERO, ZERO))
+        pos, entry, realized, _reduced, _flipped = _apply_fill(pos, entry, signed_qty, price)
+        positions[key] = (pos, entry)
+        total += realized
+    return total
+
+
 def realized_pnl_windows_from_rows(
     rows: list[dict[str, Any]] | None,
     *,
@@ -450,27 +512,7 @@ def realized_pnl_windows_from_rows(
 
     for key, signed_qty, price, ts in norm:
         pos, entry = state.get(key, (ZERO, ZERO))
-        realized = ZERO
-        reduced = flipped = False
-        if pos == ZERO or (pos > ZERO) == (signed_qty > ZERO):
-            # Opening or adding in the same direction: update the average entry.
-            new_abs = abs(pos) + abs(signed_qty)
-            entry = (entry * abs(pos) + price * abs(signed_qty)) / new_abs
-            pos = pos + signed_qty
-        else:
-            # Reducing / closing / flipping: realize PnL on the closed portion.
-            reduced = True
-            closing = min(abs(pos), abs(signed_qty))
-            realized = (price - entry) * closing if pos > ZERO else (entry - price) * closing
-            if abs(signed_qty) < abs(pos):
-                pos = pos + signed_qty  # move toward flat; entry unchanged
-            elif abs(signed_qty) == abs(pos):
-                pos, entry = ZERO, ZERO
-            else:
-                remaining = abs(signed_qty) - abs(pos)  # flip: open the remainder
-                pos = remaining if signed_qty > ZERO else -remaining
-                entry = price
-                flipped = True
+        pos, entry, realized, reduced, flipped = _apply_fill(pos, entry, signed_qty, price)
         state[key] = (pos, entry)
 
         # Per-FILL realized bucketing keeps the PnL total exact at fill granularity.
@@ -0,0 +1,183 @@
+"""FIFO round-trip pairing — PURE folding behind the History tab's ``round_trips``.
+
+``trade_service.compute_round_trips`` used to select every manual fill since
+the history epoch and re-pair it on each History view and each Share-PnL
+callback. The fold here carries the open-lot inventory per
+``(product_id, isolated)`` between calls, so ``database.advance_round_trips``
+feeds it only the fills synced since the last advance. Folding the ledger in
+any number of batches emits the same trips as one full pass.
+
+Pure: no DB, no network.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Mapping
+
+# (product_id, isolated) -> open lots, oldest first
+Inventory = dict[tuple[int, bool], list[dict[str, Any]]]
+
+# Columns of one emitted trip, in ``round_trips`` storage order.
+TRIP_COLUMNS: tuple[str, ...] = (
+    "trip_key", "product_id", "product_name", "isolated", "side", "size", "leverage",
+    "avg_open_price", "avg_close_price", "open_ts", "close_ts", "fees",
+    "funding_paid", "realized_pnl", "volume_usd",
+)
+
+
+def encode_inventory(inventory: Inventory) -> dict[str, list[dict[str, Any]]]:
+    """JSON-safe inventory: floats round-trip exactly, timestamps as ISO text."""
+    out: dict[str, list[dict[str, Any]]] = {}
+    for (pid, iso), lots in inventory.items():
+        if not lots:
+            continue
+        out[f"{pid}:{1 if iso else 0}"] = [
+            {**lot, "ts": lot["ts"].isoformat() if isinstance(lot.get("ts"), datetime) else lot.get("ts")}
+            for lot in lots
+        ]
+    return out
+
+
+def decode_inventory(raw: Mapping[str, Any] | None) -> Inventory:
+    out: Inventory = {}
+    for key, lots in (raw or {}).items():
+        pid, iso = str(key).split(":", 1)
+        decoded = []
+        for lot in lots or []:
+            ts = lot.get("ts")
+            decoded.append({**lot, "ts": datetime.fromisoformat(ts) if isinstance(ts, str) else ts})
+        out[(int(pid), iso == "1")] = decoded
+    return out
+
+
+def fold_round_trips(rows: Iterable[Mapping[str, Any]] | None, inventory: Inventory) -> list[dict[str, Any]]:
+    """Fold manual fills (chronological) into ``inventory`` in place; return the trips they close.
+
+    ``rows`` carry the ``compute_round_trips`` ledger columns (``sz``, ``px``,
+    ``fee``, ``funding_paid``, ``leverage``, ``order_type``, ``ts``). Lots are
+    matched FIFO per ``(product_id, isolated)``; each close emits one trip
+    keyed by the close row id.
+    """
+    round_trips: list[dict[str, Any]] = []
+    for row in rows or []:
+        side = str(row.get("side") or "").lower()
+        order_type = str(row.get("order_type") or "").upper()
+        product_id = int(row.get("product_id") or 0)
+        isolated = bool(row.get("isolated"))
+        key = (product_id, isolated)
+        size = float(row.get("sz") or 0)
+        if size <= 0:
+            continue
+        price = float(row.get("px") or 0)
+        # A fill without a resolvable price carries NO price information: queued
+        # as an open lot at $0 it turns every later close into "entry @ $0.00,
+        # PnL = full exit notional"; as a close it emits an all-zero trip. Same
+        # philosophy as the product_id=0 exclusion in the ledger query — skip
+        # rather than show WRONG. (Migration 0015 + the match-sync human-column
+        # backfill repair the rows that have the venue x18 quote; the rest have
+        # no price data.)
+        if price <= 0:
+            continue
+        fee = float(row.get("fee") or 0)
+        funding = float(row.get("funding_paid") or 0)
+        leverage = float(row.get("leverage") or 0)
+        ts = row.get("ts")
+        product_name = str(row.get("product_name") or "")
+        # Reduce-only closes (close orders) always pop the FIFO regardless
+        # of side. Otherwise we pop opposite-side lots and queue same-side.
+        is_close = "CLOSE" in order_type
+        queued = inventory.setdefault(key, [])
+        existing_side = queued[0]["side"] if queued else None
+        opposite = existing_side and existing_side != side
+        if is_close or opposite:
+            remaining = size
+            close_fees = fee
+            close_funding = funding
+            open_lots: list[dict] = []
+            while remaining > 1e-12 and queued:
+                lot = queued[0]
+                take = min(lot["size"], remaining)
+                lot_share = take / lot["size"] if lot["size"] > 0 else 1.0
+                open_lots.append({
+                    "trade_id": lot["trade_id"],
+                    "size": take,
+                    "price": lot["price"],
+                    "ts": lot["ts"],
+                    "fees": lot["fees"] * lot_share,
+                    "funding": lot["funding"] * lot_share,
+                    "leverage": lot.get("leverage") or 0.0,
+                })
+                lot["size"] -= take
+                lot["fees"] -= lot["fees"] * lot_share
+                lot["funding"] -= lot["funding"] * lot_share
+                remaining -= take
+                if lot["size"] <= 1e-12:
+                    queued.pop(0)
+            if open_lots:
+                total_open_qty = sum(l["size"] for l in open_lots) or 1.0
+                avg_open = sum(l["price"] * l["size"] for l in open_lots) / total_open_qty
+                open_fees = sum(l["fees"] for l in open_lots)
+                open_funding = sum(l["funding"] for l in open_lots)
+                # Both legs use the MATCHED quantity. Using the close row's full
+                # size overstated a partially-matched close (its leftover opens a
+                # new lot whose notional is counted again when THAT trip closes).
+                volume_usd = total_open_qty * (avg_open + price)
+                # Realized PnL is DERIVED from open/close prices, NOT read from the
+                # per-fill ``realized_pnl`` column — this venue reports none, so that
+                # column is always 0 and every venue-closed manual trade showed PnL 0.
+                # Gross of fees (fees are a separate field), consistent with the
+                # session/portfolio surfaces. FIFO-derived total over a full
+                # round-trip equals the avg-cost engine's (pair_fills_into_trades).
+                opened_long = existing_side in ("long", "buy")
+                derived_realized = sum(
+                    ((price - l["price"]) if opened_long else (l["price"] - price)) * l["size"]
+                    for l in open_lots
+                )
+                round_trips.append({
+                    "trip_key": str(row.get("id")),
+                    "product_id": product_id,
+                    "product_name": product_name,
+                    "pair": product_name,
+                    "isolated": isolated,
+                    "side": "long" if existing_side in ("long", "buy") else "short",
+                    "size": min(total_open_qty, size),
+                    "leverage": open_lots[0].get("leverage") or 0.0,
+                    "avg_open_price": avg_open,
+                    "avg_close_price": price,
+                    "open_ts": open_lots[0]["ts"],
+                    "close_ts": ts,
+                    "fees": open_fees + close_fees,
+                    "funding_paid": open_funding + close_funding,
+                    "realized_pnl": derived_realized,
+                    "volume_usd": volume_usd,
+                })
+            if remaining > 1e-12:
+                # Close was bigger than inventory — record the leftover as
+                # an opening lot for the opposite side.
+                queued.append({
+                    "trade_id": int(row.get("id") or 0),
+                    "side": "long" if side in ("long", "buy") else "short",
+                    "size": remaining,
+                    "price": price,
+                    "fees": fee * (remaining / size),
+                    "funding": funding * (remaining / size),
+                    "leverage": leverage,
+                    "ts": ts,
+                })
+        else:
+            queued.append({
+                "trade_id": int(row.get("id") or 0),
+                "side": side if side in ("long", "short", "buy", "sell") else "long",
+                "size": size,
+                "price": price,
+                "fees": fee,
+                "funding": funding,
+                "leverage": leverage,
+                "ts": ts,
+            })
+    return round_trips
+
+
+def newest_first(round_trips: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """History order: newest ``close_ts`` first; ties keep fold order."""
+    return sorted(round_trips, key=lambda r: (r.get("close_ts") or ""), reverse=True)
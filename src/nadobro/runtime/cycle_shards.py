@@ -0,0 +1,456 @@
+"""User-affine, long-lived cycle workers for ``NADO_RUNTIME_MODE=sharded``.
+
+The process-pool mode hands every cycle to whichever pool process is free.
+Each job then builds a new event loop with ``asyncio.run``, so per-loop
+resources (DB pools, async HTTP clients, engine controllers) are rebuilt on
+every tick, and a user's next cycle usually lands on a process that has never
+seen them.
+
+Here a fixed set of worker processes (*shards*) each run one event loop for
+their whole life. A consistent-hash ring over ``(telegram_id, network)`` picks
+the shard for a key, and the key stays pinned there. Every cycle for that user
+therefore runs in the same process and on the same loop. Its controller,
+clients and caches stay resident, and the in-process cycle lock is effective
+again.
+
+Jobs stream to a shard over a ``multiprocessing.Pipe`` as
+``("job", id, payload)`` and come back as ``("result", id, result)``. One
+reader thread per shard resolves the waiting futures on their own loops.
+
+A monitor thread pings every shard. The pong is sent from the shard's loop, so
+it proves the loop is still turning, not only that the process exists. When a
+shard exits or stops answering:
+
+* it is terminated and taken off the ring;
+* its in-flight jobs resolve to ``ok=False``;
+* its keys re-pin to their next owner on the ring;
+* it is respawned with backoff and rejoins for new keys.
+
+Only the dead shard's keys move. A key unpins when its cycle reports
+``skipped="not_running"``, so a later restart of that strategy is routed by
+the ring again.
+"""
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import importlib
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+
+from src.nadobro.utils.env import env_float, env_int, env_str
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TARGET = "src.nadobro.strategy.bot_runtime:run_cycle_job"
+_REPLICAS = 64
+
+
+def shard_count() -> int:
+    """``NADO_RUNTIME_SHARDS`` (default: one per CPU)."""
+    return max(1, env_int("NADO_RUNTIME_SHARDS", os.cpu_count() or 1))
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent-hash ring with ``replicas`` virtual points per node."""
+
+    def __init__(self, nodes: Iterable[int] = (), *, replicas: int = _REPLICAS) -> None:
+        self.replicas = max(1, int(replicas))
+        self._points: list[int] = []
+        self._owners: dict[int, int] = {}
+        self._nodes: set[int] = set()
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> frozenset[int]:
+        return frozenset(self._nodes)
+
+    def add(self, node: int) -> None:
+        if node in self._nodes:
+            return
+        self._nodes.add(node)
+        for i in range(self.replicas):
+            point = _hash(f"{node}#{i}")
+            self._owners[point] = node
+            bisect.insort(self._points, point)
+
+    def remove(self, node: int) -> None:
+        if node not in self._nodes:
+            return
+        self._nodes.discard(node)
+        dropped = {p for p, n in self._owners.items() if n == node}
+        for point in dropped:
+            del self._owners[point]
+        self._points = [p for p in self._points if p not in dropped]
+
+    def owner(self, key: Hashable) -> Optional[int]:
+        if not self._points:
+            return None
+        idx = bisect.bisect(self._points, _hash(repr(key))) % len(self._points)
+        return self._owners[self._points[idx]]
+
+
+def shard_key(payload: dict[str, Any]) -> tuple[int, str]:
+    return int(payload.get("telegram_id") or 0), str(payload.get("network") or "mainnet").lower()
+
+
+def _resolve_target(target: str) -> Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]:
+    module, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module), attr)
+
+
+def _shard_main(conn: Any, shard_id: int, target: str) -> None:
+    """Worker process entry point: one persistent loop fed from ``conn``."""
+    logging.basicConfig(level=env_str("LOG_LEVEL", "INFO") or "INFO")
+    run_job = _resolve_target(target)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    send_lock = threading.Lock()
+    tasks: set[asyncio.Task] = set()
+    stats = {"shard": shard_id, "pid": os.getpid(), "jobs": 0, "errors": 0}
+
+    def _reply(message: tuple) -> None:
+        try:
+            with send_lock:
+                conn.send(message)
+        except (OSError, EOFError, BrokenPipeError):
+            loop.call_soon_threadsafe(loop.stop)
+
+    async def _job(job_id: int, payload: dict[str, Any]) -> None:
+        started = time.perf_counter()
+        try:
+            result = await run_job(payload)
+        except Exception as exc:  # noqa: BLE001 - reported back, never kills the shard
+            stats["errors"] += 1
+            result = {
+                "ok": False,
+                "error": str(exc),
+                "worker_pid": os.getpid(),
+                "elapsed_ms": (time.perf_counter() - started) * 1000.0,
+                "completed_at": time.time(),
+            }
+        stats["jobs"] += 1
+        _reply(("result", job_id, result))
+
+    def _start(job_id: int, payload: dict[str, Any]) -> None:
+        task = loop.create_task(_job(job_id, payload))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    def _pong(ping_id: int) -> None:
+        _reply(("pong", ping_id, dict(stats, inflight=len(tasks))))
+
+    def _pump() -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            kind = message[0]
+            if kind == "job":
+                loop.call_soon_threadsafe(_start, message[1], message[2])
+            elif kind == "ping":
+                loop.call_soon_threadsafe(_pong, message[1])
+            elif kind == "stop":
+                break
+        loop.call_soon_threadsafe(loop.stop)
+
+    threading.Thread(target=_pump, name=f"cycle-shard-{shard_id}-pump", daemon=True).start()
+    try:
+        loop.run_forever()
+    finally:
+        for task in list(tasks):
+            task.cancel()
+        if tasks:
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+        conn.close()
+
+
+class _Shard:
+    def __init__(self, shard_id: int) -> None:
+        self.id = shard_id
+        self.process: Any = None
+        self.conn: Any = None
+        self.generation = 0
+        self.alive = False
+        self.send_lock = threading.Lock()
+        self.pending: dict[int, tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self.jobs = 0
+        self.restarts = 0
+        self.respawn_at = 0.0
+        self.ping_sent_at = 0.0
+        self.last_pong = 0.0
+        self.worker_stats: dict[str, Any] = {}
+
+    @property
+    def pid(self) -> Optional[int]:
+        return getattr(self.process, "pid", None)
+
+
+def _settle(fut: asyncio.Future, result: dict[str, Any]) -> None:
+    if not fut.done():
+        fut.set_result(result)
+
+
+class ShardPool:
+    """Fixed set of persistent cycle workers behind a consistent-hash ring."""
+
+    def __init__(
+        self,
+        size: int,
+        *,
+        target: str = DEFAULT_TARGET,
+        replicas: int = _REPLICAS,
+        start_method: Optional[str] = None,
+        ping_interval: Optional[float] = None,
+        ping_timeout: Optional[float] = None,
+        respawn_backoff: Optional[float] = None,
+    ) -> None:
+        self.size = max(1, int(size))
+        self.target = target
+        self._ctx = multiprocessing.get_context(
+            start_method or env_str("NADO_RUNTIME_SHARD_START_METHOD", "spawn") or "spawn"
+        )
+        self._ping_interval = (
+            ping_interval if ping_interval is not None else env_float("NADO_RUNTIME_SHARD_PING_SECONDS", 5.0)
+        )
+        self._ping_timeout = (
+            ping_timeout if ping_timeout is not None else env_float("NADO_RUNTIME_SHARD_PING_TIMEOUT_SECONDS", 60.0)
+        )
+        self._respawn_backoff = (
+            respawn_backoff if respawn_backoff is not None
+            else env_float("NADO_RUNTIME_SHARD_RESPAWN_SECONDS", 1.0)
+        )
+        self._lock = threading.RLock()
+        self._ring = HashRing(replicas=replicas)
+        self._shards = [_Shard(i) for i in range(self.size)]
+        self._pinned: dict[tuple[int, str], int] = {}
+        self._ids = itertools.count(1)
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+        self.rebalanced_keys = 0
+
+    # -- lifecycle ---------------------------------------------------------
+
+    def start(self) -> None:
+        with self._lock:
+            for shard in self._shards:
+                self._spawn(shard)
+        self._monitor = threading.Thread(target=self._monitor_loop, name="cycle-shard-monitor", daemon=True)
+        self._monitor.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        with self._lock:
+            shards = list(self._shards)
+            for shard in shards:
+                self._ring.remove(shard.id)
+                shard.alive = False
+                self._send(shard, ("stop",))
+        for shard in shards:
+            proc = shard.process
+            if proc is None:
+                continue
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(1.0)
+            self._fail_pending(shard, "runtime supervisor stopped")
+        if self._monitor is not None:
+            self._monitor.join(timeout)
+        self._pinned.clear()
+
+    def _spawn(self, shard: _Shard) -> None:
+        parent, child = self._ctx.Pipe()
+        proc = self._ctx.Process(
+            target=_shard_main,
+            args=(child, shard.id, self.target),
+            name=f"nado-cycle-shard-{shard.id}",
+            daemon=True,
+        )
+        proc.start()
+        child.close()
+        shard.process = proc
+        shard.conn = parent
+        shard.generation += 1
+        shard.alive = True
+        shard.ping_sent_at = 0.0
+        shard.last_pong = time.monotonic()
+        self._ring.add(shard.id)
+        threading.Thread(
+            target=self._read_loop,
+            args=(shard, parent, shard.generation),
+            name=f"cycle-shard-{shard.id}-reader",
+            daemon=True,
+        ).start()
+        logger.info("cycle shard %d started pid=%s generation=%d", shard.id, proc.pid, shard.generation)
+
+    def _send(self, shard: _Shard, message: tuple) -> bool:
+        try:
+            with shard.send_lock:
+                shard.conn.send(message)
+            return True
+        except (OSError, EOFError, BrokenPipeError, AttributeError):
+            return False
+
+    # -- routing -----------------------------------------------------------
+
+    def route(self, key: tuple[int, str]) -> Optional[int]:
+        """Shard that owns ``key``: its pinned shard while alive, else the ring's pick."""
+        with self._lock:
+            pinned = self._pinned.get(key)
+            if pinned is not None and self._shards[pinned].alive:
+                return pinned
+            owner = self._ring.owner(key)
+            if owner is None:
+                return None
+            if pinned is not None:
+                self.rebalanced_keys += 1
+            self._pinned[key] = owner
+            return owner
+
+    async def submit(self, payload: dict[str, Any]) -> dict[str, Any]:
+        key = shard_key(payload)
+        loop = asyncio.get_running_loop()
+        fut: asyncio.Future = loop.create_future()
+        job_id = next(self._ids)
+        with self._lock:
+            shard_id = self.route(key)
+            if shard_id is None:
+                raise RuntimeError("no live cycle shard")
+            shard = self._shards[shard_id]
+            shard.pending[job_id] = (loop, fut)
+            shard.jobs += 1
+        fut.add_done_callback(lambda _f, s=shard, j=job_id: s.pending.pop(j, None))
+        if not self._send(shard, ("job", job_id, payload)):
+            self._mark_dead(shard, shard.generation, "pipe closed")
+        result = await fut
+        if isinstance(result, dict):
+            result.setdefault("shard", shard_id)
+            if result.get("skipped") == "not_running":
+                with self._lock:
+                    if self._pinned.get(key) == shard_id:
+                        self._pinned.pop(key, None)
+        return result
+
+    # -- health ------------------------------------------------------------
+
+    def _read_loop(self, shard: _Shard, conn: Any, generation: int) -> None:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            kind = message[0]
+            if kind == "result":
+                entry = shard.pending.pop(message[1], None)
+                if entry is not None:
+                    loop, fut = entry
+                    if not loop.is_closed():
+                        loop.call_soon_threadsafe(_settle, fut, message[2])
+            elif kind == "pong":
+                shard.last_pong = time.monotonic()
+                shard.ping_sent_at = 0.0
+                shard.worker_stats = dict(message[2])
+        self._mark_dead(shard, generation, "worker exited")
+
+    def _mark_dead(self, shard: _Shard, generation: int, reason: str) -> None:
+        with self._lock:
+            if shard.generation != generation or not shard.alive:
+                return
+            shard.alive = False
+            self._ring.remove(shard.id)
+            shard.respawn_at = time.monotonic() + self._respawn_backoff * (2 ** min(shard.restarts, 6))
+        if self._stop.is_set():
+            return
+        proc = shard.process
+        if proc is not None and proc.is_alive():
+            proc.terminate()
+        logger.error(
+            "cycle shard %d lost (%s) pid=%s; %d job(s) failed, its keys move to the next shard",
+            shard.id, reason, shard.pid, len(shard.pending),
+        )
+        self._fail_pending(shard, f"cycle shard {shard.id} {reason}")
+
+    def _fail_pending(self, shard: _Shard, error: str) -> None:
+        pending = list(shard.pending.items())
+        shard.pending.clear()
+        for _job_id, (loop, fut) in pending:
+            if loop.is_closed():
+                continue
+            loop.call_soon_threadsafe(_settle, fut, {
+                "ok": False,
+                "error": error,
+                "worker_pid": shard.pid,
+                "elapsed_ms": 0.0,
+                "completed_at": time.time(),
+            })
+
+    def check_health(self) -> None:
+        """One monitor pass: reap dead or hung shards, ping live ones, respawn due ones."""
+        now = time.monotonic()
+        for shard in self._shards:
+            if self._stop.is_set():
+                return
+            if shard.alive:
+                proc = shard.process
+                if proc is None or not proc.is_alive():
+                    self._mark_dead(shard, shard.generation, "process died")
+                elif shard.ping_sent_at and now - shard.ping_sent_at > self._ping_timeout:
+                    self._mark_dead(shard, shard.generation, "loop unresponsive")
+                elif not shard.ping_sent_at:
+                    shard.ping_sent_at = now
+                    self._send(shard, ("ping", next(self._ids)))
+            elif now >= shard.respawn_at:
+                with self._lock:
+                    if self._stop.is_set() or shard.alive:
+                        continue
+                    if shard.process is not None:
+                        shard.process.join(0.5)
+                    shard.restarts += 1
+                    self._spawn(shard)
+
+    def _monitor_loop(self) -> None:
+        interval = max(0.05, self._ping_interval)
+        while not self._stop.wait(interval):
+            try:
+                self.check_health()
+            except Exception:  # noqa: BLE001 - the monitor must outlive one bad pass
+                logger.exception("cycle shard health check failed")
+
+    def diagnostics(self) -> dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            shards = {
+                str(s.id): {
+                    "alive": s.alive,
+                    "pid": s.pid,
+                    "jobs": s.jobs,
+                    "inflight": len(s.pending),
+                    "restarts": s.restarts,
+                    "keys": sum(1 for owner in self._pinned.values() if owner == s.id),
+                    "pong_age_s": round(now - s.last_pong, 2) if s.last_pong else None,
+                    "worker": dict(s.worker_stats),
+                }
+                for s in self._shards
+            }
+            return {
+                "size": self.size,
+                "alive": sum(1 for s in self._shards if s.alive),
+                "pinned_keys": len(self._pinned),
+                "rebalanced_keys": self.rebalanced_keys,
+                "shards": shards,
+            }
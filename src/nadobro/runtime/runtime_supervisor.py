@@ -9,6 +9,7 @@ logger = logging.getLogger(__name__)
 _MODE = (os.environ.get("NADO_RUNTIME_MODE") or "single").strip().lower()
 _STARTED = False
 _POOLS: dict[str, ProcessPoolExecutor] = {}
+_SHARDS: Any = None
 
 _WORKER_GROUP_MAP = {
     "grid": "mm_grid",
@@ -25,8 +26,13 @@ def runtime_mode() -> str:
     return _MODE
 
 
+def is_sharded_enabled() -> bool:
+    """Cycles run on user-affine, long-lived shard processes (``runtime/cycle_shards``)."""
+    return _MODE in ("sharded", "shard")
+
+
 def is_multiprocess_enabled() -> bool:
-    return _MODE in ("multiprocess", "multi_process", "process")
+    return _MODE in ("multiprocess", "multi_process", "process") or is_sharded_enabled()
 
 
 def strategy_worker_group(strategy: str | None) -> str:
@@ -43,13 +49,21 @@ def _pool_size_for_group(group: str) -> int:
 
 
 def start_runtime_supervisor() -> None:
-    global _STARTED
+    global _STARTED, _SHARDS
     if _STARTED:
         return
     if not is_multiprocess_enabled():
         logger.info("Runtime supervisor disabled (mode=%s).", _MODE)
         _STARTED = True
         return
+    if is_sharded_enabled():
+        from src.nadobro.runtime.cycle_shards import ShardPool, shard_count
+
+        _SHARDS = ShardPool(shard_count())
+        _SHARDS.start()
+        _STARTED = True
+        logger.info("Runtime supervisor started in sharded mode with %d shard(s)", _SHARDS.size)
+        return
 
     groups = ("mm_grid", "dn", "vol", "bro", "general")
     for group in groups:
@@ -66,7 +80,10 @@ def start_runtime_supervisor() -> None:
 
 
 def stop_runtime_supervisor() -> None:
-    global _STARTED
+    global _STARTED, _SHARDS
+    if _SHARDS is not None:
+        _SHARDS.stop()
+        _SHARDS = None
     for pool in _POOLS.values():
         pool.shutdown(wait=False, cancel_futures=True)
     _POOLS.clear()
@@ -89,12 +106,15 @@ def get_runtime_supervisor_diagnostics() -> dict[str, Any]:
             "max_workers": int(max_workers or 0),
             "alive_workers": int(alive),
         }
-    return {
+    out = {
         "mode": runtime_mode(),
         "multiprocess_enabled": is_multiprocess_enabled(),
         "started": bool(_STARTED),
         "pools": pools,
     }
+    if _SHARDS is not None:
+        out["shards"] = _SHARDS.diagnostics()
+    return out
 
 
 def _run_cycle_job(payload: dict[str, Any]) -> dict[str, Any]:
@@ -109,6 +129,8 @@ async def submit_cycle_job(payload: dict[str, Any]) -> dict[str, Any]:
         start_runtime_supervisor()
     if not is_multiprocess_enabled():
         return {"delegated": False}
+    if _SHARDS is not None:
+        return await _SHARDS.submit(payload)
 
     group = str(payload.get("worker_group") or strategy_worker_group(payload.get("strategy")))
     pool = _POOLS.get(group) or _POOLS.get("general")
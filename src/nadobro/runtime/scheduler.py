@@ -3,13 +3,15 @@ import asyncio
 from datetime import datetime, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from src.nadobro.utils.env import env_float, env_int
-from src.nadobro.notify.alert_service import get_triggered_alerts
+from src.nadobro.notify.alert_service import get_alert_context_keys, get_triggered_alerts
+from src.nadobro.notify.telegram_sender import Lane, deliver
 from src.nadobro.trading.stop_loss_service import process_stop_losses
 from src.nadobro.venue.nado_client import NadoClient
 from src.nadobro.core.async_utils import run_blocking
+from src.nadobro.core.feature_flags import alert_index_enabled
 from src.nadobro.core.perf import timed_metric
 from src.nadobro.trading.execution_queue import enqueue_alert
-from src.nadobro.users.lowiq_relay_client import relay_poll_interval_seconds
+from src.nadobro.users.lowiq_relay_client import relay_long_poll_seconds, relay_poll_interval_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -92,21 +94,27 @@ async def _build_alert_context(network: str | None = None) -> tuple[dict, dict]:
     each user's CURRENT active network — a user browsing testnet had their
     mainnet PnL alert evaluated against testnet positions (wrong-fire or
     never-fire)."""
-    from src.nadobro.models.database import get_all_active_alerts, AlertCondition
+    from src.nadobro.models.database import aget_all_active_alerts, AlertCondition
     from src.nadobro.config import get_product_id
     from src.nadobro.users.user_service import get_user_readonly_client
 
     funding_rates: dict = {}
     positions_by_user: dict = {}
 
-    active_alerts = await run_blocking(get_all_active_alerts, network)
-    if not active_alerts:
-        return funding_rates, positions_by_user
-
-    needs_funding = False
-    needs_pnl = False
-    funding_products: set[str] = set()
-    pnl_user_ids: set[int] = set()
+    if alert_index_enabled() and network:
+        # Served from the alert index: no per-tick scan of the alerts tables.
+        funding_products, pnl_user_ids = await run_blocking(get_alert_context_keys, network)
+        needs_funding = bool(funding_products)
+        needs_pnl = bool(pnl_user_ids)
+        active_alerts = []
+    else:
+        active_alerts = await aget_all_active_alerts(network)
+        if not active_alerts:
+            return funding_rates, positions_by_user
+        needs_funding = False
+        needs_pnl = False
+        funding_products: set[str] = set()
+        pnl_user_ids: set[int] = set()
 
     for alert in active_alerts:
         cond = alert.get("condition")
@@ -228,7 +236,7 @@ async def handle_alert_job(payload: dict):
                         f"{alert['product']} {localize_text('is', lang)} {condition_label}: {target_fmt}\n"
                         f"{localize_text('Current value:', lang)} {current_fmt}"
                     )
-                await _bot_app.bot.send_message(chat_id=alert["user_id"], text=msg)
+                await deliver(_bot_app.bot, alert["user_id"], msg, lane=Lane.ALERT)
                 logger.info(f"Alert sent to user {alert['user_id']}: {alert['product']} {alert['condition']}")
             except Exception as e:
                 logger.error(f"Failed to send alert to {alert['user_id']}: {e}")
@@ -238,7 +246,7 @@ async def handle_alert_job(payload: dict):
                 from src.nadobro.i18n import language_context, get_user_language, localize_text, get_active_language
                 with language_context(get_user_language(note["user_id"])):
                     lang = get_active_language()
-                    await _bot_app.bot.send_message(chat_id=note["user_id"], text=localize_text(note["text"], lang))
+                    await deliver(_bot_app.bot, note["user_id"], localize_text(note["text"], lang), lane=Lane.ORDER)
             except Exception as e:
                 logger.error("Failed to send stop-loss notification to %s: %s", note.get("user_id"), e)
     except Exception as e:
@@ -260,6 +268,14 @@ async def tick_price_tracker():
 
 async def _get_market_snapshot(force_refresh: bool = False) -> dict:
     global _last_market_snapshot
+    from src.nadobro.venue import market_feed
+
+    network = getattr(_check_client, "network", "mainnet")
+    if not force_refresh and market_feed.stream_live(network):
+        # Streamed quotes are sub-second fresh; no REST read, no local TTL.
+        prices = await market_feed.get_prices(network)
+        if prices:
+            return prices
     # AUDIT-FIX-SCH-2: hold the lock for the full check-then-fetch sequence
     # so two concurrent coroutines don't both miss the cache and race a
     # second venue request.
@@ -319,9 +335,11 @@ async def tick_howl():
                     try:
                         with language_context(get_user_language(telegram_id)):
                             lang = get_active_language()
-                            await _bot_app.bot.send_message(
-                                chat_id=telegram_id,
-                                text=localize_text(msg, lang),
+                            await deliver(
+                                _bot_app.bot,
+                                telegram_id,
+                                localize_text(msg, lang),
+                                lane=Lane.INFO,
                                 parse_mode="HTML",
                                 reply_markup=localize_markup(howl_approval_kb(suggestions_count), lang),
                             )
@@ -386,9 +404,9 @@ async def tick_night_howl():
                 try:
                     with language_context(get_user_language(telegram_id)):
                         lang = get_active_language()
-                        await _bot_app.bot.send_message(
-                            chat_id=telegram_id, text=localize_text(md, lang),
-                            parse_mode="Markdown",
+                        await deliver(
+                            _bot_app.bot, telegram_id, localize_text(md, lang),
+                            lane=Lane.INFO, parse_mode="Markdown",
                         )
                 except Exception as e:
                     logger.error("Failed to send Night HOWL to user %s: %s", telegram_id, e)
@@ -409,6 +427,33 @@ async def poll_lowiqpts_relay():
         logger.error("LOWIQPTS relay poll failed: %s", e)
 
 
+async def run_lowiqpts_relay_long_poll():
+    """Hold one batch poll at the relay for every pending session, back to back.
+
+    Replaces the interval job when LOWIQPTS_RELAY_LONG_POLL_SECONDS > 0. Sleeps
+    the regular poll interval whenever nothing is pending or the relay could
+    not batch, and spaces batch polls by at least a second so a relay that
+    answers without holding is not hammered.
+    """
+    from src.nadobro.users.points_service import poll_lowiqpts_relay_events
+
+    interval = relay_poll_interval_seconds()
+    wait_seconds = relay_long_poll_seconds()
+    loop = asyncio.get_running_loop()
+    while scheduler.running:
+        started = loop.time()
+        batched = False
+        if _bot_app:
+            try:
+                batched = await poll_lowiqpts_relay_events(_bot_app, wait_seconds=wait_seconds)
+            except Exception as e:
+                logger.error("LOWIQPTS relay long-poll failed: %s", e)
+        if batched:
+            await asyncio.sleep(max(0.0, 1.0 - (loop.time() - started)))
+        else:
+            await asyncio.sleep(interval)
+
+
 def _is_partial_fill(requested_size: float, fill_size: float, epsilon: float = 1e-12) -> bool:
     if requested_size <= 0:
         return False
@@ -422,7 +467,7 @@ async def _notify_limit_order_filled_once(trade_row: dict, network: str):
     if not _bot_app or not trade_row:
         return
     try:
-        from src.nadobro.models.database import get_bot_state, set_bot_state
+        from src.nadobro.models.database import aget_bot_state, aset_bot_state
 
         source = str((trade_row or {}).get("source") or "").strip().lower()
         strategy_session_id = trade_row.get("strategy_session_id")
@@ -431,7 +476,7 @@ async def _notify_limit_order_filled_once(trade_row: dict, network: str):
 
         trade_id = int(trade_row.get("id"))
         dedupe_key = f"limit_fill_notified:{network}:{trade_id}"
-        if await run_blocking(get_bot_state, dedupe_key):
+        if await aget_bot_state(dedupe_key):
             return
 
         user_id = int(trade_row.get("user_id"))
@@ -450,8 +495,12 @@ async def _notify_limit_order_filled_once(trade_row: dict, network: str):
             "📶 Status: fully filled\n"
             f"🌐 Network: {network}"
         )
-        await _bot_app.bot.send_message(chat_id=user_id, text=msg)
-        await run_blocking(set_bot_state, dedupe_key, {"notified_at": datetime.now(timezone.utc).isoformat()})
+        # Only an accepted (outbox-persisted) message marks the trade notified;
+        # one dropped by a full lane must not suppress a later attempt.
+        if not await deliver(_bot_app.bot, user_id, msg, lane=Lane.ORDER):
+            logger.warning("Limit-fill notification for trade %s not accepted", trade_id)
+            return
+        await aset_bot_state(dedupe_key, {"notified_at": datetime.now(timezone.utc).isoformat()})
     except Exception as e:
         logger.warning("Failed to send limit-fill notification: %s", e)
 
@@ -473,7 +522,7 @@ async def _notify_limit_order_cancelled_once(
     if not _bot_app or not trade_row:
         return
     try:
-        from src.nadobro.models.database import get_bot_state, set_bot_state
+        from src.nadobro.models.database import aget_bot_state, aset_bot_state
 
         source = str((trade_row or {}).get("source") or "").strip().lower()
         strategy_session_id = trade_row.get("strategy_session_id")
@@ -482,7 +531,7 @@ async def _notify_limit_order_cancelled_once(
 
         trade_id = int(trade_row.get("id"))
         dedupe_key = f"limit_cancel_notified:{network}:{trade_id}"
-        if await run_blocking(get_bot_state, dedupe_key):
+        if await aget_bot_state(dedupe_key):
             return
 
         user_id = int(trade_row.get("user_id"))
@@ -505,8 +554,12 @@ async def _notify_limit_order_cancelled_once(
             f"🧭 Cancel source: {source_label}\n"
             f"🌐 Network: {network}"
         )
-        await _bot_app.bot.send_message(chat_id=user_id, text=msg)
-        await run_blocking(set_bot_state, dedupe_key, {"notified_at": datetime.now(timezone.utc).isoformat()})
+        # Only an accepted (outbox-persisted) message marks the trade notified;
+        # one dropped by a full lane must not suppress a later attempt.
+        if not await deliver(_bot_app.bot, user_id, msg, lane=Lane.ORDER):
+            logger.warning("Limit-cancel notification for trade %s not accepted", trade_id)
+            return
+        await aset_bot_state(dedupe_key, {"notified_at": datetime.now(timezone.utc).isoformat()})
     except Exception as e:
         logger.warning("Failed to send limit-cancel notification: %s", e)
 
@@ -530,10 +583,10 @@ async def sync_pending_fills():
     """
     try:
         from src.nadobro.models.database import (
-            claim_pending_fill_syncs, update_trade, resolve_fill_sync,
-            expire_fill_sync, release_fill_sync,
+            claim_pending_fill_syncs, update_trade, aresolve_fill_sync,
+            aexpire_fill_sync, arelease_fill_sync,
             increment_session_metrics,
-            get_trade_by_id,
+            aget_trade_by_id,
         )
         from src.nadobro.venue.nado_archive import (
             is_archive_rate_limited,
@@ -578,7 +631,7 @@ async def sync_pending_fills():
                     network = entry["network"]
                     digest = entry["order_digest"]
                     attempts = int(entry.get("attempts", 0))
-                    trade_row = await run_blocking(get_trade_by_id, trade_id, network)
+                    trade_row = await aget_trade_by_id(trade_id, network)
 
                     # Expire old entries
                     created = entry.get("created_at")
@@ -596,13 +649,13 @@ async def sync_pending_fills():
                             created_dt = created_dt.replace(tzinfo=timezone.utc)
                         age_seconds = (dt.now(timezone.utc) - created_dt.astimezone(timezone.utc)).total_seconds()
                         if age_seconds > 7200:  # 2 hours
-                            await run_blocking(expire_fill_sync, sync_id)
+                            await aexpire_fill_sync(sync_id)
                             return False
 
                     fill_data = prefetched.get((network, str(digest)))
                     if not fill_data or not fill_data.get("is_filled"):
                         if is_archive_rate_limited():
-                            await run_blocking(release_fill_sync, sync_id)
+                            await arelease_fill_sync(sync_id)
                             return False
                         fill_data = await run_blocking(
                             query_order_by_digest,
@@ -613,7 +666,7 @@ async def sync_pending_fills():
                         )
                     if not fill_data or not fill_data.get("is_filled"):
                         if is_archive_rate_limited() or _trade_has_recorded_fill(trade_row):
-                            await run_blocking(release_fill_sync, sync_id)
+                            await arelease_fill_sync(sync_id)
                             return False
                         # Check if order was cancelled only after enough retries to avoid
                         # misclassifying late archive indexing as cancellation.
@@ -646,25 +699,25 @@ async def sync_pending_fills():
                                             digest_still_open = True
                                     if not digest_still_open:
                                         if attempts < 20:
-                                            await run_blocking(release_fill_sync, sync_id)
+                                            await arelease_fill_sync(sync_id)
                                             return False
                                         await run_blocking(
                                             update_trade, trade_id,
                                             {"status": "cancelled"}, network,
                                         )
-                                        refreshed_trade = await run_blocking(get_trade_by_id, trade_id, network)
+                                        refreshed_trade = await aget_trade_by_id(trade_id, network)
                                         trade_for_notify = refreshed_trade or trade_row
                                         await _notify_limit_order_cancelled_once(
                                             trade_for_notify,
                                             network,
                                             cancel_source=_infer_cancel_source(trade_for_notify or {}),
                                         )
-                                        await run_blocking(resolve_fill_sync, sync_id)
+                                        await aresolve_fill_sync(sync_id)
                                         return True
                             except Exception:
                                 pass
                         if not fill_data or not fill_data.get("is_filled"):
-                            await run_blocking(release_fill_sync, sync_id)
+                            await arelease_fill_sync(sync_id)
                             return False
 
                     requested_size = abs(float((trade_row or {}).get("size") or 0))
@@ -757,10 +810,10 @@ async def sync_pending_fills():
                             digest_still_open = True
                         resolved_partial = False
                         if not digest_still_open:
-                            await run_blocking(resolve_fill_sync, sync_id)
+                            await aresolve_fill_sync(sync_id)
                             resolved_partial = True
                         else:
-                            await run_blocking(release_fill_sync, sync_id)
+                            await arelease_fill_sync(sync_id)
                         logger.info(
                             "Fill sync partial trade #%s: filled=%.6f/%.6f price=%.6f",
                             trade_id,
@@ -770,8 +823,8 @@ async def sync_pending_fills():
                         )
                         return resolved_partial
 
-                    await run_blocking(resolve_fill_sync, sync_id)
-                    refreshed_trade = await run_blocking(get_trade_by_id, trade_id, network)
+                    await aresolve_fill_sync(sync_id)
+                    refreshed_trade = await aget_trade_by_id(trade_id, network)
                     await _notify_limit_order_filled_once(refreshed_trade or trade_row, network)
                     logger.info(
                         "Fill sync resolved trade #%s: price=%.6f fee=%.6f pnl=%.6f",
@@ -782,7 +835,7 @@ async def sync_pending_fills():
                 except Exception as e:
                     logger.warning("Fill sync error for entry %s: %s", entry.get("id"), e)
                     try:
-                        await run_blocking(release_fill_sync, entry.get("id"))
+                        await arelease_fill_sync(entry.get("id"))
                     except Exception:
                         pass
                     return False
@@ -921,10 +974,16 @@ def start_scheduler():
         tick_night_howl, "cron", minute=0, id="night_howl_hourly",
         replace_existing=True, **_LONG_TICK,
     )
-    scheduler.add_job(
-        poll_lowiqpts_relay, "interval", seconds=relay_poll_seconds,
-        id="lowiqpts_relay_poll", replace_existing=True, **_SHORT_TICK,
-    )
+    if relay_long_poll_seconds() > 0:
+        scheduler.add_job(
+            run_lowiqpts_relay_long_poll, "date",
+            id="lowiqpts_relay_poll", replace_existing=True,
+        )
+    else:
+        scheduler.add_job(
+            poll_lowiqpts_relay, "interval", seconds=relay_poll_seconds,
+            id="lowiqpts_relay_poll", replace_existing=True, **_SHORT_TICK,
+        )
     # sync_pending_fills can legitimately take longer than its 30s interval
     # when the archive lags. Keep a single in-flight tick so overlapping runs
     # do not amplify archive API pressure.
@@ -70,7 +70,11 @@ from src.nadobro.core.perf import timed_metric, record_metric
 from src.nadobro.utils.env import env_bool, env_float, env_tristate
 from src.nadobro.core.cadence import FAST_CADENCE_STRATEGIES, effective_interval_seconds
 from src.nadobro.trading.execution_queue import enqueue_strategy
-from src.nadobro.core.feature_flags import legacy_bro_autoloop_enabled
+from src.nadobro.core.feature_flags import (
+    legacy_bro_autoloop_enabled,
+    strategy_state_store_enabled,
+    strategy_state_writeback_seconds,
+)
 from src.nadobro.strategy.strategy_registry import (
     SUPPORTED_STRATEGIES,
     migrate_state_strategy,
@@ -79,6 +83,7 @@ from src.nadobro.strategy.strategy_registry import (
     strategy_display_name,
 )
 from src.nadobro.strategy.strategy_lifecycle import cleanup_strategy_positions
+from src.nadobro.strategy.state_store import StrategyStateStore, VersionedState
 
 logger = logging.getLogger(__name__)
 
@@ -381,8 +386,34 @@ def _default_state() -> dict:
     }
 
 
+# Steady-state cycles read and rewrite this blob several times each; the store
+# serves reads from memory and coalesces non-lifecycle writes (state_store.py).
+# Lambdas so the module-level DB helpers stay patchable.
+_STATE_STORE = StrategyStateStore(
+    load_raw=lambda key: get_bot_state_raw(key),
+    write=lambda key, value: set_bot_state(key, value),
+    writeback_seconds=strategy_state_writeback_seconds(),
+)
+
+
+def _state_store_enabled() -> bool:
+    if not strategy_state_store_enabled():
+        return False
+    # Worker processes write the same keys; a per-process cache would go stale.
+    from src.nadobro.runtime.runtime_supervisor import is_multiprocess_enabled
+
+    return not is_multiprocess_enabled()
+
+
 def _load_state(telegram_id: int, network: str) -> dict:
-    raw = get_bot_state_raw(_state_key(telegram_id, network))
+    key = _state_key(telegram_id, network)
+    if _state_store_enabled():
+        loaded = _STATE_STORE.get(key)
+        state = VersionedState(_default_state(), version=loaded.version if loaded is not None else 0)
+        state.update(loaded or {})
+        _migrate_state_strategy(state)
+        return state
+    raw = get_bot_state_raw(key)
     if not raw:
         return _default_state()
     try:
@@ -397,7 +428,28 @@ def _load_state(telegram_id: int, network: str) -> dict:
 
 
 def _save_state(telegram_id: int, network: str, state: dict):
-    set_bot_state(_state_key(telegram_id, network), state)
+    key = _state_key(telegram_id, network)
+    if _state_store_enabled():
+        _STATE_STORE.put(key, state)
+        return
+    set_bot_state(key, state)
+
+
+def _save_scanned_state(key: str, state: dict) -> None:
+    """Write a state read by a ``bot_state`` key scan and make it the newest version."""
+    set_bot_state(key, state)
+    if _state_store_enabled():
+        _STATE_STORE.replace(key, state)
+
+
+def _flush_state_store() -> None:
+    """Persist coalesced writes before reading ``bot_state`` rows straight from the DB."""
+    if _state_store_enabled():
+        _STATE_STORE.flush()
+
+
+def get_state_store_stats() -> dict:
+    return {"enabled": _state_store_enabled(), **_STATE_STORE.stats()}
 
 
 def _engine_stop_timeout_seconds() -> float:
@@ -517,7 +569,9 @@ async def _notify(telegram_id: int, text: str, **fmt_kwargs):
             translated = localize_text(text, lang)
             if fmt_kwargs:
                 translated = translated.format(**fmt_kwargs)
-            await _bot_app.bot.send_message(chat_id=telegram_id, text=translated)
+            from src.nadobro.notify.telegram_sender import Lane, deliver
+
+            await deliver(_bot_app.bot, telegram_id, translated, lane=Lane.ALERT)
     except Exception as e:
         logger.warning("Notify failed for %s: %s", telegram_id, e)
 
@@ -1355,7 +1409,8 @@ def set_process_worker_mode(enabled: bool) -> None:
 
 
 def is_process_worker_mode() -> bool:
-    """True inside a strategy-cycle worker process (set by run_cycle_job_sync).
+    """True inside a strategy-cycle worker process (set by run_cycle_job_sync
+    and, for shard workers, run_cycle_job).
     The engine build gate uses this to let the cycle-running worker ADOPT
     (build) its own controller when it has none locally — even if another
     (dead) process left a non-terminated executor row — without the main
@@ -1363,43 +1418,51 @@ def is_process_worker_mode() -> bool:
     return _process_worker_mode
 
 
-def run_cycle_job_sync(payload: dict) -> dict:
-    telegram_id = int(payload.get("telegram_id"))
-    network = str(payload.get("network"))
+def _cycle_job_result(started: float, ok: bool, error: str | None = None, **extra) -> dict:
+    out = {
+        "ok": bool(ok),
+        "error": error,
+        "worker_pid": os.getpid(),
+        "elapsed_ms": (time.perf_counter() - started) * 1000.0,
+        "completed_at": time.time(),
+    }
+    out.update(extra)
+    return out
+
+
+async def _run_cycle_job(payload: dict) -> dict:
     started = time.perf_counter()
-    set_process_worker_mode(True)
     try:
+        telegram_id = int(payload.get("telegram_id"))
+        network = str(payload.get("network"))
         state = _load_state(telegram_id, network)
         if not state.get("running"):
-            return {
-                "ok": True,
-                "skipped": "not_running",
-                "worker_pid": os.getpid(),
-                "elapsed_ms": (time.perf_counter() - started) * 1000.0,
-                "completed_at": time.time(),
-            }
-        ok, error_msg = asyncio.run(
-            _run_cycle(telegram_id, network, state, nudge=bool(payload.get("nudge")))
-        )
-        return {
-            "ok": bool(ok),
-            "error": error_msg,
-            "worker_pid": os.getpid(),
-            "elapsed_ms": (time.perf_counter() - started) * 1000.0,
-            "completed_at": time.time(),
-        }
+            return _cycle_job_result(started, True, skipped="not_running")
+        ok, error_msg = await _run_cycle(telegram_id, network, state, nudge=bool(payload.get("nudge")))
+        return _cycle_job_result(started, ok, error_msg)
     except Exception as e:
-        return {
-            "ok": False,
-            "error": str(e),
-            "worker_pid": os.getpid(),
-            "elapsed_ms": (time.perf_counter() - started) * 1000.0,
-            "completed_at": time.time(),
-        }
+        return _cycle_job_result(started, False, str(e))
+
+
+def run_cycle_job_sync(payload: dict) -> dict:
+    set_process_worker_mode(True)
+    try:
+        return asyncio.run(_run_cycle_job(payload))
     finally:
         set_process_worker_mode(False)
 
 
+async def run_cycle_job(payload: dict) -> dict:
+    """Cycle job for a sharded worker (``runtime/cycle_shards``).
+
+    Runs on the shard's persistent loop, so the controller, client and pools a
+    cycle builds are still there for the user's next cycle. The shard stays in
+    worker mode for its whole life.
+    """
+    set_process_worker_mode(True)
+    return await _run_cycle_job(payload)
+
+
 def stop_user_bot(telegram_id: int, cancel_orders: bool = True) -> tuple[bool, str]:
     user = get_user(telegram_id)
     network = user.network_mode.value if user else "mainnet"
@@ -1483,6 +1546,7 @@ def stop_all_user_bots(telegram_id: int, cancel_orders: bool = True) -> tuple[bo
     stopped = 0
     close_errors: list[str] = []
     stop_errors: list[str] = []
+    _flush_state_store()
     rows = query_all(
         "SELECT key, value FROM bot_state WHERE key LIKE %s",
         (f"{STATE_PREFIX}{telegram_id}:%",),
@@ -1500,7 +1564,7 @@ def stop_all_user_bots(telegram_id: int, cancel_orders: bool = True) -> tuple[bo
                 continue
             _finalize_session(state, stop_reason="user_stop_all")
             state["running"] = False
-            set_bot_state(key, state)
+            _save_scanned_state(key, state)
             tk = _task_key(telegram_id, network)
             task = _tasks.pop(tk, None)
             if task:
@@ -1585,6 +1649,7 @@ def get_user_bot_status(telegram_id: int) -> dict:
     next_cycle_in = max(0, int(interval - (time.time() - last_run))) if last_run > 0 else 0
     other_running_networks: list[str] = []
     try:
+        _flush_state_store()
         rows = query_all(
             "SELECT key, value FROM bot_state WHERE key LIKE %s",
             (f"{STATE_PREFIX}{telegram_id}:%",),
@@ -1804,6 +1869,7 @@ def get_runtime_diagnostics() -> dict:
         "pending_coalesced_ticks": pending_coalesced_ticks,
         "queue": get_queue_diagnostics(),
         "stats": dict(_job_stats),
+        "state_store": get_state_store_stats(),
         "env": {
             "NADO_RUNTIME_MODE": runtime_mode(),
             "NADO_STRATEGY_WORKERS": (os.environ.get("NADO_STRATEGY_WORKERS") or "2").strip(),
@@ -1814,6 +1880,7 @@ def get_runtime_diagnostics() -> dict:
 
 def stop_all_strategies_for_user(telegram_id: int) -> None:
     """Stop all running strategies for a given user. Used on network switch."""
+    _flush_state_store()
     rows = query_all(
         "SELECT key, value FROM bot_state WHERE key LIKE %s",
         (f"{STATE_PREFIX}{telegram_id}:%",),
@@ -1833,7 +1900,7 @@ def stop_all_strategies_for_user(telegram_id: int) -> None:
             _finalize_session(state, stop_reason="network_switch")
             state["running"] = False
             state["last_error"] = "Stopped due to network switch"
-            set_bot_state(key, state)
+            _save_scanned_state(key, state)
             tk = _task_key(telegram_id, network)
             task = _tasks.pop(tk, None)
             if task:
@@ -1851,7 +1918,7 @@ def stop_all_strategies_for_user(telegram_id: int) -> None:
                     "Stopped due to network switch; engine cleanup failed: "
                     f"{str(engine_error or 'unknown')[:180]}"
                 )
-                set_bot_state(key, state)
+                _save_scanned_state(key, state)
             close_res = cleanup_strategy_positions(telegram_id, network, state)
             if not close_res.get("success"):
                 logger.warning(
@@ -1865,7 +1932,7 @@ def stop_all_strategies_for_user(telegram_id: int) -> None:
                     "Stopped due to network switch; cleanup failed: "
                     f"{str(close_res.get('error') or 'unknown')[:180]}"
                 )
-                set_bot_state(key, state)
+                _save_scanned_state(key, state)
             stopped.append(f"{strategy}@{network}")
         except Exception as e:
             logger.warning("Error stopping strategy for user %s: %s", telegram_id, e)
@@ -1883,6 +1950,10 @@ def stop_runtime():
     for task_id, task in list(_tasks.items()):
         task.cancel()
         _tasks.pop(task_id, None)
+    try:
+        _STATE_STORE.close()
+    except Exception:  # policy: degrade-ok(shutdown flush; DB already holds every lifecycle write)
+        logger.warning("strategy state flush on shutdown failed", exc_info=True)
 
 
 def restore_running_bots(enabled: bool = False):
@@ -3010,6 +3081,12 @@ async def _run_cycle(
     # gather; the legacy directional path stays sequential because its
     # session-PnL rail can return before open orders are ever needed.
     async def _fetch_mid() -> float:
+        from src.nadobro.venue.market_feed import live_price
+
+        # The quote stream keeps this sub-second fresh; REST only when stale.
+        streamed = live_price(network, product_id)
+        if streamed and float(streamed.get("mid") or 0.0) > 0:
+            return float(streamed["mid"])
         with timed_metric("runtime.market_price.fetch"):
             if strategy == "vol":
                 try:
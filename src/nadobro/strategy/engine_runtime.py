@@ -20,6 +20,7 @@ import time
 from decimal import Decimal
 from typing import Any, Dict, Iterable, Optional
 
+from src.nadobro.core.feature_flags import engine_write_behind_enabled
 from src.nadobro.engine.adapter.base import NadoAdapterBase
 from src.nadobro.engine.controllers.controller_base import Controller, ControllerState
 from src.nadobro.engine.controllers.delta_neutral import DeltaNeutralController
@@ -213,13 +214,17 @@ class EngineRuntime:
         # new session must NOT inherit the prior run's engine_position_hold (it
         # would skew exposure caps / sizing). PnL is already session-scoped via
         # trades_<network>; this keeps the engine's own position view per-run.
+        # A DB inventory rebuilds a re-adopted run (crash / FAILED rebuild) from
+        # that run's own trade rows instead — a fresh run has none, so it clears.
         cid = deterministic_controller_id(strategy, user_id, network)
-        clear_inv = getattr(inventory, "clear_for_controller", None)
-        if callable(clear_inv):
+        reset_inv = getattr(inventory, "recover_controller", None)
+        if not callable(reset_inv):
+            reset_inv = getattr(inventory, "clear_for_controller", None)
+        if callable(reset_inv):
             try:
-                clear_inv(cid)
+                reset_inv(cid)
             except Exception:  # noqa: BLE001 - best-effort; never block start
-                logger.debug("inventory clear_for_controller failed for %s", cid, exc_info=True)
+                logger.debug("inventory reset failed for %s", cid, exc_info=True)
 
         orch = build_orchestrator(
             limits=limits,
@@ -266,6 +271,12 @@ class EngineRuntime:
         if orch is not None and controller is not None:
             await orch.stop_controller(controller.id)
             self._persist_executors(orch)
+            release = getattr(getattr(controller, "inventory", None), "release_controller", None)
+            if callable(release):
+                try:
+                    release(controller.id)
+                except Exception:  # noqa: BLE001 - the flush below still persists the holds
+                    logger.debug("inventory release failed for %s", controller.id, exc_info=True)
         else:
             # Cross-process stop: this process doesn't own the orchestrator, so
             # mark the controller's non-terminated engine_executors rows
@@ -279,6 +290,14 @@ class EngineRuntime:
                 logger.debug("cross-process executor terminate sweep failed for %s", cid, exc_info=True)
         self._controllers.pop(key, None)
         self._orchestrators.pop(key, None)
+        # Durable barrier: the run's last holds/fills reach Postgres before the
+        # caller finalizes the session from them.
+        try:
+            from src.nadobro.trading.engine_persistence import flush_engine_writes
+
+            flush_engine_writes()
+        except Exception:  # noqa: BLE001
+            logger.warning("engine write-behind flush on stop failed for %s", cid, exc_info=True)
         # Clear the live-progress row so a stopped strategy doesn't leave stale
         # cycles/funding behind for the next start. Best-effort.
         try:
@@ -605,7 +624,7 @@ def _default_runtime() -> EngineRuntime:
 
     return EngineRuntime(
         executor_store=DbExecutorStore(),
-        trade_recorder=DbTradeRecorder(),
+        trade_recorder=DbTradeRecorder(write_behind=engine_write_behind_enabled()),
     )
 
 
@@ -1974,15 +1993,21 @@ def _cycle_lock(telegram_id: int, network: str, strategy: str) -> "asyncio.Lock"
        nothing — the double-open would come back SILENTLY. Production is
        RUNTIME_MODE=single / NADO_USE_MULTIPROCESS_STRATEGIES=false today (verified
        on Fly), so this warns loudly rather than pretending to protect.
+       NADO_RUNTIME_MODE=sharded is the exception: every cycle for a
+       (user, network) — kickoff and scheduled alike — runs on that key's one
+       shard loop, so the lock there is effective and nothing is logged.
     """
     import asyncio as _aio
 
     global _warned_mp_cycle_lock
     if not _warned_mp_cycle_lock:
         try:
-            from src.nadobro.runtime.runtime_supervisor import is_multiprocess_enabled
+            from src.nadobro.runtime.runtime_supervisor import (
+                is_multiprocess_enabled,
+                is_sharded_enabled,
+            )
 
-            if is_multiprocess_enabled():
+            if is_multiprocess_enabled() and not is_sharded_enabled():
                 _warned_mp_cycle_lock = True
                 logger.error(
                     "CYCLE-LOCK is in-process only, but the runtime is in "
@@ -2375,7 +2400,8 @@ async def _run_engine_cycle_locked(
 
         adapter = build_adapter(client, meta, on_place=_link_placed_digest)
         started_controller = await RUNTIME.start(
-            telegram_id, network, strategy, configs, adapter, DbInventoryRepository(),
+            telegram_id, network, strategy, configs, adapter,
+            DbInventoryRepository(write_behind=engine_write_behind_enabled()),
             limits=limits,
         )
         # Fail loudly when the controller could not start. If on_start raised
@@ -8,17 +8,24 @@ callable in tests.
 
 Higher timeframes change slowly, so a small process-local TTL cache keyed by
 ``(network, product_id, timeframe)`` avoids re-fetching every MM tick on top of
-the client's own shared Redis cache. No event-loop I/O lives here — callers run
-this off the loop (run_blocking_sdk) like every other SDK read.
+the client's own shared Redis cache. The features themselves come from a
+streaming :class:`IndicatorState` under the same key: a refetch only pushes
+the bars that closed since (and revises the forming one), and a cache hit is a
+dict lookup. ``compute_tf_features`` stays the reference implementation. No
+event-loop I/O lives here — callers run this off the loop (run_blocking_sdk)
+like every other SDK read.
 """
 
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from typing import Callable, Dict, List, Mapping, Optional, Sequence
 
+from src.nadobro.core.feature_flags import streaming_indicators_enabled
 from src.nadobro.engine.routines import technical_analysis as ta
+from src.nadobro.engine.routines.streaming_indicators import IndicatorState
 from src.nadobro.engine.routines.variance_regime import variance_ratio
 
 logger = logging.getLogger(__name__)
@@ -38,6 +45,11 @@ _DEFAULT_TTL = 120.0
 
 # (network, product_id, timeframe) -> (fetched_at, candles)
 _cache: Dict[tuple, tuple[float, List[Candle]]] = {}
+# (network, product_id, timeframe) -> (lock, streaming indicator state).
+# Strategy cycles on SDK-pool threads can read the same key at once; a state
+# is updated in place, so each one is advanced and read under its own lock.
+_states: Dict[tuple, tuple[threading.Lock, IndicatorState]] = {}
+_states_lock = threading.Lock()
 
 
 def _ttl_for(timeframe: str) -> float:
@@ -46,6 +58,7 @@ def _ttl_for(timeframe: str) -> float:
 
 def reset_cache() -> None:
     _cache.clear()
+    _states.clear()
 
 
 def get_candles_cached(
@@ -139,7 +152,19 @@ def multi_tf_features(
 ) -> Dict[str, Dict[str, object]]:
     """Feature dict per timeframe, e.g. ``{"15m": {...}, "1h": {...}, "4h": {...}}``."""
     out: Dict[str, Dict[str, object]] = {}
+    streaming = streaming_indicators_enabled()
     for tf in timeframes:
         candles = get_candles_cached(fetcher, network, product_id, tf, limit=limit, now=now)
-        out[str(tf)] = compute_tf_features(candles)
+        if not streaming or not candles:
+            out[str(tf)] = compute_tf_features(candles)
+            continue
+        key = (str(network), int(product_id), str(tf))
+        with _states_lock:
+            entry = _states.get(key)
+            if entry is None:
+                entry = _states[key] = (threading.Lock(), IndicatorState(capacity=limit))
+        lock, state = entry
+        with lock:
+            # Shallow copy: callers fold these into their own signal dicts.
+            out[str(tf)] = dict(state.features(candles))
     return out
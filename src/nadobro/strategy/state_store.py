@@ -0,0 +1,303 @@
+"""Process-local write-through store for per-user strategy bot state.
+
+``bot_runtime`` reads and writes the ``strategy_bot:<uid>:<network>`` JSON
+blob several times per cycle. This store keeps the parsed state in memory so
+steady-state reads cost no DB round trip and no ``json.loads``, and coalesces
+writes: changed fields mark the entry dirty and a background thread flushes
+dirty entries every ``writeback_seconds``. Lifecycle changes (start / stop /
+error, see ``LIFECYCLE_FIELDS``) are written through immediately so a crash
+never loses them.
+
+Every entry carries a version counter and, per field, the version that last
+changed it. ``get`` hands out a :class:`VersionedState` copy stamped with the
+version it was read at; ``put`` of a copy read at an older version applies
+only the fields nobody changed since, so a long cycle finishing after a stop
+cannot write ``running=True`` back over it.
+
+The DB stays the source of truth across restarts. The store assumes a single
+writer process — ``bot_runtime`` bypasses it in multiprocess runtime mode.
+"""
+
+from __future__ import annotations
+
+import atexit
+import copy
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# A change to any of these is written through at once instead of coalesced.
+LIFECYCLE_FIELDS = frozenset({
+    "running",
+    "strategy",
+    "started_at",
+    "strategy_session_id",
+    "last_error",
+})
+
+
+class VersionedState(dict):
+    """A state dict that remembers the store version it was read at."""
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args: Any, version: int = 0, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.version = version
+
+
+@dataclass
+class _Entry:
+    value: dict[str, Any] | None
+    version: int = 0
+    field_versions: dict[str, int] = field(default_factory=dict)
+    dirty: bool = False
+    persisted_version: int = 0
+
+
+class StrategyStateStore:
+    def __init__(
+        self,
+        *,
+        load_raw: Callable[[str], Any],
+        write: Callable[[str, Any], None],
+        writeback_seconds: float = 2.0,
+    ) -> None:
+        self._load_raw = load_raw
+        self._write = write
+        self.writeback_seconds = max(0.05, float(writeback_seconds))
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.RLock()
+        # Serializes DB writes so two flushes of one key can't reorder.
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._atexit_registered = False
+        self._stats = {
+            "reads_cached": 0,
+            "reads_db": 0,
+            "writes_coalesced": 0,
+            "writes_immediate": 0,
+            "writebacks": 0,
+            "writeback_errors": 0,
+            "stale_fields_dropped": 0,
+        }
+
+    # -- reads ---------------------------------------------------------------
+
+    def get(self, key: str) -> VersionedState | None:
+        """Return a private copy of ``key``'s state (``None`` if never stored)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._stats["reads_cached"] += 1
+                return self._handout(entry)
+        raw = self._load_raw(key)
+        value = _parse(raw, key)
+        with self._lock:
+            # Another thread may have loaded or written it meanwhile; keep theirs.
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(value=value)
+                self._entries[key] = entry
+            self._stats["reads_db"] += 1
+            return self._handout(entry)
+
+    @staticmethod
+    def _handout(entry: _Entry) -> VersionedState | None:
+        if entry.value is None:
+            return None
+        return VersionedState(copy.deepcopy(entry.value), version=entry.version)
+
+    # -- writes --------------------------------------------------------------
+
+    def put(self, key: str, state: dict[str, Any], *, flush: bool | None = None) -> int:
+        """Store ``state`` for ``key``; returns the entry's new version.
+
+        ``flush=None`` writes through when a lifecycle field changed (or the
+        key was never loaded) and coalesces otherwise. A :class:`VersionedState`
+        is re-stamped with the new version, and any field a newer writer
+        changed is refreshed in place so the caller stops acting on it.
+        """
+        incoming = copy.deepcopy(dict(state))
+        base = state.version if isinstance(state, VersionedState) else None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _Entry(value=None)
+                self._entries[key] = entry
+                if flush is None:
+                    flush = True
+            current = entry.value or {}
+            changed = [
+                f for f in set(current) | set(incoming)
+                if incoming.get(f, _MISSING) != current.get(f, _MISSING)
+            ]
+            stale = base is not None and base < entry.version
+            applied: list[str] = []
+            merged = dict(current)
+            for f in changed:
+                if stale and entry.field_versions.get(f, 0) > base:
+                    self._stats["stale_fields_dropped"] += 1
+                    if isinstance(state, VersionedState):
+                        if f in current:
+                            state[f] = copy.deepcopy(current[f])
+                        else:
+                            state.pop(f, None)
+                    continue
+                applied.append(f)
+                if f in incoming:
+                    merged[f] = incoming[f]
+                else:
+                    merged.pop(f, None)
+            if stale and len(applied) < len(changed):
+                logger.debug(
+                    "state store: stale write key=%s base=%s current=%s kept %s newer field(s)",
+                    key, base, entry.version, len(changed) - len(applied),
+                )
+            if applied or entry.value is None:
+                entry.version += 1
+                entry.value = merged
+                for f in applied:
+                    entry.field_versions[f] = entry.version
+                entry.dirty = True
+            if isinstance(state, VersionedState):
+                state.version = entry.version
+            if flush is None:
+                flush = bool(LIFECYCLE_FIELDS.intersection(applied))
+            version = entry.version
+            dirty = entry.dirty
+        if not dirty:
+            return version
+        if flush:
+            self._stats["writes_immediate"] += 1
+            try:
+                self._flush_key(key, raise_errors=True)
+            except Exception:
+                # The entry stays dirty; the writeback thread retries it.
+                self._ensure_flusher()
+                raise
+        else:
+            self._stats["writes_coalesced"] += 1
+            self._ensure_flusher()
+        return version
+
+    def replace(self, key: str, state: dict[str, Any]) -> None:
+        """Record a write the caller already persisted as the newest version."""
+        with self._lock:
+            entry = self._entries.setdefault(key, _Entry(value=None))
+            current = entry.value or {}
+            incoming = copy.deepcopy(dict(state))
+            entry.version += 1
+            for f in set(current) | set(incoming):
+                if incoming.get(f, _MISSING) != current.get(f, _MISSING):
+                    entry.field_versions[f] = entry.version
+            entry.value = incoming
+            entry.dirty = False
+            entry.persisted_version = entry.version
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop cached entries (all when ``key`` is None); dirty ones flush first."""
+        self.flush(key)
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    # -- writeback -----------------------------------------------------------
+
+    def flush(self, key: str | None = None) -> int:
+        """Write dirty entries now; returns how many were written."""
+        with self._lock:
+            keys = [
+                k for k, e in self._entries.items()
+                if e.dirty and (key is None or k == key)
+            ]
+        written = 0
+        for k in keys:
+            if self._flush_key(k, raise_errors=False):
+                written += 1
+        return written
+
+    def _flush_key(self, key: str, *, raise_errors: bool) -> bool:
+        with self._flush_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None or not entry.dirty:
+                    return False
+                version = entry.version
+                payload = copy.deepcopy(entry.value)
+            try:
+                self._write(key, payload)
+            except Exception:
+                self._stats["writeback_errors"] += 1
+                if raise_errors:
+                    raise
+                logger.warning("state store writeback failed key=%s; will retry", key, exc_info=True)
+                return False
+            with self._lock:
+                entry.persisted_version = max(entry.persisted_version, version)
+                if entry.version == version:
+                    entry.dirty = False
+            self._stats["writebacks"] += 1
+            return True
+
+    def _ensure_flusher(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._flusher, name="strategy-state-writeback", daemon=True,
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def _flusher(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.writeback_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001 - the writeback loop must survive
+                logger.warning("state store writeback pass failed", exc_info=True)
+
+    def close(self) -> None:
+        """Stop the writeback thread and flush everything still dirty."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=max(1.0, self.writeback_seconds * 2))
+        self._thread = None
+        self.flush()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._entries)
+            out["dirty"] = sum(1 for e in self._entries.values() if e.dirty)
+        return out
+
+
+def _parse(raw: Any, key: str) -> dict[str, Any] | None:
+    if not raw:
+        return None
+    if isinstance(raw, dict):
+        return raw
+    try:
+        loaded = json.loads(raw)
+    except Exception:
+        logger.warning("Invalid bot state JSON for key %s", key)
+        return None
+    return loaded if isinstance(loaded, dict) else None
@@ -98,6 +98,8 @@ async def _notify(telegram_id: int, text: str) -> None:
     if not _bot_app:
         return
     try:
-        await _bot_app.bot.send_message(chat_id=telegram_id, text=text)
+        from src.nadobro.notify.telegram_sender import Lane, deliver
+
+        await deliver(_bot_app.bot, telegram_id, text, lane=Lane.ALERT)
     except Exception as e:
         logger.warning("time-limit notification failed user=%s: %s", telegram_id, e, extra={"feature": "time_limit"})
@@ -55,6 +55,8 @@ from src.nadobro.trading.trade_service import execute_market_order, execute_limi
 from src.nadobro.venue.nado_client import NadoClient
 from src.nadobro.venue.nado_archive import query_order_by_digest, query_orders_by_digests
 from src.nadobro.core.async_utils import run_blocking
+from src.nadobro.core.feature_flags import copy_poll_follower_concurrency, copy_poll_leader_concurrency
+from src.nadobro.core.perf import record_metric
 from src.nadobro.utils.env import env_bool, env_float
 
 logger = logging.getLogger(__name__)
@@ -221,7 +223,9 @@ async def _notify_user(telegram_id: int, text: str, reply_markup=None):
     if not _bot_app:
         return
     try:
-        await _bot_app.bot.send_message(chat_id=telegram_id, text=text, reply_markup=reply_markup)
+        from src.nadobro.notify.telegram_sender import Lane, deliver
+
+        await deliver(_bot_app.bot, telegram_id, text, lane=Lane.ORDER, reply_markup=reply_markup)
     except Exception as e:
         logger.warning("Copy notify failed for %s: %s", telegram_id, e)
 
@@ -240,21 +244,21 @@ async def _post_copy_close_card(
 
         from telegram import InlineKeyboardButton, InlineKeyboardMarkup
         from src.nadobro.portfolio.pnl_card_builder import build_copy_trade_card_data
-        from src.nadobro.portfolio.pnl_card_type_a import generate_type_a_card
+        from src.nadobro.portfolio.pnl_card_renderer import render_card_async
 
         data = await run_blocking(
             build_copy_trade_card_data, telegram_id, str(network), int(position_id)
         )
         if not data or data.get("unsupported"):
             return False
-        png = await run_blocking(generate_type_a_card, data)
+        card = await render_card_async("a", data)
         kb = InlineKeyboardMarkup([[InlineKeyboardButton(
             "📤 Share", callback_data=f"portfolio:share_pnl:copy:{int(position_id)}"
         )]])
-        # Full-quality PNG upload — media-sized timeouts (the ~1.5MB card was
-        # tripping the default 5s write timeout).
+        # Full-resolution upload — media-sized timeouts (the old ~1.5MB PNG
+        # card was tripping the default 5s write timeout).
         await _bot_app.bot.send_photo(
-            chat_id=telegram_id, photo=_io.BytesIO(png), caption=caption, reply_markup=kb,
+            chat_id=telegram_id, photo=_io.BytesIO(card), caption=caption, reply_markup=kb,
             read_timeout=60, write_timeout=120, connect_timeout=30, pool_timeout=30,
         )
         return True
@@ -823,6 +827,7 @@ def get_copy_polling_diagnostics() -> dict:
         "running": bool(task and not task.done()),
         "interval_seconds": int(POLL_INTERVAL_SECONDS),
         "task_name": str(task.get_name()) if task else "",
+        "last_tick": dict(_last_poll_stats),
     }
 
 
@@ -911,9 +916,141 @@ async def _poll_loop():
         await asyncio.sleep(POLL_INTERVAL_SECONDS)
 
 
+class _PollTick:
+    """Shared state of one poll pass: concurrency bounds and follower locks.
+
+    Leader groups run concurrently, at most ``leader_concurrency`` loading a
+    leader portfolio at once; each leader's mirrors then fan out, at most
+    ``follower_concurrency`` syncing at once across the whole tick. A follower
+    copying several leaders holds its own lock while syncing, so two groups
+    never place orders on the same account at the same time. Locks live for
+    one tick (one event loop), never across ``asyncio.run`` boundaries.
+    """
+
+    def __init__(self, leader_concurrency: int, follower_concurrency: int) -> None:
+        self.leader_slots = asyncio.Semaphore(max(1, leader_concurrency))
+        self.follower_slots = asyncio.Semaphore(max(1, follower_concurrency))
+        # Taken on top of a leader slot once the gateway budget runs short:
+        # leader reads degrade to one at a time rather than being skipped.
+        self.starved_slot = asyncio.Lock()
+        self.synced_ids: set[int] = set()
+        self.stats = {"leaders": 0, "mirrors": 0, "leader_failures": 0, "budget_serialized": 0}
+        self._follower_locks: dict[int, asyncio.Lock] = {}
+
+    def follower_lock(self, user_id: int) -> asyncio.Lock:
+        lock = self._follower_locks.get(user_id)
+        if lock is None:
+            lock = self._follower_locks[user_id] = asyncio.Lock()
+        return lock
+
+
+# Leader position signature per trader group, for change detection.
+_LEADER_SIGNATURES: dict[str, tuple] = {}
+_last_poll_stats: dict = {}
+# Rough gateway weight of one leader read (positions + open orders per product).
+_LEADER_LOAD_WEIGHT_ESTIMATE = env_float("NADO_COPY_LEADER_WEIGHT_ESTIMATE", 4.0)
+# A follow slower than this is logged with its leader; the metric itself is
+# one series, not one per leader.
+_SLOW_FOLLOW_MS = env_float("NADO_COPY_SLOW_FOLLOW_MS", 10_000.0)
+
+
+def _leader_signature(leader_pos_map: dict) -> tuple:
+    return tuple(sorted(
+        (int(pid), str(pos.get("side") or ""), round(float(pos.get("size") or 0), 12))
+        for pid, pos in (leader_pos_map or {}).items()
+    ))
+
+
+def _leader_has_headroom(network: str) -> bool:
+    from src.nadobro.config import NADO_MAINNET_REST, NADO_TESTNET_REST
+    from src.nadobro.venue.gateway_budget import has_headroom
+
+    gateway = NADO_MAINNET_REST if str(network) == "mainnet" else NADO_TESTNET_REST
+    try:
+        return has_headroom(gateway, weight=_LEADER_LOAD_WEIGHT_ESTIMATE)
+    except Exception:  # noqa: BLE001  # policy: degrade-ok(budget probe failure admits the read; the call itself is still budgeted)
+        return True
+
+
+async def _sync_follower(tick: _PollTick, mirror: dict, leader_pos_map: dict, *, stopping: bool) -> None:
+    async with tick.follower_lock(int(mirror["user_id"])), tick.follower_slots:
+        try:
+            await _sync_mirror_positions(mirror, leader_pos_map)
+        except Exception as e:
+            logger.error(
+                "%s for mirror %s user %s: %s",
+                "Copy stop retry failed" if stopping else "Copy sync failed",
+                mirror["id"], mirror["user_id"], e, exc_info=True,
+            )
+
+
+async def _load_leader_for_tick(tick: _PollTick, trader_id, wallet: str, network: str) -> dict:
+    if _leader_has_headroom(network):
+        async with tick.leader_slots:
+            return await run_blocking(_load_leader_position_map, trader_id, wallet, network)
+    tick.stats["budget_serialized"] += 1
+    # Still inside the leader bound: the starved slot only narrows it to one.
+    async with tick.starved_slot, tick.leader_slots:
+        return await run_blocking(_load_leader_position_map, trader_id, wallet, network)
+
+
+async def _poll_trader_group(tick: _PollTick, group_key: str, group_mirrors: list[dict]) -> None:
+    trader_id = group_mirrors[0]["trader_id"]
+    network = group_mirrors[0].get("network", "mainnet")
+    wallet = group_mirrors[0].get("wallet_address", "")
+
+    # A requested stop does not need the leader's current portfolio. Run
+    # its flatten-only retry first so a leader-read outage cannot strand
+    # the follower's open exposure.
+    stopping_mirrors = [m for m in group_mirrors if m.get("stop_requested")]
+    for mirror in stopping_mirrors:
+        tick.synced_ids.add(int(mirror["id"]))
+    if stopping_mirrors:
+        await asyncio.gather(*(
+            _sync_follower(tick, mirror, {}, stopping=True) for mirror in stopping_mirrors
+        ))
+
+    copying_mirrors = [m for m in group_mirrors if not m.get("stop_requested")]
+    if not copying_mirrors:
+        return
+
+    started = time.perf_counter()
+    try:
+        leader_pos_map = await _load_leader_for_tick(tick, trader_id, wallet, network)
+    except Exception as e:
+        tick.stats["leader_failures"] += 1
+        logger.error("Failed to poll trader %s on %s: %s", wallet[:10], network, e)
+        return
+    record_metric("copy.leader_load", (time.perf_counter() - started) * 1000.0)
+    tick.stats["leaders"] += 1
+
+    signature = _leader_signature(leader_pos_map)
+    previous = _LEADER_SIGNATURES.get(group_key)
+    _LEADER_SIGNATURES[group_key] = signature
+    changed = previous is not None and previous != signature
+
+    async def _follow(mirror: dict) -> None:
+        await _sync_follower(tick, mirror, leader_pos_map, stopping=False)
+        if changed:
+            # Leader change observed (read started) -> this follower synced:
+            # leader read + queueing behind other groups + order placement.
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            record_metric("copy.follow_latency", elapsed_ms)
+            if elapsed_ms >= _SLOW_FOLLOW_MS:
+                logger.warning(
+                    "copy follow slow: trader %s network %s mirror %s %.0fms",
+                    trader_id, network, mirror["id"], elapsed_ms,
+                )
+
+    for mirror in copying_mirrors:
+        tick.synced_ids.add(int(mirror["id"]))
+    tick.stats["mirrors"] += len(copying_mirrors)
+    await asyncio.gather(*(_follow(mirror) for mirror in copying_mirrors))
+
+
 async def _poll_all_mirrors():
     """Poll all active mirrors and process position changes."""
-    synced_ids: set[int] = set()
+    started = time.perf_counter()
     mirrors = await run_blocking(get_all_active_mirrors_v2)
 
     # Group mirrors by trader+network for efficient polling
@@ -922,45 +1059,19 @@ async def _poll_all_mirrors():
         key = f"{m['trader_id']}:{m.get('network', 'mainnet')}"
         trader_groups.setdefault(key, []).append(m)
 
-    for group_key, group_mirrors in trader_groups.items():
-        trader_id = group_mirrors[0]["trader_id"]
-        network = group_mirrors[0].get("network", "mainnet")
-        wallet = group_mirrors[0].get("wallet_address", "")
-
-        # A requested stop does not need the leader's current portfolio. Run
-        # its flatten-only retry first so a leader-read outage cannot strand
-        # the follower's open exposure.
-        stopping_mirrors = [m for m in group_mirrors if m.get("stop_requested")]
-        for mirror in stopping_mirrors:
-            synced_ids.add(int(mirror["id"]))
-            try:
-                await _sync_mirror_positions(mirror, {})
-            except Exception as e:
-                logger.error(
-                    "Copy stop retry failed for mirror %s user %s: %s",
-                    mirror["id"], mirror["user_id"], e, exc_info=True,
-                )
-
-        copying_mirrors = [m for m in group_mirrors if not m.get("stop_requested")]
-        if not copying_mirrors:
-            continue
-
-        try:
-            leader_pos_map = await run_blocking(_load_leader_position_map, trader_id, wallet, network)
-
-            # Process each mirror
-            for mirror in copying_mirrors:
-                synced_ids.add(int(mirror["id"]))
-                try:
-                    await _sync_mirror_positions(mirror, leader_pos_map)
-                except Exception as e:
-                    logger.error(
-                        "Copy sync failed for mirror %s user %s: %s",
-                        mirror["id"], mirror["user_id"], e, exc_info=True,
-                    )
-
-        except Exception as e:
-            logger.error("Failed to poll trader %s on %s: %s", wallet[:10], network, e)
+    tick = _PollTick(copy_poll_leader_concurrency(), copy_poll_follower_concurrency())
+    if trader_groups:
+        await asyncio.gather(*(
+            _poll_trader_group(tick, group_key, group_mirrors)
+            for group_key, group_mirrors in trader_groups.items()
+        ))
+    for stale in set(_LEADER_SIGNATURES) - set(trader_groups):
+        _LEADER_SIGNATURES.pop(stale, None)
+    synced_ids = tick.synced_ids
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    record_metric("copy.poll.tick", elapsed_ms)
+    _last_poll_stats.clear()
+    _last_poll_stats.update(tick.stats, groups=len(trader_groups), elapsed_ms=round(elapsed_ms, 2))
 
     # AUDIT F3-1 / F2-PAUSE-PENDING-ORPHAN: resolve pending maker opens for any
     # mirror that carries one but was NOT synced above — a PAUSED mirror (the
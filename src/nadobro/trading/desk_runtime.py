@@ -142,6 +142,7 @@ def _desk_configs(telegram_id: int, network: str) -> Dict[str, Any]:
 
 
 async def _ensure_session(telegram_id: int, network: str) -> bool:
+    from src.nadobro.core.feature_flags import engine_write_behind_enabled
     from src.nadobro.trading.engine_persistence import DbInventoryRepository
     from src.nadobro.strategy.engine_runtime import (
         RUNTIME,
@@ -166,7 +167,7 @@ async def _ensure_session(telegram_id: int, network: str) -> bool:
     adapter = build_adapter(client, meta)
     await RUNTIME.start(
         int(telegram_id), network, "desk", _desk_configs(telegram_id, network),
-        adapter, DbInventoryRepository(),
+        adapter, DbInventoryRepository(write_behind=engine_write_behind_enabled()),
     )
     _RUNNING.add(key)
     logger.info("desk: session started user=%s network=%s", telegram_id, network)
@@ -239,7 +240,9 @@ async def _notify_event(telegram_id: int, evt: Dict[str, Any]) -> None:
         defaults.update({k: v for k, v in evt.items() if v is not None})
         with language_context(get_user_language(telegram_id)):
             text = localize_text(template, get_active_language()).format(**defaults)
-        await _bot_app.bot.send_message(chat_id=int(telegram_id), text=text)
+        from src.nadobro.notify.telegram_sender import Lane, deliver
+
+        await deliver(_bot_app.bot, int(telegram_id), text, lane=Lane.ORDER)
     except Exception:  # noqa: BLE001 - notification failure must not stall the runner
         logger.warning("desk: notify failed user=%s type=%s",
                        telegram_id, evt.get("type"), exc_info=True)
@@ -6,7 +6,9 @@ restarts and are visible cross-process:
 
 - ``DbInventoryRepository`` — atomic ``apply_fill`` upsert into
   ``engine_position_hold``; satisfies the same interface as the in-memory
-  ``InventoryRepository`` (and the Portfolio ``HoldsSource``).
+  ``InventoryRepository`` (and the Portfolio ``HoldsSource``). With
+  ``write_behind=True`` holds live in memory and reach the table through
+  ``engine_write_behind`` in coalesced batches.
 - ``DbExecutorStore`` — upserts executor lifecycle rows into
   ``engine_executors``.
 - ``DbKillSwitchStore`` — persists the risk kill switch in
@@ -19,12 +21,15 @@ from __future__ import annotations
 
 import dataclasses
 import json
+import time
 from decimal import Decimal
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from src.nadobro.engine.inventory import PositionHold
+from src.nadobro.core.feature_flags import engine_write_behind_seconds
+from src.nadobro.engine.inventory import HoldKey, PositionHold
 from src.nadobro.engine.risk import KillSwitchStore
 from src.nadobro.engine.types import TradeType, _dec
+from src.nadobro.trading.engine_write_behind import EngineWriteBehind, HoldDelta
 
 _STRATEGY_TYPES = {
     "OrderExecutor": "order",
@@ -52,9 +57,75 @@ def _row_to_hold(row: dict) -> PositionHold:
     )
 
 
+_HOLD_UPSERT_SET = """
+            ON CONFLICT (user_id, trading_pair, controller_id) DO UPDATE SET
+              buy_amount_base   = engine_position_hold.buy_amount_base   + EXCLUDED.buy_amount_base,
+              buy_amount_quote  = engine_position_hold.buy_amount_quote  + EXCLUDED.buy_amount_quote,
+              sell_amount_base  = engine_position_hold.sell_amount_base  + EXCLUDED.sell_amount_base,
+              sell_amount_quote = engine_position_hold.sell_amount_quote + EXCLUDED.sell_amount_quote,
+              cum_fees_quote    = engine_position_hold.cum_fees_quote    + EXCLUDED.cum_fees_quote,
+              updated_at = NOW()
+"""
+
+
+def _upsert_hold_deltas(rows: List[HoldDelta]) -> None:
+    """Add a batch of coalesced hold deltas in one statement (one row per key)."""
+    from src.nadobro.db import execute
+
+    columns = list(zip(*rows))
+    execute(
+        """
+        INSERT INTO engine_position_hold
+          (user_id, trading_pair, controller_id, buy_amount_base, buy_amount_quote,
+           sell_amount_base, sell_amount_quote, cum_fees_quote, updated_at)
+        SELECT d.user_id, d.trading_pair, d.controller_id, d.bb, d.bq, d.sb, d.sq, d.fee, NOW()
+        FROM unnest(%s::bigint[], %s::text[], %s::text[], %s::numeric[], %s::numeric[],
+                    %s::numeric[], %s::numeric[], %s::numeric[])
+             AS d(user_id, trading_pair, controller_id, bb, bq, sb, sq, fee)
+        """ + _HOLD_UPSERT_SET,
+        tuple(list(col) for col in columns),
+    )
+
+
+def _record_fill_batch(fills: list) -> None:
+    """Write-behind sink: ``fills`` are ``(recorder, args, kwargs)`` tuples."""
+    by_recorder: Dict[int, tuple] = {}
+    for recorder, args, kwargs in fills:
+        by_recorder.setdefault(id(recorder), (recorder, []))[1].append((args, kwargs))
+    for recorder, batch in by_recorder.values():
+        recorder._record_batch(batch)
+
+
+# Process-wide: every write-behind repository/recorder shares one set of
+# holds, so any instance reads the owner's latest position. Lambdas keep the
+# sinks patchable.
+_WRITE_BEHIND = EngineWriteBehind(
+    write_deltas=lambda rows: _upsert_hold_deltas(rows),
+    record_fills=lambda fills: _record_fill_batch(fills),
+    lag_seconds=engine_write_behind_seconds(),
+)
+
+
+def flush_engine_writes() -> int:
+    """Durable barrier: persist every queued engine hold delta and fill now."""
+    return _WRITE_BEHIND.flush()
+
+
+def get_engine_write_behind_stats() -> dict:
+    return _WRITE_BEHIND.stats()
+
+
 class DbInventoryRepository:
     """engine_position_hold-backed inventory. Same surface as the in-memory
-    ``InventoryRepository`` so it is a drop-in for executors and Portfolio."""
+    ``InventoryRepository`` so it is a drop-in for executors and Portfolio.
+
+    ``write_behind=True`` (the runtime's wiring) makes ``apply_fill`` a memory
+    update: the hold is loaded once, mutated in place, and its delta persisted
+    by the shared write-behind flusher. Reads on any instance prefer those
+    in-memory holds, so the owning process never sees a lagging row."""
+
+    def __init__(self, *, write_behind: bool = False) -> None:
+        self.write_behind = bool(write_behind)
 
     def apply_fill(
         self,
@@ -67,6 +138,13 @@ class DbInventoryRepository:
         fee_quote: object = Decimal(0),
         timestamp: Optional[float] = None,
     ) -> PositionHold:
+        if self.write_behind:
+            return _WRITE_BEHIND.apply_fill(
+                (user_id, trading_pair, controller_id), side,
+                base_qty, quote_qty, fee_quote, timestamp,
+                load=lambda: self._load(user_id, trading_pair, controller_id),
+            )
+
         from src.nadobro.db import execute_returning
 
         base, quote, fee = _dec(base_qty), _dec(quote_qty), _dec(fee_quote)
@@ -80,13 +158,7 @@ class DbInventoryRepository:
               (user_id, trading_pair, controller_id, buy_amount_base, buy_amount_quote,
                sell_amount_base, sell_amount_quote, cum_fees_quote, updated_at)
             VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
-            ON CONFLICT (user_id, trading_pair, controller_id) DO UPDATE SET
-              buy_amount_base   = engine_position_hold.buy_amount_base   + EXCLUDED.buy_amount_base,
-              buy_amount_quote  = engine_position_hold.buy_amount_quote  + EXCLUDED.buy_amount_quote,
-              sell_amount_base  = engine_position_hold.sell_amount_base  + EXCLUDED.sell_amount_base,
-              sell_amount_quote = engine_position_hold.sell_amount_quote + EXCLUDED.sell_amount_quote,
-              cum_fees_quote    = engine_position_hold.cum_fees_quote    + EXCLUDED.cum_fees_quote,
-              updated_at = NOW()
+            """ + _HOLD_UPSERT_SET + """
             RETURNING *
             """,
             (user_id, trading_pair, controller_id, bb, bq, sb, sq, fee),
@@ -94,7 +166,7 @@ class DbInventoryRepository:
         assert row is not None
         return _row_to_hold(row)
 
-    def get(self, user_id: int, trading_pair: str, controller_id: str) -> PositionHold:
+    def _load(self, user_id: int, trading_pair: str, controller_id: str) -> PositionHold:
         from src.nadobro.db import query_one
 
         row = query_one(
@@ -106,18 +178,43 @@ class DbInventoryRepository:
             return PositionHold(user_id=user_id, trading_pair=trading_pair, controller_id=controller_id)
         return _row_to_hold(row)
 
+    def get(self, user_id: int, trading_pair: str, controller_id: str) -> PositionHold:
+        hold = _WRITE_BEHIND.get((user_id, trading_pair, controller_id))
+        if hold is not None:
+            return hold
+        if _WRITE_BEHIND.owns(controller_id):
+            return PositionHold(user_id=user_id, trading_pair=trading_pair, controller_id=controller_id)
+        return self._load(user_id, trading_pair, controller_id)
+
+    @staticmethod
+    def _overlay(rows: List[dict], live: List[PositionHold]) -> List[PositionHold]:
+        holds: Dict[HoldKey, PositionHold] = {}
+        for r in rows:
+            hold = _row_to_hold(r)
+            holds[(hold.user_id, hold.trading_pair, hold.controller_id)] = hold
+        for hold in live:
+            holds[(hold.user_id, hold.trading_pair, hold.controller_id)] = hold
+        return list(holds.values())
+
     def list_for_user(self, user_id: int) -> List[PositionHold]:
         from src.nadobro.db import query_all
 
-        return [_row_to_hold(r) for r in query_all(
-            "SELECT * FROM engine_position_hold WHERE user_id=%s", (user_id,))]
+        return self._overlay(
+            query_all("SELECT * FROM engine_position_hold WHERE user_id=%s", (user_id,)),
+            _WRITE_BEHIND.holds(user_id=user_id),
+        )
 
     def list_for_controller(self, user_id: int, controller_id: str) -> List[PositionHold]:
         from src.nadobro.db import query_all
 
-        return [_row_to_hold(r) for r in query_all(
-            "SELECT * FROM engine_position_hold WHERE user_id=%s AND controller_id=%s",
-            (user_id, controller_id))]
+        if _WRITE_BEHIND.owns(controller_id):
+            return _WRITE_BEHIND.holds(user_id=user_id, controller_id=controller_id)
+        return self._overlay(
+            query_all(
+                "SELECT * FROM engine_position_hold WHERE user_id=%s AND controller_id=%s",
+                (user_id, controller_id)),
+            _WRITE_BEHIND.holds(user_id=user_id, controller_id=controller_id),
+        )
 
     def clear_for_controller(self, controller_id: str) -> None:
         """Drop the controller's inventory rows. ``controller_id`` is stable
@@ -127,10 +224,65 @@ class DbInventoryRepository:
         from src.nadobro.db import execute
 
         try:
-            execute("DELETE FROM engine_position_hold WHERE controller_id=%s", (controller_id,))
+            _WRITE_BEHIND.reset_controller(
+                controller_id,
+                lambda: execute("DELETE FROM engine_position_hold WHERE controller_id=%s", (controller_id,)),
+                own=self.write_behind,
+            )
         except Exception:  # noqa: BLE001 - best-effort; a stale hold must not block start
             pass
 
+    def release_controller(self, controller_id: str) -> None:
+        """Flush and drop a stopped controller's in-memory holds (EngineRuntime.stop)."""
+        _WRITE_BEHIND.release_controller(controller_id)
+
+    def recover_controller(self, controller_id: str) -> List[PositionHold]:
+        """Start-of-run reset that keeps the CURRENT run's fills.
+
+        A fresh run has no trade rows yet, so this is ``clear_for_controller``.
+        A run re-adopted after a crash or a FAILED-controller rebuild gets its
+        holds rebuilt from the session's ``trades_<network>`` rows — the rows
+        the venue sync back-fills even for fills a crash kept out of
+        ``engine_position_hold``. Falls back to a plain clear on any error.
+        """
+        try:
+            holds = _holds_from_session_trades(controller_id)
+        except Exception:  # noqa: BLE001 - recovery is best-effort; a clean hold is the safe default
+            _recorder_logger.debug("hold rebuild from trades failed controller=%s", controller_id, exc_info=True)
+            holds = []
+        if not holds:
+            self.clear_for_controller(controller_id)
+            return []
+
+        from src.nadobro.db import run_transaction
+
+        def _replace(cur) -> None:
+            cur.execute("DELETE FROM engine_position_hold WHERE controller_id=%s", (controller_id,))
+            for h in holds:
+                cur.execute(
+                    """
+                    INSERT INTO engine_position_hold
+                      (user_id, trading_pair, controller_id, buy_amount_base, buy_amount_quote,
+                       sell_amount_base, sell_amount_quote, cum_fees_quote, updated_at)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
+                    """,
+                    (h.user_id, h.trading_pair, h.controller_id, h.buy_amount_base,
+                     h.buy_amount_quote, h.sell_amount_base, h.sell_amount_quote, h.cum_fees_quote),
+                )
+
+        try:
+            _WRITE_BEHIND.reset_controller(
+                controller_id, lambda: run_transaction(_replace), holds, own=self.write_behind,
+            )
+        except Exception:  # noqa: BLE001 - best-effort; a stale hold must not block start
+            _recorder_logger.warning("hold rebuild not persisted controller=%s", controller_id, exc_info=True)
+            self.clear_for_controller(controller_id)
+            return []
+        _recorder_logger.info(
+            "engine holds rebuilt from session trades controller=%s holds=%s", controller_id, len(holds),
+        )
+        return holds
+
 
 # --------------------------------------------------------------------------
 # Trade recorder (trades_<network>) — bridges Engine v2 fills into the legacy
@@ -156,6 +308,10 @@ _recorder_logger = _logging.getLogger(__name__)
 # which then equals the true total the trader paid (no double-count).
 _BUILDER_FEE_RATE = Decimal("0.0001")
 
+# ``_record`` default: resolve the running session itself. ``_record_batch``
+# passes the value it already looked up (``None`` included).
+_UNRESOLVED = object()
+
 
 def _parse_controller_id(controller_id: str) -> Optional[tuple[str, int, str]]:
     """``{strategy}:{user_id}:{network}`` → (strategy, user_id, network)."""
@@ -240,6 +396,74 @@ def _resolve_engine_fill_product(strategy: str, trading_pair: str, network: str)
     return int(product_id), str(product_name)
 
 
+def _holds_from_session_trades(controller_id: str) -> List[PositionHold]:
+    """The running session's holds, summed from its ``trades_<network>`` rows.
+
+    Pairs come from the session's ``engine_executors`` rows (the hold key is
+    the engine's trading pair, trade rows carry a product id); fees are the
+    venue total ``fill_fee + builder_fee``, matching what ``apply_fill`` adds.
+    """
+    from src.nadobro.db import query_all
+
+    parsed = _parse_controller_id(controller_id)
+    if parsed is None:
+        return []
+    strategy, user_id, network = parsed
+    session_id = resolve_running_session_id(strategy, user_id, network)
+    if session_id is None:
+        return []
+    pairs = [r["trading_pair"] for r in query_all(
+        "SELECT DISTINCT trading_pair FROM engine_executors "
+        "WHERE controller_id=%s AND strategy_session_id=%s",
+        (controller_id, int(session_id)),
+    )]
+    pair_by_product: Dict[int, str] = {}
+    for pair in pairs:
+        product_id, _name = _resolve_engine_fill_product(strategy, str(pair), network)
+        if product_id:
+            pair_by_product.setdefault(int(product_id), str(pair))
+    if not pair_by_product:
+        return []
+    table = "trades_testnet" if str(network).lower() == "testnet" else "trades_mainnet"
+    rows = query_all(
+        f"""
+        SELECT product_id,
+          SUM(CASE WHEN side IN ('long', 'buy') THEN qty ELSE 0 END)        AS buy_base,
+          SUM(CASE WHEN side IN ('long', 'buy') THEN qty * px ELSE 0 END)   AS buy_quote,
+          SUM(CASE WHEN side IN ('short', 'sell') THEN qty ELSE 0 END)      AS sell_base,
+          SUM(CASE WHEN side IN ('short', 'sell') THEN qty * px ELSE 0 END) AS sell_quote,
+          SUM(fee)                                                          AS fees
+        FROM (
+          SELECT product_id, side,
+                 ABS(COALESCE(fill_size, size, 0))                          AS qty,
+                 COALESCE(fill_price, price, 0)                             AS px,
+                 ABS(COALESCE(fill_fee, 0)) + ABS(COALESCE(builder_fee, 0)) AS fee
+          FROM {table}
+          WHERE strategy_session_id = %s AND product_id = ANY(%s)
+            AND status IN ('filled', 'closed', 'partially_filled')
+        ) t
+        GROUP BY product_id
+        """,
+        (int(session_id), list(pair_by_product)),
+    )
+    holds = []
+    for r in rows:
+        hold = PositionHold(
+            user_id=int(user_id),
+            trading_pair=pair_by_product[int(r["product_id"])],
+            controller_id=controller_id,
+            buy_amount_base=_dec(r["buy_base"] or 0),
+            buy_amount_quote=_dec(r["buy_quote"] or 0),
+            sell_amount_base=_dec(r["sell_base"] or 0),
+            sell_amount_quote=_dec(r["sell_quote"] or 0),
+            cum_fees_quote=_dec(r["fees"] or 0),
+            updated_at=time.time(),
+        )
+        if hold.buy_amount_base or hold.sell_amount_base:
+            holds.append(hold)
+    return holds
+
+
 class DbTradeRecorder:
     """Writes each engine fill into ``trades_<network>`` tagged with the
     active ``strategy_session_id``. Injected into executors by the runtime
@@ -248,8 +472,14 @@ class DbTradeRecorder:
 
     Resolution is keyed entirely off ``controller_id`` (``{strategy}:{user}:
     {network}``) — executors carry it, so no extra session plumbing is needed.
+
+    ``write_behind=True`` queues fills for the shared write-behind flusher,
+    which records them in batches (``_record_batch``) instead of on the tick.
     """
 
+    def __init__(self, *, write_behind: bool = False) -> None:
+        self.write_behind = bool(write_behind)
+
     def _resolve_session_id(self, strategy: str, user_id: int, network: str) -> Optional[int]:
         return resolve_running_session_id(strategy, user_id, network)
 
@@ -270,6 +500,15 @@ class DbTradeRecorder:
         """Best-effort: persist one engine fill. Never raises — fill recording
         must not break execution (same policy as the inventory/registry writes).
         """
+        if self.write_behind:
+            # Stamp now: the row's created_at must be the fill time, not the flush time.
+            _WRITE_BEHIND.enqueue_fill((
+                self,
+                (controller_id, trading_pair, side, amount_base, price, fee_quote,
+                 order_id, timestamp if timestamp else time.time()),
+                {"realized_pnl": realized_pnl, "is_taker": is_taker},
+            ))
+            return
         try:
             self._record(
                 controller_id, trading_pair, side, amount_base, price, fee_quote,
@@ -282,6 +521,50 @@ class DbTradeRecorder:
                 controller_id, exc_info=True,
             )
 
+    def _record_batch(self, batch: list) -> None:
+        """Record queued fills with one session lookup per controller and one
+        venue dedupe probe per network for the whole batch."""
+        from src.nadobro.db import query_all
+
+        sessions: Dict[tuple, object] = {}
+        digests: Dict[str, set] = {}
+        for args, _kwargs in batch:
+            parsed = _parse_controller_id(args[0])
+            if parsed is None:
+                continue
+            if parsed not in sessions:
+                try:
+                    sessions[parsed] = self._resolve_session_id(*parsed)
+                except Exception:  # noqa: BLE001 - _record resolves (and reports) per fill
+                    sessions[parsed] = _UNRESOLVED
+            if args[6]:
+                digests.setdefault(parsed[2], set()).add(str(args[6]))
+        recorded: Dict[str, Optional[set]] = {}
+        for network, wanted in digests.items():
+            tbl = "trades_testnet" if str(network).lower() == "testnet" else "trades_mainnet"
+            try:
+                recorded[network] = {str(r["order_digest"]) for r in query_all(
+                    f"SELECT DISTINCT order_digest FROM {tbl} "
+                    f"WHERE order_digest = ANY(%s) AND submission_idx IS NOT NULL",
+                    (sorted(wanted),),
+                )}
+            except Exception:  # noqa: BLE001 - dedupe probe is best-effort
+                recorded[network] = None
+        for args, kwargs in batch:
+            parsed = _parse_controller_id(args[0])
+            try:
+                self._record(
+                    *args, **kwargs,
+                    session_id=sessions.get(parsed, _UNRESOLVED),
+                    recorded_digests=recorded.get(parsed[2]) if parsed else None,
+                )
+            except Exception:  # noqa: BLE001 - persistence must never break a fill
+                _recorder_logger.warning(
+                    "engine fill not recorded to trades for controller=%s — "
+                    "session volume/PnL counters will undercount",
+                    args[0], exc_info=True,
+                )
+
     def _record(
         self,
         controller_id: str,
@@ -295,6 +578,8 @@ class DbTradeRecorder:
         *,
         realized_pnl: object,
         is_taker: bool,
+        session_id: object = _UNRESOLVED,
+        recorded_digests: Optional[set] = None,
     ) -> None:
         from datetime import datetime, timezone
 
@@ -305,7 +590,8 @@ class DbTradeRecorder:
             return
         strategy, user_id, network = parsed
 
-        session_id = self._resolve_session_id(strategy, user_id, network)
+        if session_id is _UNRESOLVED:
+            session_id = self._resolve_session_id(strategy, user_id, network)
         source = "strategy"
         if session_id is None:
             # Resolved per fill (indexed lookup) rather than cached, so a new run
@@ -378,17 +664,22 @@ class DbTradeRecorder:
             # (not duplicated); when venue-sync runs first (it can beat the
             # executor's fill detection by tens of seconds), this guard stops the
             # recorder from double-counting the fill.
-            from src.nadobro.db import query_one as _qone
-            _tbl = "trades_testnet" if str(network).lower() == "testnet" else "trades_mainnet"
-            try:
-                if _qone(
-                    f"SELECT 1 FROM {_tbl} WHERE order_digest = %s "
-                    f"AND submission_idx IS NOT NULL LIMIT 1",
-                    (str(order_id),),
-                ):
+            if recorded_digests is not None:
+                # Batched: _record_batch probed every digest in one query.
+                if str(order_id) in recorded_digests:
                     return
-            except Exception:  # noqa: BLE001 - dedupe probe is best-effort
-                pass
+            else:
+                from src.nadobro.db import query_one as _qone
+                _tbl = "trades_testnet" if str(network).lower() == "testnet" else "trades_mainnet"
+                try:
+                    if _qone(
+                        f"SELECT 1 FROM {_tbl} WHERE order_digest = %s "
+                        f"AND submission_idx IS NOT NULL LIMIT 1",
+                        (str(order_id),),
+                    ):
+                        return
+                except Exception:  # noqa: BLE001 - dedupe probe is best-effort
+                    pass
         if realized_pnl is not None:
             data["realized_pnl"] = str(_dec(realized_pnl))
         insert_trade(data, network=network)
@@ -576,6 +867,12 @@ class DbKillSwitchStore(KillSwitchStore):
     def engage(self, reason: str) -> None:
         from src.nadobro.db import execute
 
+        # Durable barrier first: the holds/fills that led to the breach must be
+        # in Postgres before anything reads the engaged switch.
+        try:
+            flush_engine_writes()
+        except Exception:  # noqa: BLE001 - never block engaging the kill switch
+            _recorder_logger.warning("engine write-behind flush before kill switch failed", exc_info=True)
         execute(
             "INSERT INTO engine_kill_switch (scope, engaged, reason, updated_at) "
             "VALUES (%s, TRUE, %s, NOW()) "
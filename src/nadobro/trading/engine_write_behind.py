@@ -0,0 +1,286 @@
+"""Write-behind buffer for engine inventory and fill recording.
+
+Engine executors call ``DbInventoryRepository.apply_fill`` and
+``DbTradeRecorder.record`` inside the controller tick. Written through, a grid
+burst of 30 fills costs 30+ blocking Postgres round trips before the tick can
+return. This buffer keeps the authoritative position holds in memory, updated
+synchronously, and persists them from a background thread:
+
+- inventory deltas coalesce per ``(user_id, trading_pair, controller_id)`` and
+  go out as one additive multi-row upsert per pass;
+- queued fills are handed to the recorder as one batch, so per-fill lookups
+  (running session, venue dedupe probe) run once per batch.
+
+Nothing waits longer than ``lag_seconds`` to reach the DB. ``flush`` is the
+durable barrier: the runtime calls it on stop and before the kill switch
+engages. A failed inventory pass puts its deltas back for the next pass. A
+crash can still lose up to one lag window; ``DbInventoryRepository.
+recover_controller`` rebuilds a run's holds from its trade rows on restart.
+
+Single owner: the process that runs a controller is the only writer of its
+holds. Other processes read the DB and see holds at most one lag window late.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+import time
+from dataclasses import replace
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.nadobro.core.perf import record_metric
+from src.nadobro.engine.inventory import HoldKey, PositionHold
+from src.nadobro.engine.types import TradeType, _dec
+
+logger = logging.getLogger(__name__)
+
+# (user_id, trading_pair, controller_id, buy_base, buy_quote, sell_base,
+#  sell_quote, fees) — one coalesced row per hold per pass.
+HoldDelta = Tuple[int, str, str, Decimal, Decimal, Decimal, Decimal, Decimal]
+
+
+class EngineWriteBehind:
+    def __init__(
+        self,
+        *,
+        write_deltas: Callable[[List[HoldDelta]], None],
+        record_fills: Callable[[List[Any]], None],
+        lag_seconds: float = 0.5,
+    ) -> None:
+        self._write_deltas = write_deltas
+        self._record_fills = record_fills
+        self.lag_seconds = max(0.05, float(lag_seconds))
+        self._holds: Dict[HoldKey, PositionHold] = {}
+        self._deltas: Dict[HoldKey, List[Decimal]] = {}
+        self._fills: List[Any] = []
+        # Controllers whose rows this process just reset: a hold missing from
+        # memory is known to be zero in the DB, so no load round trip.
+        self._fresh: set[str] = set()
+        self._lock = threading.RLock()
+        # Serializes DB passes so a reset can never interleave with a flush.
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._atexit_registered = False
+        self._stats = {
+            "fills_applied": 0,
+            "holds_loaded": 0,
+            "fills_queued": 0,
+            "flushes": 0,
+            "rows_written": 0,
+            "fills_recorded": 0,
+            "flush_errors": 0,
+        }
+
+    # -- inventory -----------------------------------------------------------
+
+    def get(self, key: HoldKey) -> Optional[PositionHold]:
+        with self._lock:
+            hold = self._holds.get(key)
+            return replace(hold) if hold is not None else None
+
+    def holds(self, *, user_id: int, controller_id: Optional[str] = None) -> List[PositionHold]:
+        with self._lock:
+            return [
+                replace(h) for h in self._holds.values()
+                if h.user_id == user_id and (controller_id is None or h.controller_id == controller_id)
+            ]
+
+    def apply_fill(
+        self,
+        key: HoldKey,
+        side: TradeType,
+        base_qty: object,
+        quote_qty: object,
+        fee_quote: object,
+        timestamp: Optional[float],
+        *,
+        load: Callable[[], PositionHold],
+    ) -> PositionHold:
+        """Apply one fill to the in-memory hold and queue its delta.
+
+        ``load`` reads the persisted hold; it runs once per hold per process
+        (never for a controller this process reset).
+        """
+        base, quote, fee = _dec(base_qty), _dec(quote_qty), _dec(fee_quote)
+        if not (base.is_finite() and quote.is_finite() and fee.is_finite()):
+            raise ValueError(f"fill quantities must be finite (base={base}, quote={quote}, fee={fee})")
+        if base < 0 or quote < 0:
+            raise ValueError("fill quantities must be non-negative")
+        loaded: Optional[PositionHold] = None
+        with self._lock:
+            known = key in self._holds or key[2] in self._fresh
+        if not known:
+            loaded = load()
+        with self._lock:
+            hold = self._holds.get(key)
+            if hold is None:
+                if loaded is not None:
+                    self._stats["holds_loaded"] += 1
+                hold = loaded or PositionHold(user_id=key[0], trading_pair=key[1], controller_id=key[2])
+                self._holds[key] = hold
+            delta = self._deltas.setdefault(key, [Decimal(0)] * 5)
+            if side is TradeType.BUY:
+                hold.buy_amount_base += base
+                hold.buy_amount_quote += quote
+                delta[0] += base
+                delta[1] += quote
+            else:
+                hold.sell_amount_base += base
+                hold.sell_amount_quote += quote
+                delta[2] += base
+                delta[3] += quote
+            hold.cum_fees_quote += fee
+            delta[4] += fee
+            hold.updated_at = timestamp if timestamp is not None else time.time()
+            self._stats["fills_applied"] += 1
+            out = replace(hold)
+        self._ensure_flusher()
+        return out
+
+    def reset_controller(
+        self,
+        controller_id: str,
+        write: Callable[[], None],
+        holds: Iterable[PositionHold] = (),
+        *,
+        own: bool = True,
+    ) -> None:
+        """Drop the controller's holds and pending deltas and run ``write``
+        (which replaces its DB rows). With ``own`` this process becomes the
+        controller's writer and serves ``holds`` from memory.
+
+        If ``write`` raises, memory is left empty and later fills load from the
+        DB again; the error propagates.
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._fresh.discard(controller_id)
+                for key in [k for k in self._holds if k[2] == controller_id]:
+                    self._holds.pop(key, None)
+                    self._deltas.pop(key, None)
+            write()
+            if not own:
+                return
+            with self._lock:
+                self._fresh.add(controller_id)
+                for hold in holds:
+                    self._holds[(hold.user_id, hold.trading_pair, hold.controller_id)] = replace(hold)
+
+    def owns(self, controller_id: str) -> bool:
+        """True when every hold of ``controller_id`` is in memory (this process
+        reset it and is its writer), so reads need no DB round trip."""
+        with self._lock:
+            return controller_id in self._fresh
+
+    def release_controller(self, controller_id: str) -> None:
+        """Persist and forget a stopped controller's holds; later reads go to the DB."""
+        self.flush()
+        with self._flush_lock, self._lock:
+            self._fresh.discard(controller_id)
+            for key in [k for k in self._holds if k[2] == controller_id and k not in self._deltas]:
+                self._holds.pop(key, None)
+
+    # -- fills ---------------------------------------------------------------
+
+    def enqueue_fill(self, item: Any) -> None:
+        with self._lock:
+            self._fills.append(item)
+            self._stats["fills_queued"] += 1
+        self._ensure_flusher()
+
+    # -- writeback -----------------------------------------------------------
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._deltas) + len(self._fills)
+
+    def flush(self) -> int:
+        """Persist every queued delta and fill now; returns how many were written."""
+        with self._flush_lock:
+            with self._lock:
+                deltas, self._deltas = self._deltas, {}
+                fills, self._fills = self._fills, []
+            if not deltas and not fills:
+                return 0
+            started = time.perf_counter()
+            written = 0
+            if deltas:
+                rows: List[HoldDelta] = [(k[0], k[1], k[2], *d) for k, d in deltas.items()]
+                try:
+                    self._write_deltas(rows)
+                    written += len(rows)
+                    self._stats["rows_written"] += len(rows)
+                except Exception:
+                    self._requeue(deltas)
+                    self._stats["flush_errors"] += 1
+                    logger.warning(
+                        "engine inventory writeback failed (%s holds); will retry",
+                        len(rows), exc_info=True,
+                    )
+            if fills:
+                try:
+                    self._record_fills(fills)
+                    written += len(fills)
+                    self._stats["fills_recorded"] += len(fills)
+                except Exception:  # noqa: BLE001 - the recorder is best-effort, like the write-through path
+                    self._stats["flush_errors"] += 1
+                    logger.warning(
+                        "engine fill batch not recorded (%s fills) — session "
+                        "volume/PnL counters will undercount", len(fills), exc_info=True,
+                    )
+            with self._lock:
+                self._stats["flushes"] += 1
+            record_metric("engine.write_behind.flush", (time.perf_counter() - started) * 1000.0)
+            return written
+
+    def _requeue(self, deltas: Dict[HoldKey, List[Decimal]]) -> None:
+        with self._lock:
+            for key, delta in deltas.items():
+                current = self._deltas.setdefault(key, [Decimal(0)] * 5)
+                for i, value in enumerate(delta):
+                    current[i] += value
+
+    def _ensure_flusher(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._flusher, name="engine-write-behind", daemon=True,
+            )
+            self._thread.start()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+
+    def _flusher(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.lag_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:  # noqa: BLE001 - the writeback loop must survive
+                logger.warning("engine write-behind pass failed", exc_info=True)
+
+    def close(self) -> None:
+        """Stop the writeback thread and flush everything still queued."""
+        self._stop.set()
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=max(1.0, self.lag_seconds * 2))
+        self._thread = None
+        self.flush()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["holds"] = len(self._holds)
+            out["pending_holds"] = len(self._deltas)
+            out["pending_fills"] = len(self._fills)
+        return out
@@ -9,6 +9,8 @@ from src.nadobro.models.database import (
     TradeStatus, OrderSide, OrderTypeEnum, NetworkMode,
     get_last_trade_for_rate_limit, insert_trade, update_trade, get_trades_by_user,
     find_open_trade, insert_fill_sync, get_trade_by_id,
+    advance_round_trips, get_round_trip, get_round_trips_page, has_round_trip_state,
+    round_trip_history_epoch,
 )
 from src.nadobro.config import (
     get_dn_pair,
@@ -3139,203 +3141,93 @@ def compute_round_trips(
     network: str,
     *,
     limit: int = 100,
+    before: tuple | None = None,
 ) -> list[dict]:
     """FIFO-pair manual fills into round-trips.
 
-    Walks every ``trades_<network>`` row owned by ``telegram_id`` that is
+    Covers every ``trades_<network>`` row owned by ``telegram_id`` that is
     NOT tagged with a ``strategy_session_id`` (i.e. text-to-trade,
     manual buttons, or venue-sync rows that couldn't be back-linked to a
     strategy intent). Lots are matched per
     ``(product_id, isolated)`` with FIFO; each close emits a round-trip
-    record.
+    record (``quant.round_trips.fold_round_trips``).
+
+    Served from the persisted ``round_trips`` ledger alone: nado_sync
+    advances it as fills are ingested, and a read only advances it once for
+    a user it has never paired (a page read, not a fill scan, otherwise).
+    The full re-pairing below is the fallback when the ledger is disabled or
+    unavailable.
 
     The result is sorted newest-first by ``close_ts`` and capped at
-    ``limit``. The ``trip_key`` is the close trade id (stable for the
-    Share PnL callback ``portfolio:share_pnl:rt:{key}``).
+    ``limit``; ``before`` (the ``(close_ts, trip_key)`` of the previous
+    page's last trip) continues from there. The ``trip_key`` is the close
+    trade id (stable for the Share PnL callback
+    ``portfolio:share_pnl:rt:{key}``).
     """
-    from src.nadobro.db import query_all as _query_all
-
-    def _history_epoch() -> str:
-        # Override with NADO_HISTORY_EPOCH (ISO timestamp) if pre-fix rows are
-        # ever repaired enough to extend the window backwards.
-        import os
+    from src.nadobro.core.feature_flags import round_trip_ledger_enabled
 
-        from src.nadobro.connectors.provider_config import clean_env_value
+    if round_trip_ledger_enabled():
+        try:
+            page = get_round_trips_page(telegram_id, network, limit=limit, before=before)
+            if not page and not has_round_trip_state(telegram_id, network):
+                advance_round_trips(telegram_id, network)
+                page = get_round_trips_page(telegram_id, network, limit=limit, before=before)
+            return page
+        except Exception:
+            logger.warning("round-trip ledger read failed user=%s; re-pairing", telegram_id, exc_info=True)
 
-        return clean_env_value(os.environ.get("NADO_HISTORY_EPOCH")) or "2026-07-09T00:00:00+00:00"
+    from src.nadobro.db import query_all as _query_all
+    from src.nadobro.models.database import (
+        _ROUND_TRIP_FILL_COLUMNS,
+        _ROUND_TRIP_FILL_ORDER,
+        _ROUND_TRIP_FILL_WHERE,
+    )
+    from src.nadobro.quant.round_trips import fold_round_trips, newest_first
 
     table = "trades_testnet" if str(network).lower() == "testnet" else "trades_mainnet"
     try:
         rows = _query_all(
             f"""
-            SELECT id, product_id, product_name, side, status,
-                   COALESCE(fill_size, size, 0) AS sz,
-                   COALESCE(NULLIF(fill_price, 0), price, 0) AS px,
-                   COALESCE(fill_fee, fees, 0) + COALESCE(builder_fee, 0) AS fee,
-                   COALESCE(realized_pnl, pnl, 0) AS realized_pnl,
-                   COALESCE(funding_paid, 0) AS funding_paid,
-                   COALESCE(isolated, false) AS isolated,
-                   COALESCE(leverage, 0) AS leverage,
-                   order_type,
-                   COALESCE(filled_at, created_at) AS ts
+            SELECT {_ROUND_TRIP_FILL_COLUMNS}
             FROM {table}
-            WHERE user_id = %s
-              AND strategy_session_id IS NULL
-              AND COALESCE(source, 'manual') = 'manual'
-              AND status IN ('filled', 'closed', 'partially_filled')
-              -- Authoritative venue fills only. submission_idx is UNIQUE (dedup
-              -- index) so each real fill appears once, and the bot's synthetic
-              -- ``MARKET_CLOSE`` rows (account-wide, no submission_idx) are excluded
-              -- so they can't double-count or over-close the FIFO inventory.
-              AND submission_idx IS NOT NULL
-              -- Product-less venue fills (product_id 0 — this indexer's match feed
-              -- carries no product_id) can't be paired per product without mixing
-              -- BTC with ETH, so they're excluded rather than shown WRONG. The
-              -- recording fix (resolve product_id at insert) lands separately.
-              AND COALESCE(product_id, 0) <> 0
-              -- History epoch: before 2026-07-09 the manual stream has PROVABLE
-              -- holes (desk fills unrecorded, ~500 unattributable product_id=0
-              -- legs), so FIFO pairings crossing that era fabricate multi-day
-              -- holds (an old lot whose real close is invisible gets "closed"
-              -- by a much later fill). Pair only the complete-recording era.
-              AND COALESCE(filled_at, created_at) >= %s::timestamptz
-            ORDER BY COALESCE(filled_at, created_at) ASC, id ASC
+            WHERE {_ROUND_TRIP_FILL_WHERE}
+            ORDER BY {_ROUND_TRIP_FILL_ORDER}
             """,
-            (int(telegram_id), _history_epoch()),
+            (int(telegram_id), round_trip_history_epoch()),
         )
     except Exception:
         logger.warning("compute_round_trips failed user=%s", telegram_id, exc_info=True)
         return []
 
-    inventory: dict[tuple[int, bool], list[dict]] = {}
-    round_trips: list[dict] = []
-    for row in rows or []:
-        side = str(row.get("side") or "").lower()
-        order_type = str(row.get("order_type") or "").upper()
-        product_id = int(row.get("product_id") or 0)
-        isolated = bool(row.get("isolated"))
-        key = (product_id, isolated)
-        size = float(row.get("sz") or 0)
-        if size <= 0:
-            continue
-        price = float(row.get("px") or 0)
-        # A fill without a resolvable price carries NO price information: queued
-        # as an open lot at $0 it turns every later close into "entry @ $0.00,
-        # PnL = full exit notional"; as a close it emits an all-zero trip. Same
-        # philosophy as the product_id=0 exclusion above — skip rather than show
-        # WRONG. (Migration 0015 + the match-sync human-column backfill repair
-        # the rows that have the venue x18 quote; the rest have no price data.)
-        if price <= 0:
-            continue
-        fee = float(row.get("fee") or 0)
-        funding = float(row.get("funding_paid") or 0)
-        leverage = float(row.get("leverage") or 0)
-        ts = row.get("ts")
-        product_name = str(row.get("product_name") or "")
-        # Reduce-only closes (close orders) always pop the FIFO regardless
-        # of side. Otherwise we pop opposite-side lots and queue same-side.
-        is_close = "CLOSE" in order_type
-        queued = inventory.setdefault(key, [])
-        existing_side = queued[0]["side"] if queued else None
-        opposite = existing_side and existing_side != side
-        if is_close or opposite:
-            remaining = size
-            close_fees = fee
-            close_funding = funding
-            open_lots: list[dict] = []
-            while remaining > 1e-12 and queued:
-                lot = queued[0]
-                take = min(lot["size"], remaining)
-                lot_share = take / lot["size"] if lot["size"] > 0 else 1.0
-                open_lots.append({
-                    "trade_id": lot["trade_id"],
-                    "size": take,
-                    "price": lot["price"],
-                    "ts": lot["ts"],
-                    "fees": lot["fees"] * lot_share,
-                    "funding": lot["funding"] * lot_share,
-                    "leverage": lot.get("leverage") or 0.0,
-                })
-                lot["size"] -= take
-                lot["fees"] -= lot["fees"] * lot_share
-                lot["funding"] -= lot["funding"] * lot_share
-                remaining -= take
-                if lot["size"] <= 1e-12:
-                    queued.pop(0)
-            if open_lots:
-                total_open_qty = sum(l["size"] for l in open_lots) or 1.0
-                avg_open = sum(l["price"] * l["size"] for l in open_lots) / total_open_qty
-                open_fees = sum(l["fees"] for l in open_lots)
-                open_funding = sum(l["funding"] for l in open_lots)
-                # Both legs use the MATCHED quantity. Using the close row's full
-                # size overstated a partially-matched close (its leftover opens a
-                # new lot whose notional is counted again when THAT trip closes).
-                volume_usd = total_open_qty * (avg_open + price)
-                # Realized PnL is DERIVED from open/close prices, NOT read from the
-                # per-fill ``realized_pnl`` column — this venue reports none, so that
-                # column is always 0 and every venue-closed manual trade showed PnL 0.
-                # Gross of fees (fees are a separate field), consistent with the
-                # session/portfolio surfaces. FIFO-derived total over a full
-                # round-trip equals the avg-cost engine's (pair_fills_into_trades).
-                opened_long = existing_side in ("long", "buy")
-                derived_realized = sum(
-                    ((price - l["price"]) if opened_long else (l["price"] - price)) * l["size"]
-                    for l in open_lots
-                )
-                round_trips.append({
-                    "trip_key": str(row.get("id")),
-                    "product_id": product_id,
-                    "product_name": product_name,
-                    "pair": product_name,
-                    "isolated": isolated,
-                    "side": "long" if existing_side in ("long", "buy") else "short",
-                    "size": min(total_open_qty, size),
-                    "leverage": open_lots[0].get("leverage") or 0.0,
-                    "avg_open_price": avg_open,
-                    "avg_close_price": price,
-                    "open_ts": open_lots[0]["ts"],
-                    "close_ts": ts,
-                    "fees": open_fees + close_fees,
-                    "funding_paid": open_funding + close_funding,
-                    "realized_pnl": derived_realized,
-                    "volume_usd": volume_usd,
-                })
-            if remaining > 1e-12:
-                # Close was bigger than inventory — record the leftover as
-                # an opening lot for the opposite side.
-                queued.append({
-                    "trade_id": int(row.get("id") or 0),
-                    "side": "long" if side in ("long", "buy") else "short",
-                    "size": remaining,
-                    "price": price,
-                    "fees": fee * (remaining / size),
-                    "funding": funding * (remaining / size),
-                    "leverage": leverage,
-                    "ts": ts,
-                })
-        else:
-            queued.append({
-                "trade_id": int(row.get("id") or 0),
-                "side": side if side in ("long", "short", "buy", "sell") else "long",
-                "size": size,
-                "price": price,
-                "fees": fee,
-                "funding": funding,
-                "leverage": leverage,
-                "ts": ts,
-            })
-
-    round_trips.sort(key=lambda r: (r.get("close_ts") or ""), reverse=True)
+    round_trips = newest_first(fold_round_trips(rows, {}))
+    if before is not None:
+        close_ts, trip_key = before
+        round_trips = [
+            r for r in round_trips
+            if r["close_ts"] < close_ts or (r["close_ts"] == close_ts and int(r["trip_key"]) > int(trip_key))
+        ]
     return round_trips[: max(1, int(limit))]
 
 
 def find_round_trip(telegram_id: int, network: str, trip_key: str) -> dict | None:
     """Return the single round-trip whose ``trip_key`` matches.
 
-    Uses :func:`compute_round_trips` so the result is consistent with the
-    History UI. Returns ``None`` when no match is found.
+    A primary-key read of the persisted ledger, consistent with the History
+    UI; like ``compute_round_trips`` it only advances the ledger for a user
+    never paired before. Returns ``None`` when no match is found.
     """
+    from src.nadobro.core.feature_flags import round_trip_ledger_enabled
+
     target = str(trip_key)
+    if round_trip_ledger_enabled():
+        try:
+            trip = get_round_trip(telegram_id, network, target)
+            if trip is None and not has_round_trip_state(telegram_id, network):
+                advance_round_trips(telegram_id, network)
+                trip = get_round_trip(telegram_id, network, target)
+            return trip
+        except Exception:
+            logger.warning("round-trip ledger lookup failed user=%s; re-pairing", telegram_id, exc_info=True)
     for trip in compute_round_trips(telegram_id, network, limit=500):
         if str(trip.get("trip_key")) == target:
             return trip
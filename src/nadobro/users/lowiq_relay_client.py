@@ -26,6 +26,15 @@ def relay_poll_interval_seconds() -> int:
         return 2
 
 
+def relay_long_poll_seconds() -> float:
+    """How long one batch poll is held at the relay (0 = per-session polling)."""
+    raw = (os.environ.get("LOWIQPTS_RELAY_LONG_POLL_SECONDS") or "20").strip()
+    try:
+        return max(0.0, min(60.0, float(raw)))
+    except ValueError:
+        return 20.0
+
+
 def relay_is_configured() -> bool:
     return bool(relay_base_url())
 
@@ -47,12 +56,22 @@ async def _get_client() -> Optional[httpx.AsyncClient]:
     return _shared_client
 
 
-async def _request(method: str, path: str, *, json: Optional[dict[str, Any]] = None, params: Optional[dict[str, Any]] = None) -> dict:
+async def _request(
+    method: str,
+    path: str,
+    *,
+    json: Optional[dict[str, Any]] = None,
+    params: Optional[dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+) -> dict:
     client = await _get_client()
     if client is None:
         return {"ok": False, "error": "relay_not_configured"}
     try:
-        response = await client.request(method, path, json=json, params=params)
+        kwargs: dict[str, Any] = {"json": json, "params": params}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        response = await client.request(method, path, **kwargs)
         response.raise_for_status()
         data = response.json()
         if isinstance(data, dict):
@@ -114,6 +133,36 @@ async def poll_events(*, session_id: str, cursor: Optional[str]) -> dict:
     return await _request("GET", "/events/poll", params=params)
 
 
+async def poll_events_batch(*, cursors: dict[str, Optional[str]], wait_seconds: float = 0.0) -> dict:
+    """One held poll for every session: ``{"ok", "sessions": {id: poll_events-shaped}}``."""
+    payload = {
+        "sessions": [
+            {"session_id": str(sid), "cursor": (str(cursor) if cursor else None)}
+            for sid, cursor in cursors.items()
+        ],
+        "limit": _DEFAULT_POLL_LIMIT,
+        "wait_seconds": float(wait_seconds),
+    }
+    # The hold can outlast the default client timeout; give it its own.
+    timeout = max(_DEFAULT_TIMEOUT_SECONDS, float(wait_seconds) + 15.0)
+    return await _request("POST", "/events/poll_batch", json=payload, timeout=timeout)
+
+
+async def fetch_event_photo(*, session_id: str, event_id: int) -> tuple[Optional[bytes], Optional[str]]:
+    """Photo bytes for a batch event's ``photo_ref`` (``(None, None)`` on failure)."""
+    client = await _get_client()
+    if client is None:
+        return None, None
+    try:
+        response = await client.get(f"/events/{int(event_id)}/photo", params={"session_id": str(session_id)})
+        response.raise_for_status()
+    except Exception as e:
+        logger.warning("LOWIQ relay photo fetch failed event=%s: %s", event_id, e)
+        return None, None
+    mime = (response.headers.get("content-type") or "image/jpeg").split(";")[0].strip() or "image/jpeg"
+    return (response.content or None), mime
+
+
 async def close_session(*, session_id: str, reason: Optional[str] = None) -> dict:
     payload: dict[str, Any] = {"session_id": str(session_id)}
     if reason:
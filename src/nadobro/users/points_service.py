@@ -11,7 +11,9 @@ from src.nadobro.utils.env import env_int
 from src.nadobro.users.points_ui import points_followup_options_kb, points_scope_kb
 from src.nadobro.users.lowiq_relay_client import (
     close_session as relay_close_session,
+    fetch_event_photo as relay_fetch_event_photo,
     poll_events as relay_poll_events,
+    poll_events_batch as relay_poll_events_batch,
     relay_is_configured,
     send_user_reply_option as relay_send_user_reply_option,
     send_user_reply as relay_send_user_reply,
@@ -87,6 +89,17 @@ _RELAY_CURSOR_KEY = "lowiqpts_relay_cursor"
 # bot_data is process memory; persist the pending queue + cursors here so a bot
 # restart mid-refresh can resume instead of silently dropping the user's request.
 _RELAY_STATE_KEY = "lowiqpts_relay_state"
+# A relay without /events/poll_batch (older deploy) answers 404/405; fall back
+# to per-session polls and retry the batch endpoint after this long.
+_BATCH_POLL_RETRY_SECONDS = 600.0
+_batch_poll_unsupported_until = 0.0
+# Sessions per batch request (the relay's MAX_BATCH_SESSIONS); larger sets go
+# out as concurrent held requests.
+_BATCH_POLL_MAX_SESSIONS = 200
+# Set when a refresh starts a relay session, so a held batch poll that does
+# not cover it is abandoned and re-issued at once. (loop, event) — an
+# asyncio.Event must not outlive the loop it was first awaited on.
+_relay_sessions_added: Optional[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = None
 
 _WALLET_RE = re.compile(r"0x[a-fA-F0-9]{40}")
 _NO_POINTS_HINT_RE = re.compile(
@@ -465,6 +478,17 @@ def _extract_event_photo(event: dict) -> tuple[Optional[bytes], Optional[str]]:
     return raw, mime
 
 
+def _extract_event_photo_ref(event: dict) -> Optional[int]:
+    """Event id whose photo the relay serves separately (batch polls)."""
+    if not isinstance(event, dict) or event.get("photo_base64"):
+        return None
+    try:
+        ref = int(event.get("photo_ref") or 0)
+    except (TypeError, ValueError):
+        return None
+    return ref or None
+
+
 def _relay_photo_filename(mime: Optional[str]) -> str:
     m = (mime or "").lower()
     if "png" in m:
@@ -714,6 +738,7 @@ async def request_points_refresh(context, telegram_id: int, chat_id: int) -> dic
         return {"ok": False, "error": "❌ Could not start LOWIQPTS session. Try again shortly."}
 
     req["relay_session_id"] = session_id
+    _wake_relay_long_poll()
     _schedule_timeout(context.application, req_id)
     await _persist_relay_state(bot_data)
     # Deploy/runtime verification: this line + the rehydration log together prove
@@ -820,13 +845,16 @@ async def relay_user_reply_to_lowiqpts(context, chat_id: int, text: str) -> dict
 async def _process_relay_event(bot_app, bot_data: dict, event: dict) -> None:
     text = _extract_event_text(event)
     photo_bytes, photo_mime = _extract_event_photo(event)
-    if not text.strip() and not photo_bytes:
+    photo_ref = _extract_event_photo_ref(event)
+    if not text.strip() and not photo_bytes and photo_ref is None:
         return
 
     session_id = _extract_event_session_id(event)
     req = _claim_pending_for_event(bot_data, session_id, text)
     if not req:
         return
+    if not photo_bytes and photo_ref is not None:
+        photo_bytes, photo_mime = await relay_fetch_event_photo(session_id=session_id, event_id=photo_ref)
 
     chat_id = int(req.get("chat_id"))
     telegram_id = int(req.get("telegram_id"))
@@ -1042,9 +1070,107 @@ async def _finalize_dead_session(bot_app, bot_data: dict, session_id: str, statu
             logger.warning("Failed to deliver LOWIQPTS session-ended notice: %s", e)
 
 
-async def poll_lowiqpts_relay_events(bot_app) -> None:
+def _relay_sessions_added_event() -> asyncio.Event:
+    global _relay_sessions_added
+    loop = asyncio.get_running_loop()
+    if _relay_sessions_added is None or _relay_sessions_added[0] is not loop:
+        _relay_sessions_added = (loop, asyncio.Event())
+    return _relay_sessions_added[1]
+
+
+def _wake_relay_long_poll() -> None:
+    """A relay session was started: cut short a held batch poll that lacks it."""
+    try:
+        _relay_sessions_added_event().set()
+    except RuntimeError:  # no running loop
+        pass
+
+
+async def _poll_relay_chunk(cursors: dict[str, Optional[str]], wait_seconds: float) -> Optional[dict]:
+    """One batch request; None to poll its sessions one by one this round."""
+    global _batch_poll_unsupported_until
+    response = await relay_poll_events_batch(cursors=cursors, wait_seconds=wait_seconds)
+    sessions = response.get("sessions") if response.get("ok") else None
+    if isinstance(sessions, dict):
+        return sessions
+    status_code = response.get("status_code")
+    if status_code in (404, 405):
+        _batch_poll_unsupported_until = time.time() + _BATCH_POLL_RETRY_SECONDS
+        logger.info("LOWIQ relay has no batch poll endpoint; polling sessions one by one")
+        return None
+    if status_code == 422 and len(cursors) > 1:
+        # Rejected as too large (a relay with a lower session cap): split.
+        items = list(cursors.items())
+        half = len(items) // 2
+        parts = await asyncio.gather(
+            _poll_relay_chunk(dict(items[:half]), wait_seconds),
+            _poll_relay_chunk(dict(items[half:]), wait_seconds),
+        )
+        if any(part is None for part in parts):
+            return None
+        return {sid: resp for part in parts for sid, resp in part.items()}
+    # Transport error or a single-session 422: this round falls back to the
+    # per-session endpoint, which is still retried in batch next round.
+    return None
+
+
+async def _poll_relay_batch(cursors: dict[str, Optional[str]], wait_seconds: float) -> Optional[dict]:
+    """Per-session responses from the batch polls, or None to poll one by one.
+
+    Sessions are chunked to the relay's per-request cap and the chunks held
+    concurrently. A failed chunk sends the round to the per-session endpoint;
+    cursors have not advanced, so it returns the same events.
+    """
+    if time.time() < _batch_poll_unsupported_until:
+        return None
+    items = list(cursors.items())
+    chunks = [
+        dict(items[offset:offset + _BATCH_POLL_MAX_SESSIONS])
+        for offset in range(0, len(items), _BATCH_POLL_MAX_SESSIONS)
+    ]
+    parts = await asyncio.gather(*(_poll_relay_chunk(chunk, wait_seconds) for chunk in chunks))
+    if any(part is None for part in parts):
+        return None
+    return {sid: resp for part in parts for sid, resp in part.items()}
+
+
+async def _held_relay_batch(cursors: dict[str, Optional[str]], wait_seconds: float) -> Optional[dict]:
+    """``_poll_relay_batch``, abandoned (``{}``) as soon as a new session starts.
+
+    Nothing is lost by cancelling: cursors only advance once a response is
+    processed, so the re-issued poll returns the same events.
+    """
+    added = _relay_sessions_added_event()
+    poll = asyncio.ensure_future(_poll_relay_batch(cursors, wait_seconds))
+    woken = asyncio.ensure_future(added.wait())
+    try:
+        await asyncio.wait({poll, woken}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        woken.cancel()
+    if poll.done():
+        return poll.result()
+    poll.cancel()
+    try:
+        await poll
+    except asyncio.CancelledError:
+        pass
+    return {}
+
+
+async def poll_lowiqpts_relay_events(bot_app, *, wait_seconds: float = 0.0) -> bool:
+    """Poll every pending relay session and dispatch its events.
+
+    All sessions go out in batch requests (one per ``_BATCH_POLL_MAX_SESSIONS``),
+    held at the relay up to ``wait_seconds`` until any of them has events; a
+    session started meanwhile cuts the hold short. Falls back to one
+    ``/events/poll`` per session when the batch call is unavailable. Returns
+    True when a batch poll served the sessions.
+    """
     if not relay_is_configured():
-        return
+        return False
+    if wait_seconds > 0:
+        # Sessions started from here on are not in this poll: they wake it.
+        _relay_sessions_added_event().clear()
     bot_data = bot_app.bot_data
     queue, _ = _pending_maps(bot_data)
     # Heartbeat: keep pending rows alive while we wait on a slow LOWIQPTS session.
@@ -1059,17 +1185,28 @@ async def poll_lowiqpts_relay_events(bot_app) -> None:
             seen_sessions.add(sid)
             session_ids.append(sid)
     if not session_ids:
-        return
+        return False
+    cursors: dict[str, Optional[str]] = {}
+    for session_id in session_ids:
+        cursor = bot_data.get(f"{_RELAY_CURSOR_KEY}:{session_id}")
+        cursors[session_id] = str(cursor) if cursor else None
+    if wait_seconds > 0:
+        batch = await _held_relay_batch(cursors, wait_seconds)
+    else:
+        batch = await _poll_relay_batch(cursors, wait_seconds)
     for session_id in session_ids:
-        cursor_key = f"{_RELAY_CURSOR_KEY}:{session_id}"
-        cursor = bot_data.get(cursor_key)
-        response = await relay_poll_events(session_id=session_id, cursor=str(cursor) if cursor else None)
+        if batch is not None:
+            response = batch.get(session_id)
+            if not isinstance(response, dict):
+                continue
+        else:
+            response = await relay_poll_events(session_id=session_id, cursor=cursors[session_id])
         if not response.get("ok"):
             continue
 
         events, next_cursor = _extract_events_response(response)
         if next_cursor:
-            bot_data[cursor_key] = next_cursor
+            bot_data[f"{_RELAY_CURSOR_KEY}:{session_id}"] = next_cursor
         for raw in events:
             event = dict(raw) if isinstance(raw, dict) else {}
             if not _extract_event_session_id(event):
@@ -1091,6 +1228,7 @@ async def poll_lowiqpts_relay_events(bot_app) -> None:
                 logger.warning("Failed to finalize dead LOWIQPTS session", exc_info=True)
 
     await _persist_relay_state(bot_data)
+    return batch is not None
 
 
 async def _on_points_refresh_timeout(context) -> None:
@@ -6,6 +6,7 @@ from typing import Optional
 
 from src.nadobro.models.database import UserRow, NetworkMode
 from src.nadobro.db import query_one, query_all, execute, query_count
+from src.nadobro.db_async import aquery_one
 from src.nadobro.venue.nado_client import (
     get_nado_client,
     NadoClient,
@@ -110,6 +111,19 @@ def get_user(telegram_id: int) -> Optional[UserRow]:
     return user
 
 
+async def aget_user(telegram_id: int) -> Optional[UserRow]:
+    """``get_user`` for coroutines: same cache, the miss is read on the async pool."""
+    cached = _get_cached_user(telegram_id)
+    if cached:
+        return cached
+    row = await aquery_one("SELECT * FROM users WHERE telegram_id = %s", (telegram_id,))
+    if not row:
+        return None
+    user = UserRow(row)
+    _cache_user(user)
+    return user
+
+
 def switch_network(telegram_id: int, network: str) -> tuple[bool, str]:
     user = get_user(telegram_id)
     if not user:
@@ -500,7 +514,7 @@ def update_user_language(telegram_id: int, lang: str, *, source: str = "settings
     the logs. We now normalize the value, log the change, and write an
     append-only audit row (fail-soft) so the switch is observable.
     """
-    from src.nadobro.i18n import normalize_lang
+    from src.nadobro.i18n import invalidate_user_language, normalize_lang
 
     new_lang = normalize_lang(lang)
     previous = None
@@ -513,6 +527,7 @@ def update_user_language(telegram_id: int, lang: str, *, source: str = "settings
 
     execute("UPDATE users SET language = %s WHERE telegram_id = %s", (new_lang, telegram_id))
     invalidate_user_cache(telegram_id)
+    invalidate_user_language(telegram_id)
 
     if previous != new_lang:
         logger.info(
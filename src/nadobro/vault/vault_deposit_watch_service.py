@@ -54,9 +54,13 @@ async def _notify(telegram_id: int, text: str) -> None:
             [InlineKeyboardButton("⬇️ Deposit now", callback_data="vault:deposit")],
             [InlineKeyboardButton("💰 Vault", callback_data="vault:home")],
         ])
-        await _bot_app.bot.send_message(
-            chat_id=telegram_id,
-            text=text,
+        from src.nadobro.notify.telegram_sender import Lane, deliver
+
+        await deliver(
+            _bot_app.bot,
+            telegram_id,
+            text,
+            lane=Lane.INFO,
             parse_mode="Markdown",
             reply_markup=kb,
         )
@@ -0,0 +1,297 @@
+"""Shared candle store — one ring buffer per (network, product, granularity).
+
+``get_candlesticks`` used to cache only the exact ``(product, timeframe,
+limit)`` latest window for a short TTL, so limit 100 vs 200, or the
+15m/1h/4h trio the market features read, all missed independently and each
+re-pulled the whole series from the archive indexer under the gateway budget.
+
+The store keeps the newest ``capacity`` bars of each series oldest-first and:
+
+* serves any ``limit`` (and any ``max_time`` it already covers) from memory;
+* refreshes with a *delta* query — only the bars since its last one, plus that
+  bar itself, since it was still forming when fetched — at most once per
+  ``min(granularity, refresh_seconds)``;
+* reseeds with a full query only when cold, asked for more history than it
+  holds, or when a delta fails to overlap (a gap);
+* derives a coarser timeframe from a fresh finer series that covers the window
+  instead of querying the coarse one at all;
+* serves the last known bars when the budget throttles a refresh.
+
+Any ``NadoClient`` of the network can do the fetching: the store is module
+level and ``fetch`` is passed per call. A fetch returns ``None`` when it could
+not run (throttled, SDK error) and a list otherwise.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from src.nadobro.utils.env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+GRANULARITY_SECONDS: Dict[str, int] = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400,
+}
+
+# Bars kept per series (raised per series when a caller asks for more).
+_CAPACITY = env_int("NADO_CANDLE_STORE_CAPACITY", 1000)
+# Upper bound on how stale the forming bar may get; the effective refresh
+# interval is min(granularity, this). Defaults to the legacy Redis TTL.
+_REFRESH_SECONDS = env_float("NADO_CANDLE_STORE_REFRESH_SECONDS", 30.0)
+
+Fetch = Callable[[int, str, int, Optional[int]], Optional[List[dict]]]
+
+
+def _ts(candle: dict) -> int:
+    try:
+        return int(candle.get("time") or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _normalized(rows: List[dict]) -> List[dict]:
+    """Oldest-first copies with integer ``time`` (the indexer sends strings)."""
+    return sorted((dict(c, time=_ts(c)) for c in rows), key=_ts)
+
+
+class _Series:
+    __slots__ = ("bars", "lock", "refreshed_at", "exhausted")
+
+    def __init__(self, capacity: int) -> None:
+        self.bars: Deque[dict] = deque(maxlen=capacity)
+        self.lock = threading.Lock()
+        self.refreshed_at = 0.0
+        # The indexer returned fewer bars than asked: there is no older history.
+        self.exhausted = False
+
+    @property
+    def capacity(self) -> int:
+        return int(self.bars.maxlen or 0)
+
+    def last_time(self) -> int:
+        return _ts(self.bars[-1]) if self.bars else 0
+
+    def reseed(self, candles: List[dict], asked: int, now: float) -> None:
+        if asked > self.capacity:
+            self.bars = deque(maxlen=asked)
+        self.bars.clear()
+        self.bars.extend(candles)
+        self.exhausted = len(candles) < asked
+        self.refreshed_at = now
+
+    def merge(self, candles: List[dict], now: float) -> bool:
+        """Fold a delta into the tail; False when it does not overlap (a gap)."""
+        if not candles:
+            self.refreshed_at = now
+            return True
+        last = self.last_time()
+        if _ts(candles[0]) > last:
+            return False
+        for c in candles:
+            t = _ts(c)
+            if t < last:
+                continue
+            if t == last:
+                self.bars[-1] = c
+            else:
+                self.bars.append(c)
+                last = t
+        self.refreshed_at = now
+        return True
+
+    def window(self, limit: int, max_time: Optional[int]) -> Optional[List[dict]]:
+        """The newest ``limit`` bars at or before ``max_time``, if held."""
+        bars = self.bars
+        if max_time is None:
+            if len(bars) >= limit or (self.exhausted and bars):
+                return [dict(b) for b in list(bars)[-limit:]]
+            return None
+        if not bars or max_time >= self.last_time():
+            return None
+        upto = [b for b in bars if _ts(b) <= max_time]
+        if len(upto) >= limit or (self.exhausted and upto):
+            return [dict(b) for b in upto[-limit:]]
+        return None
+
+
+def _aggregate(bars: List[dict], seconds: int) -> List[dict]:
+    """Roll finer bars (oldest-first) up into ``seconds`` buckets."""
+    out: List[dict] = []
+    for b in bars:
+        start = _ts(b) // seconds * seconds
+        if out and out[-1]["time"] == start:
+            agg = out[-1]
+            agg["high"] = max(agg["high"], b.get("high", 0.0))
+            agg["low"] = min(agg["low"], b.get("low", 0.0))
+            agg["close"] = b.get("close", 0.0)
+            agg["volume"] = agg["volume"] + float(b.get("volume", 0.0) or 0.0)
+        else:
+            out.append({
+                "time": start,
+                "open": b.get("open", 0.0),
+                "high": b.get("high", 0.0),
+                "low": b.get("low", 0.0),
+                "close": b.get("close", 0.0),
+                "volume": float(b.get("volume", 0.0) or 0.0),
+            })
+    return out
+
+
+class CandleStore:
+    def __init__(
+        self,
+        *,
+        capacity: int = _CAPACITY,
+        refresh_seconds: float = _REFRESH_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.capacity = max(1, int(capacity))
+        self.refresh_seconds = max(1.0, float(refresh_seconds))
+        self._clock = clock
+        self._series: Dict[Tuple[str, int, str], _Series] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "delta_fetches": 0, "full_fetches": 0,
+                       "gaps": 0, "derived": 0, "stale_served": 0, "misses": 0}
+
+    def _get_series(self, key: Tuple[str, int, str]) -> _Series:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.capacity)
+            return series
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _interval(self, timeframe: str) -> float:
+        return min(float(GRANULARITY_SECONDS.get(timeframe, 3600)), self.refresh_seconds)
+
+    def _is_fresh(self, series: _Series, timeframe: str, now: float) -> bool:
+        return bool(series.bars) and now - series.refreshed_at < self._interval(timeframe)
+
+    # -- reads ---------------------------------------------------------------
+
+    def get(
+        self,
+        network: str,
+        product_id: int,
+        timeframe: str,
+        limit: int,
+        max_time: Optional[int],
+        fetch: Fetch,
+    ) -> List[dict]:
+        """Oldest-first bars, as ``NadoClient.get_candlesticks`` returns them."""
+        timeframe = str(timeframe) if str(timeframe) in GRANULARITY_SECONDS else "1h"
+        limit = max(1, int(limit))
+        key = (str(network), int(product_id), timeframe)
+        series = self._get_series(key)
+        with series.lock:
+            now = self._clock()
+            fresh = self._is_fresh(series, timeframe, now)
+            if fresh or max_time is not None:
+                served = series.window(limit, max_time)
+                if served is not None:
+                    self._count("hits")
+                    return served
+            if max_time is not None:
+                # History the series does not hold: one-off query, not stored.
+                self._count("misses")
+                return list(fetch(int(product_id), timeframe, limit, max_time) or [])
+            if not series.bars:
+                derived = self._derive(key, limit, now)
+                if derived is not None:
+                    self._count("derived")
+                    return derived
+            if self._refresh(series, key, limit, now, fetch):
+                served = series.window(limit, None)
+                if served is not None:
+                    return served
+            if series.bars:
+                self._count("stale_served")
+                return [dict(b) for b in list(series.bars)[-limit:]]
+            return []
+
+    def _refresh(self, series: _Series, key: Tuple[str, int, str], limit: int, now: float, fetch: Fetch) -> bool:
+        _network, product_id, timeframe = key
+        seconds = GRANULARITY_SECONDS[timeframe]
+        held = len(series.bars) >= limit or series.exhausted
+        if series.bars and held:
+            # Bars opened since the newest held one, plus that one (it was forming).
+            delta = int(max(0.0, now - series.last_time()) // seconds) + 1
+            if delta < series.capacity:
+                rows = fetch(product_id, timeframe, delta, None)
+                if rows is None:
+                    return False
+                self._count("delta_fetches")
+                if series.merge(_normalized(rows), now):
+                    return True
+                self._count("gaps")
+        asked = max(limit, len(series.bars))
+        rows = fetch(product_id, timeframe, asked, None)
+        if rows is None:
+            return False
+        self._count("full_fetches")
+        series.reseed(_normalized(rows), asked, now)
+        return True
+
+    def _derive(self, key: Tuple[str, int, str], limit: int, now: float) -> Optional[List[dict]]:
+        """Build ``limit`` coarse bars from a fresh finer series covering them."""
+        network, product_id, timeframe = key
+        seconds = GRANULARITY_SECONDS[timeframe]
+        finer = sorted(
+            (tf for tf, s in GRANULARITY_SECONDS.items() if s < seconds and seconds % s == 0),
+            key=GRANULARITY_SECONDS.get, reverse=True,
+        )
+        for tf in finer:
+            with self._lock:
+                series = self._series.get((network, product_id, tf))
+            if series is None:
+                continue
+            # Copy under the finer series' own lock: its owner appends to the
+            # deque in place. Locks are only ever taken coarse -> finer, so
+            # this cannot deadlock with the caller's lock on the coarse series.
+            with series.lock:
+                if not self._is_fresh(series, tf, now):
+                    continue
+                bars = list(series.bars)
+                exhausted = series.exhausted
+            first_bucket = (_ts(bars[-1]) // seconds - (limit - 1)) * seconds
+            if _ts(bars[0]) > first_bucket and not exhausted:
+                continue
+            out = _aggregate([b for b in bars if _ts(b) >= first_bucket], seconds)
+            if out:
+                return out[-limit:]
+        return None
+
+    def invalidate(self, network: Optional[str] = None) -> None:
+        with self._lock:
+            if network is None:
+                self._series.clear()
+            else:
+                for key in [k for k in self._series if k[0] == network]:
+                    del self._series[key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._stats)
+            out["series"] = len(self._series)
+            out["bars"] = sum(len(s.bars) for s in self._series.values())
+        return out
+
+
+CANDLE_STORE = CandleStore()
+
+
+def get_candle_store_stats() -> dict:
+    """Diagnostic snapshot for observability endpoints."""
+    return CANDLE_STORE.stats()
@@ -18,10 +18,12 @@ Callers pass ``weight`` (documented per-call cost — see ``nado_weights``) and
 
 1. **Host circuit** — Cloudflare + Nado ``error_code=1000`` breakers.
 2. **Per-user in-flight cap** — max ``NADO_USER_MAX_INFLIGHT`` (default 4).
-3. **Host weight bucket** — the per-IP query budget (40 weight/s, set in
+3. **Per-user weight bucket** — fair share so one user can't starve the IP
+   budget (default **8 weight/s / burst 24**). Checked before the host
+   bucket, so a user out of share never spends shared IP weight.
+4. **Host weight bucket** — the per-IP query budget (40 weight/s, set in
    ``http_session``; keyed by netloc so gateway and archive are independent).
-4. **Per-user weight bucket** — fair share so one user can't starve the IP
-   budget (default **8 weight/s / burst 24**).
+   A denial here refunds the user's tokens.
 
 **Execute (kind="execute", limited per wallet):**
 
@@ -37,6 +39,7 @@ and serve cached data — never fan out to per-product fallbacks.
 """
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from src.nadobro.utils.env import env_float, env_int
@@ -105,6 +108,10 @@ class _TokenBucket:
             needed = (need - self.tokens) / self.rps if self.rps > 0 else 0.25
             time.sleep(min(needed, 0.25, max(0.0, deadline - now)))
 
+    def refund(self, cost: float = 1.0) -> None:
+        """Return tokens taken by a :meth:`try_acquire` whose call never went out."""
+        self.tokens = min(self.burst, self.tokens + max(1.0, min(float(cost), self.burst)))
+
 
 @dataclass
 class _BreakerLite:
@@ -294,13 +301,17 @@ def try_acquire(
                 return False
             _user_inflight[uid] = _user_inflight.get(uid, 0) + 1
     allowed = True
+    deadline = time.monotonic() + max(0.0, wait)
+    bucket = _user_bucket(uid) if uid is not None else None
     try:
         from src.nadobro.core.http_session import throttle_host
-        if not throttle_host(url, cost=w, max_wait=wait):
-            allowed = False
-        elif uid is not None and not _user_bucket(uid).try_acquire(max_wait=wait, cost=w):
+        if bucket is not None and not bucket.try_acquire(max_wait=wait, cost=w):
             logger.debug("gateway budget: user %s token bucket starved (w=%s)", uid, w)
             allowed = False
+        elif not throttle_host(url, cost=w, max_wait=max(0.0, deadline - time.monotonic())):
+            if bucket is not None:
+                bucket.refund(w)
+            allowed = False
     except Exception:
         pass
     if not allowed:
@@ -309,6 +320,63 @@ def try_acquire(
     return True
 
 
+async def try_acquire_async(
+    url: str,
+    *,
+    user_id: Optional[int] = None,
+    weight: float = 1.0,
+    kind: str = "query",
+    wallet: Optional[str] = None,
+    max_wait: Optional[float] = None,
+) -> bool:
+    """:func:`try_acquire` for coroutines: waits on the event loop, not a thread.
+
+    Each probe is a zero-wait :func:`try_acquire`; between probes the coroutine
+    sleeps with ``asyncio.sleep``. A denied probe spends no shared host weight
+    (the user bucket is checked first, a host denial refunds it). Blocked hosts
+    and a full per-user in-flight cap fail immediately, exactly like the sync
+    path.
+    """
+    wait = _USER_MAX_WAIT if max_wait is None else float(max_wait)
+    deadline = time.monotonic() + max(0.0, wait)
+    uid: Optional[int] = int(user_id) if user_id is not None else None
+    while True:
+        if try_acquire(url, user_id=uid, weight=weight, kind=kind, wallet=wallet, max_wait=0.0):
+            return True
+        if is_gateway_blocked(url) or (kind == "execute" and is_write_blocked(url)):
+            return False
+        if kind != "execute" and uid is not None:
+            with _lock:
+                if _user_inflight.get(uid, 0) >= _USER_MAX_INFLIGHT:
+                    return False
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(0.05, remaining))
+
+
+def has_headroom(url: str, *, weight: float = 1.0, user_id: Optional[int] = None) -> bool:
+    """Non-consuming admission check for schedulers fanning out many calls.
+
+    True when the host is not blocked, the host weight bucket holds at least
+    ``weight`` tokens, and (if ``user_id`` is given) the user has a free
+    in-flight slot. Nothing is reserved — each underlying call still goes
+    through :func:`try_acquire`; this only lets a batch scheduler stop
+    dispatching *before* its calls start getting denied.
+    """
+    if is_gateway_blocked(url):
+        return False
+    if user_id is not None:
+        with _lock:
+            if _user_inflight.get(int(user_id), 0) >= _USER_MAX_INFLIGHT:
+                return False
+    try:
+        from src.nadobro.core.http_session import available_tokens
+        return available_tokens(url) >= max(1.0, float(weight))
+    except Exception:
+        return True
+
+
 def release(user_id: Optional[int] = None) -> None:
     if user_id is None:
         return
@@ -4,6 +4,19 @@ Phase 4: strategy cycles and alerts previously each called
 ``get_all_market_prices`` independently. This singleton caches one
 snapshot per network with a short TTL so 1000 users share one price
 fetch instead of N.
+
+The ``best_bid_offer`` stream (``venue/market_ws``) pushes quotes into the
+cache as they change. While that stream is live and every product it
+subscribed has quoted within ``NADO_MARKET_FEED_QUOTE_STALE_SECONDS``,
+``get_prices`` serves the pushed quotes and never touches REST. Otherwise —
+the stream has gone quiet for ``NADO_MARKET_FEED_STREAM_STALE_SECONDS``, or a
+product's subscription was rejected or it stopped quoting — the bound REST
+fetcher runs, and fresh streamed quotes are kept over its prices.
+
+Every accepted update bumps the network's ``version``. Per product, a quote
+carrying a ``seq`` at or below the last applied one is dropped, so a late
+frame never rolls a price back. Readers can ``await wait_for_update(...)`` or
+register a listener instead of polling.
 """
 from __future__ import annotations
 
@@ -17,11 +30,40 @@ from typing import Any, Callable, Optional
 logger = logging.getLogger(__name__)
 
 _TTL = env_float("NADO_MARKET_FEED_TTL_SECONDS", 3.0)
+# The stream counts as live while any frame arrived within this window.
+_STREAM_STALE_SECONDS = env_float("NADO_MARKET_FEED_STREAM_STALE_SECONDS", 2.0)
+# A product's streamed quote is served only while it is younger than this;
+# liveness alone is per network and any frame (ack, heartbeat, error) keeps it.
+_QUOTE_STALE_SECONDS = env_float("NADO_MARKET_FEED_QUOTE_STALE_SECONDS", 5.0)
 _lock = asyncio.Lock()
 _cache: dict[str, dict[str, Any]] = {}
 _ts: dict[str, float] = {}
+_rest_ts: dict[str, float] = {}
 _fetcher: Optional[Callable[[], Any]] = None
 
+_version: dict[str, int] = {}
+_seq: dict[tuple[str, str], int] = {}
+_by_id: dict[str, dict[int, str]] = {}
+_stream_seen: dict[str, float] = {}
+# network -> product -> monotonic time of its last streamed quote
+_quoted_at: dict[str, dict[str, float]] = {}
+# network -> products the stream subscribed (``expect_products``)
+_expected: dict[str, set[str]] = {}
+_rest_fetches: dict[str, int] = {}
+_waiters: dict[str, list[asyncio.Future]] = {}
+# Listeners (dependency inversion, like ``nado_ws`` fill listeners): called as
+# ``callback(network, version)`` after each accepted update. They run on the
+# feed's loop, so they must be cheap and non-blocking.
+_listeners: list[Callable[[str, int], None]] = []
+
+
+def _net(network: str) -> str:
+    return str(network or "mainnet").lower()
+
+
+def _key(name: str) -> str:
+    return str(name).replace("-PERP", "")
+
 
 def bind_fetcher(fetcher: Callable[[], Any]) -> None:
     """Bind a callable that returns ``{product: {mid, bid, ask}}``."""
@@ -29,20 +71,170 @@ def bind_fetcher(fetcher: Callable[[], Any]) -> None:
     _fetcher = fetcher
 
 
+def register_listener(callback: Callable[[str, int], None]) -> None:
+    """Register ``callback(network, version)`` for every accepted update."""
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def unregister_listener(callback: Callable[[str, int], None]) -> None:
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def version(network: str = "mainnet") -> int:
+    """Monotonic update counter for ``network`` (0 = nothing received yet)."""
+    return _version.get(_net(network), 0)
+
+
+def _bump(net: str) -> int:
+    ver = _version.get(net, 0) + 1
+    _version[net] = ver
+    for fut in _waiters.pop(net, []):
+        if fut.done():
+            continue
+        loop = fut.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is running:
+            fut.set_result(ver)
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(_resolve, fut, ver)
+    for cb in list(_listeners):
+        try:
+            cb(net, ver)
+        except Exception:  # noqa: BLE001 - a listener bug must not stall the feed
+            logger.debug("market_feed listener failed network=%s", net, exc_info=True)
+    return ver
+
+
+def _resolve(fut: asyncio.Future, ver: int) -> None:
+    if not fut.done():
+        fut.set_result(ver)
+
+
+def note_stream_alive(network: str) -> None:
+    """Record a frame (quote, ack or heartbeat) from the market stream."""
+    _stream_seen[_net(network)] = time.monotonic()
+
+
+def stream_live(network: str = "mainnet") -> bool:
+    seen = _stream_seen.get(_net(network))
+    return seen is not None and (time.monotonic() - seen) < _STREAM_STALE_SECONDS
+
+
+def expect_products(network: str, names: list[str]) -> None:
+    """Record the products the stream subscribed; each must keep quoting for
+    ``get_prices`` to skip REST."""
+    _expected[_net(network)] = {_key(name) for name in names}
+
+
+def _quote_fresh(net: str, key: str, now: float) -> bool:
+    quoted = _quoted_at.get(net, {}).get(key)
+    return quoted is not None and (now - quoted) < _QUOTE_STALE_SECONDS
+
+
+def _stream_covers(net: str, now: float) -> bool:
+    """Live stream with a fresh quote for every subscribed (else every quoted) product."""
+    if not stream_live(net):
+        return False
+    keys = _expected.get(net) or set(_quoted_at.get(net, {}))
+    return bool(keys) and all(_quote_fresh(net, key, now) for key in keys)
+
+
+def apply_quote(
+    network: str,
+    product_id: int,
+    name: str,
+    *,
+    bid: float,
+    ask: float,
+    seq: Optional[int] = None,
+) -> bool:
+    """Merge one product's top of book; False when ``seq`` is stale or the quote empty."""
+    net = _net(network)
+    key = _key(name)
+    if seq is not None:
+        last = _seq.get((net, key))
+        if last is not None and int(seq) <= last:
+            return False
+    if bid <= 0 and ask > 0:
+        bid = ask
+    if ask <= 0 and bid > 0:
+        ask = bid
+    if bid <= 0:
+        return False
+    if seq is not None:
+        _seq[(net, key)] = int(seq)
+    now = time.monotonic()
+    _cache.setdefault(net, {})[key] = {
+        "bid": float(bid), "ask": float(ask), "mid": (float(bid) + float(ask)) / 2.0,
+    }
+    _by_id.setdefault(net, {})[int(product_id)] = key
+    _quoted_at.setdefault(net, {})[key] = now
+    _ts[net] = now
+    _stream_seen[net] = now
+    _bump(net)
+    return True
+
+
 def update_from_ws(network: str, prices: dict[str, Any]) -> None:
-    """Push WS-derived prices into the cache."""
-    net = str(network or "mainnet").lower()
+    """Push WS-derived prices into the cache (merged per product)."""
+    net = _net(network)
     if not prices:
         return
-    _cache[net] = dict(prices)
+    _cache.setdefault(net, {}).update(prices)
     _ts[net] = time.monotonic()
+    _stream_seen[net] = _ts[net]
+    _quoted_at.setdefault(net, {}).update(dict.fromkeys(prices, _ts[net]))
+    _bump(net)
+
+
+def live_price(network: str, product_id: int) -> Optional[dict]:
+    """The streamed ``{bid, ask, mid}`` for ``product_id`` while the stream is
+    live and the product quoted within ``_QUOTE_STALE_SECONDS``."""
+    net = _net(network)
+    if not stream_live(net):
+        return None
+    name = _by_id.get(net, {}).get(int(product_id))
+    if not name or not _quote_fresh(net, name, time.monotonic()):
+        return None
+    row = _cache.get(net, {}).get(name)
+    return dict(row) if row else None
+
+
+async def wait_for_update(
+    network: str = "mainnet", *, after: Optional[int] = None, timeout: Optional[float] = None
+) -> int:
+    """Wait until ``version(network)`` exceeds ``after`` (default: now); returns it.
+
+    Returns the current version unchanged on timeout.
+    """
+    net = _net(network)
+    current = _version.get(net, 0)
+    if after is not None and current > after:
+        return current
+    fut = asyncio.get_running_loop().create_future()
+    _waiters.setdefault(net, []).append(fut)
+    try:
+        return await asyncio.wait_for(fut, timeout)
+    except asyncio.TimeoutError:
+        return _version.get(net, 0)
+    finally:
+        waiting = _waiters.get(net)
+        if waiting and fut in waiting:
+            waiting.remove(fut)
 
 
 async def get_prices(network: str = "mainnet", *, force_refresh: bool = False) -> dict[str, Any]:
-    net = str(network or "mainnet").lower()
+    net = _net(network)
     async with _lock:
         now = time.monotonic()
-        if not force_refresh and net in _cache and (now - _ts.get(net, 0)) < _TTL:
+        if not force_refresh and net in _cache and (
+            _stream_covers(net, now) or (now - _rest_ts.get(net, float("-inf"))) < _TTL
+        ):
             return dict(_cache[net])
     if _fetcher is None:
         return dict(_cache.get(net, {}))
@@ -53,14 +245,48 @@ async def get_prices(network: str = "mainnet", *, force_refresh: bool = False) -
         logger.debug("market_feed fetch failed network=%s err=%s", net, exc)
         return dict(_cache.get(net, {}))
     async with _lock:
-        _cache[net] = dict(prices or {})
-        _ts[net] = time.monotonic()
+        _rest_fetches[net] = _rest_fetches.get(net, 0) + 1
+        now = time.monotonic()
+        merged = dict(prices or {})
+        if stream_live(net):
+            # Fresh streamed quotes are newer than the REST read.
+            streamed = _cache.get(net, {})
+            for key in _quoted_at.get(net, {}):
+                if key in streamed and _quote_fresh(net, key, now):
+                    merged[key] = streamed[key]
+        _cache[net] = merged
+        _ts[net] = _rest_ts[net] = now
+        _bump(net)
         return dict(_cache[net])
 
 
 def snapshot() -> dict:
     now = time.monotonic()
     return {
-        net: {"age_s": round(now - ts, 2), "products": len(_cache.get(net, {}))}
+        net: {
+            "age_s": round(now - ts, 2),
+            "products": len(_cache.get(net, {})),
+            "version": _version.get(net, 0),
+            "stream_live": stream_live(net),
+            "rest_fetches": _rest_fetches.get(net, 0),
+        }
         for net, ts in _ts.items()
     }
+
+
+def reset() -> None:
+    """Drop every cached price, sequence and waiter (tests)."""
+    _cache.clear()
+    _ts.clear()
+    _rest_ts.clear()
+    _version.clear()
+    _seq.clear()
+    _by_id.clear()
+    _stream_seen.clear()
+    _quoted_at.clear()
+    _expected.clear()
+    _rest_fetches.clear()
+    for waiting in _waiters.values():
+        for fut in waiting:
+            fut.cancel()
+    _waiters.clear()
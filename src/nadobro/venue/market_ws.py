@@ -0,0 +1,195 @@
+"""Market-data stream: per-network ``best_bid_offer`` quotes into ``market_feed``.
+
+One ``/v1/subscribe`` socket per network subscribes the ``best_bid_offer``
+stream for every listed perp. Each frame becomes a ``market_feed.apply_quote``
+and uses the frame's nanosecond ``timestamp`` as the product's sequence
+number. Every inbound frame (quote, ack, heartbeat) marks the stream alive,
+and the subscribed products are registered with ``market_feed.expect_products``.
+Price reads are therefore served from memory while the socket is healthy and
+every product keeps quoting. They go back to REST once it has been quiet for
+``NADO_MARKET_FEED_STREAM_STALE_SECONDS``, or once any subscribed product has
+not quoted for ``NADO_MARKET_FEED_QUOTE_STALE_SECONDS``.
+
+The product list is re-read from the catalog on every (re)connect, and
+reconnects back off exponentially with jitter, like the portfolio sockets.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+from typing import Any, Optional
+
+from src.nadobro.core.ipv4_egress import websocket_connect_kwargs
+from src.nadobro.utils.env import env_str
+from src.nadobro.venue import market_feed
+from src.nadobro.venue.nado_ws import subscribe_url_for_network
+
+logger = logging.getLogger(__name__)
+
+_STREAM = "best_bid_offer"
+
+
+def market_stream_networks() -> list[str]:
+    """Networks to stream (``NADO_MARKET_WS_NETWORKS``, comma-separated)."""
+    raw = env_str("NADO_MARKET_WS_NETWORKS", "mainnet,testnet") or ""
+    return [n for n in (part.strip().lower() for part in raw.split(",")) if n in ("mainnet", "testnet")]
+
+
+def _perp_products(network: str) -> list[tuple[str, int]]:
+    from src.nadobro.venue.product_catalog import get_catalog_snapshot
+
+    snap = get_catalog_snapshot(network=network)
+    ids = snap.id_by_alias
+    out: list[tuple[str, int]] = []
+    for key in snap.ordered_keys:
+        pid = ids.get(key.lower())
+        if pid is not None:
+            out.append((str(snap.name_by_id.get(pid) or key), int(pid)))
+    return out
+
+
+def _x18(value: Any) -> float:
+    try:
+        return int(value) / 1e18
+    except (TypeError, ValueError):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+
+def _int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MarketDataWs:
+    """One network's quote stream; ``start`` is idempotent."""
+
+    def __init__(self, network: str) -> None:
+        self.network = network
+        self.task: asyncio.Task | None = None
+        self.connected = False
+        self.names: dict[int, str] = {}
+        self.quotes = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name=f"market-ws-{self.network}")
+
+    async def stop(self) -> None:
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+        self.task = None
+        self.connected = False
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "connected": self.connected,
+            "products": len(self.names),
+            "quotes": self.quotes,
+            "dropped": self.dropped,
+        }
+
+    async def _run(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                await self._connect_once()
+                backoff = 1.0
+            except asyncio.CancelledError:
+                self.connected = False
+                raise
+            except Exception as exc:
+                self.connected = False
+                logger.warning("market ws disconnected network=%s: %s", self.network, exc)
+            await asyncio.sleep(backoff + random.uniform(0, backoff * 0.2))
+            backoff = min(60.0, backoff * 2)
+
+    async def _connect_once(self) -> None:
+        import websockets
+
+        products = await asyncio.to_thread(_perp_products, self.network)
+        if not products:
+            raise RuntimeError("perp catalog unavailable")
+        self.names = {pid: name for name, pid in products}
+        async with websockets.connect(
+            subscribe_url_for_network(self.network),
+            ping_interval=20,
+            ping_timeout=20,
+            compression="deflate",
+            **websocket_connect_kwargs(),
+        ) as ws:
+            for i, (_name, pid) in enumerate(products, start=1):
+                await ws.send(json.dumps({
+                    "method": "subscribe",
+                    "stream": {"type": _STREAM, "product_id": pid},
+                    "id": i,
+                }))
+            market_feed.expect_products(self.network, [name for name, _pid in products])
+            self.connected = True
+            logger.info("market ws subscribed network=%s products=%d", self.network, len(products))
+            async for raw in ws:
+                self.handle_frame(raw)
+        raise ConnectionError("market stream closed")
+
+    def handle_frame(self, raw: Any) -> bool:
+        """Apply one frame; True when it moved a price."""
+        market_feed.note_stream_alive(self.network)
+        try:
+            event = raw if isinstance(raw, dict) else json.loads(raw)
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(event, dict):
+            return False
+        if event.get("error"):
+            logger.warning("market ws control error network=%s: %s", self.network, event.get("error"))
+            return False
+        if str(event.get("type") or "") != _STREAM:
+            return False
+        pid = _int(event.get("product_id"))
+        name = self.names.get(pid) if pid is not None else None
+        if name is None:
+            return False
+        applied = market_feed.apply_quote(
+            self.network,
+            pid,
+            name,
+            bid=_x18(event.get("bid_price")),
+            ask=_x18(event.get("ask_price")),
+            seq=_int(event.get("timestamp")),
+        )
+        if applied:
+            self.quotes += 1
+        else:
+            self.dropped += 1
+        return applied
+
+
+_streams: dict[str, MarketDataWs] = {}
+
+
+def start_market_streams(networks: Optional[list[str]] = None) -> None:
+    """Start (or keep) one quote stream per network on the running loop."""
+    for net in networks if networks is not None else market_stream_networks():
+        stream = _streams.get(net)
+        if stream is None:
+            stream = MarketDataWs(net)
+            _streams[net] = stream
+        stream.start()
+
+
+async def stop_market_streams() -> None:
+    streams = list(_streams.values())
+    _streams.clear()
+    await asyncio.gather(*(s.stop() for s in streams), return_exceptions=True)
+
+
+def market_stream_stats() -> dict[str, Any]:
+    return {net: s.stats() for net, s in _streams.items()}
@@ -6,6 +6,7 @@ after trades are placed via the Nado SDK (which only returns a digest).
 
 Archive docs: https://docs.nado.xyz/developer-resources/api/archive-indexer
 """
+import asyncio
 import logging
 import re
 import threading
@@ -209,11 +210,12 @@ def _derive_archive_weight(payload: dict) -> float:
     )
 
 
-def _post(url: str, payload: dict, *, weight: float | None = None) -> dict | list | None:
+def _admit(url: str, payload: dict, weight: float | None) -> tuple[bool, float]:
+    """Pre-flight checks shared by ``_post`` / ``_apost``: ``(proceed, weight cost)``."""
     # BUG-NAR-3 partial: short-circuit *before* acquiring the semaphore so we
     # don't hold a slot during cooldown.
     if is_archive_rate_limited():
-        return None
+        return False, 0.0
     # SCALE: also short-circuit when our Cloudflare circuit breaker is open
     # for this host. Avoids stacking up archive calls into a queue that just
     # gets 403'd back to back.
@@ -221,9 +223,60 @@ def _post(url: str, payload: dict, *, weight: float | None = None) -> dict | lis
         from src.nadobro.core.http_session import is_circuit_open
 
         if is_circuit_open(url):
-            return None
+            return False, 0.0
+    except Exception:
+        pass
+    try:
+        cost = _derive_archive_weight(payload) if weight is None else float(weight)
     except Exception:
+        cost = 1.0
+    return True, cost
+
+
+def _handle_http_error(url: str, status, body: str, headers, attempt: int) -> bool:
+    """Record an archive HTTP error; True when the caller must stop (429)."""
+    global _rate_limited_until
+    retry_after = 0.0
+    content_type = ""
+    try:
+        retry_after = _parse_retry_after(headers)
+        content_type = (headers or {}).get("content-type") or ""
+    except Exception:  # noqa: BLE001
         pass
+    if status == 429:
+        _mark_rate_limited(status, body, attempt + 1, retry_after=retry_after)
+        return True
+    # Also honor Retry-After for 5xx; pause without escalating
+    # the 429 counter.
+    if isinstance(status, int) and 500 <= status < 600 and retry_after > 0:
+        with _rate_lock:
+            _rate_limited_until = max(
+                _rate_limited_until, time.time() + retry_after,
+            )
+    # Cloudflare-challenge: route through the throttled logger and
+    # let the breaker capture the failure so callers stop hammering.
+    if status == 403 and "text/html" in content_type.lower():
+        try:
+            from src.nadobro.core.http_session import _log_cf_warning, _record_challenge, _host  # noqa: WPS437
+
+            _log_cf_warning(url, status, body)
+            _record_challenge(_host(url))
+        except Exception:
+            pass
+    else:
+        logger.warning(
+            "Archive API HTTP %s (attempt %d): %s",
+            status,
+            attempt + 1,
+            redact_sensitive_text(body),
+        )
+    return False
+
+
+def _post(url: str, payload: dict, *, weight: float | None = None) -> dict | list | None:
+    proceed, cost = _admit(url, payload, weight)
+    if not proceed:
+        return None
 
     # Charge the documented archive IP weight against the shared per-host
     # weight bucket so this path and the SDK indexer paths in nado_client share
@@ -231,7 +284,6 @@ def _post(url: str, payload: dict, *, weight: float | None = None) -> dict | lis
     try:
         from src.nadobro.core.http_session import throttle_host
 
-        cost = _derive_archive_weight(payload) if weight is None else float(weight)
         if not throttle_host(url, cost=cost):
             return None
     except Exception:
@@ -255,42 +307,12 @@ def _post(url: str, payload: dict, *, weight: float | None = None) -> dict | lis
             except requests.HTTPError as e:
                 status = getattr(e.response, "status_code", "?")
                 body = ""
-                retry_after = 0.0
-                content_type = ""
                 try:
                     body = (e.response.text or "")[:200]
-                    retry_after = _parse_retry_after(getattr(e.response, "headers", None))
-                    content_type = (getattr(e.response, "headers", {}) or {}).get("content-type") or ""
                 except Exception:  # noqa: BLE001
                     pass
-                if status == 429:
-                    _mark_rate_limited(status, body, attempt + 1, retry_after=retry_after)
+                if _handle_http_error(url, status, body, getattr(e.response, "headers", None), attempt):
                     return None
-                # Also honor Retry-After for 5xx; pause without escalating
-                # the 429 counter.
-                if isinstance(status, int) and 500 <= status < 600 and retry_after > 0:
-                    with _rate_lock:
-                        global _rate_limited_until
-                        _rate_limited_until = max(
-                            _rate_limited_until, time.time() + retry_after,
-                        )
-                # Cloudflare-challenge: route through the throttled logger and
-                # let the breaker capture the failure so callers stop hammering.
-                if status == 403 and "text/html" in content_type.lower():
-                    try:
-                        from src.nadobro.core.http_session import _log_cf_warning, _record_challenge, _host  # noqa: WPS437
-
-                        _log_cf_warning(url, status, body)
-                        _record_challenge(_host(url))
-                    except Exception:
-                        pass
-                else:
-                    logger.warning(
-                        "Archive API HTTP %s (attempt %d): %s",
-                        status,
-                        attempt + 1,
-                        redact_sensitive_text(body),
-                    )
                 if attempt >= _MAX_RETRIES:
                     return None
             except requests.RequestException as e:
@@ -303,6 +325,71 @@ def _post(url: str, payload: dict, *, weight: float | None = None) -> dict | lis
         _request_semaphore.release()
 
 
+async def _await_request_slot() -> None:
+    while True:
+        with _rate_lock:
+            now = time.time()
+            cooldown = max(0.0, _rate_limited_until - now)
+            spacing = max(0.0, _MIN_INTERVAL_SECONDS - (now - _last_request_at))
+            wait = max(cooldown, spacing)
+        if wait <= 0:
+            return
+        await asyncio.sleep(min(wait, 1.0))
+
+
+async def _apost(url: str, payload: dict, *, weight: float | None = None) -> dict | list | None:
+    """``_post`` on the async HTTP/2 client; waits with ``asyncio.sleep``.
+
+    Shares the sync path's cooldown, concurrency slots, spacing and weight
+    bucket, so mixing the two never exceeds the archive budget.
+    """
+    import httpx
+
+    from src.nadobro.core import http_async
+
+    proceed, cost = _admit(url, payload, weight)
+    if not proceed:
+        return None
+    try:
+        if not await http_async.throttle_host_async(url, cost=cost):
+            return None
+    except Exception:
+        pass
+
+    while not _request_semaphore.acquire(blocking=False):
+        if is_archive_rate_limited():
+            return None
+        await asyncio.sleep(0.05)
+    try:
+        if is_archive_rate_limited():
+            return None
+        await _await_request_slot()
+        for attempt in range(_MAX_RETRIES + 1):
+            try:
+                _note_request_sent()
+                resp = await http_async.request("POST", url, json_body=payload, timeout=_REQUEST_TIMEOUT)
+                if resp.status_code < 400:
+                    _reset_rate_limit_streak()
+                    return resp.json()
+                body = ""
+                try:
+                    body = (resp.text or "")[:200]
+                except Exception:  # noqa: BLE001
+                    pass
+                if _handle_http_error(url, resp.status_code, body, resp.headers, attempt):
+                    return None
+                if attempt >= _MAX_RETRIES:
+                    return None
+            except (httpx.HTTPError, ValueError) as e:
+                logger.warning("Archive API request failed (attempt %d): %s", attempt + 1, e)
+                if attempt >= _MAX_RETRIES:
+                    return None
+            await asyncio.sleep(_RETRY_BASE_SECONDS * (2 ** attempt))
+        return None
+    finally:
+        _request_semaphore.release()
+
+
 def _orders_list_from_archive_response(result) -> list:
     """Normalize archive POST bodies that may return orders at top level or under data."""
     if result is None:
@@ -603,15 +690,12 @@ def query_order_by_digest(
         time.sleep(sleep_for)
 
 
-def query_orders_by_subaccount(
-    network: str,
+def _subaccount_params(
     subaccount_hex: str,
-    product_ids: list[int] | None = None,
-    limit: int = 100,
-    max_time: int | None = None,
-) -> list[dict]:
-    """Query recent orders for a subaccount from the archive."""
-    url = archive_url_for_network(network)
+    product_ids: list[int] | None,
+    limit: int,
+    max_time: int | None,
+) -> dict:
     params: dict = {
         "subaccounts": [subaccount_hex],
         "limit": min(limit, 500),
@@ -620,17 +704,51 @@ def query_orders_by_subaccount(
         params["product_ids"] = product_ids
     if max_time:
         params["max_time"] = max_time
+    return params
 
-    result = _post(url, {"orders": params})
+
+def _orders_from_result(result) -> list[dict]:
     if not result:
         return []
-
     orders_raw = _orders_list_from_archive_response(result)
     if not isinstance(orders_raw, list):
         return []
     return [_parse_order(o) for o in orders_raw if isinstance(o, dict)]
 
 
+def _matches_from_result(result) -> list[dict]:
+    if not result:
+        return []
+    matches_raw = _matches_list_from_archive_response(result)
+    if not isinstance(matches_raw, list):
+        return []
+    return [_parse_match(m) for m in matches_raw if isinstance(m, dict)]
+
+
+def query_orders_by_subaccount(
+    network: str,
+    subaccount_hex: str,
+    product_ids: list[int] | None = None,
+    limit: int = 100,
+    max_time: int | None = None,
+) -> list[dict]:
+    """Query recent orders for a subaccount from the archive."""
+    params = _subaccount_params(subaccount_hex, product_ids, limit, max_time)
+    return _orders_from_result(_post(archive_url_for_network(network), {"orders": params}))
+
+
+async def aquery_orders_by_subaccount(
+    network: str,
+    subaccount_hex: str,
+    product_ids: list[int] | None = None,
+    limit: int = 100,
+    max_time: int | None = None,
+) -> list[dict]:
+    """``query_orders_by_subaccount`` over the async HTTP/2 client."""
+    params = _subaccount_params(subaccount_hex, product_ids, limit, max_time)
+    return _orders_from_result(await _apost(archive_url_for_network(network), {"orders": params}))
+
+
 def query_matches_by_subaccount(
     network: str,
     subaccount_hex: str,
@@ -639,24 +757,20 @@ def query_matches_by_subaccount(
     max_time: int | None = None,
 ) -> list[dict]:
     """Query recent matches/fills for a subaccount from the archive."""
-    url = archive_url_for_network(network)
-    params: dict = {
-        "subaccounts": [subaccount_hex],
-        "limit": min(limit, 500),
-    }
-    if product_ids:
-        params["product_ids"] = product_ids
-    if max_time:
-        params["max_time"] = max_time
+    params = _subaccount_params(subaccount_hex, product_ids, limit, max_time)
+    return _matches_from_result(_post(archive_url_for_network(network), {"matches": params}))
 
-    result = _post(url, {"matches": params})
-    if not result:
-        return []
 
-    matches_raw = _matches_list_from_archive_response(result)
-    if not isinstance(matches_raw, list):
-        return []
-    return [_parse_match(m) for m in matches_raw if isinstance(m, dict)]
+async def aquery_matches_by_subaccount(
+    network: str,
+    subaccount_hex: str,
+    product_ids: list[int] | None = None,
+    limit: int = 50,
+    max_time: int | None = None,
+) -> list[dict]:
+    """``query_matches_by_subaccount`` over the async HTTP/2 client."""
+    params = _subaccount_params(subaccount_hex, product_ids, limit, max_time)
+    return _matches_from_result(await _apost(archive_url_for_network(network), {"matches": params}))
 
 
 # ---------------------------------------------------------------------------
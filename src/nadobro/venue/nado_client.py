@@ -16,6 +16,7 @@ from src.nadobro.config import (
     get_product_name, get_perp_products, get_product_id,
     get_nado_builder_routing_config,
 )
+from src.nadobro.venue.product_catalog import get_catalog_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -177,6 +178,13 @@ from src.nadobro.core.http_session import SESSION as _rest_session  # noqa: E402
 # (order execution, WS auth, Telegram-reply DB reads) that also fan work out to
 # the default executor — a poll storm can no longer starve them.
 from src.nadobro.core.async_utils import run_blocking_sdk  # noqa: E402
+from src.nadobro.venue.single_flight import (  # noqa: E402
+    MARKET_RETAIN_SECONDS,
+    acoalesced,
+    clear_single_flight,
+    coalesced,
+    single_flight_stats,
+)
 
 
 def _install_session_timeout(session, timeout) -> bool:
@@ -395,6 +403,7 @@ def clear_nado_client_cache() -> None:
         _NADO_CLIENT_CACHE.clear()
         _NADO_CLIENT_CACHE_USER_INDEX.clear()
         _NADO_CLIENT_CACHE_STATS["clear_all"] += 1
+    clear_single_flight()
 
 
 def get_nado_client_cache_stats() -> dict:
@@ -404,6 +413,7 @@ def get_nado_client_cache_stats() -> dict:
             **_NADO_CLIENT_CACHE_STATS,
             "size": len(_NADO_CLIENT_CACHE),
             "users_tracked": len(_NADO_CLIENT_CACHE_USER_INDEX),
+            "single_flight": single_flight_stats(),
         }
 
 
@@ -629,6 +639,51 @@ class NadoClient:
         finally:
             self._gateway_release()
 
+    async def _aquery_rest(self, query_type: str, extra_params: Optional[dict] = None) -> Optional[dict]:
+        """``_query_rest`` on the async HTTP/2 client (no thread, no blocking sleeps)."""
+        import httpx
+
+        from src.nadobro.core import http_async
+        from src.nadobro.venue.gateway_budget import try_acquire_async
+        from src.nadobro.venue.nado_weights import query_weight
+        if not await try_acquire_async(
+            self._rest_url(),
+            user_id=getattr(self, "acting_user_id", None),
+            weight=query_weight(query_type, extra_params),
+        ):
+            return None
+        params = {"type": query_type}
+        if extra_params:
+            params.update(extra_params)
+        url = f"{self._rest_url()}/query"
+        use_post = query_type in {"market_prices", "orders"} or isinstance((extra_params or {}).get("product_ids"), list)
+        max_attempts = max(1, _REST_MAX_RETRIES + 1)
+        try:
+            for attempt in range(max_attempts):
+                try:
+                    if use_post:
+                        resp = await http_async.request("POST", url, json_body=params, timeout=_REQUEST_TIMEOUT_SECONDS)
+                    else:
+                        resp = await http_async.request("GET", url, params=params, timeout=_REQUEST_TIMEOUT_SECONDS)
+                    data = self._parse_json_response(resp)
+                    if data is not None:
+                        return data
+                    if attempt >= (max_attempts - 1):
+                        return None
+                except httpx.HTTPError as e:
+                    self._record_gateway_error(e)
+                    if attempt >= (max_attempts - 1):
+                        logger.error("REST query failed type=%s attempts=%s: %s", query_type, max_attempts, e)
+                        return None
+                except Exception as e:
+                    logger.error("REST query failed type=%s unexpected: %s", query_type, e)
+                    return None
+                sleep_s = (_REST_RETRY_BASE_SECONDS * (2 ** attempt)) + random.uniform(0.0, _REST_RETRY_JITTER_SECONDS)
+                await asyncio.sleep(sleep_s)
+            return None
+        finally:
+            self._gateway_release()
+
     @staticmethod
     def _to_plain(value):
         """Convert SDK/Pydantic objects into plain Python containers."""
@@ -658,6 +713,7 @@ class NadoClient:
             return self.initialize()
         return False
 
+    @coalesced(lambda self, product_id: (self.network, product_id), retain_seconds=MARKET_RETAIN_SECONDS)
     def get_market_price(self, product_id: int) -> dict:
         cache_key = f"{self.network}:{product_id}"
         with _caches_lock:
@@ -692,6 +748,12 @@ class NadoClient:
 
         return {"bid": 0, "ask": 0, "mid": 0}
 
+    @coalesced(
+        lambda self, product_id, timeframe="1h", limit=200, max_time=None: (
+            self.network, product_id, timeframe, limit, max_time
+        ),
+        retain_seconds=MARKET_RETAIN_SECONDS,
+    )
     def get_candlesticks(self, product_id: int, timeframe: str = "1h", limit: int = 200, max_time: int | None = None) -> list[dict]:
         """Fetch OHLCV candles from the Nado indexer through the official SDK.
 
@@ -707,6 +769,16 @@ class NadoClient:
                 self.initialize()
             if not self._initialized or not self.client:
                 return []
+        from src.nadobro.core.feature_flags import candle_store_enabled
+        if candle_store_enabled():
+            # Process-wide ring buffer per (network, product, granularity):
+            # any limit/max_time it holds is served from memory and refreshes
+            # are small delta queries (venue/candle_store.py).
+            from src.nadobro.venue.candle_store import CANDLE_STORE
+            return CANDLE_STORE.get(
+                self.network, int(product_id), str(timeframe), int(limit), max_time,
+                fetch=self._fetch_candlesticks,
+            )
         # Shared Redis cache for the live "latest" window (max_time is None).
         # Historical/paginated queries (max_time set) are not cached — they are
         # rare and would pollute the shared key. A hit here avoids both the
@@ -721,6 +793,15 @@ class NadoClient:
                 # Sort cache hits too: entries written before this fix (or by an
                 # older worker during a rolling deploy) are newest-first.
                 return _candles_sorted_asc(cached)
+        candles = self._fetch_candlesticks(product_id, timeframe, limit, max_time)
+        if not candles:
+            return []
+        if candles_redis_key is not None:
+            self._write_shared_cache(candles_redis_key, candles, _CANDLES_CACHE_TTL)
+        return candles
+
+    def _fetch_candlesticks(self, product_id: int, timeframe: str, limit: int, max_time: int | None) -> list[dict] | None:
+        """One indexer candlesticks query, oldest-first; None when throttled or failed."""
         from src.nadobro.venue.nado_weights import query_weight
         if not self._gateway_allowed(
             weight=query_weight("candlesticks", {"limit": limit}),
@@ -735,7 +816,7 @@ class NadoClient:
                 "timeframe=%s limit=%s — returning empty (cache miss)",
                 product_id, timeframe, limit,
             )
-            return []
+            return None
         try:
             from nado_protocol.indexer_client.types.query import IndexerCandlesticksParams
             from nado_protocol.indexer_client.types.models import IndexerCandlesticksGranularity
@@ -770,56 +851,83 @@ class NadoClient:
                         "volume": float(get("volume", 0) or 0),
                     }
                 )
-            candles = _candles_sorted_asc(candles)
-            if candles_redis_key is not None and candles:
-                self._write_shared_cache(candles_redis_key, candles, _CANDLES_CACHE_TTL)
-            return candles
+            return _candles_sorted_asc(candles)
         except Exception as e:
             logger.warning("SDK get_candlesticks failed product_id=%s timeframe=%s: %s", product_id, timeframe, e)
-            return []
+            return None
+
+    def _perp_products(self) -> tuple[list[tuple[str, int]], dict]:
+        """Listed perps as ``(name, product_id)`` plus id → display name.
+
+        Read off one catalog snapshot per call instead of a catalog lookup per
+        product; falls back to the config product list when the catalog is
+        unavailable.
+        """
+        try:
+            snap = get_catalog_snapshot(network=self.network, client=self)
+        except Exception:  # policy: degrade-ok(catalog unavailable; config product list below)
+            snap = None
+        if snap is not None and snap.ordered_keys:
+            ids = snap.id_by_alias
+            pairs = [(key, ids[key.lower()]) for key in snap.ordered_keys if key.lower() in ids]
+            return pairs, snap.name_by_id
+        pairs = []
+        for name in get_perp_products(network=self.network, client=self):
+            pid = get_product_id(name, network=self.network, client=self)
+            if pid is not None:
+                pairs.append((name, int(pid)))
+        return pairs, {}
+
+    def _market_prices_from_response(self, data: dict, names_by_id: dict) -> dict:
+        """``{name: {bid, ask, mid}}`` from a ``market_prices`` response; cached when non-empty."""
+        prices: dict = {}
+        if data.get("status") != "success":
+            return prices
+        payload = data.get("data", {}) or {}
+        rows = payload.get("market_prices") if isinstance(payload, dict) else None
+        if rows is None and isinstance(payload, list):
+            rows = payload
+        if rows is None and isinstance(payload, dict):
+            rows = payload.get("prices") or payload.get("markets")
+        if isinstance(rows, dict):
+            rows = list(rows.values())
+        for row in rows or []:
+            if not isinstance(row, dict):
+                continue
+            try:
+                pid = int(row.get("product_id"))
+            except Exception:  # policy: degrade-ok(malformed price row; skipped)
+                continue
+            name = names_by_id.get(pid) or get_product_name(pid, network=self.network, client=self)
+            name = str(name).replace("-PERP", "")
+            bid = self._from_x18_dynamic(row.get("bid_x18") or row.get("bid") or row.get("price_x18") or row.get("price"))
+            ask = self._from_x18_dynamic(row.get("ask_x18") or row.get("ask") or row.get("price_x18") or row.get("price"))
+            if bid <= 0 and ask > 0:
+                bid = ask
+            if ask <= 0 and bid > 0:
+                ask = bid
+            mid = (bid + ask) / 2.0 if (bid > 0 and ask > 0) else 0.0
+            if mid > 0:
+                prices[name] = {"bid": float(bid), "ask": float(ask), "mid": float(mid)}
+        if prices:
+            with _caches_lock:
+                _ALL_PRICES_CACHE[self.network] = {"data": prices, "ts": time.time()}
+        return prices
 
+    @coalesced(lambda self: (self.network,), retain_seconds=MARKET_RETAIN_SECONDS)
     def get_all_market_prices(self) -> dict:
         prices = {}
+        perp_products: list[tuple[str, int]] = []
         try:
-            product_ids = []
-            for name in get_perp_products(network=self.network, client=self):
-                pid = get_product_id(name, network=self.network, client=self)
-                if pid is not None:
-                    product_ids.append(int(pid))
+            perp_products, names_by_id = self._perp_products()
+            product_ids = [pid for _, pid in perp_products]
             if product_ids:
                 data = self._query_rest("market_prices", {"product_ids": product_ids}) or {}
             else:
                 data = {}
-            if data.get("status") == "success":
-                payload = data.get("data", {}) or {}
-                rows = payload.get("market_prices")
-                if rows is None and isinstance(payload, list):
-                    rows = payload
-                if rows is None and isinstance(payload, dict):
-                    rows = payload.get("prices") or payload.get("markets")
-                if isinstance(rows, dict):
-                    rows = list(rows.values())
-                for row in rows or []:
-                    if not isinstance(row, dict):
-                        continue
-                    try:
-                        pid = int(row.get("product_id"))
-                    except Exception:  # policy: degrade-ok(malformed price row; skipped)
-                        continue
-                    name = str(get_product_name(pid, network=self.network, client=self)).replace("-PERP", "")
-                    bid = self._from_x18_dynamic(row.get("bid_x18") or row.get("bid") or row.get("price_x18") or row.get("price"))
-                    ask = self._from_x18_dynamic(row.get("ask_x18") or row.get("ask") or row.get("price_x18") or row.get("price"))
-                    if bid <= 0 and ask > 0:
-                        bid = ask
-                    if ask <= 0 and bid > 0:
-                        ask = bid
-                    mid = (bid + ask) / 2.0 if (bid > 0 and ask > 0) else 0.0
-                    if mid > 0:
-                        prices[name] = {"bid": float(bid), "ask": float(ask), "mid": float(mid)}
-                if prices:
-                    with _caches_lock:
-                        _ALL_PRICES_CACHE[self.network] = {"data": prices, "ts": time.time()}
-                    return prices
+            prices = self._market_prices_from_response(data, names_by_id)
+            if prices:
+                return prices
         except Exception as e:
             logger.debug("market_prices bulk query unavailable, falling back to fanout: %s", e)
 
@@ -833,11 +941,8 @@ class NadoClient:
                 cached = _ALL_PRICES_CACHE.get(self.network)
             return dict(cached["data"]) if cached else {}
 
-        perp_products = []
-        for name in get_perp_products(network=self.network, client=self):
-            pid = get_product_id(name, network=self.network, client=self)
-            if pid is not None:
-                perp_products.append((name, pid))
+        if not perp_products:
+            perp_products, _names = self._perp_products()
         with ThreadPoolExecutor(max_workers=max(1, _FANOUT_WORKERS)) as pool:
             futures = {pool.submit(self.get_market_price, pid): name for name, pid in perp_products}
             for fut in as_completed(futures):
@@ -848,6 +953,27 @@ class NadoClient:
                     prices[name] = {"bid": 0, "ask": 0, "mid": 0}
         return prices
 
+    @acoalesced(lambda self: (self.network,), retain_seconds=MARKET_RETAIN_SECONDS)
+    async def aget_all_market_prices(self) -> dict:
+        """Async ``get_all_market_prices``: one batched read on the HTTP/2 client.
+
+        An empty batch (throttled, gateway error) takes the sync path on the SDK
+        pool, which owns the cache-serving and per-product fan-out fallbacks.
+        """
+        from src.nadobro.core.feature_flags import async_http_enabled
+        if async_http_enabled():
+            try:
+                perp_products, names_by_id = self._perp_products()
+                product_ids = [pid for _, pid in perp_products]
+                if product_ids:
+                    data = await self._aquery_rest("market_prices", {"product_ids": product_ids}) or {}
+                    prices = self._market_prices_from_response(data, names_by_id)
+                    if prices:
+                        return prices
+            except Exception as e:
+                logger.debug("async market_prices unavailable, using the SDK pool: %s", e)
+        return await run_blocking_sdk(self.get_all_market_prices)
+
     def get_perp_contracts(self) -> dict:
         """Best-effort contracts/tickers payload used by miniapp quotes.
 
@@ -881,6 +1007,12 @@ class NadoClient:
             pass
         return {}
 
+    # cache_only is a memory read: nothing to share.
+    @coalesced(
+        lambda self, force=False, cache_only=False: (
+            None if cache_only else (self.network, self.subaccount_hex, bool(force))
+        )
+    )
     def get_balance(self, force: bool = False, cache_only: bool = False) -> dict:
         # Redis cache layer. Three-fold purpose:
         #   1. Smooth over transient "Too Many Requests" on query_subaccount_info
@@ -954,15 +1086,8 @@ class NadoClient:
 
         try:
             data = self._query_rest("subaccount_info", {"subaccount": self.subaccount_hex}) or {}
-            if data.get("status") == "success":
-                data_payload = data.get("data", {}) or {}
-                exists_field = data_payload.get("exists")
-                balances = {}
-                for sb in data_payload.get("spot_balances", []):
-                    bal = int(sb["balance"]["amount"]) / 1e18
-                    balances[sb["product_id"]] = bal
-                exists = bool(exists_field) if exists_field is not None else bool(balances)
-                result = {"exists": exists, "balances": balances}
+            result = self._balance_from_subaccount_info(data)
+            if result is not None:
                 self._write_balance_cache(redis_key, result, balance_ttl_seconds)
                 return result
         except Exception as e:
@@ -974,6 +1099,46 @@ class NadoClient:
             return cached
         return {"exists": False, "balances": {}}
 
+    @staticmethod
+    def _balance_from_subaccount_info(data: dict) -> Optional[dict]:
+        """``{exists, balances}`` from a REST ``subaccount_info`` response, or None."""
+        if data.get("status") != "success":
+            return None
+        data_payload = data.get("data", {}) or {}
+        exists_field = data_payload.get("exists")
+        balances = {}
+        for sb in data_payload.get("spot_balances", []):
+            bal = int(sb["balance"]["amount"]) / 1e18
+            balances[sb["product_id"]] = bal
+        exists = bool(exists_field) if exists_field is not None else bool(balances)
+        return {"exists": exists, "balances": balances}
+
+    @acoalesced(lambda self, force=False: (self.network, self.subaccount_hex, bool(force)))
+    async def aget_balance(self, force: bool = False) -> dict:
+        """Async ``get_balance``: same cache contract, ``subaccount_info`` over HTTP/2."""
+        from src.nadobro.core.feature_flags import async_http_enabled
+        if not async_http_enabled():
+            return await run_blocking_sdk(self.get_balance, force)
+        redis_key = f"balance:{self.network}:{self.subaccount_hex}"
+        balance_ttl_seconds = env_int("NADO_BALANCE_CACHE_TTL_SECONDS", 30)
+        if not force and balance_ttl_seconds > 0:
+            cached = self._read_balance_cache(redis_key)
+            if cached is not None:
+                return cached
+        try:
+            data = await self._aquery_rest("subaccount_info", {"subaccount": self.subaccount_hex}) or {}
+            result = self._balance_from_subaccount_info(data)
+            if result is not None:
+                self._write_balance_cache(redis_key, result, balance_ttl_seconds)
+                return result
+        except Exception as e:
+            logger.error("async get_balance failed: %s", e)
+        # Throttled or failed: last known-good snapshot before exists=False.
+        cached = self._read_balance_cache(redis_key)
+        if cached is not None:
+            return cached
+        return {"exists": False, "balances": {}}
+
     def _read_balance_cache(self, cache_key: str) -> Optional[dict]:
         cached = _shared_cache_get(cache_key)
         if isinstance(cached, dict) and "balances" in cached:
@@ -1013,6 +1178,11 @@ class NadoClient:
     def _write_shared_cache(cache_key: str, value, ttl_seconds: int) -> None:
         _shared_cache_set(cache_key, value, ttl_seconds)
 
+    @coalesced(
+        lambda self, product_id, refresh=False, sender=None: (
+            self.network, (sender or "").strip() or self.subaccount_hex, product_id, bool(refresh)
+        )
+    )
     def get_open_orders(self, product_id: int, refresh: bool = False, sender: Optional[str] = None) -> list:
         eff_sender = (sender or "").strip() or self.subaccount_hex
         cache_key = (self.network, str(eff_sender or ""), int(product_id))
@@ -1128,8 +1298,6 @@ class NadoClient:
             return []
 
         try:
-            from nado_protocol.utils.math import from_x18
-
             data = self.client.context.engine_client.get_subaccount_multi_products_open_orders(
                 product_ids, sender
             )
@@ -1147,6 +1315,12 @@ class NadoClient:
         finally:
             self._gateway_release()
 
+        return self._cache_open_order_blocks(sender, data)
+
+    def _cache_open_order_blocks(self, sender: str, data) -> list[dict]:
+        """Flatten a multi-product open-orders payload and refresh the per-product cache."""
+        from nado_protocol.utils.math import from_x18
+
         rows: list[dict] = []
         now = time.time()
         for product_block in getattr(data, "product_orders", None) or []:
@@ -1175,6 +1349,28 @@ class NadoClient:
             rows.extend(block_orders)
         return rows
 
+    async def aget_open_orders_batched(self, product_ids: list[int], sender: Optional[str] = None) -> list[dict]:
+        """Async ``_open_orders_for_sender_batched``: one ``orders`` query over HTTP/2."""
+        eff_sender = (sender or "").strip() or self.subaccount_hex
+        if not eff_sender or not product_ids:
+            return []
+        from src.nadobro.core.feature_flags import async_http_enabled
+        if not async_http_enabled():
+            return await run_blocking_sdk(self._open_orders_for_sender_batched, eff_sender, list(product_ids))
+        data = await self._aquery_rest(
+            "orders", {"sender": eff_sender, "product_ids": [int(pid) for pid in product_ids]}
+        ) or {}
+        if data.get("status") != "success":
+            return []
+        try:
+            from nado_protocol.engine_client.types.query import SubaccountMultiProductsOpenOrdersData
+
+            parsed = SubaccountMultiProductsOpenOrdersData.parse_obj(data.get("data") or {})
+        except Exception as e:
+            logger.error("async open-orders payload unparsable: %s", e)
+            return []
+        return self._cache_open_order_blocks(eff_sender, parsed)
+
     def _open_order_product_ids(self, *, include_spot: bool = True, refresh: bool = False) -> list[int]:
         """Product ids the portfolio open-order sweep should query.
 
@@ -1267,6 +1463,11 @@ class NadoClient:
                 rows.append(order)
         return rows
 
+    @acoalesced(
+        lambda self, *, product_ids=None, limit=200, idx=None, max_time=None: (
+            self.network, self.subaccount_hex, tuple(product_ids or ()), limit, idx, max_time
+        )
+    )
     async def get_matches(
         self,
         *,
@@ -1282,32 +1483,37 @@ class NadoClient:
         """
         if not self._ensure_sdk_client():
             return []
+        from src.nadobro.core.feature_flags import async_http_enabled
         from src.nadobro.venue.nado_weights import query_weight
-        # _gateway_allowed -> try_acquire can time.sleep() on a starved token
-        # bucket. This runs in the coroutine body (not inside _call), so doing it
-        # inline would block the event loop. Run it in the SDK pool.
-        if not await run_blocking_sdk(
-            self._gateway_allowed,
-            weight=query_weight("matches", {"limit": limit, "subaccounts": [self.subaccount_hex]}),
-            url=self._archive_url(),
-            user_scoped=False,
-        ):
+        weight = query_weight("matches", {"limit": limit, "subaccounts": [self.subaccount_hex]})
+        native = async_http_enabled()
+        if native:
+            from src.nadobro.venue.gateway_budget import try_acquire_async
+
+            allowed = await try_acquire_async(self._archive_url(), weight=weight)
+        else:
+            # _gateway_allowed -> try_acquire can time.sleep() on a starved token
+            # bucket, so the blocking gate runs in the SDK pool.
+            allowed = await run_blocking_sdk(
+                self._gateway_allowed, weight=weight, url=self._archive_url(), user_scoped=False
+            )
+        if not allowed:
             return []
         try:
             from nado_protocol.indexer_client.types.query import IndexerMatchesParams
 
-            def _call():
-                params = IndexerMatchesParams(
-                    subaccounts=[self.subaccount_hex],
-                    product_ids=product_ids,
-                    isolated=None,
-                    idx=int(idx) if idx is not None else None,
-                    max_time=max_time,
-                    limit=int(limit),
-                )
-                return self.client.context.indexer_client.get_matches(params)
-
-            data = await run_blocking_sdk(_call)
+            params = IndexerMatchesParams(
+                subaccounts=[self.subaccount_hex],
+                product_ids=product_ids,
+                isolated=None,
+                idx=int(idx) if idx is not None else None,
+                max_time=max_time,
+                limit=int(limit),
+            )
+            if native:
+                data = await self._aindexer_matches(params)
+            else:
+                data = await run_blocking_sdk(self.client.context.indexer_client.get_matches, params)
             rows = getattr(data, "matches", None)
             if rows is None and isinstance(data, dict):
                 rows = data.get("matches")
@@ -1316,6 +1522,18 @@ class NadoClient:
             logger.error("SDK get_matches failed: %s", _format_sdk_error(e))
             return []
 
+    async def _aindexer_matches(self, params):
+        """The SDK's indexer ``matches`` request and parse, sent over HTTP/2."""
+        from nado_protocol.indexer_client.types.query import IndexerMatchesData, to_indexer_request
+
+        from src.nadobro.core import http_async
+        resp = await http_async.request(
+            "POST", self._archive_url(), json_body=to_indexer_request(params).dict(), timeout=_REQUEST_TIMEOUT_SECONDS
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(f"indexer matches HTTP {resp.status_code}: {resp.text[:200]}")
+        return IndexerMatchesData.parse_obj(resp.json())
+
     async def get_interest_and_funding_payments(
         self,
         *,
@@ -2065,6 +2283,7 @@ class NadoClient:
             out.append(iso)
         return out
 
+    @coalesced(lambda self: (self.network, self.subaccount_hex))
     def get_all_positions(self) -> list:
         # Default (cross / main) subaccount.
         main = self._positions_for_subaccount_hex(
@@ -3331,6 +3550,10 @@ class NadoClient:
             results.append(r)
         return {"success": True, "cancelled": len([r for r in results if r["success"]])}
 
+    @coalesced(
+        lambda self, product_ids: (self.network, tuple(product_ids or ())),
+        retain_seconds=MARKET_RETAIN_SECONDS,
+    )
     def get_perp_funding_rates(self, product_ids: list[int]) -> dict:
         """Latest funding rates for the given perp products, read from the
         indexer funding endpoint (SDK ``get_perp_funding_rates``).
@@ -3387,6 +3610,7 @@ class NadoClient:
             }
         return rates
 
+    @coalesced(lambda self: (self.network,), retain_seconds=MARKET_RETAIN_SECONDS)
     def get_all_funding_rates(self) -> dict:
         cache_key = f"{self.network}:funding"
         with _caches_lock:
@@ -3411,6 +3635,7 @@ class NadoClient:
         except (TypeError, ValueError):
             return rates.get(product_id)
 
+    @coalesced(lambda self, product_id: (self.network, product_id), retain_seconds=MARKET_RETAIN_SECONDS)
     def get_product_market_stats(self, product_id: int) -> dict:
         """
         Best-effort market stats for a product from Nado gateway payloads.
@@ -9,13 +9,14 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 
-from src.nadobro.utils.env import env_float
+from src.nadobro.utils.env import env_float, env_int
 from src.nadobro.db import execute, query_all, query_one
 from src.nadobro.config import NADO_MAINNET_REST, NADO_TESTNET_REST
 from src.nadobro.core.feature_flags import (
     fill_nudge_enabled,
     portfolio_heavy_sync_seconds,
     portfolio_poll_cache_seconds,
+    portfolio_sync_concurrency,
     portfolio_sync_interval_seconds,
     portfolio_sync_users_per_tick,
     portfolio_ws_enabled,
@@ -76,6 +77,42 @@ def get_cached_snapshot(user_id: int, network: str | None = None) -> dict[str, A
     return deepcopy(snapshot) if snapshot else None
 
 
+def get_cached_holdings(user_id: int, network: str) -> dict[str, Any] | None:
+    """Positions, spot balances and spot oracle prices of the last synced
+    snapshot, without a gateway call.
+
+    Copies only those small parts (``get_cached_snapshot`` deep-copies the
+    whole snapshot, matches included), so the portfolio history sampler can
+    read every active user each tick. ``spot_prices`` maps product_id to the
+    oracle price the account summary valued that balance at. ``None`` until
+    the user has synced in this process.
+    """
+    snapshot = _snapshot_cache.get(_cache_key(user_id, network))
+    if not snapshot or snapshot.get("last_sync") is None:
+        return None
+    return {
+        "network": _normalize_network(snapshot.get("network") or network),
+        "positions": deepcopy(list(snapshot.get("positions") or [])),
+        "spot_balances": dict(snapshot.get("spot_balances") or {}),
+        "spot_prices": _spot_oracle_prices(snapshot.get("summary")),
+        "last_sync": snapshot.get("last_sync"),
+    }
+
+
+def _spot_oracle_prices(summary: Any) -> dict[int, Decimal]:
+    """product_id -> oracle price from the account summary's ``spot_positions``."""
+    prices: dict[int, Decimal] = {}
+    rows = summary.get("spot_positions") if isinstance(summary, dict) else None
+    for row in rows or []:
+        if not isinstance(row, dict):
+            continue
+        try:
+            prices[int(row["product_id"])] = Decimal(str(row["oracle_price"]))
+        except (KeyError, TypeError, ValueError, ArithmeticError):
+            continue
+    return prices
+
+
 def set_cached_snapshot(user_id: int, network: str, snapshot: dict[str, Any]) -> None:
     cached = dict(snapshot)
     cached.setdefault("user_id", int(user_id))
@@ -120,6 +157,16 @@ _ACTIVE_USERS_PAGE_SIZE = portfolio_sync_users_per_tick()
 # scheduler walks all active users across ticks without re-syncing the same
 # top-N every iteration. Reset to 0 when we reach the end (handled below).
 _active_users_cursor: int = 0
+# Concurrent mode ranks the whole active set each tick; it is listed in pages
+# of this size, capped so a runaway table can't turn the listing into the hot
+# path.
+_ACTIVE_USERS_SCAN_PAGE = 500
+_ACTIVE_USERS_SCAN_MAX = env_int("NADO_PORTFOLIO_SYNC_SCAN_MAX", 10000)
+# Rough gateway weight of one poll sync (subaccount summary + open orders +
+# trigger orders + balance). Only used as the admission threshold: a user
+# starts only while the host bucket can absorb a typical sync.
+_SYNC_USER_WEIGHT_ESTIMATE = env_float("NADO_SYNC_USER_WEIGHT_ESTIMATE", 30.0)
+_last_tick_stats: dict[str, Any] = {}
 
 
 def active_users(limit: int | None = None, after_user_id: int | None = None) -> list[dict[str, Any]]:
@@ -133,7 +180,13 @@ def active_users(limit: int | None = None, after_user_id: int | None = None) ->
     cursor = int(after_user_id or 0)
     return query_all(
         """
-        SELECT u.telegram_id, u.network_mode AS network, u.last_active
+        SELECT u.telegram_id, u.network_mode AS network, u.last_active,
+               EXISTS (
+                 SELECT 1 FROM strategy_sessions rs
+                 WHERE rs.user_id = u.telegram_id
+                   AND rs.network = u.network_mode
+                   AND rs.status = 'running'
+               ) AS has_running_strategy
         FROM users u
         WHERE u.main_address IS NOT NULL
           AND u.telegram_id > %s
@@ -166,21 +219,18 @@ def active_users(limit: int | None = None, after_user_id: int | None = None) ->
 
 
 async def sync_active_users(reason: str = "poll") -> None:
-    """Walk active users in stable cursor order, one page per tick.
+    """Sync one tick's worth of active users.
 
-    Each scheduler invocation advances ``_active_users_cursor`` so we never
-    re-sync the same top-N users every tick. Page size and poll interval are
-    tunable via env (defaults: 8 users / 30s) to stay under Cloudflare limits.
+    ``NADO_PORTFOLIO_SYNC_CONCURRENCY`` > 1 (the default) runs the
+    budget-aware concurrent mode (:func:`_sync_active_users_concurrent`);
+    1 keeps the legacy one-at-a-time cursor walk
+    (:func:`_sync_active_users_sequential`).
 
-    A Redis-backed lock guards the tick: APScheduler ``max_instances=1`` only
-    protects *within* a process, but a slow tick (we saw 99s callbacks on
-    2026-05-27) still made subsequent ticks pile up and skip. With the
-    distributed lock + tick budget, only one tick runs at a time across the
-    fleet, and ticks that would pile up are silently dropped (apscheduler
-    ``coalesce=True`` already collapses missed runs).
+    No cross-process lock: a single machine runs this job, and APScheduler's
+    ``max_instances=1`` already prevents overlapping ticks in-process. (The
+    former Upstash RedisLock was removed with the rest of the Upstash layer;
+    its synchronous REST round-trips were a source of event-loop starvation.)
     """
-    global _active_users_cursor
-
     if reason == "poll":
         try:
             from src.nadobro.core.http_session import is_circuit_open
@@ -192,11 +242,66 @@ async def sync_active_users(reason: str = "poll") -> None:
             pass
 
     tick_budget = max(5.0, portfolio_sync_interval_seconds() * 0.85)
+    concurrency = portfolio_sync_concurrency()
+    if concurrency > 1:
+        await _sync_active_users_concurrent(reason, tick_budget, concurrency)
+    else:
+        await _sync_active_users_sequential(reason, tick_budget)
+
+
+async def _sync_one_user(
+    user_id: int, network: str, *, reason: str, poll_cache_ms: int | None, remaining: float,
+) -> bool:
+    """Run one bounded ``sync_user``; returns False when it timed out."""
+    # Cap the per-user timeout to the budget left in this tick. With a
+    # bare 30s per-user timeout (>= the 30s sync interval and > the
+    # ~25.5s tick budget), a single user wedged on a dead SDK connection
+    # ran the whole tick past its interval and APScheduler skipped the
+    # next sync_active_users run ("maximum number of running instances
+    # reached"). Bounding by the remaining budget means the tick can
+    # never overrun, so ticks stop piling up.
+    user_timeout = min(_SYNC_USER_TIMEOUT_SECONDS, remaining)
+    try:
+        await asyncio.wait_for(
+            sync_user(
+                user_id,
+                network=network,
+                reason=reason,
+                max_age_ms=poll_cache_ms,
+            ),
+            timeout=user_timeout,
+        )
+    except asyncio.TimeoutError:
+        # Only the FULL per-user timeout signals a wedged connection.
+        # A budget-truncated timeout (user_timeout < the configured
+        # per-user timeout) just means the tick ran out of room — the
+        # user is retried next tick, so don't cry "dead connection".
+        if user_timeout >= _SYNC_USER_TIMEOUT_SECONDS:
+            logger.warning(
+                "portfolio sync user=%s network=%s exceeded %.0fs budget — "
+                "likely a wedged SDK call on a dead connection; skipping user "
+                "so the tick does not stall",
+                user_id, network, _SYNC_USER_TIMEOUT_SECONDS,
+            )
+        else:
+            logger.debug(
+                "portfolio sync user=%s network=%s truncated at %.1fs (tick "
+                "budget); will retry next tick",
+                user_id, network, user_timeout,
+            )
+        return False
+    return True
+
+
+async def _sync_active_users_sequential(reason: str, tick_budget: float) -> None:
+    """Walk active users in stable cursor order, one page per tick.
+
+    Each scheduler invocation advances ``_active_users_cursor`` so we never
+    re-sync the same top-N users every tick. Page size and poll interval are
+    tunable via env (defaults: 8 users / 30s) to stay under Cloudflare limits.
+    """
+    global _active_users_cursor
 
-    # No cross-process lock: a single machine runs this job, and APScheduler's
-    # ``max_instances=1`` already prevents overlapping ticks in-process. (The
-    # former Upstash RedisLock was removed with the rest of the Upstash layer;
-    # its synchronous REST round-trips were a source of event-loop starvation.)
     try:
         rows = await asyncio.to_thread(active_users, _ACTIVE_USERS_PAGE_SIZE, _active_users_cursor)
     except Exception as exc:
@@ -221,46 +326,140 @@ async def sync_active_users(reason: str = "poll") -> None:
             break
         user_id = int(row.get("telegram_id"))
         network = str(row.get("network") or "mainnet")
-        # Cap the per-user timeout to the budget left in this tick. With a
-        # bare 30s per-user timeout (>= the 30s sync interval and > the
-        # ~25.5s tick budget), a single user wedged on a dead SDK connection
-        # ran the whole tick past its interval and APScheduler skipped the
-        # next sync_active_users run ("maximum number of running instances
-        # reached"). Bounding by the remaining budget means the tick can
-        # never overrun, so ticks stop piling up.
-        user_timeout = min(_SYNC_USER_TIMEOUT_SECONDS, remaining)
-        try:
-            await asyncio.wait_for(
-                sync_user(
-                    user_id,
-                    network=network,
-                    reason=reason,
-                    max_age_ms=poll_cache_ms,
-                ),
-                timeout=user_timeout,
-            )
-        except asyncio.TimeoutError:
-            # Only the FULL per-user timeout signals a wedged connection.
-            # A budget-truncated timeout (user_timeout < the configured
-            # per-user timeout) just means the tick ran out of room — the
-            # user is retried next tick, so don't cry "dead connection".
-            if user_timeout >= _SYNC_USER_TIMEOUT_SECONDS:
-                logger.warning(
-                    "portfolio sync user=%s network=%s exceeded %.0fs budget — "
-                    "likely a wedged SDK call on a dead connection; skipping user "
-                    "so the tick does not stall",
-                    user_id, network, _SYNC_USER_TIMEOUT_SECONDS,
-                )
-            else:
-                logger.debug(
-                    "portfolio sync user=%s network=%s truncated at %.1fs (tick "
-                    "budget); will retry next tick",
-                    user_id, network, user_timeout,
-                )
+        await _sync_one_user(
+            user_id, network, reason=reason, poll_cache_ms=poll_cache_ms, remaining=remaining,
+        )
         _active_users_cursor = max(_active_users_cursor, user_id)
         synced += 1
 
 
+def _all_active_users() -> list[dict[str, Any]]:
+    """Every active user, walked in ``_ACTIVE_USERS_SCAN_PAGE`` pages."""
+    rows: list[dict[str, Any]] = []
+    cursor = 0
+    while len(rows) < _ACTIVE_USERS_SCAN_MAX:
+        page = active_users(_ACTIVE_USERS_SCAN_PAGE, cursor)
+        if not page:
+            break
+        rows.extend(page)
+        if len(page) < _ACTIVE_USERS_SCAN_PAGE:
+            break
+        cursor = int(page[-1].get("telegram_id") or 0)
+    return rows[:_ACTIVE_USERS_SCAN_MAX]
+
+
+def active_user_ids() -> list[int]:
+    """Telegram ids of every user :func:`sync_active_users` keeps synced."""
+    return [int(row.get("telegram_id")) for row in _all_active_users()]
+
+
+def _snapshot_age_seconds(user_id: int, network: str, now: float) -> float:
+    cached = _snapshot_cache.get(_cache_key(user_id, network))
+    if not cached:
+        return float("inf")
+    return max(0.0, now - float(cached.get("monotonic_ts", 0) or 0))
+
+
+def _prioritize_sync_rows(rows: list[dict[str, Any]], now: float) -> list[tuple[float, dict[str, Any]]]:
+    """Order users for a tick: running strategies first, then stalest first.
+
+    Ranking by snapshot age is what makes the concurrent mode fair without a
+    cursor — a user synced this tick sinks to the back of the next one.
+    Returns ``(age_seconds, row)`` pairs.
+    """
+    ranked = []
+    for row in rows:
+        network = _normalize_network(row.get("network") or "mainnet")
+        age = _snapshot_age_seconds(int(row.get("telegram_id")), network, now)
+        ranked.append((age, row))
+    ranked.sort(key=lambda item: (0 if item[1].get("has_running_strategy") else 1, -item[0]))
+    return ranked
+
+
+async def _sync_active_users_concurrent(reason: str, tick_budget: float, concurrency: int) -> None:
+    """Budget-aware concurrent sync of the stalest active users.
+
+    Up to ``concurrency`` users sync at once, and at most
+    ``users_per_tick × concurrency`` users start per tick. A user only starts
+    while its gateway has headroom for a typical sync
+    (``gateway_budget.has_headroom``); once a network's budget denies, no
+    further users on it start this tick — they stay stalest and lead the next
+    one — so the gateway request rate never exceeds the existing budget.
+    Per-tick stats land in :func:`last_sync_tick_stats` and ``perf``.
+    """
+    from src.nadobro.core.perf import increment_counter, percentile, record_metric
+    from src.nadobro.venue.gateway_budget import has_headroom
+
+    started_tick = time.monotonic()
+    try:
+        rows = await asyncio.to_thread(_all_active_users)
+    except Exception as exc:
+        logger.warning("portfolio active user query failed: %s", exc)
+        return
+
+    poll_cache_ms = portfolio_poll_cache_seconds() * 1000 if reason == "poll" else None
+    fresh_seconds = (poll_cache_ms or 0) / 1000.0
+    ranked = _prioritize_sync_rows(rows, time.time())
+    # Users still inside the poll-cache window would be cache hits; don't
+    # spend a slot (or a budget probe) on them.
+    queue = [row for age, row in ranked if age >= fresh_seconds][: _ACTIVE_USERS_PAGE_SIZE * concurrency]
+
+    deadline = started_tick + tick_budget
+    latencies: list[float] = []
+    starved: set[str] = set()
+    stats = {"candidates": len(rows), "due": len(queue), "synced": 0, "timeouts": 0, "budget_denied": 0}
+    pending = iter(queue)
+
+    async def _worker() -> None:
+        for row in pending:
+            remaining = deadline - time.monotonic()
+            if remaining < _MIN_USER_SYNC_BUDGET_SECONDS:
+                return
+            user_id = int(row.get("telegram_id"))
+            network = _normalize_network(row.get("network") or "mainnet")
+            if network in starved:
+                continue
+            gateway = NADO_MAINNET_REST if network == "mainnet" else NADO_TESTNET_REST
+            if not has_headroom(gateway, weight=_SYNC_USER_WEIGHT_ESTIMATE, user_id=user_id):
+                starved.add(network)
+                stats["budget_denied"] += 1
+                increment_counter("portfolio_sync.budget_denied")
+                continue
+            started = time.perf_counter()
+            ok = await _sync_one_user(
+                user_id, network, reason=reason, poll_cache_ms=poll_cache_ms, remaining=remaining,
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            latencies.append(elapsed_ms)
+            record_metric("portfolio_sync.user", elapsed_ms)
+            if ok:
+                stats["synced"] += 1
+            else:
+                stats["timeouts"] += 1
+
+    await asyncio.gather(*(_worker() for _ in range(max(1, min(concurrency, len(queue))))))
+
+    stats.update({
+        "mode": "concurrent",
+        "concurrency": concurrency,
+        "p95_user_ms": round(percentile(latencies, 0.95), 2) if latencies else 0.0,
+        "elapsed_ms": round((time.monotonic() - started_tick) * 1000.0, 2),
+    })
+    _last_tick_stats.clear()
+    _last_tick_stats.update(stats)
+    increment_counter("portfolio_sync.users_synced", stats["synced"])
+    logger.debug(
+        "portfolio sync tick: synced=%d/%d due (active=%d) p95=%.0fms denied=%d timeouts=%d",
+        stats["synced"], stats["due"], stats["candidates"], stats["p95_user_ms"],
+        stats["budget_denied"], stats["timeouts"],
+    )
+
+
+def last_sync_tick_stats() -> dict[str, Any]:
+    """Stats from the most recent concurrent portfolio sync tick."""
+    return dict(_last_tick_stats)
+
+
 async def sync_user(
     user_id: int,
     *,
@@ -400,7 +599,7 @@ async def sync_user(
                 client.calculate_account_summary(ts=int(time.time())),
                 run_blocking_sdk(client.get_all_open_orders, True, include_isolated=include_isolated),
                 client.get_trigger_orders(limit=200),
-                run_blocking_sdk(client.get_balance),
+                client.aget_balance(),
             )
 
             if need_heavy:
@@ -478,13 +677,39 @@ def _write_snapshot(snapshot: dict[str, Any], duration_ms: int) -> None:
     # ``stats`` so the portfolio deck's Realized line reflects real round trips.
     # Volume/fees windows stay as computed from the venue x18 columns.
     try:
+        from src.nadobro.core.feature_flags import fill_rollups_enabled, round_trip_ledger_enabled
         from src.nadobro.models.database import (
+            advance_fill_rollups,
+            advance_round_trips,
             get_account_realized_pnl_windows,
             get_analytics_fills,
+            get_fill_rollup_analytics,
         )
         from src.nadobro.quant.user_analytics import aggregate_user_analytics
 
-        realized = get_account_realized_pnl_windows(user_id, network)
+        # Fold this pass's fills / funding into the per-day rollups, then read
+        # every window from them instead of replaying the whole ledger twice
+        # per sync. The advance is O(rows stamped since the last one) plus a
+        # fill-revision lookup; the window read is a grouped range sum over
+        # the rollup rows and a replay of each window's start day. The
+        # full-ledger path stays the fallback.
+        rolled = None
+        if fill_rollups_enabled():
+            try:
+                advance_fill_rollups(user_id, network)
+            except Exception as exc:  # derived data; the ledger replay below still answers
+                logger.warning("fill rollup advance failed user=%s network=%s: %s", user_id, network, exc)
+            rolled = get_fill_rollup_analytics(user_id, network)
+        # Pair this pass's manual fills into the History round-trip ledger so
+        # the History view / Share-PnL callback are page and key reads. This
+        # is the only place it advances; History never does.
+        if round_trip_ledger_enabled():
+            try:
+                advance_round_trips(user_id, network)
+            except Exception as exc:  # derived data; the next sync pass advances it again
+                logger.warning("round-trip advance failed user=%s network=%s: %s", user_id, network, exc)
+
+        realized = rolled["realized"] if rolled else get_account_realized_pnl_windows(user_id, network)
         stats = snapshot.get("stats")
         if isinstance(stats, dict) and realized:
             stats["pnl_windows"] = realized["pnl_windows"]
@@ -498,9 +723,13 @@ def _write_snapshot(snapshot: dict[str, Any], duration_ms: int) -> None:
         # get_matches(limit=200) list, which produced "Volume $0.00" next to
         # "Realized +$16.73" and capped the All-time window at 200 fills.
         if isinstance(stats, dict):
-            ledger = get_analytics_fills(user_id, network)
+            if rolled:
+                ledger = rolled["fills"]
+                analytics = rolled["analytics"]
+            else:
+                ledger = get_analytics_fills(user_id, network)
+                analytics = aggregate_user_analytics(ledger, funding) if ledger else None
             if ledger:
-                analytics = aggregate_user_analytics(ledger, funding)
                 stats["analytics"] = analytics
                 stats["volume_windows"] = {
                     w: v["total_usd"] for w, v in analytics["nado_volume"].items()
@@ -687,6 +916,267 @@ def _write_open_orders(user_id: int, network: str, orders: list[dict[str, Any]])
         )
 
 
+# Passes with at least this many keyed matches use the set-based lookups.
+_MATCH_BATCH_MIN = max(2, env_int("NADO_SYNC_MATCH_BATCH_MIN", 2))
+# Rows per multi-row INSERT (20 params each, well under the bind limit).
+_MATCH_INSERT_CHUNK = 100
+
+_MATCH_INSERT_COLUMNS = (
+    "user_id, product_id, product_name, order_type, side, size, "
+    "fill_size, price, fill_price, fill_fee, status, "
+    "submission_idx, isolated, realized_pnl_x18, fee_x18, base_filled_x18, quote_filled_x18, "
+    "order_digest, strategy_session_id, source, via_nadobro, "
+    "filled_at, created_at"
+)
+_MATCH_INSERT_ROW = (
+    "(%s, %s, %s, 'match', %s, %s, %s, %s, %s, %s, 'filled', %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now())"
+)
+
+
+def _submission_key(value: Any) -> str:
+    """Canonical form of a submission_idx (the column is NUMERIC; matches carry strings)."""
+    try:
+        return str(int(Decimal(str(value))))
+    except Exception:
+        return str(value)
+
+
+class _RowMatchLookups:
+    """The questions ``_write_matches`` asks per match, one query each.
+
+    Used for small passes; :class:`_BatchMatchLookups` answers the same
+    questions from a prefetch so both paths share one attribution flow.
+    """
+
+    def __init__(self, table: str) -> None:
+        self.table = table
+
+    def is_known(self, submission_idx: Any) -> bool:
+        row = query_one(f"SELECT id FROM {self.table} WHERE submission_idx = %s LIMIT 1", (submission_idx,))
+        return bool(row)
+
+    def open_order_product(self, digest: str) -> dict[str, Any] | None:
+        return query_one(
+            "SELECT product_id, pair FROM open_orders "
+            "WHERE order_digest = %s AND COALESCE(product_id, 0) <> 0 LIMIT 1",
+            (digest,),
+        )
+
+    def prior_product_row(self, digest: str) -> dict[str, Any] | None:
+        return query_one(
+            f"SELECT product_id, product_name, strategy_session_id FROM {self.table} "
+            f"WHERE order_digest = %s AND COALESCE(product_id, 0) <> 0 "
+            f"ORDER BY id ASC LIMIT 1",
+            (digest,),
+        )
+
+    def prior_session_row(self, digest: str) -> dict[str, Any] | None:
+        return query_one(
+            f"SELECT strategy_session_id FROM {self.table} "
+            f"WHERE order_digest = %s AND strategy_session_id IS NOT NULL "
+            f"ORDER BY id ASC LIMIT 1",
+            (digest,),
+        )
+
+    def back_link(self, digest: str, network: str) -> tuple[int | None, str, bool, int | None, str | None]:
+        return _back_link_intent(digest, network)
+
+    def session_product(self, session_id: int) -> dict[str, Any] | None:
+        return query_one(
+            "SELECT product_id, product_name FROM strategy_sessions "
+            "WHERE id = %s AND COALESCE(product_id, 0) <> 0 LIMIT 1",
+            (int(session_id),),
+        )
+
+    def recorder_row(self, digest: str) -> dict[str, Any] | None:
+        return query_one(
+            f"SELECT id, fill_size FROM {self.table} "
+            f"WHERE order_digest = %s "
+            f"AND submission_idx IS NULL AND COALESCE(order_type, '') NOT ILIKE '%%close%%' "
+            f"ORDER BY id ASC LIMIT 1",
+            (digest,),
+        )
+
+    def note_enriched(self, row: dict[str, Any], submission_idx: Any, session_id: int | None) -> None:
+        """Per-match lookups re-read the table, so writes need no bookkeeping."""
+
+    def note_inserted(
+        self, submission_idx: Any, digest: str, product_id: int, product_name: str, session_id: int | None
+    ) -> None:
+        """Per-match lookups re-read the table, so writes need no bookkeeping."""
+
+
+class _BatchMatchLookups(_RowMatchLookups):
+    """Set-based prefetch of everything a pass of matches needs.
+
+    Four queries (known submission_idx, trades rows by digest, open_orders
+    products, latest intents) plus one for the intents' sessions replace up
+    to six round trips per match. Writes made during the pass are mirrored
+    into the in-memory rows so later matches for the same digest see exactly
+    what the per-match queries would have returned.
+    """
+
+    def __init__(self, table: str, matches: list[dict[str, Any]]) -> None:
+        super().__init__(table)
+        keys = sorted({_submission_key(m.get("submission_idx")) for m in matches})
+        known = query_all(
+            f"SELECT submission_idx FROM {table} WHERE submission_idx = ANY(%s::numeric[])",
+            (keys,),
+        )
+        self._known = {_submission_key(r.get("submission_idx")) for r in known}
+        digests = sorted({
+            d for d in (_match_digest(m) for m in matches
+                        if _submission_key(m.get("submission_idx")) not in self._known)
+            if d
+        })
+        self._rows: dict[str, list[dict[str, Any]]] = {d: [] for d in digests}
+        self._open_orders: dict[str, dict[str, Any]] = {}
+        self._intents: dict[str, dict[str, Any]] = {}
+        self._sessions: dict[int, dict[str, Any] | None] = {}
+        self._next_id = 0
+        if not digests:
+            return
+        for row in query_all(
+            f"SELECT id, order_digest, product_id, product_name, strategy_session_id, "
+            f"submission_idx, order_type, fill_size FROM {table} "
+            f"WHERE order_digest = ANY(%s) ORDER BY id ASC",
+            (digests,),
+        ):
+            self._rows.setdefault(str(row.get("order_digest")), []).append(row)
+            self._next_id = max(self._next_id, int(row.get("id") or 0))
+        for row in query_all(
+            "SELECT DISTINCT ON (order_digest) order_digest, product_id, pair FROM open_orders "
+            "WHERE order_digest = ANY(%s) AND COALESCE(product_id, 0) <> 0",
+            (digests,),
+        ):
+            self._open_orders[str(row.get("order_digest"))] = row
+        for row in query_all(
+            "SELECT DISTINCT ON (order_digest) order_digest, value FROM order_intents "
+            "WHERE order_digest = ANY(%s) ORDER BY order_digest, updated_at DESC NULLS LAST",
+            (digests,),
+        ):
+            self._intents[str(row.get("order_digest"))] = row
+        session_ids = sorted({
+            sid for sid in (_intent_session_id(r.get("value")) for r in self._intents.values())
+            if sid is not None
+        })
+        if session_ids:
+            for row in query_all(
+                "SELECT id, network, product_id, product_name FROM strategy_sessions WHERE id = ANY(%s)",
+                (session_ids,),
+            ):
+                self._sessions[int(row["id"])] = row
+            for sid in session_ids:
+                self._sessions.setdefault(sid, None)
+
+    def is_known(self, submission_idx: Any) -> bool:
+        return _submission_key(submission_idx) in self._known
+
+    def open_order_product(self, digest: str) -> dict[str, Any] | None:
+        return self._open_orders.get(digest)
+
+    def prior_product_row(self, digest: str) -> dict[str, Any] | None:
+        return next((r for r in self._rows.get(digest, ()) if int(r.get("product_id") or 0) != 0), None)
+
+    def prior_session_row(self, digest: str) -> dict[str, Any] | None:
+        return next((r for r in self._rows.get(digest, ()) if r.get("strategy_session_id") is not None), None)
+
+    def back_link(self, digest: str, network: str) -> tuple[int | None, str, bool, int | None, str | None]:
+        if not digest:
+            return None, "manual", False, None, None
+        return _intent_link(self._intents.get(digest), network, self._session_row)
+
+    def session_product(self, session_id: int) -> dict[str, Any] | None:
+        row = self._session_row(session_id)
+        if row is not None and int(row.get("product_id") or 0) != 0:
+            return row
+        if int(session_id) in self._sessions:
+            return None
+        return super().session_product(session_id)
+
+    def recorder_row(self, digest: str) -> dict[str, Any] | None:
+        return next(
+            (
+                r for r in self._rows.get(digest, ())
+                if r.get("submission_idx") is None and "close" not in str(r.get("order_type") or "").lower()
+            ),
+            None,
+        )
+
+    def note_enriched(self, row: dict[str, Any], submission_idx: Any, session_id: int | None) -> None:
+        row["submission_idx"] = submission_idx
+        if row.get("strategy_session_id") is None:
+            row["strategy_session_id"] = session_id
+        self._known.add(_submission_key(submission_idx))
+
+    def note_inserted(
+        self, submission_idx: Any, digest: str, product_id: int, product_name: str, session_id: int | None
+    ) -> None:
+        self._known.add(_submission_key(submission_idx))
+        if not digest:
+            return
+        self._next_id += 1
+        self._rows.setdefault(digest, []).append({
+            "id": self._next_id,
+            "order_digest": digest,
+            "product_id": product_id,
+            "product_name": product_name,
+            "strategy_session_id": session_id,
+            "submission_idx": submission_idx,
+            "order_type": "match",
+        })
+
+    def _session_row(self, session_id: int) -> dict[str, Any] | None:
+        sid = int(session_id)
+        if sid not in self._sessions:
+            try:
+                self._sessions[sid] = query_one(
+                    "SELECT id, network, product_id, product_name FROM strategy_sessions WHERE id = %s",
+                    (sid,),
+                )
+            except Exception:
+                logger.debug("session lookup failed session=%s", sid, exc_info=True)
+                return None
+        return self._sessions[sid]
+
+
+def _match_digest(match: dict[str, Any]) -> str:
+    order = match.get("order") or {}
+    return str(
+        match.get("digest")
+        or match.get("order_digest")
+        or order.get("digest")
+        or order.get("order_digest")
+        or ""
+    ).strip()
+
+
+def _insert_match_rows(table: str, pending: list[tuple[tuple[Any, ...], int | None, str]]) -> int:
+    """Multi-row INSERT of venue-only fills; returns the rows actually written.
+
+    ``ON CONFLICT DO NOTHING`` keeps a fill another writer stored since the
+    prefetch from failing the whole chunk; only the rows returned count
+    toward the session win/loss bump.
+    """
+    from src.nadobro.db import execute_returning_all
+
+    written = 0
+    for offset in range(0, len(pending), _MATCH_INSERT_CHUNK):
+        chunk = pending[offset:offset + _MATCH_INSERT_CHUNK]
+        rows = execute_returning_all(
+            f"INSERT INTO {table} ({_MATCH_INSERT_COLUMNS}) VALUES "
+            + ", ".join([_MATCH_INSERT_ROW] * len(chunk))
+            + " ON CONFLICT DO NOTHING RETURNING submission_idx",
+            tuple(p for params, _sid, _pnl in chunk for p in params),
+        )
+        stored = {_submission_key(r.get("submission_idx")) for r in rows or ()}
+        for params, session_id, pnl_x18 in chunk:
+            if _submission_key(params[9]) in stored:
+                written += 1
+                _maybe_increment_session_win_loss(session_id, pnl_x18)
+    return written
+
+
 def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) -> int:
     inserted = 0
     table = f"trades_{_network_table_suffix(network)}"
@@ -695,14 +1185,28 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
     # the finalize rollup at STOP — but a session's CLOSE fills sync AFTER stop, so
     # without re-rolling up here the shareable card would miss the close turnover.
     touched_sessions: set[int] = set()
+    started = time.perf_counter()
+    # A heavy sync hands over up to 200 matches, nearly all already stored.
+    # Large passes answer every dedup / product / attribution question with a
+    # few set-based queries up front and insert the new fills in multi-row
+    # statements; small passes keep the per-match round trips.
+    lookups: _RowMatchLookups = _RowMatchLookups(table)
+    keyed = [m for m in matches if m.get("submission_idx") is not None]
+    if len(keyed) >= _MATCH_BATCH_MIN:
+        try:
+            lookups = _BatchMatchLookups(table, keyed)
+        # policy: degrade-ok(batch prefetch failed; the per-match lookups give the same answers)
+        except Exception:  # noqa: BLE001
+            logger.debug("match batch prefetch failed table=%s; per-match lookups", table, exc_info=True)
+    batched = isinstance(lookups, _BatchMatchLookups)
+    pending_inserts: list[tuple[tuple[Any, ...], int | None, str]] = []
     for match in matches:
         submission_idx = match.get("submission_idx")
         if submission_idx is None:
             continue
         order = match.get("order") or {}
         product_id = match.get("product_id") or order.get("product_id") or 0
-        row = query_one(f"SELECT id FROM {table} WHERE submission_idx = %s LIMIT 1", (submission_idx,))
-        if row:
+        if lookups.is_known(submission_idx):
             continue
         base_x18 = _x18_field(match, "base_filled", "base_filled_x18")
         quote_x18 = _x18_field(match, "quote_filled", "quote_filled_x18")
@@ -723,13 +1227,7 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
         quote_h = abs(from_x18(quote_x18))
         fee_h = abs(from_x18(fee_x18))
         price_h = (quote_h / base_h) if base_h > 0 else Decimal(0)
-        digest = str(
-            match.get("digest")
-            or match.get("order_digest")
-            or order.get("digest")
-            or order.get("order_digest")
-            or ""
-        ).strip()
+        digest = _match_digest(match)
         # IndexerMatch carries no product_id/name; recover BOTH from open_orders by
         # digest BEFORE the window fallback so (a) the product-scoped window resolve
         # can match the session's product (product_id=0 never matched → orphaned),
@@ -738,11 +1236,7 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
         recovered_pname = str(match.get("product_name") or "").strip()
         if int(product_id or 0) == 0 and digest:
             try:
-                _oo = query_one(
-                    "SELECT product_id, pair FROM open_orders "
-                    "WHERE order_digest = %s AND COALESCE(product_id, 0) <> 0 LIMIT 1",
-                    (digest,),
-                )
+                _oo = lookups.open_order_product(digest)
                 if _oo and _oo.get("product_id"):
                     product_id = int(_oo["product_id"])
                     if not recovered_pname and _oo.get("pair"):
@@ -760,12 +1254,7 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
         if int(product_id or 0) == 0 and digest:
             _prior_row_checked = True
             try:
-                _tr = query_one(
-                    f"SELECT product_id, product_name, strategy_session_id FROM {table} "
-                    f"WHERE order_digest = %s AND COALESCE(product_id, 0) <> 0 "
-                    f"ORDER BY id ASC LIMIT 1",
-                    (digest,),
-                )
+                _tr = lookups.prior_product_row(digest)
                 if _tr:
                     if _tr.get("product_id"):
                         product_id = int(_tr["product_id"])
@@ -776,7 +1265,7 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
             # policy: degrade-ok(prior-trades product lookup best-effort; session-product fallback still runs)
             except Exception:  # noqa: BLE001 - recovery is best-effort
                 pass
-        session_id, source, intent_found, intent_pid, intent_pname = _back_link_intent(digest, network)
+        session_id, source, intent_found, intent_pid, intent_pname = lookups.back_link(digest, network)
         if int(product_id or 0) == 0 and intent_pid:
             # Close tags carry the product (link_digest_intent): the only
             # product source for an instantly-filled close that never rested
@@ -789,12 +1278,7 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
             # product resolved earlier: only consulted when the intent row is
             # missing, so the common (tagged) path costs no extra query.
             try:
-                _tr = query_one(
-                    f"SELECT strategy_session_id FROM {table} "
-                    f"WHERE order_digest = %s AND strategy_session_id IS NOT NULL "
-                    f"ORDER BY id ASC LIMIT 1",
-                    (digest,),
-                )
+                _tr = lookups.prior_session_row(digest)
                 if _tr and _tr.get("strategy_session_id"):
                     inherited_session = int(_tr["strategy_session_id"])
             # policy: degrade-ok(session-inherit lookup best-effort; fill stays unattributed, window fallback still runs)
@@ -837,11 +1321,7 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
         # session's own close and must carry the session's product to count.
         if int(product_id or 0) == 0 and session_id:
             try:
-                _sp = query_one(
-                    "SELECT product_id, product_name FROM strategy_sessions "
-                    "WHERE id = %s AND COALESCE(product_id, 0) <> 0 LIMIT 1",
-                    (int(session_id),),
-                )
+                _sp = lookups.session_product(int(session_id))
                 if _sp and _sp.get("product_id"):
                     product_id = int(_sp["product_id"])
                     if not recovered_pname and _sp.get("product_name"):
@@ -871,13 +1351,7 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
         # (``NOT ILIKE '%close%'``) so an oversized close never acquires a
         # submission_idx and pollutes the ledger.
         if digest:
-            recorder_row = query_one(
-                f"SELECT id, fill_size FROM {table} "
-                f"WHERE order_digest = %s "
-                f"AND submission_idx IS NULL AND COALESCE(order_type, '') NOT ILIKE '%%close%%' "
-                f"ORDER BY id ASC LIMIT 1",
-                (digest,),
-            )
+            recorder_row = lookups.recorder_row(digest)
             if recorder_row:
                 # FILL-PRICE-CONSISTENCY: the venue quote is authoritative. If the
                 # recorder's own size/price disagree materially with it, that row
@@ -941,6 +1415,7 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
                         recorder_row["id"],
                     ),
                 )
+                lookups.note_enriched(recorder_row, submission_idx, session_id)
                 inserted += 1
                 _maybe_increment_session_win_loss(session_id, pnl_x18)
                 continue
@@ -964,50 +1439,49 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
                 pass
         insert_pname = insert_pname or f"ID:{insert_pid}"
 
+        insert_params = (
+            user_id,
+            insert_pid,
+            insert_pname,
+            "long" if base_amount >= 0 else "short",
+            str(abs(base_amount)),
+            # Human columns so this venue-only fill contributes real volume/fees
+            # (rollups read fill_size * fill_price, not the x18 columns). Use
+            # fixed-point (:f) so a value like 100/1.25 is stored "80", not "8E+1".
+            f"{base_h:f}",
+            f"{price_h:f}",
+            f"{price_h:f}",
+            f"{fee_h:f}",
+            submission_idx,
+            bool(match.get("isolated")),
+            pnl_x18,
+            fee_x18,
+            base_x18,
+            quote_x18,
+            digest or None,
+            session_id,
+            source,
+            # Analytics attribution: this fill came from an order Nadobro
+            # placed iff its digest is registered in order_intents.
+            # `source` cannot carry this — unlinked venue fills default to
+            # 'manual', conflating bot trades with Nado-UI trades.
+            bool(intent_found),
+            _timestamp_or_now(match.get("timestamp")),
+        )
+        if batched:
+            pending_inserts.append((insert_params, session_id, pnl_x18))
+            lookups.note_inserted(submission_idx, digest, insert_pid, insert_pname, session_id)
+            continue
         execute(
-            f"""
-            INSERT INTO {table} (
-              user_id, product_id, product_name, order_type, side, size,
-              fill_size, price, fill_price, fill_fee, status,
-              submission_idx, isolated, realized_pnl_x18, fee_x18, base_filled_x18, quote_filled_x18,
-              order_digest, strategy_session_id, source, via_nadobro,
-              filled_at, created_at
-            )
-            VALUES (%s, %s, %s, 'match', %s, %s, %s, %s, %s, %s, 'filled', %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, now())
-            """,
-            (
-                user_id,
-                insert_pid,
-                insert_pname,
-                "long" if base_amount >= 0 else "short",
-                str(abs(base_amount)),
-                # Human columns so this venue-only fill contributes real volume/fees
-                # (rollups read fill_size * fill_price, not the x18 columns). Use
-                # fixed-point (:f) so a value like 100/1.25 is stored "80", not "8E+1".
-                f"{base_h:f}",
-                f"{price_h:f}",
-                f"{price_h:f}",
-                f"{fee_h:f}",
-                submission_idx,
-                bool(match.get("isolated")),
-                pnl_x18,
-                fee_x18,
-                base_x18,
-                quote_x18,
-                digest or None,
-                session_id,
-                source,
-                # Analytics attribution: this fill came from an order Nadobro
-                # placed iff its digest is registered in order_intents.
-                # `source` cannot carry this — unlinked venue fills default to
-                # 'manual', conflating bot trades with Nado-UI trades.
-                bool(intent_found),
-                _timestamp_or_now(match.get("timestamp")),
-            ),
+            f"INSERT INTO {table} ({_MATCH_INSERT_COLUMNS}) VALUES {_MATCH_INSERT_ROW}",
+            insert_params,
         )
         inserted += 1
         _maybe_increment_session_win_loss(session_id, pnl_x18)
 
+    if pending_inserts:
+        inserted += _insert_match_rows(table, pending_inserts)
+
     # Re-roll up any session that got a fill this pass so its STORED totals
     # (Volume/Fees/PnL/counts) reflect late-syncing fills — crucially the close
     # turnover, which lands after the finalize rollup ran at stop. Off the event
@@ -1031,6 +1505,18 @@ def _write_matches(user_id: int, network: str, matches: list[dict[str, Any]]) ->
                 rollup_engine_session_pnl_funding(_sid, network)
         except Exception:  # noqa: BLE001 - re-rollup is best-effort, never break sync
             logger.debug("post-sync session re-rollup failed sid=%s", _sid, exc_info=True)
+    if matches:
+        from src.nadobro.core.perf import increment_counter, record_metric
+
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        record_metric("nado_sync.match_ingest", elapsed_ms)
+        increment_counter("nado_sync.match_rows", len(matches))
+        increment_counter("nado_sync.match_inserted", inserted)
+        logger.debug(
+            "match ingest user=%s network=%s matches=%s written=%s batched=%s %.1fms (%.0f rows/s)",
+            user_id, network, len(matches), inserted, batched, elapsed_ms,
+            len(matches) / max(elapsed_ms / 1000.0, 1e-6),
+        )
     return inserted
 
 
@@ -1094,9 +1580,21 @@ def _back_link_intent(
     except Exception:
         logger.debug("intent back-link query failed digest=%s", digest, exc_info=True)
         return None, "manual", False, None, None
-    if not intent:
-        return None, "manual", False, None, None
-    value = intent.get("value") or {}
+    return _intent_link(intent, network, _session_network_row)
+
+
+def _session_network_row(session_id: int) -> dict[str, Any] | None:
+    try:
+        return query_one(
+            "SELECT network FROM strategy_sessions WHERE id = %s",
+            (int(session_id),),
+        )
+    except Exception:
+        return None
+
+
+def _intent_value(raw: Any) -> Any:
+    value = raw or {}
     if isinstance(value, str):
         try:
             import json
@@ -1104,14 +1602,33 @@ def _back_link_intent(
             value = json.loads(value)
         except Exception:
             value = {}
-    if not isinstance(value, dict):
-        return None, "manual", True, None, None
-    raw_session = value.get("strategy_session_id")
-    session_id: int | None
+    return value
+
+
+def _intent_session_id(raw: Any) -> int | None:
+    value = _intent_value(raw)
+    if not isinstance(value, dict) or value.get("strategy_session_id") is None:
+        return None
     try:
-        session_id = int(raw_session) if raw_session is not None else None
+        return int(value["strategy_session_id"])
     except (TypeError, ValueError):
-        session_id = None
+        return None
+
+
+def _intent_link(
+    intent: dict[str, Any] | None, network: str, session_row: Any
+) -> tuple[int | None, str, bool, int | None, str | None]:
+    """Decode an ``order_intents`` row into the :func:`_back_link_intent` tuple.
+
+    ``session_row(session_id)`` returns the session's row (``network`` at
+    least) or ``None``; the batch path serves it from its prefetch.
+    """
+    if not intent:
+        return None, "manual", False, None, None
+    value = _intent_value(intent.get("value"))
+    if not isinstance(value, dict):
+        return None, "manual", True, None, None
+    session_id = _intent_session_id(value)
     source = str(value.get("source") or "manual") or "manual"
     # Product identity stored by link_digest_intent (close paths pass it): the
     # only reliable product source for an instantly-filled close whose digest
@@ -1122,18 +1639,12 @@ def _back_link_intent(
         intent_pid = None
     intent_pname = str(value.get("product_name") or "").strip() or None
     if session_id is not None:
-        try:
-            session_row = query_one(
-                "SELECT network FROM strategy_sessions WHERE id = %s",
-                (int(session_id),),
-            )
-        except Exception:
-            session_row = None
-        if not session_row or _normalize_network(session_row.get("network")) != _normalize_network(network):
+        row = session_row(session_id)
+        if not row or _normalize_network(row.get("network")) != _normalize_network(network):
             logger.debug(
                 "back-link dropped: session=%s network=%s != fill network=%s",
                 session_id,
-                session_row.get("network") if session_row else None,
+                row.get("network") if row else None,
                 network,
             )
             return None, source, True, intent_pid, intent_pname
@@ -8,15 +8,30 @@ import time
 from dataclasses import dataclass
 from typing import Any
 
-from src.nadobro.utils.env import env_float
+from src.nadobro.utils.env import env_float, env_int
 from src.nadobro.core.ipv4_egress import websocket_connect_kwargs
-from src.nadobro.venue.ws_health import mark_connected, mark_disconnected, touch
+from src.nadobro.venue.ws_health import (
+    bind,
+    drop_connection,
+    mark_connected,
+    mark_connection,
+    mark_disconnected,
+    touch,
+    touch_connection,
+    unbind,
+)
 
 logger = logging.getLogger(__name__)
 
 # Debounce WS invalidations — coalesce bursts into one sync per window.
 _DEBOUNCE_SECONDS = env_float("NADO_WS_DEBOUNCE_SECONDS", 2.0)
 _pending_sync: dict[tuple[int, str], float] = {}
+# Shared subscription sockets per network. Streams from many subaccounts are
+# packed onto at most this many connections; a gateway blip costs this many
+# reconnects, not one per active user.
+_POOL_SIZE = env_int("NADO_WS_POOL_SIZE", 4)
+# Ceiling on concurrent portfolio syncs triggered from stream events.
+_SYNC_CONCURRENCY = env_int("NADO_WS_SYNC_CONCURRENCY", 8)
 
 # Subscriptions (streams) WebSocket streams we use for portfolio invalidation.
 # NOTE: this is the live-data SUBSCRIPTIONS socket (/v1/subscribe). It is NOT
@@ -103,62 +118,193 @@ def _subscription_streams(sub: PortfolioWsSubscription):
     return _PORTFOLIO_STREAMS if sub.sync_portfolio else _FILL_NUDGE_STREAMS
 
 
+class _PooledConnection:
+    """One ``/v1/subscribe`` socket carrying many subaccounts' streams.
+
+    ``members`` is authoritative: a (re)connect subscribes every current
+    member in one burst, and joins/leaves that happen while the socket is up
+    are replayed from ``ops`` as incremental subscribe/unsubscribe frames.
+    """
+
+    def __init__(self, network: str, index: int) -> None:
+        self.network = network
+        self.conn_id = f"{network}#{index}"
+        self.members: dict[tuple[int, str], PortfolioWsSubscription] = {}
+        self.by_subaccount: dict[str, set[tuple[int, str]]] = {}
+        self.ops: asyncio.Queue = asyncio.Queue()
+        self.task: asyncio.Task | None = None
+        self.connected = False
+        self._next_id = 0
+
+    def add(self, sub: PortfolioWsSubscription) -> None:
+        key = (int(sub.user_id), str(sub.network))
+        self.members[key] = sub
+        self.by_subaccount.setdefault(_norm_subaccount(sub.subaccount), set()).add(key)
+
+    def remove(self, key: tuple[int, str]) -> PortfolioWsSubscription | None:
+        sub = self.members.pop(key, None)
+        if sub is not None:
+            acct = _norm_subaccount(sub.subaccount)
+            keys = self.by_subaccount.get(acct)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    self.by_subaccount.pop(acct, None)
+        return sub
+
+    def has_portfolio_members(self) -> bool:
+        return any(sub.sync_portfolio for sub in self.members.values())
+
+    def stream_count(self) -> int:
+        count = sum(
+            1
+            for sub in self.members.values()
+            for _name, _auth, per_subaccount in _subscription_streams(sub)
+            if per_subaccount
+        )
+        # funding_payment is per-product: one subscription serves the socket.
+        return count + (1 if self.has_portfolio_members() else 0)
+
+    def next_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def targets(self, event: dict[str, Any]) -> list[PortfolioWsSubscription]:
+        """Members a stream frame belongs to.
+
+        Per-subaccount frames route by their ``subaccount`` field. The
+        per-product ``funding_payment`` stream fans out to every portfolio
+        member (each per-user socket used to receive it too). A frame with
+        no subaccount can only be attributed when the socket carries a single
+        member; otherwise it still feeds the global lifecycle store and the
+        periodic REST reconcile covers the invalidation.
+        """
+        if _event_type(event) == "funding_payment":
+            return [sub for sub in self.members.values() if sub.sync_portfolio]
+        acct = _event_subaccount(event)
+        if acct:
+            return [self.members[key] for key in self.by_subaccount.get(acct, ()) if key in self.members]
+        if len(self.members) == 1:
+            return list(self.members.values())
+        return []
+
+
 class NadoPortfolioWs:
-    """WebSocket invalidation layer; polling sync is fallback when WS is down."""
+    """WebSocket invalidation layer; polling sync is fallback when WS is down.
+
+    Subscriptions are multiplexed: each network holds at most
+    ``NADO_WS_POOL_SIZE`` sockets and every user's per-subaccount streams are
+    packed onto the least-loaded one, so socket count, reconnect loops and
+    handshakes scale with the pool size rather than with active users.
+    """
 
     def __init__(self) -> None:
-        self._tasks: dict[tuple[int, str], asyncio.Task] = {}
+        self._pools: dict[str, list[_PooledConnection]] = {}
+        self._placement: dict[tuple[int, str], _PooledConnection] = {}
+        self._sync_tasks: set[asyncio.Task] = set()
+        self._sync_slots: asyncio.Semaphore | None = None
 
     def subscribe(self, sub: PortfolioWsSubscription) -> None:
         key = (int(sub.user_id), str(sub.network))
-        existing = self._tasks.get(key)
-        if existing and not existing.done():
+        if key in self._placement:
             return
-        self._tasks[key] = asyncio.create_task(self._run(sub), name=f"portfolio-ws-{sub.user_id}-{sub.network}")
+        conn = self._place(str(sub.network))
+        conn.add(sub)
+        self._placement[key] = conn
+        bind(sub.user_id, sub.network, conn.conn_id)
+        if conn.task is None or conn.task.done():
+            conn.task = asyncio.create_task(self._run(conn), name=f"portfolio-ws-{conn.conn_id}")
+        elif conn.connected:
+            conn.ops.put_nowait(("join", sub))
+
+    def _place(self, network: str) -> _PooledConnection:
+        pool = self._pools.setdefault(network, [])
+        if len(pool) < max(1, _POOL_SIZE):
+            used = {int(c.conn_id.rsplit("#", 1)[1]) for c in pool}
+            index = next(i for i in range(len(pool) + 1) if i not in used)
+            conn = _PooledConnection(network, index)
+            pool.append(conn)
+            return conn
+        return min(pool, key=lambda c: len(c.members))
 
     async def unsubscribe(self, user_id: int, network: str) -> None:
         key = (int(user_id), str(network))
-        mark_disconnected(user_id, network)
-        task = self._tasks.pop(key, None)
-        if task:
-            task.cancel()
-            await asyncio.gather(task, return_exceptions=True)
+        unbind(user_id, network)
+        conn = self._placement.pop(key, None)
+        if conn is None:
+            return
+        sub = conn.remove(key)
+        if conn.members:
+            if sub is not None and conn.connected:
+                conn.ops.put_nowait(("leave", sub))
+            return
+        # Last member gone: close the socket rather than hold it idle.
+        pool = self._pools.get(conn.network, [])
+        if conn in pool:
+            pool.remove(conn)
+        if conn.task:
+            conn.task.cancel()
+            await asyncio.gather(conn.task, return_exceptions=True)
+        drop_connection(conn.conn_id)
 
     async def stop(self) -> None:
-        for key in list(self._tasks):
-            uid, net = key
-            mark_disconnected(uid, net)
-        tasks = list(self._tasks.values())
-        self._tasks.clear()
+        for uid, net in list(self._placement):
+            unbind(uid, net)
+        conns = [conn for pool in self._pools.values() for conn in pool]
+        self._pools.clear()
+        self._placement.clear()
+        tasks = [conn.task for conn in conns if conn.task]
+        tasks.extend(self._sync_tasks)
+        self._sync_tasks.clear()
         for task in tasks:
             task.cancel()
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
-
-    async def _run(self, sub: PortfolioWsSubscription) -> None:
+        for conn in conns:
+            drop_connection(conn.conn_id)
+
+    def stats(self) -> dict[str, int]:
+        conns = [conn for pool in self._pools.values() for conn in pool]
+        return {
+            "connections": sum(1 for conn in conns if conn.connected),
+            "pooled": len(conns),
+            "members": len(self._placement),
+            "streams": sum(conn.stream_count() for conn in conns),
+        }
+
+    async def _run(self, conn: _PooledConnection) -> None:
         backoff = 1.0
-        while True:
+        reason = "ws_connect"
+        while conn.members:
             try:
-                await self._connect_once(sub)
+                await self._connect_once(conn, reason=reason)
                 backoff = 1.0
             except asyncio.CancelledError:
-                mark_disconnected(sub.user_id, sub.network)
+                conn.connected = False
+                for sub in list(conn.members.values()):
+                    mark_disconnected(sub.user_id, sub.network)
                 raise
             except Exception as exc:
-                if sub.sync_portfolio:
-                    mark_disconnected(sub.user_id, sub.network)
-                logger.warning("portfolio ws disconnected user=%s network=%s: %s", sub.user_id, sub.network, exc)
+                conn.connected = False
+                drop_connection(conn.conn_id, reconnecting=True)
+                for sub in list(conn.members.values()):
+                    if sub.sync_portfolio:
+                        mark_disconnected(sub.user_id, sub.network)
+                logger.warning(
+                    "portfolio ws disconnected conn=%s members=%d: %s",
+                    conn.conn_id, len(conn.members), exc,
+                )
                 await asyncio.sleep(backoff + random.uniform(0, backoff * 0.2))
                 backoff = min(60.0, backoff * 2)
-                if sub.sync_portfolio:
-                    await self._schedule_sync(
-                        sub.user_id, sub.network, force=True, reason="ws_reconnect"
-                    )
-
-    def _build_auth_message(self, sub: PortfolioWsSubscription) -> dict[str, Any] | None:
-        """Sign the per-connection ``authenticate`` message using the user's
-        signing client. Returns None for read-only users (no signer) — they
-        simply won't get the authenticated streams and stay on REST polling.
+                reason = "ws_reconnect"
+
+    def _build_auth_message(
+        self, sub: PortfolioWsSubscription, auth_id: int = 0
+    ) -> dict[str, Any] | None:
+        """Sign the ``authenticate`` message for one subaccount using the
+        user's signing client. Returns None for read-only users (no signer) —
+        they simply won't get the authenticated streams and stay on REST
+        polling.
         """
         try:
             from src.nadobro.users.user_service import get_user_nado_client
@@ -166,7 +312,7 @@ class NadoPortfolioWs:
             client = get_user_nado_client(int(sub.user_id), network=sub.network)
             if client is None:
                 return None
-            return client.sign_stream_authentication(sender=sub.subaccount, auth_id=0)
+            return client.sign_stream_authentication(sender=sub.subaccount, auth_id=auth_id)
         except Exception as exc:  # noqa: BLE001
             logger.warning(
                 "portfolio ws auth signing failed user=%s network=%s: %s",
@@ -174,78 +320,145 @@ class NadoPortfolioWs:
             )
             return None
 
-    async def _connect_once(self, sub: PortfolioWsSubscription) -> None:
+    async def _send_member(
+        self, ws: Any, conn: _PooledConnection, sub: PortfolioWsSubscription, *, method: str
+    ) -> None:
+        streams = _subscription_streams(sub)
+        # 1) Authenticate. Only ``order_update`` requires auth; each member
+        #    authenticates its own subaccount on the shared socket before
+        #    its subscribe frames go out.
+        if method == "subscribe" and any(requires_auth for _n, requires_auth, _p in streams):
+            auth_msg = await asyncio.to_thread(self._build_auth_message, sub, conn.next_id())
+            if auth_msg is not None:
+                await ws.send(json.dumps(auth_msg))
+        # 2) One ``stream`` per frame (not a ``channels`` array); the id is
+        #    echoed back in the response. funding_payment is per-product and
+        #    subscribed once per socket, so only per-subaccount streams here —
+        #    an extra ``subaccount`` field gets a per-product sub rejected.
+        for stream_type, _auth, per_subaccount in streams:
+            if not per_subaccount:
+                continue
+            await ws.send(json.dumps({
+                "method": method,
+                "stream": {
+                    "type": stream_type,
+                    "product_id": None,  # all products
+                    "subaccount": sub.subaccount,
+                },
+                "id": conn.next_id(),
+            }))
+
+    async def _send_funding(self, ws: Any, conn: _PooledConnection) -> None:
+        for stream_type, _auth, per_subaccount in _PORTFOLIO_STREAMS:
+            if per_subaccount:
+                continue
+            await ws.send(json.dumps({
+                "method": "subscribe",
+                "stream": {"type": stream_type, "product_id": None},
+                "id": conn.next_id(),
+            }))
+
+    async def _connect_once(self, conn: _PooledConnection, *, reason: str = "ws_connect") -> None:
         import websockets
 
-        streams = _subscription_streams(sub)
         # ``compression="deflate"`` makes the client advertise the required
         # ``Sec-WebSocket-Extensions: permessage-deflate`` in the handshake.
         async with websockets.connect(
-            subscribe_url_for_network(sub.network),
+            subscribe_url_for_network(conn.network),
             ping_interval=20,
             ping_timeout=20,
             compression="deflate",
             **websocket_connect_kwargs(),
         ) as ws:
-            # 1) Authenticate. Only ``order_update`` requires auth; we send
-            #    authenticate once up-front so it is in place before subscribe.
-            if any(requires_auth for _name, requires_auth, _per_subaccount in streams):
-                auth_msg = await asyncio.to_thread(self._build_auth_message, sub)
-                if auth_msg is not None:
-                    await ws.send(json.dumps(auth_msg))
-
-            # 2) Subscribe to each portfolio stream as its own message. The
-            #    subscriptions API takes ONE ``stream`` per ``subscribe`` (not a
-            #    ``channels`` array) and echoes the ``id`` back in the response.
-            for idx, (stream_type, _auth, per_subaccount) in enumerate(
-                streams, start=1
-            ):
-                stream: dict[str, Any] = {
-                    "type": stream_type,
-                    "product_id": None,  # all products
-                }
-                # funding_payment is per-product only; the others are
-                # per-subaccount. Only add ``subaccount`` where the stream
-                # actually accepts it (an extra field gets the sub rejected).
-                if per_subaccount:
-                    stream["subaccount"] = sub.subaccount
-                await ws.send(json.dumps({
-                    "method": "subscribe",
-                    "stream": stream,
-                    "id": idx,
-                }))
-
-            if sub.sync_portfolio:
-                mark_connected(sub.user_id, sub.network)
-                await self._schedule_sync(sub.user_id, sub.network, force=True, reason="ws_connect")
-
-            async for raw in ws:
-                event = _json(raw)
-                # Any inbound frame (event, subscribe ack, heartbeat) proves the
-                # socket is alive — keep health fresh so sync_user keeps skipping
-                # the REST poll.
+            # Members are authoritative on (re)connect: drop queued ops and
+            # subscribe everyone in one burst. No await between the drain, the
+            # snapshot and ``connected`` flipping on, so a concurrent join
+            # lands in exactly one of them.
+            while not conn.ops.empty():
+                conn.ops.get_nowait()
+            members = list(conn.members.values())
+            conn.connected = True
+            funding_on = any(sub.sync_portfolio for sub in members)
+            for sub in members:
+                await self._send_member(ws, conn, sub, method="subscribe")
+            if funding_on:
+                await self._send_funding(ws, conn)
+
+            mark_connection(conn.conn_id, streams=conn.stream_count())
+            for sub in members:
+                if sub.sync_portfolio and (int(sub.user_id), str(sub.network)) in conn.members:
+                    mark_connected(sub.user_id, sub.network)
+                    self._spawn_sync(sub.user_id, sub.network, force=True, reason=reason)
+
+            reader = asyncio.create_task(self._read_loop(ws, conn))
+            writer = asyncio.create_task(self._drain_ops(ws, conn, funding_on=funding_on))
+            try:
+                done, _pending = await asyncio.wait(
+                    {reader, writer}, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    task.result()
+            finally:
+                for task in (reader, writer):
+                    task.cancel()
+                await asyncio.gather(reader, writer, return_exceptions=True)
+            # The server closed the stream cleanly; surface it as a disconnect
+            # so ``_run`` backs off and resubscribes.
+            raise ConnectionError("subscription stream closed")
+
+    async def _drain_ops(self, ws: Any, conn: _PooledConnection, *, funding_on: bool) -> None:
+        while True:
+            op, sub = await conn.ops.get()
+            key = (int(sub.user_id), str(sub.network))
+            if op == "join":
+                if key not in conn.members:
+                    continue
+                await self._send_member(ws, conn, sub, method="subscribe")
+                if sub.sync_portfolio:
+                    if not funding_on:
+                        await self._send_funding(ws, conn)
+                        funding_on = True
+                    mark_connected(sub.user_id, sub.network)
+                    self._spawn_sync(sub.user_id, sub.network, force=True, reason="ws_connect")
+            else:
+                await self._send_member(ws, conn, sub, method="unsubscribe")
+            mark_connection(conn.conn_id, streams=conn.stream_count())
+
+    async def _read_loop(self, ws: Any, conn: _PooledConnection) -> None:
+        async for raw in ws:
+            event = _json(raw)
+            # Any inbound frame (event, subscribe ack, heartbeat) proves the
+            # socket — and so every member riding it — is alive; one O(1)
+            # connection touch keeps them all healthy for sync_user.
+            touch_connection(conn.conn_id)
+            if _is_auth_or_error(event):
+                _log_control_frame(conn, event)
+                continue
+            # Phase C: drive the per-order lifecycle store off the stream so
+            # the engine can stop polling order_status on every tick.
+            _route_lifecycle(event)
+            etype = _event_type(event)
+            for sub in conn.targets(event):
                 if sub.sync_portfolio:
                     touch(sub.user_id, sub.network)
-                if _is_auth_or_error(event):
-                    _log_control_frame(sub, event)
-                    continue
-                # Phase C: drive the per-order lifecycle store off the stream so
-                # the engine can stop polling order_status on every tick.
-                _route_lifecycle(event)
-                # P2 fill-nudge: fills (only — order_update also fires on every
-                # placement ack and would storm) wake the strategy runtime so
-                # the controller re-quotes immediately instead of next tick.
-                if _event_type(event) == "fill":
+                # P2 fill-nudge: fills (only — order_update also fires on
+                # every placement ack and would storm) wake the strategy
+                # runtime so the controller re-quotes immediately.
+                if etype == "fill":
                     _notify_fill_listeners(sub.user_id, sub.network)
                 if sub.sync_portfolio and _should_invalidate(event):
-                    await self._schedule_sync(
-                        sub.user_id,
-                        sub.network,
-                        force=False,
-                        reason=f"ws_{_event_type(event) or 'event'}",
+                    self._spawn_sync(
+                        sub.user_id, sub.network, force=False,
+                        reason=f"ws_{etype or 'event'}",
                     )
 
-    async def _schedule_sync(self, user_id: int, network: str, *, force: bool, reason: str) -> None:
+    def _spawn_sync(self, user_id: int, network: str, *, force: bool, reason: str) -> None:
+        """Debounce, then run the sync off the read loop.
+
+        A shared socket must never await a REST sync inline — one slow user
+        would stall routing for everyone on it. Syncs run as tasks bounded by
+        ``NADO_WS_SYNC_CONCURRENCY`` so a reconnect burst drains gradually.
+        """
         key = (int(user_id), str(network))
         now = time.monotonic()
         if not force:
@@ -253,11 +466,28 @@ class NadoPortfolioWs:
             if now - last < _DEBOUNCE_SECONDS:
                 return
         _pending_sync[key] = now
+        task = asyncio.create_task(self._schedule_sync(user_id, network, force=force, reason=reason))
+        self._sync_tasks.add(task)
+        task.add_done_callback(self._sync_tasks.discard)
+
+    async def _schedule_sync(self, user_id: int, network: str, *, force: bool, reason: str) -> None:
+        if self._sync_slots is None:
+            self._sync_slots = asyncio.Semaphore(max(1, _SYNC_CONCURRENCY))
         from src.nadobro.venue.nado_sync import sync_user
-        try:
-            await sync_user(user_id, network=network, reason=reason, force=force)
-        except Exception:
-            logger.debug("portfolio ws sync failed user=%s reason=%s", user_id, reason, exc_info=True)
+        async with self._sync_slots:
+            try:
+                await sync_user(user_id, network=network, reason=reason, force=force)
+            except Exception:
+                logger.debug("portfolio ws sync failed user=%s reason=%s", user_id, reason, exc_info=True)
+
+
+def _norm_subaccount(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _event_subaccount(event: dict[str, Any]) -> str:
+    body = _payload(event)
+    return _norm_subaccount(body.get("subaccount") or (event.get("subaccount") if isinstance(event, dict) else None))
 
 
 def _json(raw: Any) -> dict[str, Any]:
@@ -279,14 +509,13 @@ def _is_auth_or_error(event: dict[str, Any]) -> bool:
     return method in {"authenticate", "subscribe", "unsubscribe"}
 
 
-def _log_control_frame(sub: PortfolioWsSubscription, event: dict[str, Any]) -> None:
+def _log_control_frame(conn: _PooledConnection, event: dict[str, Any]) -> None:
     if event.get("error"):
         logger.warning(
-            "portfolio ws control error user=%s network=%s: %s",
-            sub.user_id, sub.network, event.get("error"),
+            "portfolio ws control error conn=%s: %s", conn.conn_id, event.get("error"),
         )
     else:
-        logger.debug("portfolio ws control frame user=%s: %s", sub.user_id, event)
+        logger.debug("portfolio ws control frame conn=%s: %s", conn.conn_id, event)
 
 
 def _payload(event: dict[str, Any]) -> dict[str, Any]:
@@ -1,6 +1,10 @@
+import itertools
 import logging
+import threading
 import time
-from typing import Optional
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Callable, Mapping, Optional
 
 
 from src.nadobro.utils.env import env_float, env_int
@@ -27,10 +31,204 @@ _CATALOG_STALE_TTL_SECONDS = env_int("NADO_PRODUCT_CATALOG_STALE_TTL_SECONDS", 8
 _DYNAMIC_DEFAULT_MAX_LEVERAGE = env_int("NADO_DYNAMIC_DEFAULT_MAX_LEVERAGE", 20)
 _REQUEST_TIMEOUT_SECONDS = env_float("NADO_HTTP_TIMEOUT_SECONDS", 6.0)
 
+# A failed background refresh is not retried sooner than this, so a blocked
+# endpoint is not hammered by every lookup that sees the expired TTL.
+_REFRESH_RETRY_SECONDS = env_float("NADO_PRODUCT_CATALOG_REFRESH_RETRY_SECONDS", 60.0)
+
 _catalog_cache: dict[str, dict] = {}
 _spot_catalog_cache: dict[str, dict] = {}
 _dn_pair_cache: dict[str, dict] = {}
 
+_refresh_lock = threading.Lock()
+_refresh_inflight: set[tuple[str, str]] = set()
+_refresh_attempted_at: dict[tuple[str, str], float] = {}
+
+# Pre-indexed snapshots keyed by (market, network); see CatalogSnapshot.
+_snapshots: dict[tuple[str, str], "CatalogSnapshot"] = {}
+_snapshot_versions = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Frozen, pre-indexed view of one network's perp or spot catalog.
+
+    Built once per catalog build (``source`` is the cached catalog dict it
+    indexes) and swapped in by reference, so lookups on the price and order
+    paths are single dict reads instead of alias/by_id/row walks per call.
+    Tables are keyed by catalog key (``BTC``, ``KBTC``); resolve a user-facing
+    name with :meth:`resolve`.
+    """
+
+    network: str
+    market: str
+    version: int
+    built_at: float
+    source: dict = field(repr=False, compare=False)
+    ids: frozenset = frozenset()
+    ordered_keys: tuple = ()
+    rows: Mapping[str, Mapping] = field(default_factory=dict, repr=False)
+    key_by_id: Mapping[int, str] = field(default_factory=dict, repr=False)
+    name_by_id: Mapping[int, str] = field(default_factory=dict, repr=False)
+    key_by_alias: Mapping[str, str] = field(default_factory=dict, repr=False)
+    id_by_alias: Mapping[str, int] = field(default_factory=dict, repr=False)
+    max_leverage: Mapping[str, int] = field(default_factory=dict, repr=False)
+    isolated_only: frozenset = frozenset()
+    size_increment: Mapping[str, float] = field(default_factory=dict, repr=False)
+    price_increment: Mapping[str, float] = field(default_factory=dict, repr=False)
+    min_notional: Mapping[str, float] = field(default_factory=dict, repr=False)
+    maker_fee: Mapping[str, float] = field(default_factory=dict, repr=False)
+    taker_fee: Mapping[str, float] = field(default_factory=dict, repr=False)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Catalog key for a base, symbol or alias (``BTC``, ``BTC-PERP``)."""
+        key = (name or "").upper().strip()
+        if not key:
+            return None
+        if key in self.rows:
+            return key
+        return self.key_by_alias.get(key.lower())
+
+
+def _index_catalog(market: str, network: str, catalog: dict) -> CatalogSnapshot:
+    rows_src = catalog.get("perps" if market == "perp" else "spots") or {}
+    rows: dict[str, Mapping] = {}
+    ids: set[int] = set()
+    max_leverage: dict[str, int] = {}
+    isolated: set[str] = set()
+    tables: dict[str, dict[str, float]] = {
+        "size_increment_x18": {}, "price_increment_x18": {}, "min_size_x18": {},
+        "maker_fee_rate_x18": {}, "taker_fee_rate_x18": {},
+    }
+    for key, row in rows_src.items():
+        if not isinstance(row, dict):
+            continue
+        rows[key] = MappingProxyType(dict(row))
+        try:
+            ids.add(int(row.get("id")))
+        except (TypeError, ValueError):
+            pass
+        if market == "perp":
+            try:
+                max_leverage[key] = max(1, int(row.get("max_leverage", _DYNAMIC_DEFAULT_MAX_LEVERAGE)))
+            except (TypeError, ValueError):
+                max_leverage[key] = max(1, int(_DYNAMIC_DEFAULT_MAX_LEVERAGE))
+            if _as_bool(row.get("isolated_only")):
+                isolated.add(key)
+        for column, table in tables.items():
+            value = _x18_to_float(row.get(column))
+            if value is not None:
+                table[key] = value
+
+    def _row_id(item) -> int:
+        try:
+            return int((item[1] or {}).get("id", 0))
+        except (TypeError, ValueError):
+            return 0
+
+    ordered = tuple(k for k, _ in sorted(rows_src.items(), key=_row_id))
+
+    by_id_src = catalog.get("by_id") or {}
+    key_by_id: dict[int, str] = {}
+    name_by_id: dict[int, str] = {}
+    for pid, key in by_id_src.items():
+        try:
+            pid = int(pid)
+        except (TypeError, ValueError):
+            continue
+        key_by_id[pid] = key
+        row = rows_src.get(key) or {}
+        if market == "perp":
+            name_by_id[pid] = str(row.get("symbol") or f"{key}-PERP")
+        else:
+            name_by_id[pid] = str(row.get("base") or row.get("symbol") or key)
+
+    key_by_alias = dict(catalog.get("aliases") or {})
+    id_by_alias: dict[str, int] = {}
+    for alias, key in key_by_alias.items():
+        row = rows_src.get(key)
+        if not row:
+            continue
+        try:
+            id_by_alias[alias] = int(row.get("id"))
+        except (TypeError, ValueError):
+            continue
+
+    return CatalogSnapshot(
+        network=network,
+        market=market,
+        version=next(_snapshot_versions),
+        built_at=time.time(),
+        source=catalog,
+        ids=frozenset(ids),
+        ordered_keys=ordered,
+        rows=MappingProxyType(rows),
+        key_by_id=MappingProxyType(key_by_id),
+        name_by_id=MappingProxyType(name_by_id),
+        key_by_alias=MappingProxyType(key_by_alias),
+        id_by_alias=MappingProxyType(id_by_alias),
+        max_leverage=MappingProxyType(max_leverage),
+        isolated_only=frozenset(isolated),
+        size_increment=MappingProxyType(tables["size_increment_x18"]),
+        price_increment=MappingProxyType(tables["price_increment_x18"]),
+        min_notional=MappingProxyType(tables["min_size_x18"]),
+        maker_fee=MappingProxyType(tables["maker_fee_rate_x18"]),
+        taker_fee=MappingProxyType(tables["taker_fee_rate_x18"]),
+    )
+
+
+def _snapshot_for(market: str, network: str, catalog: dict) -> CatalogSnapshot:
+    """The snapshot indexing ``catalog``; re-indexed only when the catalog changed."""
+    slot = (market, network)
+    snap = _snapshots.get(slot)
+    if snap is not None and snap.source is catalog:
+        return snap
+    snap = _index_catalog(market, network, catalog)
+    _snapshots[slot] = snap
+    return snap
+
+
+def _refresh_in_background(kind: str, network: str, rebuild: Callable[[], object]) -> None:
+    """Run ``rebuild`` on a daemon thread; one in flight per (kind, network)."""
+    slot = (kind, network)
+    now = time.time()
+    with _refresh_lock:
+        if slot in _refresh_inflight or now - _refresh_attempted_at.get(slot, 0.0) < _REFRESH_RETRY_SECONDS:
+            return
+        _refresh_inflight.add(slot)
+        _refresh_attempted_at[slot] = now
+
+    def _run() -> None:
+        try:
+            rebuild()
+        except Exception:
+            logger.warning("background %s catalog refresh failed network=%s", kind, network, exc_info=True)
+        finally:
+            with _refresh_lock:
+                _refresh_inflight.discard(slot)
+
+    threading.Thread(target=_run, name=f"catalog-refresh-{kind}-{network}", daemon=True).start()
+
+
+def _cached_or_refresh(cache: dict, key: str, kind: str, rebuild: Callable[[], object]):
+    """Serve a cached catalog without blocking on a rebuild.
+
+    Inside the TTL this is a plain read. Past the TTL but inside the stale
+    window it serves the cached data and rebuilds in the background. Returns
+    ``None`` when the caller must build inline (cold, or too stale to serve).
+    """
+    cached = cache.get(key)
+    if not cached:
+        return None
+    age = time.time() - cached["ts"]
+    if age < _CATALOG_TTL_SECONDS:
+        return cached["data"]
+    from src.nadobro.core.feature_flags import catalog_background_refresh_enabled
+
+    if age < _CATALOG_STALE_TTL_SECONDS and catalog_background_refresh_enabled():
+        _refresh_in_background(kind, key, rebuild)
+        return cached["data"]
+    return None
+
 
 def _first_present(*candidates):
     """Return the first non-``None`` candidate, or ``None`` if all are ``None``.
@@ -369,9 +567,13 @@ def _build_dynamic_spot_catalog(network: str) -> Optional[dict]:
 
 def get_spot_catalog(network: str = "mainnet", refresh: bool = False) -> dict:
     key = str(network or "mainnet").lower()
+    if not refresh:
+        served = _cached_or_refresh(
+            _spot_catalog_cache, key, "spot", lambda: get_spot_catalog(network=key, refresh=True),
+        )
+        if served is not None:
+            return served
     cached = _spot_catalog_cache.get(key)
-    if not refresh and cached and (time.time() - cached["ts"] < _CATALOG_TTL_SECONDS):
-        return cached["data"]
     live = _build_dynamic_spot_catalog(key)
     if live is not None:
         _spot_catalog_cache[key] = {"data": live, "ts": time.time()}
@@ -812,9 +1014,11 @@ def _build_dn_pair_catalog(network: str, client=None) -> Optional[dict]:
 def get_catalog(network: str = "mainnet", client=None, refresh: bool = False) -> dict:
     key = str(network or "mainnet").lower()
     if not refresh:
-        cached = _catalog_cache.get(key)
-        if cached and (time.time() - cached["ts"] < _CATALOG_TTL_SECONDS):
-            return cached["data"]
+        served = _cached_or_refresh(
+            _catalog_cache, key, "perp", lambda: get_catalog(network=key, client=client, refresh=True),
+        )
+        if served is not None:
+            return served
 
     live = _build_dynamic_catalog(key, client=client)
     if live is not None:
@@ -833,9 +1037,11 @@ def get_catalog(network: str = "mainnet", client=None, refresh: bool = False) ->
 def get_dn_pair_catalog(network: str = "mainnet", client=None, refresh: bool = False) -> dict:
     key = str(network or "mainnet").lower()
     if not refresh:
-        cached = _dn_pair_cache.get(key)
-        if cached and (time.time() - cached["ts"] < _CATALOG_TTL_SECONDS):
-            return cached["data"]
+        served = _cached_or_refresh(
+            _dn_pair_cache, key, "dn", lambda: get_dn_pair_catalog(network=key, client=client, refresh=True),
+        )
+        if served is not None:
+            return served
     data = _build_dn_pair_catalog(key, client=client)
     if data is None:
         # Conservative fallback for legacy BTC/ETH behavior when live metadata is unavailable.
@@ -886,11 +1092,22 @@ def get_dn_pair_catalog(network: str = "mainnet", client=None, refresh: bool = F
     return data
 
 
+def get_catalog_snapshot(network: str = "mainnet", client=None, refresh: bool = False) -> CatalogSnapshot:
+    """Frozen, pre-indexed perp catalog for ``network`` (see :class:`CatalogSnapshot`).
+
+    Hot loops should fetch this once per tick and read its tables directly.
+    """
+    key = str(network or "mainnet").lower()
+    return _snapshot_for("perp", key, get_catalog(network=key, client=client, refresh=refresh))
+
+
+def get_spot_catalog_snapshot(network: str = "mainnet", refresh: bool = False) -> CatalogSnapshot:
+    key = str(network or "mainnet").lower()
+    return _snapshot_for("spot", key, get_spot_catalog(network=key, refresh=refresh))
+
+
 def list_perp_names(network: str = "mainnet", client=None, refresh: bool = False) -> list[str]:
-    catalog = get_catalog(network=network, client=client, refresh=refresh)
-    entries = list((catalog.get("perps") or {}).items())
-    entries.sort(key=lambda kv: int((kv[1] or {}).get("id", 0)))
-    return [name for name, _ in entries]
+    return list(get_catalog_snapshot(network=network, client=client, refresh=refresh).ordered_keys)
 
 
 def list_dn_product_names(network: str = "mainnet", client=None, refresh: bool = False) -> list[str]:
@@ -912,35 +1129,20 @@ def get_dn_pair(product: str, network: str = "mainnet", client=None, refresh: bo
 def get_product_id(name: str, network: str = "mainnet", client=None, refresh: bool = False) -> Optional[int]:
     if not name:
         return None
-    catalog = get_catalog(network=network, client=client, refresh=refresh)
-    key = (catalog.get("aliases") or {}).get(str(name).lower().strip())
-    if not key:
-        return None
-    row = (catalog.get("perps") or {}).get(key)
-    if not row:
-        return None
-    try:
-        return int(row.get("id"))
-    except (TypeError, ValueError):
-        return None
+    snap = get_catalog_snapshot(network=network, client=client, refresh=refresh)
+    return snap.id_by_alias.get(str(name).lower().strip())
 
 
 def get_product_name(product_id: int, network: str = "mainnet", client=None, refresh: bool = False) -> str:
-    catalog = get_catalog(network=network, client=client, refresh=refresh)
+    snap = get_catalog_snapshot(network=network, client=client, refresh=refresh)
     try:
         pid = int(product_id)
     except (TypeError, ValueError):
         return f"ID:{product_id}"
-    key = (catalog.get("by_id") or {}).get(pid)
-    if key:
-        row = (catalog.get("perps") or {}).get(key) or {}
-        return str(row.get("symbol") or f"{key}-PERP")
-    spot_catalog = get_spot_catalog(network=network, refresh=refresh)
-    spot_key = (spot_catalog.get("by_id") or {}).get(pid)
-    if spot_key:
-        row = (spot_catalog.get("spots") or {}).get(spot_key) or {}
-        return str(row.get("base") or row.get("symbol") or spot_key)
-    return f"ID:{product_id}"
+    name = snap.name_by_id.get(pid)
+    if name is None:
+        name = get_spot_catalog_snapshot(network=network, refresh=refresh).name_by_id.get(pid)
+    return name if name is not None else f"ID:{product_id}"
 
 
 def get_product_max_leverage(
@@ -949,21 +1151,12 @@ def get_product_max_leverage(
     client=None,
     refresh: bool = False,
 ) -> int:
-    key = (product or "").upper().strip()
-    if not key:
+    if not (product or "").strip():
         return 1
-    catalog = get_catalog(network=network, client=client, refresh=refresh)
-    row = (catalog.get("perps") or {}).get(key)
-    if not row:
-        # Resolve aliases when a caller passes BTC-PERP, etc.
-        resolved = (catalog.get("aliases") or {}).get(key.lower())
-        row = (catalog.get("perps") or {}).get(resolved) if resolved else None
-    if not row:
-        return 1
-    try:
-        return max(1, int(row.get("max_leverage", _DYNAMIC_DEFAULT_MAX_LEVERAGE)))
-    except (TypeError, ValueError):
-        return max(1, int(_DYNAMIC_DEFAULT_MAX_LEVERAGE))
+    snap = get_catalog_snapshot(network=network, client=client, refresh=refresh)
+    # resolve() also accepts aliases when a caller passes BTC-PERP, etc.
+    key = snap.resolve(product)
+    return snap.max_leverage.get(key, 1) if key else 1
 
 
 def _x18_to_float(value) -> Optional[float]:
@@ -978,28 +1171,20 @@ def _x18_to_float(value) -> Optional[float]:
             return None
 
 
-def _resolve_perp_row(
+def _resolve_perp_key(
     product: str,
     network: str,
     client,
     refresh: bool,
-) -> Optional[dict]:
+) -> tuple[CatalogSnapshot, Optional[str]]:
     """F12 (Phase 5 audit): single perp lookup helper used by every accessor.
 
     Mirrors ``get_product_max_leverage``'s lookup order: try the uppercase
     base key directly against the perps map, then fall back to the alias
-    table. Returns the perp row dict or ``None`` when unresolved.
+    table. Returns the snapshot and the resolved key (``None`` when unresolved).
     """
-    key = (product or "").upper().strip()
-    if not key:
-        return None
-    catalog = get_catalog(network=network, client=client, refresh=refresh)
-    perps_map = catalog.get("perps") or {}
-    row = perps_map.get(key)
-    if not row:
-        resolved = (catalog.get("aliases") or {}).get(key.lower())
-        row = perps_map.get(resolved) if resolved else None
-    return row or None
+    snap = get_catalog_snapshot(network=network, client=client, refresh=refresh)
+    return snap, snap.resolve(product)
 
 
 def get_product_min_quote_notional_usd(
@@ -1008,10 +1193,8 @@ def get_product_min_quote_notional_usd(
     client=None,
     refresh: bool = False,
 ) -> Optional[float]:
-    row = _resolve_perp_row(product, network, client, refresh)
-    if not row:
-        return None
-    return _x18_to_float(row.get("min_size_x18"))
+    snap, key = _resolve_perp_key(product, network, client, refresh)
+    return snap.min_notional.get(key) if key else None
 
 
 def get_product_size_increment(
@@ -1020,10 +1203,8 @@ def get_product_size_increment(
     client=None,
     refresh: bool = False,
 ) -> Optional[float]:
-    row = _resolve_perp_row(product, network, client, refresh)
-    if not row:
-        return None
-    return _x18_to_float(row.get("size_increment_x18"))
+    snap, key = _resolve_perp_key(product, network, client, refresh)
+    return snap.size_increment.get(key) if key else None
 
 
 def get_product_price_increment(
@@ -1032,10 +1213,8 @@ def get_product_price_increment(
     client=None,
     refresh: bool = False,
 ) -> Optional[float]:
-    row = _resolve_perp_row(product, network, client, refresh)
-    if not row:
-        return None
-    return _x18_to_float(row.get("price_increment_x18"))
+    snap, key = _resolve_perp_key(product, network, client, refresh)
+    return snap.price_increment.get(key) if key else None
 
 
 def get_product_maker_fee_rate(
@@ -1049,10 +1228,8 @@ def get_product_maker_fee_rate(
     Returns ``None`` if the catalog has not seen a value yet (caller decides
     whether to use a defensive default).
     """
-    row = _resolve_perp_row(product, network, client, refresh)
-    if not row:
-        return None
-    return _x18_to_float(row.get("maker_fee_rate_x18"))
+    snap, key = _resolve_perp_key(product, network, client, refresh)
+    return snap.maker_fee.get(key) if key else None
 
 
 def get_product_taker_fee_rate(
@@ -1061,10 +1238,8 @@ def get_product_taker_fee_rate(
     client=None,
     refresh: bool = False,
 ) -> Optional[float]:
-    row = _resolve_perp_row(product, network, client, refresh)
-    if not row:
-        return None
-    return _x18_to_float(row.get("taker_fee_rate_x18"))
+    snap, key = _resolve_perp_key(product, network, client, refresh)
+    return snap.taker_fee.get(key) if key else None
 
 
 def get_spot_maker_fee_rate(
@@ -1108,20 +1283,17 @@ def get_spot_taker_fee_rate(
 
 
 def get_product_metadata(product: str, network: str = "mainnet", client=None, refresh: bool = False) -> dict:
-    key = (product or "").upper().strip()
-    if not key:
+    if not (product or "").strip():
         return {}
-    catalog = get_catalog(network=network, client=client, refresh=refresh)
-    row = (catalog.get("perps") or {}).get(key)
-    if not row:
-        resolved = (catalog.get("aliases") or {}).get(key.lower())
-        row = (catalog.get("perps") or {}).get(resolved) if resolved else None
-    return dict(row or {})
+    snap, key = _resolve_perp_key(product, network, client, refresh)
+    return dict(snap.rows[key]) if key else {}
 
 
 def is_product_isolated_only(product: str, network: str = "mainnet", client=None, refresh: bool = False) -> bool:
-    row = get_product_metadata(product=product, network=network, client=client, refresh=refresh)
-    return _as_bool(row.get("isolated_only"))
+    if not (product or "").strip():
+        return False
+    snap, key = _resolve_perp_key(product, network, client, refresh)
+    return key in snap.isolated_only
 
 
 def get_spot_product_id(name: str, network: str = "mainnet", refresh: bool = False) -> Optional[int]:
@@ -1130,18 +1302,8 @@ def get_spot_product_id(name: str, network: str = "mainnet", refresh: bool = Fal
     dn_pair = get_dn_pair(name, network=network, refresh=refresh)
     if dn_pair.get("spot_product_id") is not None:
         return int(dn_pair["spot_product_id"])
-    catalog = get_spot_catalog(network=network, refresh=refresh)
-    aliases = catalog.get("aliases") or {}
-    key = aliases.get(str(name).lower().strip())
-    if not key:
-        return None
-    row = (catalog.get("spots") or {}).get(key)
-    if not row:
-        return None
-    try:
-        return int(row.get("id"))
-    except (TypeError, ValueError):
-        return None
+    snap = get_spot_catalog_snapshot(network=network, refresh=refresh)
+    return snap.id_by_alias.get(str(name).lower().strip())
 
 
 def get_spot_metadata(name: str, network: str = "mainnet", refresh: bool = False) -> dict:
@@ -1167,12 +1329,10 @@ def get_spot_metadata(name: str, network: str = "mainnet", refresh: bool = False
         except Exception:  # noqa: BLE001
             pass
         return meta
-    catalog = get_spot_catalog(network=network, refresh=refresh)
-    aliases = catalog.get("aliases") or {}
-    key = aliases.get(str(name).lower().strip())
-    if not key:
-        return {}
-    return dict((catalog.get("spots") or {}).get(key) or {})
+    snap = get_spot_catalog_snapshot(network=network, refresh=refresh)
+    key = snap.key_by_alias.get(str(name).lower().strip())
+    row = snap.rows.get(key) if key else None
+    return dict(row or {})
 
 
 def is_product_id_isolated_only(
@@ -1182,12 +1342,8 @@ def is_product_id_isolated_only(
         pid = int(product_id)
     except (TypeError, ValueError):
         return False
-    catalog = get_catalog(network=network, client=client, refresh=refresh)
-    key = (catalog.get("by_id") or {}).get(pid)
-    if not key:
-        return False
-    row = (catalog.get("perps") or {}).get(key) or {}
-    return _as_bool(row.get("isolated_only"))
+    snap = get_catalog_snapshot(network=network, client=client, refresh=refresh)
+    return snap.key_by_id.get(pid) in snap.isolated_only
 
 
 def spot_min_notional_cached(base: str, network: str = "mainnet") -> Optional[float]:
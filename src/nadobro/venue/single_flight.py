@@ -0,0 +1,226 @@
+"""Keyed single-flight for Nado reads.
+
+The home card, strategy cycles, portfolio sync and alerts read the same
+balance, positions, candles, funding and market stats at the same moment. Each
+read is its own gateway call even when an identical call is already in flight.
+This module lets concurrent identical reads share one call:
+
+* the first caller for a key (the *leader*) runs the read;
+* callers that arrive while it runs (*joiners*) wait for and receive its
+  result, or its exception;
+* with ``retain_seconds > 0`` the result keeps serving *hits* for that long
+  after the call returns.
+
+``coalesced`` / ``acoalesced`` wrap sync / async ``NadoClient`` methods. The
+key function returns ``None`` to bypass coalescing for a call. Keys must scope
+anything caller-specific (network, subaccount) so users never share reads.
+Joiners and hits get a deep copy, so callers that mutate their rows cannot
+affect each other. ``NADO_SINGLE_FLIGHT=0`` turns coalescing off.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import functools
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Hashable, Optional, TypeVar
+
+from src.nadobro.utils.env import env_float
+
+logger = logging.getLogger(__name__)
+
+# Retention for market-data reads (candles, funding, stats, prices). Off by
+# default: callers that drop a price/funding cache expect the next read to
+# refetch, and the per-method caches already absorb sequential repeats.
+MARKET_RETAIN_SECONDS = max(0.0, env_float("NADO_SINGLE_FLIGHT_RETAIN_SECONDS", 0.0))
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "joins": 0, "errors": 0}
+_retained: dict[Hashable, tuple[float, Any]] = {}
+_retained_max = 4096
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "thread_id")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.thread_id = threading.get_ident()
+
+
+_inflight: dict[Hashable, _Call] = {}
+_ainflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Task]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _enabled() -> bool:
+    from src.nadobro.core.feature_flags import single_flight_enabled
+
+    return single_flight_enabled()
+
+
+def _retained_hit(key: Hashable) -> tuple[bool, Any]:
+    entry = _retained.get(key)
+    if entry is None:
+        return False, None
+    if entry[0] <= time.monotonic():
+        _retained.pop(key, None)
+        return False, None
+    _stats["hits"] += 1
+    return True, entry[1]
+
+
+def _retain(key: Hashable, result: Any, retain_seconds: float) -> None:
+    if retain_seconds <= 0:
+        return
+    if len(_retained) >= _retained_max:
+        now = time.monotonic()
+        for k in [k for k, (exp, _) in _retained.items() if exp <= now]:
+            _retained.pop(k, None)
+        if len(_retained) >= _retained_max:
+            _retained.clear()
+    # Stored as a copy: the leader owns (and may mutate) the object it returned.
+    _retained[key] = (time.monotonic() + retain_seconds, copy.deepcopy(result))
+
+
+def single_flight(key: Hashable, fn: Callable[[], T], *, retain_seconds: float = 0.0) -> T:
+    """Run ``fn()`` once for all concurrent callers of ``key`` (thread callers)."""
+    with _lock:
+        hit, value = _retained_hit(key)
+        if hit:
+            return copy.deepcopy(value)
+        call = _inflight.get(key)
+        if call is not None and call.thread_id == threading.get_ident():
+            # The leader re-entering its own key would wait on itself.
+            _stats["misses"] += 1
+            reentrant, leader = True, False
+        elif call is None:
+            call = _Call()
+            _inflight[key] = call
+            _stats["misses"] += 1
+            reentrant, leader = False, True
+        else:
+            _stats["joins"] += 1
+            reentrant, leader = False, False
+    if reentrant:
+        return fn()
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+    try:
+        call.result = fn()
+    except BaseException as e:
+        call.error = e
+        with _lock:
+            _stats["errors"] += 1
+        raise
+    finally:
+        with _lock:
+            _inflight.pop(key, None)
+            if call.error is None:
+                _retain(key, call.result, retain_seconds)
+        call.done.set()
+    return call.result
+
+
+async def asingle_flight(
+    key: Hashable, factory: Callable[[], Awaitable[T]], *, retain_seconds: float = 0.0
+) -> T:
+    """``single_flight`` for coroutines on one event loop; joiners await the leader's task."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        hit, value = _retained_hit(key)
+        if hit:
+            return copy.deepcopy(value)
+        per_loop = _ainflight.get(loop)
+        if per_loop is None:
+            per_loop = {}
+            _ainflight[loop] = per_loop
+        task = per_loop.get(key)
+        joined = task is not None
+        if joined:
+            _stats["joins"] += 1
+        else:
+            _stats["misses"] += 1
+            task = loop.create_task(factory())
+            per_loop[key] = task
+
+            def _settle(t: asyncio.Task, _key: Hashable = key) -> None:
+                with _lock:
+                    if per_loop.get(_key) is t:
+                        per_loop.pop(_key, None)
+                    if t.cancelled():
+                        return
+                    if t.exception() is not None:
+                        _stats["errors"] += 1
+                    else:
+                        _retain(_key, t.result(), retain_seconds)
+
+            task.add_done_callback(_settle)
+    # Shielded: one cancelled caller must not cancel the read for the others.
+    result = await asyncio.shield(task)
+    return copy.deepcopy(result) if joined else result
+
+
+def coalesced(
+    key: Callable[..., Optional[Hashable]], *, retain_seconds: float = 0.0
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorate a sync read so concurrent calls with the same ``key(*args)`` share one."""
+
+    def _wrap(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def _call(*args: Any, **kwargs: Any) -> T:
+            k = key(*args, **kwargs) if _enabled() else None
+            if k is None:
+                return fn(*args, **kwargs)
+            return single_flight((fn.__qualname__, k), lambda: fn(*args, **kwargs), retain_seconds=retain_seconds)
+
+        return _call
+
+    return _wrap
+
+
+def acoalesced(
+    key: Callable[..., Optional[Hashable]], *, retain_seconds: float = 0.0
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """``coalesced`` for coroutine methods."""
+
+    def _wrap(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(fn)
+        async def _call(*args: Any, **kwargs: Any) -> T:
+            k = key(*args, **kwargs) if _enabled() else None
+            if k is None:
+                return await fn(*args, **kwargs)
+            return await asingle_flight(
+                (fn.__qualname__, k), lambda: fn(*args, **kwargs), retain_seconds=retain_seconds
+            )
+
+        return _call
+
+    return _wrap
+
+
+def single_flight_stats() -> dict[str, Any]:
+    with _lock:
+        out: dict[str, Any] = dict(_stats)
+        out["inflight"] = len(_inflight) + sum(len(v) for v in _ainflight.values())
+        out["retained"] = len(_retained)
+    return out
+
+
+def clear_single_flight() -> None:
+    """Drop retained results and reset counters (tests, cache clears)."""
+    with _lock:
+        _retained.clear()
+        for k in _stats:
+            _stats[k] = 0
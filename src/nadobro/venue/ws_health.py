@@ -3,6 +3,11 @@
 Tracks the last successful WS message per ``(user_id, network)``. When
 ``portfolio_ws_enabled()`` and the socket is healthy, ``nado_sync`` can
 serve cached snapshots and only reconcile on a longer interval.
+
+Subscriptions are multiplexed onto a small per-network connection pool
+(``nado_ws``), so a user's freshness is the later of their own last routed
+event and the last frame seen on the pooled connection that carries them —
+a quiet subaccount on a live socket is still healthy.
 """
 from __future__ import annotations
 
@@ -18,6 +23,12 @@ _RECONCILE_SECONDS = env_float("NADO_WS_RECONCILE_SECONDS", 300.0)
 _lock = threading.RLock()
 _last_event: dict[tuple[int, str], float] = {}
 _connected: dict[tuple[int, str], bool] = {}
+# Pooled-connection bookkeeping: which connection carries each user, when
+# that connection last saw a frame, and how many streams it holds.
+_binding: dict[tuple[int, str], str] = {}
+_conn_last_event: dict[str, float] = {}
+_conn_streams: dict[str, int] = {}
+_reconnects = 0
 
 
 def _key(user_id: int, network: str) -> tuple[int, str]:
@@ -37,6 +48,41 @@ def mark_disconnected(user_id: int, network: str) -> None:
         _connected[key] = False
 
 
+def bind(user_id: int, network: str, conn_id: str) -> None:
+    """Attach a user to the pooled connection that carries their streams."""
+    with _lock:
+        _binding[_key(user_id, network)] = str(conn_id)
+
+
+def unbind(user_id: int, network: str) -> None:
+    key = _key(user_id, network)
+    with _lock:
+        _binding.pop(key, None)
+        _connected[key] = False
+
+
+def mark_connection(conn_id: str, *, streams: int) -> None:
+    """Record a pooled connection as open with ``streams`` subscriptions."""
+    with _lock:
+        _conn_streams[str(conn_id)] = max(0, int(streams))
+        _conn_last_event[str(conn_id)] = time.time()
+
+
+def touch_connection(conn_id: str) -> None:
+    with _lock:
+        if str(conn_id) in _conn_streams:
+            _conn_last_event[str(conn_id)] = time.time()
+
+
+def drop_connection(conn_id: str, *, reconnecting: bool = False) -> None:
+    global _reconnects
+    with _lock:
+        _conn_streams.pop(str(conn_id), None)
+        _conn_last_event.pop(str(conn_id), None)
+        if reconnecting:
+            _reconnects += 1
+
+
 def touch(user_id: int, network: str) -> None:
     key = _key(user_id, network)
     with _lock:
@@ -51,6 +97,9 @@ def is_healthy(user_id: int, network: str) -> bool:
         if not _connected.get(key):
             return False
         last = _last_event.get(key, 0.0)
+        conn_id = _binding.get(key)
+        if conn_id is not None:
+            last = max(last, _conn_last_event.get(conn_id, 0.0))
         return (now - last) <= _HEALTH_SECONDS
 
 
@@ -68,12 +117,21 @@ def reconcile_due(user_id: int, network: str, last_reconcile_monotonic: float) -
 def snapshot() -> dict:
     now = time.time()
     with _lock:
-        healthy = sum(
-            1 for key in _connected
-            if _connected.get(key) and (now - _last_event.get(key, 0)) <= _HEALTH_SECONDS
-        )
+        healthy = 0
+        for key, is_connected in _connected.items():
+            if not is_connected:
+                continue
+            last = _last_event.get(key, 0.0)
+            conn_id = _binding.get(key)
+            if conn_id is not None:
+                last = max(last, _conn_last_event.get(conn_id, 0.0))
+            if (now - last) <= _HEALTH_SECONDS:
+                healthy += 1
         return {
             "connected": sum(1 for v in _connected.values() if v),
             "healthy": healthy,
             "tracked": len(_last_event),
+            "connections": len(_conn_streams),
+            "streams": sum(_conn_streams.values()),
+            "reconnects": _reconnects,
         }
@@ -161,3 +161,91 @@ def test_dn_is_profitable_only_when_funding_beats_fees():
     assert no_funding.funding == 0
     assert with_funding.net_pnl > no_funding.net_pnl   # funding is DN's edge
     assert no_funding.net_pnl <= 0                      # no funding => fees bleed
+
+
+# --------------------------------------------------------------------------- #
+# throughput: price-indexed sim book, candle window, sweep                    #
+# --------------------------------------------------------------------------- #
+
+def test_price_indexed_book_fills_like_a_full_scan():
+    """The sorted bid/ask book must fill exactly the orders a full scan of every
+    resting order would, in placement order, and honour cancels."""
+    import asyncio
+    import random
+    from src.nadobro.engine.types import OrderType, TradeType
+
+    rng = random.Random(11)
+
+    def scan(orders, c):
+        return [
+            o.id for o in orders
+            if not o.state.is_terminal and o.order_type is not OrderType.MARKET
+            and ((o.side is TradeType.BUY and c.low <= o.price)
+                 or (o.side is TradeType.SELL and c.high >= o.price))
+        ]
+
+    async def body():
+        sim = SimNadoAdapter()
+        px = Decimal(100)
+        sim.set_candle(Candle(0, px, px, px, px))
+        for bar in range(1, 60):
+            for _ in range(rng.randint(0, 6)):
+                side = rng.choice((TradeType.BUY, TradeType.SELL))
+                price = Decimal(rng.randint(9500, 10500)) / 100
+                await sim.place_order("BTC", side, OrderType.LIMIT, Decimal("0.1"), price)
+            live = [o for o in sim._orders.values() if not o.state.is_terminal]  # noqa: SLF001
+            if live and rng.random() < 0.3:
+                await sim.cancel_order(rng.choice(live).id)
+            lo = Decimal(rng.randint(9600, 10000)) / 100
+            hi = lo + Decimal(rng.randint(0, 400)) / 100
+            c = Candle(bar, lo, hi, lo, hi)
+            sim.set_candle(c)
+            expected = scan(list(sim._orders.values()), c)  # noqa: SLF001
+            before = len(sim._fills)  # noqa: SLF001
+            sim.match_resting()
+            assert [f.order_id for f in sim._fills[before:]] == expected  # noqa: SLF001
+
+    asyncio.run(body())
+
+
+def test_candle_window_bounds_the_provider_history():
+    from src.nadobro.engine.backtester import BacktestEngine
+
+    candles = _ranging(n=50)
+    full = BacktestEngine("grid", _grid_cfg(), candles)
+    windowed = BacktestEngine("grid", _grid_cfg(), candles, candle_window=20)
+    full._idx = windowed._idx = 34  # noqa: SLF001
+    assert len(full._candle_provider("BTC")) == 35  # noqa: SLF001
+    rows = windowed._candle_provider("BTC")  # noqa: SLF001
+    assert [r["ts"] for r in rows] == [c.ts for c in candles[15:35]]
+    assert rows[-1]["close"] == candles[34].close
+
+
+def test_run_sweep_ranks_points_and_isolates_failures():
+    from src.nadobro.engine.backtester import format_sweep_table, run_sweep
+
+    candles = _ranging(n=80)
+    grid = [
+        {"levels_count": 3},
+        {"levels_count": 5},
+        {"levels_count": 8},
+        {"levels_count": "not-a-number"},
+    ]
+    rows = run_sweep("grid", grid, candles, base_configs=_grid_cfg(), processes=2)
+    assert [r.rank for r in rows] == [1, 2, 3, 4]
+    ok = [r for r in rows if r.error is None]
+    assert len(ok) == 3
+    assert rows[-1].error is not None
+    assert [r.net_pnl for r in ok] == sorted((r.net_pnl for r in ok), reverse=True)
+    # Same numbers as a direct run with the same window.
+    direct = run_backtest("grid", dict(_grid_cfg(), **ok[0].params), candles, candle_window=200)
+    assert ok[0].net_pnl == direct.net_pnl
+    assert "ERROR" in format_sweep_table(rows)
+
+
+def test_expand_grid_is_the_cartesian_product():
+    from src.nadobro.engine.backtester.sweep import expand_grid
+
+    points = expand_grid({"a": [1, 2], "b": ["x", "y", "z"]})
+    assert len(points) == 6
+    assert {"a": 2, "b": "z"} in points
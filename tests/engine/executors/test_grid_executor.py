@@ -300,3 +300,86 @@ def test_adversarial_transient_errors_on_open_placement():
         assert len(adapter.placed) == 5
 
     asyncio.run(body())
+
+
+class _BatchingAdapter(MockNadoAdapter):
+    """Resolves a tick's statuses in one call, like the live adapter."""
+
+    batched_order_status = True
+
+    def __init__(self, **kw):
+        super().__init__(**kw)
+        self.batch_calls = 0
+        self.single_calls = 0
+        self.ws_cached: set = set()  # ids served from a cached snapshot
+
+    async def order_statuses(self, order_ids):
+        self.batch_calls += 1
+        out = {oid: await MockNadoAdapter.order_status(self, oid) for oid in order_ids}
+        self.last_status_batch_polled = len(set(out) - self.ws_cached)
+        return out
+
+    async def order_status(self, order_id):
+        self.single_calls += 1
+        return await super().order_status(order_id)
+
+
+def test_tick_resolves_all_levels_from_one_batched_status_call():
+    async def body():
+        adapter = _BatchingAdapter(mid=Decimal(105))
+        inv = InventoryRepository()
+        ex = _ex(_cfg(), adapter, inv)
+        await ex.on_create()
+        lvl = ex.levels[0]
+        adapter.fill_order(lvl.open_order_id, price=lvl.open_price)
+        await ex.on_tick()
+        assert adapter.batch_calls == 1 and adapter.single_calls == 0
+        assert ex.last_tick_status_calls_saved == 4  # 5 level polls -> 1 call
+        assert lvl.state is GridLevelState.CLOSE_ORDER_PLACED
+        assert inv.get(1, PAIR, "c").buy_amount_base > 0
+        adapter.fill_order(lvl.close_order_id, price=lvl.close_price)
+        await ex.on_tick()
+        assert lvl.state is GridLevelState.COMPLETE
+        assert adapter.batch_calls == 2 and adapter.single_calls == 0
+        assert ex.status_calls_saved == 8
+
+    asyncio.run(body())
+
+
+def test_level_missing_from_batch_falls_back_to_order_status():
+    async def body():
+        adapter = _BatchingAdapter(mid=Decimal(105))
+        ex = _ex(_cfg(), adapter)
+        await ex.on_create()
+        skipped = ex.levels[2].open_order_id
+
+        async def partial_batch(order_ids):
+            adapter.batch_calls += 1
+            out = {
+                oid: await MockNadoAdapter.order_status(adapter, oid)
+                for oid in order_ids if oid != skipped
+            }
+            adapter.last_status_batch_polled = len(out)
+            return out
+
+        adapter.order_statuses = partial_batch
+        adapter.fill_order(skipped, price=ex.levels[2].open_price)
+        await ex.on_tick()
+        assert adapter.single_calls == 1
+        assert ex.levels[2].state is GridLevelState.CLOSE_ORDER_PLACED
+        assert ex.last_tick_status_calls_saved == 3
+
+    asyncio.run(body())
+
+
+def test_ws_cached_levels_do_not_count_as_saved_status_calls():
+    async def body():
+        adapter = _BatchingAdapter(mid=Decimal(105))
+        ex = _ex(_cfg(), adapter)
+        await ex.on_create()
+        adapter.ws_cached = {lv.open_order_id for lv in ex.levels[:3]}
+        await ex.on_tick()
+        assert adapter.single_calls == 0
+        assert ex.last_tick_status_calls_saved == 1  # 2 venue polls -> 1 call
+
+    asyncio.run(body())
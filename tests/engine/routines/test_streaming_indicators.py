@@ -0,0 +1,148 @@
+"""Golden check: the streaming indicator state equals the list functions.
+
+``IndicatorState`` advances EMA/RSI/ATR/MACD/VR per candle; these tests slide
+a 200-bar window (with a jittering forming bar) over a random walk and compare
+every feature against ``compute_tf_features`` on the same list.
+"""
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from src.nadobro.engine.routines.streaming_indicators import IndicatorState
+from src.nadobro.strategy import market_features as mf
+from src.nadobro.strategy.market_features import compute_tf_features
+
+
+def _walk(n: int, seed: int = 1, t0: int = 1000):
+    rng = random.Random(seed)
+    px = 100.0
+    bars = []
+    for i in range(n):
+        px *= math.exp(rng.gauss(0, 0.004))
+        bars.append({
+            "time": t0 + 60 * i,
+            "open": px,
+            "high": px * (1 + abs(rng.gauss(0, 0.002))),
+            "low": px * (1 - abs(rng.gauss(0, 0.002))),
+            "close": px,
+            "volume": 1.0,
+        })
+    return bars
+
+
+def _assert_same(got, ref):
+    assert set(got) == set(ref)
+    for key, want in ref.items():
+        have = got[key]
+        if want is None or isinstance(want, str):
+            assert have == want, key
+        elif isinstance(want, dict):
+            assert set(have) == set(want), key
+            for sub, v in want.items():
+                assert have[sub] == pytest.approx(v, rel=1e-8, abs=1e-12), (key, sub)
+        else:
+            assert have == pytest.approx(want, rel=1e-8, abs=1e-12), key
+
+
+def test_sliding_window_matches_compute_tf_features():
+    rng = random.Random(5)
+    bars = _walk(600)
+    state = IndicatorState(capacity=200)
+    for end in range(1, len(bars)):
+        window = [dict(b) for b in bars[max(0, end - 200):end]]
+        window[-1]["close"] *= 1 + rng.gauss(0, 0.001)  # forming bar keeps moving
+        _assert_same(state.features(window), compute_tf_features(window))
+    assert state.rebuilds == 1
+    assert state.pushes == len(bars) - 1  # one bar per slide
+
+
+def test_gap_or_rewrite_rebuilds():
+    bars = _walk(300)
+    state = IndicatorState(capacity=200)
+    state.features(bars[:200])
+    holed = bars[100:140] + bars[150:300]  # overlaps the state's newest bar, with a hole
+    _assert_same(state.features(holed), compute_tf_features(holed))
+    assert state.rebuilds == 2
+    skipped = _walk(80, seed=2, t0=bars[-1]["time"] + 6000)  # no overlap
+    _assert_same(state.features(skipped), compute_tf_features(skipped))
+    assert state.rebuilds == 3
+
+
+def test_same_list_object_is_a_lookup():
+    bars = _walk(200)
+    state = IndicatorState(capacity=200)
+    first = state.features(bars)
+    pushes = state.pushes
+    assert state.features(bars) is first
+    assert state.pushes == pushes
+
+
+def test_flat_series():
+    bars = [{"time": 1000 + 60 * i, "high": 100.0, "low": 100.0, "close": 100.0} for i in range(60)]
+    got = IndicatorState(capacity=200).features(bars)
+    _assert_same(got, compute_tf_features(bars))
+    assert got["rsi"] == 100.0
+    assert got["variance_ratio"] is None
+
+
+def test_multi_tf_features_reuses_state_across_refetches(monkeypatch):
+    mf.reset_cache()
+    bars = _walk(260)
+    cursor = {"end": 200}
+
+    def fetch(pid, tf, limit):
+        return [dict(b) for b in bars[cursor["end"] - limit:cursor["end"]]]
+
+    try:
+        for step in range(5):
+            cursor["end"] = 200 + step * 10
+            feats = mf.multi_tf_features(fetch, "mainnet", 2, timeframes=("1h",), now=1000.0 + 600 * step)
+            _assert_same(feats["1h"], compute_tf_features(fetch(2, "1h", mf.DEFAULT_LIMIT)))
+        _, state = mf._states[("mainnet", 2, "1h")]
+        assert state.rebuilds == 1
+    finally:
+        mf.reset_cache()
+
+
+def test_concurrent_callers_advance_one_state_one_at_a_time(monkeypatch):
+    import threading
+    import time
+
+    mf.reset_cache()
+    bars = _walk(260)
+    active = {"now": 0, "peak": 0}
+    guard = threading.Lock()
+    real = IndicatorState.features
+
+    def features(self, candles):
+        with guard:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.005)
+        try:
+            return real(self, candles)
+        finally:
+            with guard:
+                active["now"] -= 1
+
+    monkeypatch.setattr(IndicatorState, "features", features)
+    results = []
+
+    def run(end):
+        window = [dict(b) for b in bars[end - 200:end]]
+        got = mf.multi_tf_features(lambda pid, tf, limit: window, "mainnet", 2, timeframes=("1h",))
+        results.append((got["1h"], compute_tf_features(window)))
+
+    try:
+        threads = [threading.Thread(target=run, args=(200 + i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        mf.reset_cache()
+    assert active["peak"] == 1
+    assert len(results) == 8
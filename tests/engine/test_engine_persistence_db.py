@@ -44,11 +44,13 @@ def _schema():
     # upgrade path every run.
     for mig in ("0007_engine_v2_tables.sql", "0009_engine_kill_switch.sql",
                 "0013_engine_controller_state.sql",
-                "0014_portfolio_history_network.sql"):
+                "0014_portfolio_history_network.sql",
+                "0023_portfolio_history_rollups.sql"):
         execute((MIGRATIONS / mig).read_text())
     # clean slate for deterministic assertions
     execute("TRUNCATE engine_position_hold, engine_executors, engine_kill_switch, "
-            "engine_controller_state, engine_portfolio_history")
+            "engine_controller_state, engine_portfolio_history, "
+            "engine_portfolio_history_1h, engine_portfolio_history_1d")
     yield
 
 
@@ -70,6 +72,75 @@ def test_db_inventory_condor_example_persists_and_reads_back():
     assert [h.controller_id for h in DbInventoryRepository().list_for_user(uid)] == [cid]
 
 
+def test_write_behind_batch_upsert_adds_onto_existing_rows(monkeypatch):
+    from src.nadobro.db import query_one
+    from src.nadobro.engine.types import TradeType
+    from src.nadobro.trading import engine_persistence as ep
+    from src.nadobro.trading.engine_write_behind import EngineWriteBehind
+
+    buffer = EngineWriteBehind(write_deltas=ep._upsert_hold_deltas, record_fills=lambda fills: None)
+    monkeypatch.setattr(buffer, "_ensure_flusher", lambda: None)
+    monkeypatch.setattr(ep, "_WRITE_BEHIND", buffer)
+    cid = "grid:9003:mainnet"
+    ep.DbInventoryRepository().apply_fill(9003, "BTC-PERP", cid, TradeType.BUY, Decimal(1), Decimal(100))
+
+    repo = ep.DbInventoryRepository(write_behind=True)
+    repo.apply_fill(9003, "BTC-PERP", cid, TradeType.BUY, Decimal(2), Decimal(210), Decimal("0.5"))
+    repo.apply_fill(9003, "BTC-PERP", cid, TradeType.SELL, Decimal(1), Decimal(120))
+    repo.apply_fill(9003, "ETH-PERP", cid, TradeType.SELL, Decimal(3), Decimal(30))
+    assert repo.get(9003, "BTC-PERP", cid).buy_amount_base == Decimal(3)  # loaded once, then memory
+    sql = "SELECT * FROM engine_position_hold WHERE user_id=9003 AND trading_pair=%s"
+    assert Decimal(query_one(sql, ("BTC-PERP",))["buy_amount_base"]) == Decimal(1)  # not flushed yet
+
+    assert buffer.flush() == 2
+    btc = query_one(sql, ("BTC-PERP",))
+    assert Decimal(btc["buy_amount_base"]) == Decimal(3) and Decimal(btc["buy_amount_quote"]) == Decimal(310)
+    assert Decimal(btc["sell_amount_quote"]) == Decimal(120) and Decimal(btc["cum_fees_quote"]) == Decimal("0.5")
+    assert Decimal(query_one(sql, ("ETH-PERP",))["sell_amount_base"]) == Decimal(3)
+
+
+def test_recover_controller_rebuilds_holds_from_session_trades(monkeypatch):
+    import uuid
+
+    from src.nadobro.db import execute, query_one
+    from src.nadobro.trading import engine_persistence as ep
+
+    execute(_TRADES_DDL)
+    uid, sid, cid = 4050, 7301, "grid:4050:mainnet"
+    execute("DELETE FROM trades_mainnet WHERE user_id = %s", (uid,))
+    execute(
+        "INSERT INTO engine_executors (id,user_id,controller_id,strategy_type,trading_pair,side,"
+        "config_json,state,volume_quote,keep_position,created_at,strategy_session_id) "
+        "VALUES (%s,%s,%s,'grid','BTC-PERP','BUY','{}'::jsonb,'ACTIVE',0,false,now(),%s)",
+        (str(uuid.uuid4()), uid, cid, sid),
+    )
+    _insert_fill(uid, sid, "long", 0.02, 60000.0, fee=0.5)
+    _insert_fill(uid, sid, "short", 0.01, 61000.0, fee=0.25)
+    # A partial fill back-filled by venue sync, and a closed one, count too.
+    _insert_fill(uid, sid, "long", 0.01, 60000.0, status="partially_filled")
+    _insert_fill(uid, sid, "short", 0.005, 62000.0, status="closed")
+    _insert_fill(uid, sid, "long", 1.0, 60000.0, status="cancelled")  # never filled: ignored
+    _insert_fill(uid, sid + 1, "long", 5.0, 60000.0)  # another run: ignored
+    execute(  # a stale hold this run's crash left behind
+        "INSERT INTO engine_position_hold (user_id,trading_pair,controller_id,buy_amount_base) "
+        "VALUES (%s,'BTC-PERP',%s,9) ON CONFLICT DO NOTHING", (uid, cid),
+    )
+    monkeypatch.setattr(ep, "resolve_running_session_id", lambda *a: sid)
+    monkeypatch.setattr(ep, "_resolve_engine_fill_product", lambda *a: (2, "BTC-PERP"))
+
+    holds = ep.DbInventoryRepository().recover_controller(cid)
+
+    assert [h.trading_pair for h in holds] == ["BTC-PERP"]
+    row = query_one("SELECT * FROM engine_position_hold WHERE controller_id=%s", (cid,))
+    assert Decimal(row["buy_amount_base"]) == Decimal("0.03")
+    assert Decimal(row["sell_amount_quote"]) == Decimal("920")
+    assert Decimal(row["cum_fees_quote"]) == Decimal("0.75")
+
+    monkeypatch.setattr(ep, "resolve_running_session_id", lambda *a: sid + 99)  # fresh run
+    assert ep.DbInventoryRepository().recover_controller(cid) == []
+    assert query_one("SELECT 1 FROM engine_position_hold WHERE controller_id=%s", (cid,)) is None
+
+
 def test_controller_progress_roundtrip_and_clear():
     from decimal import Decimal
     from src.nadobro.trading.engine_persistence import (
@@ -234,15 +305,15 @@ CREATE TABLE IF NOT EXISTS trades_mainnet (
 """
 
 
-def _insert_fill(user_id, sid, side, base, price, *, fee=0.0, product_id=2):
+def _insert_fill(user_id, sid, side, base, price, *, fee=0.0, product_id=2, status="filled"):
     """Insert a recorder-style fill (no x18 venue columns yet) for a session.
     Mirrors DbTradeRecorder's NOT NULL columns (product_name/order_type/size)."""
     from src.nadobro.db import execute
     execute(
         "INSERT INTO trades_mainnet (user_id,product_id,product_name,order_type,side,status,source,"
         "size,price,fill_size,fill_price,fill_fee,strategy_session_id) "
-        "VALUES (%s,%s,'BTC-PERP','match',%s,'filled','strategy',%s,%s,%s,%s,%s,%s)",
-        (user_id, product_id, side, base, price, base, price, fee, sid),
+        "VALUES (%s,%s,'BTC-PERP','match',%s,%s,'strategy',%s,%s,%s,%s,%s,%s)",
+        (user_id, product_id, side, status, base, price, base, price, fee, sid),
     )
 
 
@@ -494,6 +565,50 @@ def test_portfolio_history_network_separation_roundtrip():
     ]
 
 
+def test_portfolio_history_tick_writes_every_tier_in_one_statement(monkeypatch):
+    """One bulk statement per sampler tick: raw 1m rows plus the 1h / 1d
+    last-sample upserts; range reads pick the tier; retention is per-tier
+    range DELETEs."""
+    from datetime import datetime, timedelta, timezone
+
+    from src.nadobro import db
+    from src.nadobro.engine.portfolio import PortfolioHistoryRow
+    from src.nadobro.portfolio import portfolio_history_worker as worker
+
+    repo = worker.DbPortfolioHistoryRepository()
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    users = range(9600, 9600 + 2000)
+    statements = []
+    real = db.execute_returning
+    monkeypatch.setattr(db, "execute_returning", lambda sql, params=None: statements.append(sql) or real(sql, params))
+
+    for minutes_ago, value in ((3, 1), (2, 2), (1, 3)):
+        rows = [PortfolioHistoryRow(uid, now - timedelta(minutes=minutes_ago), Decimal(value),
+                                    {"nado_spot": Decimal(value)}, {"USDC": Decimal(value)}) for uid in users]
+        assert repo.record_many(rows) == len(rows)
+    assert len(statements) == 3
+    # A replayed tick is a no-op everywhere.
+    assert repo.record_many(rows) == 0
+
+    uid = 9600
+    fine = repo.fetch(uid, since=now - timedelta(hours=1), until=now)
+    assert [r.total_value_quote for r in fine] == [Decimal(1), Decimal(2), Decimal(3)]
+    hourly = repo.fetch(uid, since=now - timedelta(days=7), until=now)
+    daily = repo.fetch(uid)
+    assert hourly[-1].total_value_quote == daily[-1].total_value_quote == Decimal(3)
+    assert hourly[-1].ts == now - timedelta(minutes=1)          # the surviving sample's own ts
+    assert hourly[-1].by_asset == {"USDC": Decimal(3)}
+    assert len(hourly) <= 2 and len(daily) <= 2                 # tick may straddle a boundary
+
+    # Retention drops only what each tier no longer keeps.
+    removed = repo.prune(now + timedelta(days=8))
+    assert removed >= 3 * len(users)
+    assert repo.fetch(uid, since=now - timedelta(hours=1), until=now) == []
+    assert repo.fetch(uid, since=now - timedelta(days=7), until=now)[-1].total_value_quote == Decimal(3)
+    assert repo.prune(now + timedelta(days=400)) >= len(users)
+    assert repo.fetch(uid) == []
+
+
 def test_history_fill_price_repair_and_round_trip_pairing(monkeypatch):
     """0015 repair + compute_round_trips regression (the '$0.00 entry' bug).
 
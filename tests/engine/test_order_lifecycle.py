@@ -171,3 +171,89 @@ def test_terminal_snapshot_never_polls_again():
 
 async def _match_full(*, product_ids=None, limit=200, idx=None, max_time=None):
     return [{"digest": "lim-1", "amount": 1, "price": 100, "fee": "0.01"}]
+
+
+class _LadderClient:
+    """Distinct digests per order; counts every venue read."""
+
+    def __init__(self):
+        self.open_orders_calls = 0
+        self.matches_calls = 0
+        self.resting: list = []
+        self.matches: list = []
+        self._n = 0
+
+    def place_limit_order(self, product_id, size, price, is_buy=True, post_only=False,
+                          reduce_only=False, client_id=None, **kwargs):
+        self._n += 1
+        digest = f"lad-{self._n}"
+        self.resting.append({"digest": digest, "filled_base": 0, "price": price})
+        return {"digest": digest, "status": "open"}
+
+    def get_open_orders(self, product_id, refresh=False, sender=None):
+        self.open_orders_calls += 1
+        return list(self.resting)
+
+    async def get_matches(self, *, product_ids=None, limit=200, idx=None, max_time=None):
+        self.matches_calls += 1
+        return list(self.matches)
+
+
+def test_batched_statuses_share_one_read_per_product_and_match_single_path():
+    async def body():
+        client = _LadderClient()
+        a = NadoAdapter(client, META)
+        ids = [
+            (await a.place_order(PAIR, TradeType.BUY, OrderType.LIMIT_MAKER, Decimal(1), Decimal(px))).id
+            for px in (99, 98, 97, 96)
+        ]
+        # lad-1 filled and left the book; the rest still rest unfilled.
+        client.resting = [r for r in client.resting if r["digest"] != ids[0]]
+        client.matches = [{"digest": ids[0], "amount": 1, "price": 99, "fee": "0.01"}]
+        client.open_orders_calls = 0
+        batch = await a.order_statuses(ids)
+        assert client.open_orders_calls == 1 and client.matches_calls == 1
+        assert a.last_status_batch_polled == 4
+        assert batch[ids[0]].state is OrderState.FILLED
+        assert all(batch[i].state is OrderState.OPEN for i in ids[1:])
+
+        single = NadoAdapter(client, META)
+        single._orders.update(a._orders)
+        for oid in ids:
+            one = await single.order_status(oid)
+            assert (one.state, one.filled_base, one.filled_quote, one.fee_quote) == (
+                batch[oid].state, batch[oid].filled_base, batch[oid].filled_quote, batch[oid].fee_quote,
+            )
+    asyncio.run(body())
+
+
+def test_batched_statuses_skip_reads_for_ws_proven_and_terminal_orders():
+    async def body():
+        client = _LadderClient()
+        a = NadoAdapter(client, META)
+        ids = [
+            (await a.place_order(PAIR, TradeType.BUY, OrderType.LIMIT_MAKER, Decimal(1), Decimal(px))).id
+            for px in (99, 98)
+        ]
+        for oid in ids:
+            order_lifecycle.apply_order_update(digest=oid, reason="placed")
+        await a.order_statuses(ids)
+        reads = (client.open_orders_calls, client.matches_calls)
+        # No new WS events: both snapshots are proven current -> no venue reads.
+        again = await a.order_statuses(ids)
+        assert (client.open_orders_calls, client.matches_calls) == reads
+        assert set(again) == set(ids)
+        assert a.last_status_batch_polled == 0
+        # A fill event on one order re-reads the book once for that product.
+        order_lifecycle.apply_fill(digest=ids[1])
+        await a.order_statuses(ids)
+        assert client.open_orders_calls == reads[0] + 1
+        assert a.last_status_batch_polled == 1
+    asyncio.run(body())
+
+
+def test_batched_statuses_leave_unknown_ids_to_the_fallback():
+    async def body():
+        a = NadoAdapter(_LadderClient(), META)
+        assert await a.order_statuses(["never-placed"]) == {}
+    asyncio.run(body())
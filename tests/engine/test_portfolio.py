@@ -7,6 +7,8 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from types import SimpleNamespace
 
+import pytest
+
 from src.nadobro.engine.inventory import InventoryRepository
 from src.nadobro.engine.portfolio import (
     InMemoryAccountProvider,
@@ -18,6 +20,7 @@ from src.nadobro.engine.portfolio import (
 from src.nadobro.engine.types import TradeType
 from src.nadobro.portfolio.portfolio_history_worker import (
     SnapshotAccountProvider,
+    history_tier,
     run_retention_once,
     run_sampler_once,
 )
@@ -117,6 +120,162 @@ def test_sampler_writes_one_row_per_user():
     asyncio.run(body())
 
 
+class _BatchCountingHistory(InMemoryPortfolioHistoryRepository):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: list[int] = []
+
+    def record(self, row: PortfolioHistoryRow) -> None:
+        raise AssertionError("the sampler must write the tick in one record_many")
+
+    def record_many(self, rows):
+        self.batches.append(len(rows))
+        self._rows.extend(rows)
+        return len(rows)
+
+
+def test_sampler_writes_the_tick_in_one_batch_at_5000_users():
+    async def body():
+        acct = InMemoryAccountProvider()
+        for uid in range(1, 5001):
+            acct.set(uid, {"nado_spot": {"USDC": {"value": Decimal(uid)}}}, network="mainnet")
+        hist = _BatchCountingHistory()
+        now = datetime(2026, 5, 21, 12, 0, tzinfo=timezone.utc)
+        n = await run_sampler_once(_portfolio(acct=acct, hist=hist), list(range(1, 5001)), now)
+        assert n == 5000
+        assert hist.batches == [5000]
+        assert {r.ts for r in hist.fetch(4321)} == {now}   # one timestamp per tick
+
+    asyncio.run(body())
+
+
+def test_cache_only_provider_reads_the_synced_snapshot_without_a_gateway_call():
+    from src.nadobro.venue import nado_sync
+
+    class NoGatewayProvider(SnapshotAccountProvider):
+        def _snapshot(self, user_id: int) -> object:
+            raise AssertionError("gateway snapshot")
+
+        def _spot_balances(self, user_id: int):
+            raise AssertionError("gateway balance")
+
+    nado_sync.clear_cache(77)
+    nado_sync.set_cached_snapshot(77, "testnet", {
+        "positions": [
+            {"symbol": "BTC-PERP", "amount": Decimal("-0.5"), "notional_value": Decimal("-30000")},
+            {"symbol": "BTC-PERP", "amount": Decimal("0.25"), "notional_value": Decimal("15000")},
+        ],
+        "spot_balances": {0: Decimal("1000"), 3: Decimal("0.5")},
+        "summary": {"spot_positions": [
+            {"product_id": 0, "amount": Decimal("1000"), "oracle_price": Decimal("1")},
+            {"product_id": 3, "amount": Decimal("0.5"), "oracle_price": Decimal("2500")},
+        ]},
+        "matches": [{"x": i} for i in range(200)],
+        "last_sync": datetime.now(timezone.utc),
+    })
+
+    async def body():
+        provider = NoGatewayProvider(network="testnet", shared_cache_only=True)
+        accounts = await provider.accounts(77)
+        # The net short of 0.25 BTC at the 60000 oracle mark.
+        assert accounts["nado_perps"]["BTC-PERP"] == {
+            "units": Decimal("-0.25"), "mark": Decimal("60000"), "value": Decimal("15000"),
+        }
+        assert accounts["nado_spot"]["spot:0"]["value"] == Decimal("1000")
+        # A non-USDC token is valued at its oracle price, not as dollars.
+        assert accounts["nado_spot"]["spot:3"] == {
+            "units": Decimal("0.5"), "mark": Decimal("2500"), "value": Decimal("1250"),
+        }
+        hist = InMemoryPortfolioHistoryRepository()
+        assert await run_sampler_once(_portfolio(acct=provider, hist=hist), [77, 78]) == 1
+        row = hist.fetch(77)[0]
+        assert (row.network, row.total_value_quote) == ("testnet", Decimal("17250"))
+
+    try:
+        asyncio.run(body())
+    finally:
+        nado_sync.clear_cache(77)
+
+
+def test_cache_only_provider_skips_stale_or_unpriced_snapshots():
+    from src.nadobro.portfolio.portfolio_service import PortfolioSnapshotUnavailable
+    from src.nadobro.venue import nado_sync
+
+    provider = SnapshotAccountProvider(network="mainnet", shared_cache_only=True)
+
+    async def body():
+        # The user dropped out of the sync: its last holdings are not sampled.
+        nado_sync.set_cached_snapshot(79, "mainnet", {
+            "spot_balances": {0: Decimal("1000")},
+            "last_sync": datetime.now(timezone.utc) - timedelta(hours=1),
+        })
+        with pytest.raises(PortfolioSnapshotUnavailable, match="stale"):
+            await provider.accounts(79)
+        hist = InMemoryPortfolioHistoryRepository()
+        assert await run_sampler_once(_portfolio(acct=provider, hist=hist), [79]) == 0
+
+        # A token balance without an oracle price is not recorded as dollars.
+        nado_sync.set_cached_snapshot(79, "mainnet", {
+            "spot_balances": {0: Decimal("1000"), 3: Decimal("0.5")},
+            "last_sync": datetime.now(timezone.utc),
+        })
+        with pytest.raises(PortfolioSnapshotUnavailable, match="oracle price"):
+            await provider.accounts(79)
+
+    try:
+        asyncio.run(body())
+    finally:
+        nado_sync.clear_cache(79)
+
+
+def test_sampler_lists_the_users_the_portfolio_sync_keeps_current(monkeypatch):
+    from src.nadobro.portfolio.portfolio_history_worker import list_active_user_ids
+    from src.nadobro.venue import nado_sync
+
+    rows = [{"telegram_id": 5, "network": "mainnet"}, {"telegram_id": 9, "network": "testnet"}]
+    monkeypatch.setattr(nado_sync, "_all_active_users", lambda: rows)
+    assert list_active_user_ids() == [5, 9]
+
+
+def test_sampler_loop_lists_users_off_the_event_loop():
+    import threading
+
+    from src.nadobro.portfolio.portfolio_history_worker import sampler_loop
+
+    listed_on: list[int] = []
+
+    async def body():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        loop_thread = threading.get_ident()
+
+        def list_users():
+            listed_on.append(threading.get_ident())
+            loop.call_soon_threadsafe(stop.set)  # one tick
+            return [1]
+
+        acct = InMemoryAccountProvider()
+        acct.set(1, {"nado_spot": {"USDC": {"value": Decimal(5)}}})
+        hist = InMemoryPortfolioHistoryRepository()
+        await sampler_loop(lambda: _portfolio(acct=acct, hist=hist), list_users, interval=0, stop_event=stop)
+        return loop_thread, hist
+
+    loop_thread, hist = asyncio.run(body())
+    assert listed_on and listed_on[0] != loop_thread
+    assert len(hist.fetch(1)) == 1
+
+
+def test_history_tier_matches_the_range_to_a_retained_resolution():
+    now = datetime(2026, 5, 21, 12, 0, tzinfo=timezone.utc)
+    assert history_tier(now - timedelta(hours=24), now, now) == "1m"
+    assert history_tier(now - timedelta(days=7), now, now) == "1h"
+    assert history_tier(now - timedelta(days=30), now, now) == "1h"
+    # A short range that is no longer retained at 1m reads the hourly tier.
+    assert history_tier(now - timedelta(days=10), now - timedelta(days=9, hours=20), now) == "1h"
+    assert history_tier(now - timedelta(days=90), now, now) == "1d"
+    assert history_tier(None) == "1d"
+
+
 def test_snapshot_account_provider_derives_missing_notional_value():
     class FakeSnapshotProvider(SnapshotAccountProvider):
         def _snapshot(self, user_id: int) -> object:
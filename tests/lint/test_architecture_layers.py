@@ -31,6 +31,8 @@ ALLOWED_EDGES = {
     ("connectors", "utils"),
     ("core", "utils"),
     ("db", "utils"),
+    ("db_async", "db"),           # shares the DSN and connect kwargs
+    ("db_async", "utils"),
     ("engine", "quant"),
     # quant/ is a pure-math LEAF (see docs/ARCHITECTURE.md). live_session
     # derives isolated-position uPnL with quant.derive_unrealized_pnl —
@@ -51,6 +53,7 @@ ALLOWED_EDGES = {
     ("handlers", "utils"),
     ("handlers", "vault"),
     ("handlers", "venue"),
+    ("i18n", "utils"),
     ("llm", "config"),
     ("llm", "connectors"),
     ("llm", "db"),
@@ -65,12 +68,14 @@ ALLOWED_EDGES = {
     ("market_data", "core"),
     ("market_data", "utils"),
     ("models", "db"),
+    ("models", "db_async"),
     ("notify", "config"),
     ("notify", "core"),
     ("notify", "i18n"),
     ("notify", "models"),
     ("notify", "users"),
     ("notify", "utils"),
+    ("portfolio", "core"),        # card renderer: misc thread pool, perf metrics, flags
     ("portfolio", "db"),
     ("portfolio", "engine"),
     ("portfolio", "trading"),
@@ -106,6 +111,7 @@ ALLOWED_EDGES = {
     ("users", "config"),
     ("users", "core"),
     ("users", "db"),
+    ("users", "db_async"),
     ("users", "i18n"),
     ("users", "models"),
     ("users", "strategy"),        # settings expose registry defaults; unlink stops strategies
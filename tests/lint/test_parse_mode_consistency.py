@@ -11,7 +11,7 @@ Heuristic, tuned for zero false positives on the current tree:
   (``*``/`` ` ``/escape_md) or HTML tags (<b>/<code>/<i>) — docstrings
   excluded.
 - At each send call (_edit_loc / reply_text / send_message /
-  edit_message_text), the text payload's class is derived from inline
+  edit_message_text / telegram_sender.deliver), the text payload's class is derived from inline
   builder calls plus line-ordered variable assignments within the same
   function (sequential tracking, so a later reassignment cannot taint an
   earlier send).
@@ -28,7 +28,7 @@ REPO_ROOT = pathlib.Path(__file__).resolve().parents[2]
 # packages (llm/, strategies/, trading/, notify/, ...) since the services/
 # decomposition. Scanning the whole tree keeps every builder classified.
 SCAN = sorted((REPO_ROOT / "src/nadobro").rglob("*.py"))
-SENDS = {"_edit_loc", "reply_text", "send_message", "edit_message_text"}
+SENDS = {"_edit_loc", "reply_text", "send_message", "edit_message_text", "deliver"}
 
 
 def _docstring_nodes(fn: ast.AST) -> set[int]:
@@ -0,0 +1,151 @@
+"""The alert index must fire exactly what the linear scan fires, without DB reads.
+
+``get_triggered_alerts`` evaluates alerts from sorted per-product thresholds
+(notify/alert_index.py). These tests pin it to the legacy linear scan on a
+randomized alert book, and pin the cost model: a quiet tick issues no DB read
+and only the alerts that fire are written.
+"""
+from __future__ import annotations
+
+import random
+import time
+
+import pytest
+
+from src.nadobro.notify import alert_service
+from src.nadobro.notify.alert_index import AlertIndex
+
+_CONDITIONS = ("above", "below", "funding_above", "funding_below", "pnl_above", "pnl_below")
+
+
+def _book(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    alerts = []
+    for i in range(1, n + 1):
+        cond = rng.choice(_CONDITIONS)
+        product = rng.choice(("BTC-PERP", "ETH-PERP", "SOL-PERP"))
+        if cond.startswith("funding"):
+            target = rng.uniform(-0.001, 0.001)
+        elif cond.startswith("pnl"):
+            target = rng.uniform(-50, 50)
+        else:
+            target = rng.uniform(90, 110)
+        alerts.append({
+            "id": i,
+            "user_id": rng.randint(1, 20),
+            "product_name": product,
+            "condition": cond,
+            "target_value": round(target, 6),
+        })
+    return alerts
+
+
+class _Db:
+    def __init__(self, alerts):
+        self.active = {a["id"]: dict(a) for a in alerts}
+        self.loads = 0
+        self.marked: list[int] = []
+
+    def load(self, network=None):
+        self.loads += 1
+        return [dict(a) for a in self.active.values()]
+
+    def mark(self, alert_id, network="mainnet"):
+        self.marked.append(alert_id)
+        return self.active.pop(alert_id, None) is not None
+
+
+def _inputs(seed: int):
+    rng = random.Random(seed)
+    prices = {p: {"mid": rng.uniform(90, 110)} for p in ("BTC", "ETH", "SOL")}
+    funding = {p: rng.uniform(-0.001, 0.001) for p in ("BTC", "ETH")}
+    positions = {
+        uid: [{"product_name": "BTC-PERP", "unrealized_pnl": rng.uniform(-60, 60)}]
+        for uid in range(1, 21, 2)
+    }
+    return prices, funding, positions
+
+
+def _key(rows):
+    return sorted((r["user_id"], r["product"], r["condition"], r["target"]) for r in rows)
+
+
+@pytest.fixture
+def index_with(monkeypatch):
+    def _install(db: _Db) -> AlertIndex:
+        index = AlertIndex(load=db.load, resync_seconds=3600)
+        monkeypatch.setattr(alert_service, "_ALERT_INDEX", index)
+        monkeypatch.setattr(alert_service, "get_all_active_alerts", db.load)
+        monkeypatch.setattr(alert_service, "update_alert_triggered", db.mark)
+        monkeypatch.setattr(alert_service, "alert_index_enabled", lambda: True)
+        return index
+    return _install
+
+
+def test_index_fires_the_same_alerts_as_the_linear_scan(index_with, monkeypatch):
+    alerts = _book(600)
+    indexed_db = _Db(alerts)
+    index_with(indexed_db)
+    scan_db = _Db(alerts)
+    for tick in range(6):
+        prices, funding, positions = _inputs(tick)
+        fired = alert_service.get_triggered_alerts(prices, funding, positions, "mainnet")
+        monkeypatch.setattr(alert_service, "update_alert_triggered", scan_db.mark)
+        monkeypatch.setattr(alert_service, "get_all_active_alerts", scan_db.load)
+        expected = alert_service._scan_triggered_alerts(prices, funding, positions, "mainnet")
+        monkeypatch.setattr(alert_service, "update_alert_triggered", indexed_db.mark)
+        assert _key(fired) == _key(expected)
+    assert indexed_db.loads == 1
+    assert set(indexed_db.active) == set(scan_db.active)
+
+
+def test_quiet_tick_touches_no_db(index_with):
+    db = _Db([{"id": 1, "user_id": 5, "product_name": "BTC-PERP", "condition": "above", "target_value": 200}])
+    index_with(db)
+    for _ in range(3):
+        assert alert_service.get_triggered_alerts({"BTC": {"mid": 100.0}}, network="mainnet") == []
+    assert db.loads == 1
+    assert db.marked == []
+
+
+def test_create_and_delete_keep_the_index_in_sync(index_with):
+    db = _Db([])
+    index = index_with(db)
+    alert_service.get_triggered_alerts({"BTC": {"mid": 100.0}}, network="mainnet")
+    index.add("mainnet", {"id": 9, "user_id": 5, "product_name": "BTC-PERP",
+                          "condition": "below", "target_value": 95})
+    index.add("mainnet", {"id": 10, "user_id": 5, "product_name": "BTC-PERP",
+                          "condition": "below", "target_value": 96})
+    db.active[9] = {"id": 9}
+    db.active[10] = {"id": 10}
+    index.remove("mainnet", 10)
+    fired = alert_service.get_triggered_alerts({"BTC": {"mid": 94.0}}, network="mainnet")
+    assert [r["target"] for r in fired] == [95.0]
+    assert db.marked == [9]
+    assert db.loads == 1
+
+
+def test_alert_already_inactive_in_db_is_dropped_not_sent(index_with):
+    db = _Db([{"id": 1, "user_id": 5, "product_name": "BTC-PERP", "condition": "above", "target_value": 100}])
+    index_with(db)
+    alert_service.get_triggered_alerts({"BTC": {"mid": 50.0}}, network="mainnet")
+    db.active.clear()  # deleted by another process
+    assert alert_service.get_triggered_alerts({"BTC": {"mid": 150.0}}, network="mainnet") == []
+    assert alert_service.get_triggered_alerts({"BTC": {"mid": 150.0}}, network="mainnet") == []
+    assert db.marked == [1]
+
+
+def test_quiet_scan_over_100k_alerts_is_cheap():
+    alerts = _book(100_000, seed=3)
+    for a in alerts:
+        if a["condition"] in ("above", "below"):
+            # Keep every price alert uncrossed at mid=100.
+            a["target_value"] = 150 + a["id"] % 50 if a["condition"] == "above" else 50 - a["id"] % 40
+    index = AlertIndex(load=lambda network: alerts, resync_seconds=3600)
+    prices = {"BTC": {"mid": 100.0}, "ETH": {"mid": 100.0}, "SOL": {"mid": 100.0}}
+    index.candidates("mainnet", prices)
+    started = time.perf_counter()
+    for _ in range(100):
+        assert index.candidates("mainnet", prices) == []
+    per_scan_ms = (time.perf_counter() - started) * 1000.0 / 100
+    assert per_scan_ms < 5.0, per_scan_ms
@@ -30,6 +30,9 @@ def test_build_alert_context_pins_positions_to_evaluation_network(monkeypatch):
         seen_scan_networks.append(network)
         return [pnl_alert]
 
+    async def fake_aget_all_active_alerts(network=None):
+        return fake_get_all_active_alerts(network)
+
     class _FakeClient:
         def get_all_positions(self):
             return [{"product_name": "BTC-PERP", "unrealized_pnl": 12.5}]
@@ -39,6 +42,7 @@ def test_build_alert_context_pins_positions_to_evaluation_network(monkeypatch):
         return _FakeClient()
 
     monkeypatch.setattr(db_models, "get_all_active_alerts", fake_get_all_active_alerts)
+    monkeypatch.setattr(db_models, "aget_all_active_alerts", fake_aget_all_active_alerts)
     monkeypatch.setattr(user_service, "get_user_readonly_client", fake_get_user_readonly_client)
     # No funding alerts in play — the funding branch needs _check_client anyway.
     monkeypatch.setattr(scheduler, "_check_client", None)
@@ -0,0 +1,143 @@
+"""Engine write-behind: fills update memory on the tick, Postgres catches up.
+
+``DbInventoryRepository(write_behind=True)`` and ``DbTradeRecorder(write_behind=
+True)`` share one ``EngineWriteBehind``. These tests pin that a fill burst
+costs no DB round trip on the tick path, that a flush coalesces it into one
+row per hold and one lookup pass per batch, that a failed flush loses nothing,
+and that a start-of-run reset drops the previous run's pending deltas.
+"""
+from __future__ import annotations
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from src.nadobro.engine.types import TradeType
+from src.nadobro.trading import engine_persistence as ep
+from src.nadobro.trading.engine_write_behind import EngineWriteBehind
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.batches: list[list] = []
+        self.fail = False
+
+    def write(self, rows):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.batches.append(rows)
+
+
+@pytest.fixture
+def wb(monkeypatch):
+    sink = _Sink()
+    buffer = EngineWriteBehind(
+        write_deltas=sink.write, record_fills=lambda fills: ep._record_fill_batch(fills), lag_seconds=60,
+    )
+    monkeypatch.setattr(buffer, "_ensure_flusher", lambda: None)  # flush by hand
+    monkeypatch.setattr(ep, "_WRITE_BEHIND", buffer)
+    return buffer, sink
+
+
+def _no_db(*_a, **_k):
+    raise AssertionError("tick path must not touch Postgres")
+
+
+def test_fill_burst_is_memory_only_then_one_row_per_hold(wb):
+    buffer, sink = wb
+    repo = ep.DbInventoryRepository(write_behind=True)
+    cid = "grid:7:mainnet"
+    buffer.reset_controller(cid, lambda: None)  # fresh run: this process owns the holds
+    with patch("src.nadobro.db.query_one", _no_db), patch("src.nadobro.db.query_all", _no_db), \
+         patch("src.nadobro.db.execute_returning", _no_db):
+        for i in range(15):
+            repo.apply_fill(7, "BTC-PERP", cid, TradeType.BUY, Decimal("0.1"), Decimal("6000"), Decimal("0.6"))
+            repo.apply_fill(7, "BTC-PERP", cid, TradeType.SELL, Decimal("0.1"), Decimal("6010"), Decimal("0.6"))
+        repo.apply_fill(7, "ETH-PERP", cid, TradeType.BUY, Decimal("1"), Decimal("3000"))
+        hold = repo.get(7, "BTC-PERP", cid)
+        assert hold.buy_amount_base == Decimal("1.5") and hold.net_amount_base == 0
+        assert {h.trading_pair for h in repo.list_for_controller(7, cid)} == {"BTC-PERP", "ETH-PERP"}
+    assert sink.batches == []
+
+    assert buffer.flush() == 2
+    rows = {r[1]: r for r in sink.batches[0]}
+    assert rows["BTC-PERP"] == (7, "BTC-PERP", cid, Decimal("1.5"), Decimal("90000"),
+                                Decimal("1.5"), Decimal("90150"), Decimal("18.0"))
+    assert rows["ETH-PERP"][3:5] == (Decimal("1"), Decimal("3000"))
+    assert buffer.flush() == 0  # nothing left
+
+
+def test_failed_flush_requeues_and_merges_with_newer_fills(wb):
+    buffer, sink = wb
+    repo = ep.DbInventoryRepository(write_behind=True)
+    buffer.reset_controller("grid:8:mainnet", lambda: None)
+    repo.apply_fill(8, "BTC-PERP", "grid:8:mainnet", TradeType.BUY, Decimal(1), Decimal(100))
+    sink.fail = True
+    assert buffer.flush() == 0
+    assert buffer.stats()["flush_errors"] == 1
+    sink.fail = False
+    repo.apply_fill(8, "BTC-PERP", "grid:8:mainnet", TradeType.BUY, Decimal(2), Decimal(210))
+    buffer.flush()
+    assert sink.batches == [[(8, "BTC-PERP", "grid:8:mainnet", Decimal(3), Decimal(310),
+                              Decimal(0), Decimal(0), Decimal(0))]]
+
+
+def test_unowned_hold_loads_once_and_reset_drops_pending(wb):
+    buffer, sink = wb
+    repo = ep.DbInventoryRepository(write_behind=True)
+    loads = []
+
+    def _query_one(sql, params):
+        loads.append(params)
+        return {"user_id": 9, "trading_pair": "SOL-PERP", "controller_id": "dn:9:mainnet",
+                "buy_amount_base": "5", "buy_amount_quote": "500", "sell_amount_base": "0",
+                "sell_amount_quote": "0", "cum_fees_quote": "1"}
+
+    with patch("src.nadobro.db.query_one", _query_one):
+        repo.apply_fill(9, "SOL-PERP", "dn:9:mainnet", TradeType.BUY, Decimal(1), Decimal(100))
+        hold = repo.apply_fill(9, "SOL-PERP", "dn:9:mainnet", TradeType.BUY, Decimal(1), Decimal(100))
+    assert len(loads) == 1 and hold.buy_amount_base == Decimal(7)
+
+    deletes = []
+    with patch("src.nadobro.db.execute", lambda sql, params=None: deletes.append(sql)):
+        repo.clear_for_controller("dn:9:mainnet")
+    assert deletes and "DELETE FROM engine_position_hold" in deletes[0]
+    assert buffer.flush() == 0  # the old run's deltas never reach the new run's rows
+    assert repo.get(9, "SOL-PERP", "dn:9:mainnet").buy_amount_base == 0
+
+
+def test_queued_fills_share_one_session_lookup_and_one_dedupe_probe(wb):
+    buffer, _sink = wb
+    rec = ep.DbTradeRecorder(write_behind=True)
+    inserted: list = []
+    session_lookups: list = []
+    probes: list = []
+
+    with patch("src.nadobro.models.database.insert_trade", _no_db):
+        for i in range(5):
+            rec.record("grid:42:mainnet", "BTC-PERP", TradeType.BUY, "0.01", "60000", "0.1",
+                       order_id=f"0xd{i}")
+    assert buffer.stats()["pending_fills"] == 5
+
+    def _resolve(strategy, user_id, network):
+        session_lookups.append((strategy, user_id, network))
+        return 90
+
+    def _query_all(sql, params):
+        probes.append(params)
+        return [{"order_digest": "0xd1"}]  # venue sync already wrote this one
+
+    with patch.object(ep, "resolve_running_session_id", _resolve), \
+         patch.object(ep, "_resolve_engine_fill_product", lambda *a: (2, "BTC-PERP")), \
+         patch("src.nadobro.db.query_all", _query_all), \
+         patch("src.nadobro.db.query_one", _no_db), \
+         patch("src.nadobro.db.execute"), \
+         patch("src.nadobro.models.database.insert_trade",
+               side_effect=lambda data, network="mainnet": inserted.append(data)):
+        buffer.flush()
+
+    assert session_lookups == [("grid", 42, "mainnet")]
+    assert probes == [(["0xd0", "0xd1", "0xd2", "0xd3", "0xd4"],)]
+    assert [d["order_digest"] for d in inserted] == ["0xd0", "0xd2", "0xd3", "0xd4"]
+    assert all(d["strategy_session_id"] == 90 for d in inserted)
@@ -0,0 +1,160 @@
+"""Per-day fill rollups must give exactly what a full-ledger replay gives.
+
+``quant/fill_rollups`` folds fills into ``(product, day)`` rows at ingest time
+and answers rolling windows from whole-day sums plus a replay of each window's
+start day. Over a randomized ledger (many products, isolated + cross legs,
+flips, partial closes, spot, funding), folded in uneven incremental batches,
+every window must equal ``aggregate_user_analytics`` and
+``realized_pnl_windows_from_rows`` over the same rows.
+"""
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from src.nadobro.quant import fill_rollups as fr
+from src.nadobro.quant.portfolio_calculator import realized_pnl_windows_from_rows
+from src.nadobro.quant.user_analytics import WINDOWS, aggregate_user_analytics
+
+NOW = datetime(2026, 7, 26, 15, 37, 11, tzinfo=timezone.utc)
+X18 = 10**18
+_EPS = Decimal("1e-9")
+_PRODUCTS = {2: "BTC-PERP", 4: "ETH-PERP", 8: "SOL-PERP", 3: "KBTC"}
+
+
+def _ledger(seed: int, n: int = 1500) -> tuple[list[dict], list[dict]]:
+    rng = random.Random(seed)
+    fills, funding = [], []
+    for i in range(n):
+        pid = rng.choice(list(_PRODUCTS))
+        base = Decimal(rng.randint(1, 40)) / Decimal(10)
+        price = Decimal(rng.randint(900, 1100))
+        ts = NOW - timedelta(seconds=rng.randint(0, 45 * 86400))
+        fills.append({
+            "product_id": pid,
+            "product_name": _PRODUCTS[pid],
+            "side": rng.choice(("long", "short")),
+            "isolated": rng.random() < 0.3,
+            "base_filled_x18": str(int(base * X18)),
+            "quote_filled_x18": str(int(base * price * X18)),
+            "fee_x18": str(int(base * price * X18) // 2000),
+            "via_nadobro": rng.random() < 0.5,
+            "submission_idx": i + 1,
+            "filled_at": ts.replace(microsecond=0),
+        })
+    for i in range(120):
+        ts = NOW - timedelta(seconds=rng.randint(0, 45 * 86400))
+        funding.append({
+            "id": i + 1,
+            "product_id": rng.choice([2, 4, 8]),
+            "amount_x18": str(rng.randint(-5 * X18, 5 * X18)),
+            "paid_at": ts.replace(microsecond=0),
+        })
+    fills.sort(key=lambda r: (r["filled_at"], r["submission_idx"]))
+    return fills, funding
+
+
+def _store(days: dict, delta: dict) -> None:
+    """The additive upsert ``_upsert_fill_rollup_days`` performs."""
+    for key, bucket in delta.items():
+        row = days.setdefault(key, fr._empty_day())
+        for col in (*fr.SUM_COLUMNS, *fr.COUNT_COLUMNS):
+            row[col] += bucket[col]
+        if bucket["eod"] is not None:
+            row["eod"] = bucket["eod"]
+
+
+def _read(days: dict, fills: list[dict], funding: list[dict], now: datetime) -> dict:
+    """The window read ``_fill_rollup_window_totals`` performs against the table."""
+    start_days = {w: ts.date() for w, ts in fr.window_starts(now).items()}
+    cols = (*fr.SUM_COLUMNS, *fr.COUNT_COLUMNS)
+    day_sums = {"all": {c: sum(r[c] for r in days.values()) for c in cols}}
+    for window, start in start_days.items():
+        day_sums[window] = {c: sum(r[c] for (_p, d), r in days.items() if d > start) for c in cols}
+    events, funds = {}, {}
+    for window, start in start_days.items():
+        positions: dict = {}
+        latest: dict = {}
+        for (pid, day), row in days.items():
+            if day < start and row["eod"] is not None and day > latest.get(pid, (None, start.min))[1]:
+                latest[pid] = (row["eod"], day)
+        for pid, (eod, _day) in latest.items():
+            positions.update(fr.decode_positions({f"{pid}:{iso}": s for iso, s in eod.items()}))
+        events[window] = fr.fill_events([f for f in fills if f["filled_at"].date() == start], positions)
+        funds[window] = [p for p in funding if p["paid_at"].date() == start]
+    return fr.window_totals(day_sums, events, funds, now)
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_incremental_rollups_match_a_full_replay(seed):
+    fills, funding = _ledger(seed)
+    rng = random.Random(seed)
+    days: dict = {}
+    positions: dict = {}
+    cut = 0
+    while cut < len(fills):
+        step = rng.randint(1, 200)
+        batch = fills[cut:cut + step]
+        funding_batch = [p for p in funding if cut <= p["id"] * len(fills) // len(funding) < cut + step]
+        _store(days, fr.fold_days(fr.fill_events(batch, positions), funding_batch))
+        # Between ingests the carried state lives in fill_rollup_state JSONB.
+        positions = fr.decode_positions(fr.encode_positions(positions))
+        cut += step
+
+    totals = _read(days, fills, funding, NOW)
+    analytics = fr.analytics_from_totals(totals)
+    realized = fr.realized_from_totals(totals)
+
+    expected = aggregate_user_analytics(fills, funding, now=NOW)
+    expected_pnl = realized_pnl_windows_from_rows(fills, now=NOW)
+    for window in WINDOWS:
+        for book in ("nado_volume", "nadobro_volume"):
+            for key in ("perp_usd", "spot_usd", "total_usd", "fills"):
+                assert analytics[book][window][key] == expected[book][window][key], (book, window, key)
+        assert analytics["fees"][window] == expected["fees"][window]
+        assert analytics["funding"][window] == expected["funding"][window]
+        # PnL sums the same terms in a different order (days, then windows):
+        # equal up to Decimal's 28-digit rounding.
+        assert analytics["realized_pnl"][window] == pytest.approx(expected["realized_pnl"][window], abs=_EPS)
+        assert analytics["wins"][window] == expected["wins"][window]
+        assert analytics["losses"][window] == expected["losses"][window]
+        assert realized["win_pnl_windows"][window] == pytest.approx(expected_pnl["win_pnl_windows"][window], abs=_EPS)
+        assert realized["loss_pnl_windows"][window] == pytest.approx(expected_pnl["loss_pnl_windows"][window], abs=_EPS)
+    assert realized["total_pnl"] == pytest.approx(expected_pnl["total_pnl"], abs=_EPS)
+    assert realized["win_rate"] == expected_pnl["win_rate"]
+    # One row per active (product, day), however many fills it holds.
+    assert len(days) <= len(_PRODUCTS) * 46 < len(fills)
+
+
+def test_window_start_day_is_cut_at_the_exact_second():
+    """A fill one second outside 24h lands on the same day as one just inside."""
+    now = datetime(2026, 7, 26, 12, 0, tzinfo=timezone.utc)
+    start = now - timedelta(hours=24)
+
+    def _f(ts, idx, side="long"):
+        return {"product_id": 2, "product_name": "BTC-PERP", "side": side, "submission_idx": idx,
+                "base_filled_x18": str(X18), "quote_filled_x18": str(100 * X18),
+                "fee_x18": str(X18 // 10), "filled_at": ts}
+
+    fills = [_f(start - timedelta(seconds=1), 1), _f(start, 2), _f(now, 3, side="short")]
+    days: dict = {}
+    _store(days, fr.fold_days(fr.fill_events(fills, {})))
+    totals = _read(days, fills, [], now)
+    assert totals["24h"]["fills"] == 2
+    assert totals["24h"]["perp_usd"] == Decimal(200)
+    assert totals["all"]["fills"] == 3
+    assert (totals["all"]["wins"], totals["all"]["losses"]) == (0, 0)  # still long 1: no round trip closed
+
+
+def test_funding_only_day_keeps_the_stored_end_of_day_positions():
+    day = NOW.date()
+    days: dict = {}
+    fill = {"product_id": 2, "product_name": "BTC-PERP", "side": "long", "submission_idx": 1,
+            "base_filled_x18": str(X18), "quote_filled_x18": str(100 * X18), "filled_at": NOW}
+    _store(days, fr.fold_days(fr.fill_events([fill], {})))
+    _store(days, fr.fold_days([], [{"product_id": 2, "amount_x18": str(3 * X18), "paid_at": NOW}]))
+    assert days[(2, day)]["eod"] == {"0": ["1", "100", "0"]}
+    assert days[(2, day)]["funding"] == Decimal(3)
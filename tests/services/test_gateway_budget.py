@@ -87,6 +87,43 @@ def test_per_user_bucket_drains_by_weight(monkeypatch):
     assert mod.try_acquire(url, user_id=99, weight=8, max_wait=0.01) is False
 
 
+def test_starved_user_spends_no_host_weight(monkeypatch):
+    """A user out of fair share is denied before the shared IP bucket is charged,
+    so an async caller probing until its deadline can't drain it."""
+    import asyncio
+
+    monkeypatch.setenv("NADO_USER_GATEWAY_RPS", "0.0001")
+    monkeypatch.setenv("NADO_USER_GATEWAY_BURST", "10")
+    monkeypatch.setenv("NADO_USER_MAX_INFLIGHT", "100")
+    from src.nadobro.venue import gateway_budget as mod
+    importlib.reload(mod)
+    charged: list[float] = []
+
+    def _host(_url, *, cost=1.0, max_wait=None):
+        charged.append(cost)
+        return True
+
+    monkeypatch.setattr("src.nadobro.core.http_session.throttle_host", _host)
+    url = "https://gateway.mainnet.nado.xyz/query"
+    assert mod.try_acquire(url, user_id=5, weight=8, max_wait=0.0) is True
+    assert asyncio.run(mod.try_acquire_async(url, user_id=5, weight=8, max_wait=0.2)) is False
+    assert charged == [8]
+
+
+def test_host_denial_refunds_the_user_share(monkeypatch):
+    monkeypatch.setenv("NADO_USER_GATEWAY_RPS", "0.0001")
+    monkeypatch.setenv("NADO_USER_GATEWAY_BURST", "10")
+    monkeypatch.setenv("NADO_USER_MAX_INFLIGHT", "100")
+    from src.nadobro.venue import gateway_budget as mod
+    importlib.reload(mod)
+    url = "https://gateway.mainnet.nado.xyz/query"
+    monkeypatch.setattr("src.nadobro.core.http_session.throttle_host", lambda *_a, **_k: False)
+    for _ in range(3):
+        assert mod.try_acquire(url, user_id=6, weight=8, max_wait=0.0) is False
+    monkeypatch.setattr("src.nadobro.core.http_session.throttle_host", lambda *_a, **_k: True)
+    assert mod.try_acquire(url, user_id=6, weight=8, max_wait=0.0) is True
+
+
 def test_execute_lane_uses_wallet_budget(monkeypatch):
     """kind='execute' charges a per-wallet bucket, independent of host/IP."""
     monkeypatch.setenv("NADO_WALLET_EXECUTE_RPS", "0.0001")
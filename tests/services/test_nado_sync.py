@@ -1,3 +1,4 @@
+import time
 import unittest
 from datetime import datetime, timezone
 from types import SimpleNamespace
@@ -47,7 +48,7 @@ class _Client:
     async def get_interest_and_funding_payments(self, limit=200):
         return [{"type": "funding", "product_id": 1, "timestamp": 1, "amount": str(to_x18("0.5"))}]
 
-    def get_balance(self):
+    async def aget_balance(self, force=False):
         # Spot balances feed the Total Balance line on the Overview deck.
         return {"exists": True, "balances": {0: "1500.00"}}
 
@@ -521,9 +522,10 @@ class NadoSyncTests(unittest.IsolatedAsyncioTestCase):
         async def _noop_sync(*args, **kwargs):
             return None
 
+        # The cursor belongs to the legacy sequential walk.
         with patch.object(nado_sync, "active_users", side_effect=_next_page), patch.object(
             nado_sync, "sync_user", new=_noop_sync,
-        ):
+        ), patch.object(nado_sync, "portfolio_sync_concurrency", return_value=1):
             await nado_sync.sync_active_users(reason="test")
             assert nado_sync._active_users_cursor == 20  # advanced to last user id
             await nado_sync.sync_active_users(reason="test")
@@ -600,6 +602,89 @@ class NadoSyncTests(unittest.IsolatedAsyncioTestCase):
         assert "wedged" not in joined
         assert "truncated" in joined
 
+    async def test_concurrent_sync_prioritizes_running_then_stalest(self):
+        """Concurrent mode ranks the full active set: running strategies first,
+        then never-synced / stalest; fresh snapshots are not re-synced."""
+        rows = [
+            {"telegram_id": 1, "network": "mainnet", "has_running_strategy": False},
+            {"telegram_id": 2, "network": "mainnet", "has_running_strategy": False},
+            {"telegram_id": 3, "network": "mainnet", "has_running_strategy": True},
+            {"telegram_id": 4, "network": "mainnet", "has_running_strategy": False},
+        ]
+        now = time.time()
+        nado_sync.set_cached_snapshot(1, "mainnet", {"monotonic_ts": now - 600})
+        nado_sync.set_cached_snapshot(2, "mainnet", {"monotonic_ts": now - 1})
+        nado_sync.set_cached_snapshot(3, "mainnet", {"monotonic_ts": now - 100})
+        order = []
+
+        async def _record_sync(user_id, **kwargs):
+            order.append(user_id)
+
+        ranked = [row["telegram_id"] for _age, row in nado_sync._prioritize_sync_rows(rows, now)]
+        assert ranked == [3, 4, 1, 2]
+
+        with patch.object(nado_sync, "_all_active_users", return_value=rows), patch.object(
+            nado_sync, "sync_user", new=_record_sync,
+        ), patch.object(nado_sync, "portfolio_sync_concurrency", return_value=2):
+            await nado_sync.sync_active_users(reason="poll")
+
+        # User 2 synced 1s ago is inside the poll-cache window and is skipped.
+        assert sorted(order) == [1, 3, 4]
+        stats = nado_sync.last_sync_tick_stats()
+        assert stats["synced"] == 3
+        assert stats["due"] == 3 and stats["candidates"] == 4
+        assert stats["budget_denied"] == 0
+        assert "p95_user_ms" in stats
+
+    async def test_concurrent_sync_runs_users_in_parallel_within_limit(self):
+        import asyncio as _asyncio
+
+        rows = [{"telegram_id": uid, "network": "mainnet"} for uid in range(1, 9)]
+        live = {"now": 0, "peak": 0}
+
+        async def _slow_sync(user_id, **kwargs):
+            live["now"] += 1
+            live["peak"] = max(live["peak"], live["now"])
+            await _asyncio.sleep(0.01)
+            live["now"] -= 1
+
+        with patch.object(nado_sync, "_all_active_users", return_value=rows), patch.object(
+            nado_sync, "sync_user", new=_slow_sync,
+        ), patch.object(nado_sync, "portfolio_sync_concurrency", return_value=3):
+            await nado_sync.sync_active_users(reason="test")
+
+        assert live["peak"] == 3
+        assert nado_sync.last_sync_tick_stats()["synced"] == 8
+
+    async def test_concurrent_sync_stops_network_on_budget_denial(self):
+        from src.nadobro.venue import gateway_budget
+
+        rows = [
+            {"telegram_id": 1, "network": "mainnet"},
+            {"telegram_id": 2, "network": "mainnet"},
+            {"telegram_id": 3, "network": "testnet"},
+        ]
+        synced = []
+
+        async def _record_sync(user_id, **kwargs):
+            synced.append(user_id)
+
+        def _headroom(url, **kwargs):
+            return url == nado_sync.NADO_TESTNET_REST
+
+        with patch.object(nado_sync, "_all_active_users", return_value=rows), patch.object(
+            nado_sync, "sync_user", new=_record_sync,
+        ), patch.object(
+            nado_sync, "portfolio_sync_concurrency", return_value=2,
+        ), patch.object(gateway_budget, "has_headroom", side_effect=_headroom):
+            await nado_sync.sync_active_users(reason="test")
+
+        assert synced == [3]
+        stats = nado_sync.last_sync_tick_stats()
+        # One denial starves the network for the rest of the tick.
+        assert stats["budget_denied"] == 1
+        assert stats["synced"] == 1
+
     def test_write_matches_increments_session_win_count(self):
         execute_calls = []
         with patch.object(nado_sync, "query_one", return_value=None), patch.object(
@@ -703,6 +788,44 @@ class AttributionRegression20260709Tests(unittest.TestCase):
         assert params[16] is None             # manual close: no session
         assert params[17] == "manual"
 
+    def test_large_match_pass_uses_set_based_lookups_and_one_insert(self):
+        """200 matches must not cost 200+ round trips: the batch path prefetches
+        with a handful of ``ANY(...)`` reads and writes new fills in one INSERT."""
+        reads, writes = [], []
+
+        def _query_all(sql, params=None):
+            reads.append(sql)
+            if "submission_idx = ANY" in sql:
+                # Every even idx is already stored.
+                return [{"submission_idx": i} for i in range(0, 200, 2)]
+            if "FROM open_orders" in sql:
+                return [{"order_digest": "0xd1", "product_id": 4, "pair": "SOL-PERP"}]
+            return []
+
+        def _insert(sql, params=None):
+            writes.append((sql, params))
+            n = sql.count("'match'")
+            return [{"submission_idx": params[i * 20 + 9]} for i in range(n)]
+
+        matches = [{
+            "submission_idx": str(i), "digest": f"0xd{i}",
+            "base_filled": str(to_x18("0.1")), "quote_filled": str(to_x18("-10")),
+            "fee": "0",
+        } for i in range(200)]
+        with patch.object(nado_sync, "query_all", side_effect=_query_all), \
+             patch.object(nado_sync, "query_one", side_effect=AssertionError("per-match query")), \
+             patch.object(nado_sync, "execute", side_effect=AssertionError("per-match write")), \
+             patch.object(nado_sync, "_resolve_session_by_window", return_value=None), \
+             patch("src.nadobro.db.execute_returning_all", side_effect=_insert):
+            inserted = nado_sync._write_matches(42, "mainnet", matches)
+
+        assert inserted == 100
+        assert len(reads) <= 5
+        assert len(writes) == 1 and "ON CONFLICT DO NOTHING" in writes[0][0]
+        params = writes[0][1]
+        # The first new fill (idx 1, digest 0xd1) recovered its open-order product.
+        assert params[1] == 4 and params[2] == "SOL-PERP" and params[9] == "1"
+
 
 class PhantomFillPriceTests(unittest.TestCase):
     """FILL-PRICE-CONSISTENCY — a recorder row must never contradict itself.
@@ -152,3 +152,98 @@ def test_sign_stream_authentication_message_shape(monkeypatch):
     assert msg["tx"]["expiration"] == "1900000000000"
     assert msg["signature"].startswith("0x")
     assert len(msg["signature"]) == 132  # 65-byte ECDSA sig hex + 0x
+
+
+def _sub(uid, *, portfolio=True, network="mainnet"):
+    return PortfolioWsSubscription(
+        user_id=uid,
+        network=network,
+        subaccount="0x" + f"{uid:064x}",
+        sync_portfolio=portfolio,
+    )
+
+
+def test_subscriptions_pack_onto_bounded_pool(monkeypatch):
+    import asyncio
+
+    from src.nadobro.venue import nado_ws
+
+    async def body():
+        hub = nado_ws.NadoPortfolioWs()
+        started = []
+
+        async def _fake_run(conn):
+            started.append(conn.conn_id)
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(hub, "_run", _fake_run)
+        monkeypatch.setattr(nado_ws, "_POOL_SIZE", 3)
+        for uid in range(1, 101):
+            hub.subscribe(_sub(uid))
+        hub.subscribe(_sub(1))  # idempotent
+        await asyncio.sleep(0)
+        try:
+            pool = hub._pools["mainnet"]
+            assert len(pool) == 3
+            assert len(started) == 3
+            assert sum(len(conn.members) for conn in pool) == 100
+            assert max(len(c.members) for c in pool) - min(len(c.members) for c in pool) <= 1
+            stats = hub.stats()
+            assert stats["pooled"] == 3 and stats["members"] == 100
+            # 3 per-subaccount streams per member + one funding sub per socket.
+            assert stats["streams"] == 100 * 3 + 3
+            await hub.unsubscribe(1, "mainnet")
+            assert hub.stats()["members"] == 99
+        finally:
+            await hub.stop()
+        assert hub.stats()["pooled"] == 0
+
+    asyncio.run(body())
+
+
+def test_pooled_connection_routes_frames_by_subaccount():
+    from src.nadobro.venue.nado_ws import _PooledConnection
+
+    conn = _PooledConnection("mainnet", 0)
+    a, b, nudge = _sub(1), _sub(2), _sub(3, portfolio=False)
+    for sub in (a, b, nudge):
+        conn.add(sub)
+
+    fill = {"type": "fill", "subaccount": a.subaccount.upper().replace("0X", "0x"), "id": 5}
+    assert conn.targets(fill) == [a]
+    assert conn.targets({"payload": {"type": "fill", "subaccount": nudge.subaccount}}) == [nudge]
+    # funding_payment is per-product: every portfolio member, not fill-only subs.
+    assert conn.targets({"type": "funding_payment", "product_id": 2}) == [a, b]
+    # No subaccount on a shared socket cannot be attributed.
+    assert conn.targets({"type": "order_update", "digest": "0x1"}) == []
+
+    conn.remove((2, "mainnet"))
+    conn.remove((3, "mainnet"))
+    assert conn.targets({"type": "order_update", "digest": "0x1"}) == [a]
+    assert conn.targets({"type": "fill", "subaccount": b.subaccount}) == []
+
+
+def test_ws_health_counts_pooled_connections(monkeypatch):
+    import importlib
+
+    from src.nadobro.venue import ws_health
+
+    importlib.reload(ws_health)
+    ws_health.bind(11, "mainnet", "mainnet#0")
+    ws_health.mark_connected(11, "mainnet")
+    ws_health.mark_connection("mainnet#0", streams=7)
+    # A quiet member stays healthy while its shared socket sees frames.
+    ws_health._last_event[(11, "mainnet")] = 0.0
+    ws_health.touch_connection("mainnet#0")
+    assert ws_health.is_healthy(11, "mainnet") is True
+    snap = ws_health.snapshot()
+    assert snap["connections"] == 1
+    assert snap["streams"] == 7
+    assert snap["healthy"] == 1
+
+    ws_health.drop_connection("mainnet#0", reconnecting=True)
+    assert ws_health.is_healthy(11, "mainnet") is False
+    snap = ws_health.snapshot()
+    assert snap["connections"] == 0 and snap["reconnects"] == 1
+    ws_health.unbind(11, "mainnet")
+    importlib.reload(ws_health)
@@ -0,0 +1,134 @@
+"""Frozen catalog snapshots: O(1) lookups, atomic swap, non-blocking refresh.
+
+``product_catalog`` indexes each built catalog once into a ``CatalogSnapshot``
+and hands it out by reference. These tests pin that lookups read the
+precomputed tables, that a rebuild swaps in a new version without touching the
+old one, and that an expired TTL serves the cached snapshot while a single
+background rebuild runs.
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from src.nadobro.venue import product_catalog as pc
+
+X18 = 10 ** 18
+
+
+def _perp_catalog(max_lev: int = 50) -> dict:
+    perps = {
+        "BTC": {
+            "id": 2, "symbol": "BTC-PERP", "base": "BTC", "max_leverage": max_lev,
+            "isolated_only": False, "size_increment_x18": str(X18 // 1000),
+            "price_increment_x18": str(X18), "min_size_x18": str(100 * X18),
+            "maker_fee_rate_x18": str(-(X18 // 10000)), "taker_fee_rate_x18": str(X18 // 5000),
+        },
+        "QQQX": {"id": 20, "symbol": "QQQX-PERP", "base": "QQQX", "max_leverage": 10, "isolated_only": True},
+    }
+    by_id, aliases = pc._rebuild_perp_indexes(perps)
+    return {"perps": perps, "by_id": by_id, "aliases": aliases}
+
+
+@pytest.fixture
+def fresh(monkeypatch):
+    monkeypatch.setattr(pc, "_catalog_cache", {})
+    monkeypatch.setattr(pc, "_spot_catalog_cache", {})
+    monkeypatch.setattr(pc, "_snapshots", {})
+    monkeypatch.setattr(pc, "_refresh_attempted_at", {})
+    monkeypatch.setattr(pc, "_refresh_inflight", set())
+    monkeypatch.setenv("NADO_CATALOG_BACKGROUND_REFRESH", "1")
+
+
+def test_snapshot_tables_match_legacy_lookups(fresh, monkeypatch):
+    monkeypatch.setattr(pc, "_build_dynamic_catalog", lambda network, client=None: _perp_catalog())
+    snap = pc.get_catalog_snapshot("mainnet")
+    assert pc.get_catalog_snapshot("mainnet") is snap  # handed out by reference
+
+    assert pc.get_product_id("btc-perp", network="mainnet") == 2
+    assert pc.get_product_name(2, network="mainnet") == "BTC-PERP"
+    assert pc.get_product_max_leverage("BTC-PERP", network="mainnet") == 50
+    assert pc.get_product_size_increment("BTC", network="mainnet") == pytest.approx(0.001)
+    assert pc.get_product_price_increment("BTC", network="mainnet") == pytest.approx(1.0)
+    assert pc.get_product_min_quote_notional_usd("BTC", network="mainnet") == pytest.approx(100.0)
+    assert pc.get_product_maker_fee_rate("BTC", network="mainnet") == pytest.approx(-0.0001)
+    assert pc.get_product_taker_fee_rate("BTC", network="mainnet") == pytest.approx(0.0002)
+    assert pc.get_product_size_increment("QQQX", network="mainnet") is None
+    assert pc.is_product_isolated_only("QQQX-PERP", network="mainnet") is True
+    assert pc.is_product_id_isolated_only(2, network="mainnet") is False
+    assert pc.get_product_metadata("qqqx", network="mainnet")["id"] == 20
+    assert pc.list_perp_names(network="mainnet") == ["BTC", "QQQX"]
+    assert pc.get_product_max_leverage("NOPE", network="mainnet") == 1
+
+    with pytest.raises(TypeError):
+        snap.rows["BTC"]["max_leverage"] = 1  # frozen
+    with pytest.raises(TypeError):
+        snap.name_by_id[99] = "X"
+
+
+def test_perp_name_lookup_never_touches_the_spot_catalog(fresh, monkeypatch):
+    monkeypatch.setattr(pc, "_build_dynamic_catalog", lambda network, client=None: _perp_catalog())
+    spot_builds = []
+
+    def _spot(network):
+        spot_builds.append(network)
+        return {"spots": {"KBTC": {"id": 1, "symbol": "KBTC", "base": "KBTC"}},
+                "by_id": {1: "KBTC"}, "aliases": {"kbtc": "KBTC"}}
+
+    monkeypatch.setattr(pc, "_build_dynamic_spot_catalog", _spot)
+    assert pc.get_product_name(2, network="mainnet") == "BTC-PERP"
+    assert spot_builds == []
+    assert pc.get_product_name(1, network="mainnet") == "KBTC"
+    assert pc.get_product_name(1, network="mainnet") == "KBTC"
+    assert spot_builds == ["mainnet"]
+
+
+def test_rebuild_swaps_in_a_new_version(fresh, monkeypatch):
+    builds = iter([_perp_catalog(50), _perp_catalog(25)])
+    monkeypatch.setattr(pc, "_build_dynamic_catalog", lambda network, client=None: next(builds))
+    old = pc.get_catalog_snapshot("mainnet")
+    new = pc.get_catalog_snapshot("mainnet", refresh=True)
+    assert new.version > old.version
+    assert old.max_leverage["BTC"] == 50 and new.max_leverage["BTC"] == 25
+    assert pc.get_product_max_leverage("BTC", network="mainnet") == 25
+
+
+def test_expired_ttl_serves_cached_snapshot_and_rebuilds_in_background(fresh, monkeypatch):
+    monkeypatch.setattr(pc, "_build_dynamic_catalog", lambda network, client=None: _perp_catalog(50))
+    before = pc.get_catalog_snapshot("mainnet")
+    pc._catalog_cache["mainnet"]["ts"] -= pc._CATALOG_TTL_SECONDS + 1  # expired, inside stale window
+
+    release = threading.Event()
+    calls = []
+
+    def _slow(network, client=None):
+        calls.append(network)
+        release.wait(5)
+        return _perp_catalog(25)
+
+    monkeypatch.setattr(pc, "_build_dynamic_catalog", _slow)
+    started = time.perf_counter()
+    for _ in range(20):
+        assert pc.get_product_max_leverage("BTC", network="mainnet") == 50
+    assert time.perf_counter() - started < 0.5  # never blocked on the rebuild
+    assert pc.get_catalog_snapshot("mainnet") is before
+
+    release.set()
+    deadline = time.time() + 5
+    while pc._refresh_inflight and time.time() < deadline:
+        time.sleep(0.01)
+    assert calls == ["mainnet"]  # single-flight
+    after = pc.get_catalog_snapshot("mainnet")
+    assert after.version > before.version
+    assert pc.get_product_max_leverage("BTC", network="mainnet") == 25
+
+
+def test_background_refresh_flag_off_rebuilds_inline(fresh, monkeypatch):
+    monkeypatch.setenv("NADO_CATALOG_BACKGROUND_REFRESH", "0")
+    monkeypatch.setattr(pc, "_build_dynamic_catalog", lambda network, client=None: _perp_catalog(50))
+    pc.get_catalog_snapshot("mainnet")
+    pc._catalog_cache["mainnet"]["ts"] -= pc._CATALOG_TTL_SECONDS + 1
+    monkeypatch.setattr(pc, "_build_dynamic_catalog", lambda network, client=None: _perp_catalog(25))
+    assert pc.get_product_max_leverage("BTC", network="mainnet") == 25
@@ -7,6 +7,8 @@ inventory model. These tests verify:
   - Partial closes consume FIFO lots correctly.
   - Cross and isolated keys are tracked independently.
   - Strategy-tagged rows are excluded from the source set.
+  - Folding the ledger in batches (the persisted ``round_trips`` ledger)
+    emits exactly the trips of one full pass.
 """
 from __future__ import annotations
 
@@ -19,9 +21,17 @@ from _stubs import install_test_stubs  # noqa: F401
 
 install_test_stubs()
 
+from src.nadobro.quant import round_trips as rt
 from src.nadobro.trading import trade_service
 
 
+@pytest.fixture(autouse=True)
+def _re_pair_from_the_ledger_query(monkeypatch):
+    # These pin the pairing and the ledger query, i.e. the full re-pairing
+    # path (the persisted ledger has its own DB tests).
+    monkeypatch.setenv("NADO_ROUND_TRIP_LEDGER", "0")
+
+
 def _row(
     trade_id: int,
     side: str,
@@ -217,3 +227,39 @@ def test_round_trips_only_pair_complete_recording_era():
 
     assert ">= %s::timestamptz" in captured["sql"]
     assert str(captured["params"][1]).startswith("2026-07-09")
+
+
+@pytest.mark.parametrize("seed", [3, 11, 2026])
+def test_batched_fold_with_carried_inventory_matches_one_pass(seed):
+    import json
+    import random
+
+    rng = random.Random(seed)
+    t0 = datetime(2026, 7, 10, tzinfo=timezone.utc)
+    rows = [
+        _row(
+            i + 1,
+            rng.choice(("long", "short", "buy", "sell")),
+            rng.choice((0.0, 0.5, 1.0, 1.5, 2.0, 3.0)),
+            rng.choice((0.0, 95.0, 100.0, 104.5, 110.0)),
+            fee=rng.random(),
+            funding_paid=rng.random() - 0.5,
+            isolated=rng.random() < 0.3,
+            order_type=rng.choice(("MARKET", "MARKET", "LIMIT", "MARKET_CLOSE")),
+            product_id=rng.choice((2, 4)),
+            ts=t0 + timedelta(minutes=i),
+        )
+        for i in range(600)
+    ]
+    expected = rt.fold_round_trips(rows, {})
+
+    got, inventory, cut = [], {}, 0
+    while cut < len(rows):
+        step = rng.randint(1, 80)
+        got.extend(rt.fold_round_trips(rows[cut:cut + step], inventory))
+        # Between advances the open lots live in round_trip_state JSONB.
+        inventory = rt.decode_inventory(json.loads(json.dumps(rt.encode_inventory(inventory))))
+        cut += step
+
+    assert got == expected
+    assert len(expected) > 50
@@ -0,0 +1,153 @@
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.nadobro.strategy.state_store import StrategyStateStore, VersionedState
+
+
+class _FakeDb:
+    def __init__(self, rows=None):
+        self.rows = dict(rows or {})
+        self.reads = 0
+        self.writes = []
+        self.fail = False
+
+    def load(self, key):
+        self.reads += 1
+        return self.rows.get(key)
+
+    def write(self, key, value):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.writes.append((key, json.loads(json.dumps(value))))
+        self.rows[key] = json.dumps(value)
+
+
+def _store(db, seconds=60.0):
+    return StrategyStateStore(load_raw=db.load, write=db.write, writeback_seconds=seconds)
+
+
+def test_steady_state_reads_do_not_touch_the_db():
+    db = _FakeDb({"k": json.dumps({"running": True, "runs": 1})})
+    store = _store(db)
+    for _ in range(50):
+        state = store.get("k")
+        state["runs"] += 1
+        store.put("k", state)
+    assert db.reads == 1
+    assert store.get("k")["runs"] == 51
+    # Only counters changed: nothing written through yet.
+    assert db.writes == []
+    assert store.flush() == 1
+    assert db.writes == [("k", {"running": True, "runs": 51})]
+
+
+def test_lifecycle_changes_are_written_through_immediately():
+    db = _FakeDb({"k": json.dumps({"running": True})})
+    store = _store(db)
+    state = store.get("k")
+    state["running"] = False
+    store.put("k", state)
+    assert db.writes == [("k", {"running": False})]
+
+
+def test_handed_out_copies_are_private():
+    db = _FakeDb({"k": json.dumps({"running": True, "grid": {"levels": [1, 2]}})})
+    store = _store(db)
+    state = store.get("k")
+    state["grid"]["levels"].append(3)
+    assert store.get("k")["grid"]["levels"] == [1, 2]
+
+
+def test_stale_copy_cannot_clobber_a_newer_stop():
+    db = _FakeDb({"k": json.dumps({"running": True, "last_run_ts": 1.0})})
+    store = _store(db)
+    cycle = store.get("k")           # a long cycle reads...
+    stop = store.get("k")            # ...the user stops meanwhile
+    stop["running"] = False
+    store.put("k", stop)
+
+    cycle["last_run_ts"] = 2.0
+    store.put("k", cycle)
+
+    current = store.get("k")
+    assert current["running"] is False, "the stale cycle resurrected the stopped bot"
+    assert current["last_run_ts"] == 2.0, "the cycle's own field was lost"
+    # The stale holder is brought up to date so it stops acting as running.
+    assert cycle["running"] is False
+    assert store.stats()["stale_fields_dropped"] == 1
+
+
+def test_plain_dict_writes_stay_authoritative():
+    db = _FakeDb({"k": json.dumps({"running": True})})
+    store = _store(db)
+    store.get("k")
+    store.put("k", {"running": False, "strategy": "grid"})
+    assert store.get("k") == {"running": False, "strategy": "grid"}
+
+
+def test_failed_write_through_raises_and_stays_dirty():
+    db = _FakeDb({"k": json.dumps({"running": True})})
+    store = _store(db)
+    state = store.get("k")
+    state["running"] = False
+    db.fail = True
+    with patch.object(store, "_ensure_flusher"):
+        with pytest.raises(RuntimeError):
+            store.put("k", state)
+    assert store.stats()["dirty"] == 1
+    db.fail = False
+    store.flush()
+    assert db.writes[-1] == ("k", {"running": False})
+
+
+def test_background_writeback_flushes_coalesced_writes():
+    db = _FakeDb({"k": json.dumps({"running": True, "runs": 0})})
+    store = _store(db, seconds=0.05)
+    try:
+        state = store.get("k")
+        state["runs"] = 7
+        store.put("k", state)
+        deadline = time.monotonic() + 2.0
+        while not db.writes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert db.writes == [("k", {"running": True, "runs": 7})]
+    finally:
+        store.close()
+
+
+def test_bot_runtime_load_save_round_trip_through_the_store():
+    from src.nadobro.strategy import bot_runtime
+
+    store = _store(_FakeDb())
+    writes = []
+    with patch.object(bot_runtime, "_STATE_STORE", store), \
+         patch.object(bot_runtime, "_state_store_enabled", return_value=True), \
+         patch.object(bot_runtime, "get_bot_state_raw",
+                      return_value=json.dumps({"running": True, "strategy": "grid"})) as raw, \
+         patch.object(bot_runtime, "set_bot_state", side_effect=lambda k, v: writes.append(v)), \
+         patch.object(store, "_ensure_flusher"):
+        store._load_raw = lambda key: bot_runtime.get_bot_state_raw(key)
+        store._write = lambda key, value: bot_runtime.set_bot_state(key, value)
+        try:
+            state = bot_runtime._load_state(7, "mainnet")
+            assert isinstance(state, VersionedState)
+            # The first save materializes the default fields (started_at, ...).
+            bot_runtime._save_state(7, "mainnet", state)
+            assert len(writes) == 1
+            for tick in range(1, 6):
+                state = bot_runtime._load_state(7, "mainnet")
+                state["last_run_ts"] = float(tick)
+                bot_runtime._save_state(7, "mainnet", state)
+
+            assert raw.call_count == 1
+            assert state["strategy"] == "grid"
+            assert len(writes) == 1  # tick bookkeeping is coalesced
+            assert store.get(bot_runtime._state_key(7, "mainnet"))["last_run_ts"] == 5.0
+        finally:
+            # Flush while set_bot_state is still patched: no writeback may
+            # reach the real bot_state table after the test.
+            store.close()
+    assert writes[-1]["last_run_ts"] == 5.0
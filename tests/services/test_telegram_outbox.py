@@ -0,0 +1,406 @@
+"""Concurrent, durable Telegram delivery (notify/telegram_sender.py, notify/telegram_outbox.py).
+
+Pins per-chat ordering with parallel chats, 429 retries that cannot be
+overtaken, outbox replay after a restart (and the age cut-off), broadcasts
+that wait for lane room instead of evicting, and the lane metrics. No test
+asserts wall-clock speed: concurrency is pinned by peak in-flight counts.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.nadobro.core import sli
+from src.nadobro.notify import telegram_outbox
+
+
+@pytest.fixture()
+def ts(monkeypatch):
+    for key, value in {
+        "TELEGRAM_GLOBAL_RPS": "10000", "TELEGRAM_GLOBAL_BURST": "10000",
+        "TELEGRAM_CHAT_RPS": "10000", "TELEGRAM_CHAT_BURST": "10000",
+        "TELEGRAM_SENDER_WORKERS": "8",
+    }.items():
+        monkeypatch.setenv(key, value)
+    from src.nadobro.notify import telegram_sender
+
+    importlib.reload(telegram_sender)
+    yield telegram_sender
+    importlib.reload(telegram_sender)
+
+
+async def _drain(sender, expected, sent, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while len(sent) < expected and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def test_slow_sends_to_different_chats_overlap_but_each_chat_stays_ordered(ts):
+    sent: list[tuple[int, str]] = []
+    active = {"now": 0, "peak": 0}
+    per_chat: dict[int, int] = {}
+    per_chat_peak = {"n": 0}
+
+    async def slow_send(*, chat_id, text, **_):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        per_chat[chat_id] = per_chat.get(chat_id, 0) + 1
+        per_chat_peak["n"] = max(per_chat_peak["n"], per_chat[chat_id])
+        await asyncio.sleep(0.05)
+        per_chat[chat_id] -= 1
+        active["now"] -= 1
+        sent.append((chat_id, text))
+
+    async def body():
+        sender = ts.TelegramSender()
+        sender.bind(slow_send)
+        await sender.start()
+        try:
+            for i in range(3):
+                for chat in range(16):
+                    await sender.send_text(chat, f"m{i}", lane=ts.Lane.ALERT)
+            await _drain(sender, 48, sent)
+        finally:
+            await sender.stop()
+
+    asyncio.run(body())
+    assert len(sent) == 48
+    assert active["peak"] == 8, "all workers should be busy on different chats"
+    assert per_chat_peak["n"] == 1, "a chat never has two sends in flight"
+    for chat in range(16):
+        assert [t for c, t in sent if c == chat] == ["m0", "m1", "m2"]
+
+
+def test_a_429_holds_its_chat_so_later_messages_cannot_overtake(ts):
+    sent: list[str] = []
+    calls = {"n": 0}
+
+    class _RetryExc(Exception):
+        retry_after = 0.05
+
+    async def flaky(*, chat_id, text, **_):
+        calls["n"] += 1
+        if text == "first" and calls["n"] == 1:
+            raise _RetryExc("429")
+        sent.append(text)
+
+    async def body():
+        sender = ts.TelegramSender()
+        sender.bind(flaky)
+        await sender.start()
+        try:
+            for text in ("first", "second", "third"):
+                await sender.send_text(7, text, lane=ts.Lane.ORDER)
+            await _drain(sender, 3, sent)
+        finally:
+            await sender.stop()
+
+    asyncio.run(body())
+    assert sent == ["first", "second", "third"]
+
+
+class _SlowStore:
+    """Outbox whose writes yield to the loop, like the DB store."""
+
+    def __init__(self):
+        self.records: list[dict] = []
+
+    async def put(self, records):
+        await asyncio.sleep(0.01)
+        self.records.extend(records)
+
+    async def ack(self, entry_ids):
+        self.records = [r for r in self.records if r["id"] not in entry_ids]
+
+    async def pending(self):
+        return list(self.records)
+
+
+def test_concurrent_sends_with_one_dedupe_key_enqueue_once(ts):
+    sent: list[str] = []
+
+    async def fake_send(*, chat_id, text, **_):
+        sent.append(text)
+
+    async def body():
+        sender = ts.TelegramSender()
+        sender.bind(fake_send)
+        sender.bind_store(_SlowStore())
+        await sender.start()
+        try:
+            results = await asyncio.gather(*(
+                sender.send_text(1, "x", lane=ts.Lane.ORDER, dedupe_key="k") for _ in range(3)
+            ))
+            await _drain(sender, 1, sent)
+            await asyncio.sleep(0.05)
+        finally:
+            await sender.stop()
+        return results
+
+    assert sorted(asyncio.run(body())) == [False, False, True]
+    assert sent == ["x"]
+
+
+def test_a_refused_send_releases_its_dedupe_key(ts, monkeypatch):
+    monkeypatch.setattr(ts, "TELEGRAM_LANE_CAPACITY", {"order": 0})
+
+    async def body():
+        sender = ts.TelegramSender()
+        sender.bind(lambda **_: None)
+        assert await sender.send_text(1, "x", lane=ts.Lane.ORDER, dedupe_key="k") is False
+        assert sender._dedupe.get("k") is None
+
+    asyncio.run(body())
+
+
+def test_stop_cancels_pending_429_requeues(ts):
+    class _RetryExc(Exception):
+        retry_after = 10.0
+
+    async def rate_limited(**_):
+        raise _RetryExc("429")
+
+    async def body():
+        sender = ts.TelegramSender()
+        sender.bind(rate_limited)
+        await sender.start()
+        await sender.send_text(7, "first", lane=ts.Lane.ORDER)
+        deadline = time.monotonic() + 5.0
+        while not sender._retry_tasks and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        retries = list(sender._retry_tasks)
+        assert len(retries) == 1
+        await sender.stop()
+        await asyncio.sleep(0)
+        assert retries[0].cancelled()
+        assert not sender._retry_tasks
+
+    asyncio.run(body())
+
+
+def test_per_chat_bucket_is_enforced(ts, monkeypatch):
+    monkeypatch.setattr(ts, "TELEGRAM_CHAT_RPS", 20.0)
+    monkeypatch.setattr(ts, "TELEGRAM_CHAT_BURST", 1.0)
+    stamps: list[float] = []
+
+    async def fake_send(**_):
+        stamps.append(time.monotonic())
+
+    async def body():
+        sender = ts.TelegramSender()
+        sender.bind(fake_send)
+        await sender.start()
+        try:
+            for i in range(5):
+                await sender.send_text(1, f"m{i}", lane=ts.Lane.INFO)
+            await _drain(sender, 5, stamps)
+        finally:
+            await sender.stop()
+
+    asyncio.run(body())
+    assert stamps[-1] - stamps[0] >= 4 / 20.0 * 0.9
+
+
+def test_pending_envelopes_survive_a_restart_and_replay_in_order(ts, monkeypatch, tmp_path):
+    path = str(tmp_path / "outbox.jsonl")
+    monkeypatch.setattr(ts, "TELEGRAM_GLOBAL_BURST", 0.0)
+    monkeypatch.setattr(ts, "TELEGRAM_GLOBAL_RPS", 0.001)  # nothing leaves the first process
+
+    async def never(**_):
+        raise AssertionError("first process must not send")
+
+    async def first_process():
+        sender = ts.TelegramSender()
+        sender.bind(never)
+        sender.bind_store(telegram_outbox.OutboxLog(path))
+        await sender.start()
+        for i in range(3):
+            await sender.send_text(11, f"fill-{i}", lane=ts.Lane.ORDER)
+        await sender.send_text(12, "alert", lane=ts.Lane.ALERT, parse_mode="Markdown")
+        await sender.send_text(13, "reply", lane=ts.Lane.USER_REPLY)  # memory-only
+        await sender.stop()
+
+    asyncio.run(first_process())
+
+    monkeypatch.setattr(ts, "TELEGRAM_GLOBAL_BURST", 10000.0)
+    monkeypatch.setattr(ts, "TELEGRAM_GLOBAL_RPS", 10000.0)
+    sent: list[tuple[int, str, dict]] = []
+
+    async def fake_send(*, chat_id, text, **kwargs):
+        sent.append((chat_id, text, kwargs))
+
+    async def second_process():
+        sender = ts.TelegramSender()
+        sender.bind(fake_send)
+        store = telegram_outbox.OutboxLog(path)
+        sender.bind_store(store)
+        await sender.start()
+        try:
+            await _drain(sender, 4, sent)
+            assert sender.stats()["replayed"] == 4
+        finally:
+            await sender.stop()
+        return await store.pending()
+
+    leftover = asyncio.run(second_process())
+    assert [t for c, t, _ in sent if c == 11] == ["fill-0", "fill-1", "fill-2"]
+    assert (12, "alert", {"parse_mode": "Markdown"}) in sent
+    assert all(c != 13 for c, _, _ in sent)
+    assert leftover == [], "delivered envelopes must be acked"
+
+
+def test_replay_discards_envelopes_older_than_the_max_age(ts, monkeypatch, tmp_path):
+    store = telegram_outbox.OutboxLog(str(tmp_path / "outbox.jsonl"))
+    now = time.time()
+    asyncio.run(store.put([
+        {"id": "old", "chat_id": 1, "lane": "alert", "text": "stale", "kwargs": {}, "created_at": now - 7200},
+        {"id": "new", "chat_id": 1, "lane": "alert", "text": "fresh", "kwargs": {}, "created_at": now - 5},
+    ]))
+    monkeypatch.setattr(ts, "TELEGRAM_OUTBOX_MAX_AGE_SECONDS", 3600.0)
+    sent: list[str] = []
+
+    async def fake_send(*, chat_id, text, **_):
+        sent.append(text)
+
+    async def body():
+        sender = ts.TelegramSender()
+        sender.bind(fake_send)
+        sender.bind_store(store)
+        await sender.start()
+        try:
+            await _drain(sender, 1, sent)
+            await asyncio.sleep(0.05)
+        finally:
+            await sender.stop()
+
+    asyncio.run(body())
+    assert sent == ["fresh"]
+    assert asyncio.run(store.pending()) == []
+
+
+def test_reply_markup_round_trips_through_the_outbox():
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+    if not hasattr(InlineKeyboardMarkup, "de_json"):
+        pytest.skip("python-telegram-bot is stubbed in this run (tests/_stubs.py)")
+    kb = InlineKeyboardMarkup([[InlineKeyboardButton("Vault", callback_data="vault:home")]])
+    encoded = telegram_outbox.encode_kwargs({"reply_markup": kb, "parse_mode": "HTML"})
+    assert encoded["reply_markup"]["__markup__"] == "InlineKeyboardMarkup"
+    decoded = telegram_outbox.decode_kwargs(encoded)
+    assert decoded["reply_markup"] == kb and decoded["parse_mode"] == "HTML"
+    assert telegram_outbox.encode_kwargs({"reply_markup": object()}) is None
+
+
+def test_broadcast_waits_for_lane_room_instead_of_evicting(ts, monkeypatch, tmp_path):
+    monkeypatch.setitem(ts.TELEGRAM_LANE_CAPACITY, "info", 50)
+    monkeypatch.setattr(ts, "TELEGRAM_GLOBAL_RPS", 1000.0)
+    monkeypatch.setattr(ts, "TELEGRAM_GLOBAL_BURST", 100.0)
+    sent: list[int] = []
+    depth = {"peak": 0}
+    holder: dict = {}
+
+    async def fake_send(*, chat_id, **_):
+        depth["peak"] = max(depth["peak"], holder["sender"].stats()["lanes"]["info"])
+        sent.append(chat_id)
+
+    async def body():
+        sender = ts.TelegramSender()
+        holder["sender"] = sender
+        sender.bind(fake_send)
+        sender.bind_store(telegram_outbox.OutboxLog(str(tmp_path / "outbox.jsonl")))
+        await sender.start()
+        try:
+            accepted = await sender.broadcast(list(range(500)) + [0, 1], "gm", lane=ts.Lane.INFO)
+            await _drain(sender, 500, sent)
+            return accepted, sender.stats()
+        finally:
+            await sender.stop()
+
+    accepted, stats = asyncio.run(body())
+    assert accepted == 500 and sorted(sent) == list(range(500))
+    assert stats["dropped"] == 0
+    assert 0 < depth["peak"] <= 50, "the lane never holds more than its capacity"
+    info = stats["lane_metrics"]["info"]
+    assert info["sent"] == 500 and info["throughput_per_s"] > 0 and info["depth"] == 0
+
+
+def test_queue_age_and_sent_counters_land_in_sli(ts):
+    sli.reset()
+
+    async def fake_send(**_):
+        return None
+
+    async def body():
+        sender = ts.TelegramSender()
+        sender.bind(fake_send)
+        await sender.start()
+        try:
+            await sender.send_text(1, "hi", lane=ts.Lane.ALERT, await_result=True)
+        finally:
+            await sender.stop()
+
+    asyncio.run(body())
+    snap = sli.snapshot(metric_prefix="telegram.")
+    assert any(v["metric"] == "telegram.queue_age" and v["labels"] == {"lane": "alert"} for v in snap.values())
+    assert any(v["metric"] == "telegram.sent" and v.get("counter") == 1 for v in snap.values())
+
+
+def test_deliver_falls_back_to_the_bot_when_the_sender_is_not_running(ts):
+    calls = []
+
+    async def send_message(**kwargs):
+        calls.append(kwargs)
+
+    bot = SimpleNamespace(send_message=send_message)
+    assert asyncio.run(ts.deliver(bot, 5, "hello", lane=ts.Lane.ALERT, parse_mode="HTML")) is True
+    assert calls == [{"chat_id": 5, "text": "hello", "parse_mode": "HTML"}]
+
+
+def _db_reachable() -> bool:
+    if not os.environ.get("DATABASE_URL"):
+        return False
+    try:
+        import psycopg2
+
+        psycopg2.connect(os.environ["DATABASE_URL"]).close()
+        return True
+    except Exception:
+        return False
+
+
+@pytest.mark.skipif(not _db_reachable(), reason="no reachable Postgres (DATABASE_URL)")
+def test_db_store_round_trip():
+    from src.nadobro import db_async
+    from src.nadobro.db import execute, init_db
+
+    init_db()
+    execute("DELETE FROM telegram_outbox WHERE id LIKE %s", ("test-outbox-%",))
+    store = telegram_outbox.DbOutboxStore()
+    now = time.time()
+
+    async def body():
+        try:
+            await store.put([
+                {"id": "test-outbox-2", "chat_id": 2, "lane": "order", "text": "b",
+                 "kwargs": {"parse_mode": "HTML"}, "dedupe_key": None, "created_at": now},
+                {"id": "test-outbox-1", "chat_id": 1, "lane": "alert", "text": "a",
+                 "kwargs": {}, "dedupe_key": "k", "created_at": now - 1},
+            ])
+            rows = [r for r in await store.pending() if str(r["id"]).startswith("test-outbox-")]
+            await store.ack(["test-outbox-1"])
+            after = [r["id"] for r in await store.pending() if str(r["id"]).startswith("test-outbox-")]
+            await store.ack(["test-outbox-2"])
+            return rows, after
+        finally:
+            await db_async.close_async_pool()
+
+    rows, after = asyncio.run(body())
+    assert [r["id"] for r in rows] == ["test-outbox-1", "test-outbox-2"]
+    assert rows[1]["kwargs"] == {"parse_mode": "HTML"} and rows[0]["dedupe_key"] == "k"
+    assert abs(float(rows[1]["created_at"]) - now) < 1.0
+    assert after == ["test-outbox-2"]
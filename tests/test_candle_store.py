@@ -0,0 +1,170 @@
+"""Shared candle store: one full seed, then small delta queries per series.
+
+``venue/candle_store.py`` serves every ``limit`` of a (network, product,
+granularity) series from one ring buffer. These tests pin the indexer traffic
+it issues — seed, delta, gap reseed, derived coarse bars, throttle fallback —
+against a fake indexer.
+"""
+from __future__ import annotations
+
+import pytest
+
+from src.nadobro.venue.candle_store import CandleStore
+
+T0 = 1_785_398_400  # aligned to 4h
+
+
+class _Indexer:
+    """Serves the newest ``limit`` bars at or before ``max_time``, newest-first."""
+
+    def __init__(self, seconds: int, bars: int, now: float) -> None:
+        self.seconds = seconds
+        self.now = now
+        self.calls: list[tuple[str, int, int | None]] = []
+        self.throttled = False
+        self._bars = [self._bar(T0 + i * seconds) for i in range(bars)]
+
+    def _bar(self, t: int) -> dict:
+        px = 100.0 + (t - T0) / self.seconds
+        return {"time": str(t), "open": px, "high": px + 1, "low": px - 1, "close": px + 0.5, "volume": 2.0}
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+        while int(self._bars[-1]["time"]) + self.seconds <= self.now:
+            self._bars.append(self._bar(int(self._bars[-1]["time"]) + self.seconds))
+        self._bars[-1]["close"] += 0.01  # the forming bar keeps trading
+
+    def fetch(self, product_id, timeframe, limit, max_time):
+        self.calls.append((timeframe, limit, max_time))
+        if self.throttled:
+            return None
+        rows = [b for b in self._bars if max_time is None or int(b["time"]) <= max_time]
+        return [dict(b) for b in reversed(rows[-limit:])]
+
+
+@pytest.fixture
+def world():
+    clock = {"now": float(T0 + 3600 * 500 + 10)}
+    indexer = _Indexer(3600, 501, clock["now"])
+    store = CandleStore(capacity=600, refresh_seconds=30, clock=lambda: clock["now"])
+
+    def advance(seconds):
+        clock["now"] += seconds
+        indexer.advance(seconds)
+
+    return store, indexer, advance
+
+
+def _times(bars):
+    return [b["time"] for b in bars]
+
+
+def test_one_seed_serves_every_limit(world):
+    store, indexer, _advance = world
+    big = store.get("mainnet", 2, "1h", 200, None, indexer.fetch)
+    small = store.get("mainnet", 2, "1h", 100, None, indexer.fetch)
+    assert len(indexer.calls) == 1
+    assert len(big) == 200 and small == big[-100:]
+    assert _times(big) == sorted(_times(big))
+    assert isinstance(big[-1]["time"], int)
+
+
+def test_refresh_is_a_small_delta(world):
+    store, indexer, advance = world
+    store.get("mainnet", 2, "1h", 200, None, indexer.fetch)
+    advance(40)  # same bar, still forming
+    store.get("mainnet", 2, "1h", 200, None, indexer.fetch)
+    advance(3600)  # one bar closed
+    bars = store.get("mainnet", 2, "1h", 200, None, indexer.fetch)
+    assert indexer.calls[1:] == [("1h", 1, None), ("1h", 2, None)]
+    expected = [dict(b, time=int(b["time"])) for b in reversed(indexer.fetch(2, "1h", 200, None))]
+    assert bars == expected
+    assert store.stats()["delta_fetches"] == 2
+
+
+def test_non_overlapping_delta_reseeds(world):
+    store, indexer, advance = world
+    store.get("mainnet", 2, "1h", 200, None, indexer.fetch)
+    advance(3600 * 3)
+
+    def lossy(pid, tf, limit, max_time):
+        rows = indexer.fetch(pid, tf, limit, max_time)
+        return rows[:-1] if limit < 10 else rows  # delta lost its overlap bar
+
+    bars = store.get("mainnet", 2, "1h", 200, None, lossy)
+    assert [c[1] for c in indexer.calls] == [200, 4, 200]
+    assert store.stats()["gaps"] == 1
+    assert bars[-1]["time"] == int(indexer._bars[-1]["time"])
+
+
+def test_deeper_history_and_max_time(world):
+    store, indexer, _advance = world
+    store.get("mainnet", 2, "1h", 100, None, indexer.fetch)
+    older = store.get("mainnet", 2, "1h", 50, T0 + 3600 * 450, indexer.fetch)
+    assert older[-1]["time"] == T0 + 3600 * 450 and len(older) == 50
+    assert len(indexer.calls) == 1
+    store.get("mainnet", 2, "1h", 50, T0 + 3600 * 100, indexer.fetch)  # not held: one-off
+    deep = store.get("mainnet", 2, "1h", 300, None, indexer.fetch)    # reseed deeper
+    assert [c[1] for c in indexer.calls] == [100, 50, 300]
+    assert len(deep) == 300
+
+
+def test_coarse_timeframe_is_derived_from_fresh_finer_bars(world):
+    store, indexer, _advance = world
+    store.get("mainnet", 2, "1h", 500, None, indexer.fetch)
+    four_h = store.get("mainnet", 2, "4h", 100, None, indexer.fetch)
+    assert len(indexer.calls) == 1
+    assert len(four_h) == 100
+    hourly = [dict(b, time=int(b["time"])) for b in reversed(indexer.fetch(2, "1h", 8, None))]
+    last_bucket = [b for b in hourly if b["time"] >= four_h[-1]["time"]]
+    assert four_h[-1]["open"] == last_bucket[0]["open"]
+    assert four_h[-1]["close"] == last_bucket[-1]["close"]
+    assert four_h[-1]["high"] == max(b["high"] for b in last_bucket)
+    assert four_h[-1]["volume"] == pytest.approx(2.0 * len(last_bucket))
+    assert all(b["time"] % 14400 == 0 for b in four_h)
+    assert store.stats()["derived"] == 1
+
+
+def test_deriving_reads_the_finer_series_under_its_lock(world):
+    import threading
+
+    store, indexer, _advance = world
+    store.get("mainnet", 2, "1h", 500, None, indexer.fetch)
+    hourly = store._series[("mainnet", 2, "1h")]
+    out: list = []
+    reader = threading.Thread(target=lambda: out.append(store.get("mainnet", 2, "4h", 100, None, indexer.fetch)))
+    with hourly.lock:  # the 1h owner is mid-append
+        reader.start()
+        reader.join(0.2)
+        assert reader.is_alive() and out == []
+    reader.join(5.0)
+    assert len(out[0]) == 100
+    assert len(indexer.calls) == 1
+
+
+def test_throttled_refresh_serves_last_known_bars(world):
+    store, indexer, advance = world
+    first = store.get("mainnet", 2, "1h", 200, None, indexer.fetch)
+    advance(60)
+    indexer.throttled = True
+    again = store.get("mainnet", 2, "1h", 200, None, indexer.fetch)
+    assert again == first
+    assert store.get("mainnet", 3, "1h", 200, None, indexer.fetch) == []
+    assert store.stats()["stale_served"] == 1
+
+
+def test_client_routes_through_the_store(monkeypatch):
+    from src.nadobro.venue import candle_store
+    from src.nadobro.venue.nado_client import NadoClient
+
+    indexer = _Indexer(900, 300, float(T0 + 900 * 299 + 5))
+    store = CandleStore(capacity=400, clock=lambda: indexer.now)
+    monkeypatch.setattr(candle_store, "CANDLE_STORE", store)
+    monkeypatch.setenv("NADO_CANDLE_STORE", "1")
+    client = NadoClient.from_address("0x" + "11" * 20, network="mainnet")
+    client._initialized = True
+    client.client = object()
+    monkeypatch.setattr(client, "_fetch_candlesticks", indexer.fetch)
+    assert len(client.get_candlesticks(2, "15m", 200)) == 200
+    assert len(client.get_candlesticks(2, "15m", 120)) == 120
+    assert indexer.calls == [("15m", 200, None)]
@@ -0,0 +1,220 @@
+"""Sharded, long-lived cycle workers (runtime/cycle_shards.py).
+
+Pins the ring (stable, balanced, minimal movement), user affinity with state
+kept warm between cycles, failover when a shard dies or hangs, and the
+``runtime_supervisor`` / ``bot_runtime`` wiring. The shards are real spawned
+processes running the fake targets below.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+
+import pytest
+
+from src.nadobro.runtime import cycle_shards as cs
+
+_TARGET = f"{__name__}:_fake_cycle"
+_seen: dict[tuple[int, str], int] = {}
+
+
+async def _fake_cycle(payload):
+    """Shard-side job: counts cycles per key, so warm state is observable."""
+    if payload.get("die"):
+        os._exit(1)
+    if payload.get("block"):
+        time.sleep(float(payload["block"]))
+    if payload.get("spin"):
+        sum(i * i for i in range(int(payload["spin"])))
+    key = cs.shard_key(payload)
+    _seen[key] = _seen.get(key, 0) + 1
+    return {
+        "ok": True,
+        "worker_pid": os.getpid(),
+        "loop": id(asyncio.get_running_loop()),
+        "seen": _seen[key],
+        "skipped": payload.get("skipped"),
+    }
+
+
+def _pool(size, **kw):
+    kw.setdefault("ping_interval", 0.05)
+    kw.setdefault("ping_timeout", 5.0)
+    kw.setdefault("respawn_backoff", 0.05)
+    pool = cs.ShardPool(size, target=_TARGET, **kw)
+    pool.start()
+    return pool
+
+
+def _wait_until(cond, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cond():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _job(uid, network="mainnet", **extra):
+    return {"telegram_id": uid, "network": network, "strategy": "grid", **extra}
+
+
+def test_ring_is_balanced_and_only_a_removed_nodes_keys_move():
+    keys = [(uid, net) for uid in range(5000) for net in ("mainnet", "testnet")]
+    ring = cs.HashRing(range(4))
+    before = {k: ring.owner(k) for k in keys}
+    assert before == {k: cs.HashRing(range(4)).owner(k) for k in keys}, "ownership must be deterministic"
+    shares = [list(before.values()).count(n) / len(keys) for n in range(4)]
+    assert all(0.15 < s < 0.35 for s in shares), shares
+
+    ring.remove(2)
+    after = {k: ring.owner(k) for k in keys}
+    moved = [k for k in keys if before[k] != after[k]]
+    assert moved and all(before[k] == 2 for k in moved)
+    assert 2 not in set(after.values())
+
+    ring.add(2)
+    assert {k: ring.owner(k) for k in keys} == before
+
+
+def test_each_user_stays_on_one_warm_shard_loop():
+    pool = _pool(2)
+    try:
+        async def _scenario():
+            out = {}
+            for _round in range(3):
+                results = await asyncio.gather(*(pool.submit(_job(uid)) for uid in range(12)))
+                for uid, r in enumerate(results):
+                    out.setdefault(uid, []).append(r)
+            return out
+
+        by_user = asyncio.run(_scenario())
+    finally:
+        pool.stop()
+
+    for uid, results in by_user.items():
+        assert len({(r["worker_pid"], r["loop"], r["shard"]) for r in results}) == 1, uid
+        assert [r["seen"] for r in results] == [1, 2, 3], "a cycle must find the previous cycle's state"
+    assert len({r[0]["shard"] for r in by_user.values()}) == 2, "keys should spread over both shards"
+
+
+def test_dead_shard_fails_its_jobs_moves_only_its_keys_and_respawns():
+    pool = _pool(2)
+    try:
+        async def _route_all():
+            return {uid: (await pool.submit(_job(uid)))["shard"] for uid in range(12)}
+
+        home = asyncio.run(_route_all())
+        victim_uid = next(uid for uid, shard in home.items() if shard == 0)
+        died = asyncio.run(pool.submit(_job(victim_uid, die=True)))
+        assert died["ok"] is False and "cycle shard 0" in died["error"]
+
+        moved = asyncio.run(_route_all())
+        assert all(moved[uid] == 1 for uid in home), "while shard 0 is down everything runs on shard 1"
+        assert _wait_until(lambda: pool.diagnostics()["alive"] == 2)
+        assert pool.diagnostics()["shards"]["0"]["restarts"] == 1
+
+        settled = asyncio.run(_route_all())
+        assert settled == moved, "re-pinned keys must not bounce back to the respawned shard"
+        assert asyncio.run(pool.submit(_job(10_000)))["ok"] is True
+        assert pool.diagnostics()["rebalanced_keys"] == sum(1 for s in home.values() if s == 0)
+    finally:
+        pool.stop()
+
+
+def test_unresponsive_loop_is_reaped_by_the_health_check():
+    pool = _pool(1, ping_timeout=2.0)
+    try:
+        async def _scenario():
+            return await pool.submit(_job(1, block=30))
+
+        started = time.monotonic()
+        result = asyncio.run(_scenario())
+        assert time.monotonic() - started < 15
+        assert result["ok"] is False and "unresponsive" in result["error"]
+        assert _wait_until(lambda: pool.diagnostics()["alive"] == 1)
+        assert asyncio.run(pool.submit(_job(1)))["seen"] == 1, "a respawned shard starts cold"
+    finally:
+        pool.stop()
+
+
+def test_not_running_result_unpins_the_key():
+    pool = _pool(2)
+    try:
+        asyncio.run(pool.submit(_job(5)))
+        assert pool.diagnostics()["pinned_keys"] == 1
+        asyncio.run(pool.submit(_job(5, skipped="not_running")))
+        assert pool.diagnostics()["pinned_keys"] == 0
+    finally:
+        pool.stop()
+
+
+def test_cpu_bound_cycles_run_on_every_shard():
+    """CPU-bound cycles spread over all shards instead of queueing on one."""
+    jobs = [_job(uid, spin=300_000) for uid in range(16)]
+    pool = _pool(4)
+    try:
+        async def _all():
+            return await asyncio.gather(*(pool.submit(dict(j)) for j in jobs))
+
+        results = asyncio.run(_all())
+    finally:
+        pool.stop()
+    assert all(r["ok"] for r in results)
+    assert len({r["worker_pid"] for r in results}) == 4
+
+
+def test_supervisor_routes_cycles_through_the_shard_pool(monkeypatch):
+    from src.nadobro.runtime import runtime_supervisor as rs
+
+    pool = _pool(1)
+    monkeypatch.setattr(rs, "_MODE", "sharded")
+    monkeypatch.setattr(rs, "_STARTED", True)
+    monkeypatch.setattr(rs, "_SHARDS", pool)
+    try:
+        result = asyncio.run(rs.submit_cycle_job(_job(3, "testnet")))
+        assert result["ok"] is True and result["shard"] == 0
+        assert rs.is_multiprocess_enabled() and rs.is_sharded_enabled()
+        diag = rs.get_runtime_supervisor_diagnostics()["shards"]
+        assert diag["alive"] == 1 and diag["shards"]["0"]["jobs"] == 1
+    finally:
+        pool.stop()
+
+
+def test_sharded_mode_does_not_flag_the_cycle_lock(monkeypatch, caplog):
+    from src.nadobro.runtime import runtime_supervisor as rs
+    from src.nadobro.strategy import engine_runtime as er
+
+    monkeypatch.setattr(rs, "_MODE", "sharded")
+    monkeypatch.setattr(er, "_warned_mp_cycle_lock", False, raising=False)
+
+    async def body():
+        with caplog.at_level("ERROR"):
+            er._cycle_lock(556, "mainnet", "dn")
+
+    asyncio.run(body())
+    er.release_cycle_lock(556, "mainnet", "dn")
+    assert not any("MULTIPROCESS" in r.getMessage() for r in caplog.records)
+
+
+def test_run_cycle_job_keeps_the_shard_in_worker_mode(monkeypatch):
+    from src.nadobro.strategy import bot_runtime
+
+    calls = []
+
+    async def _fake_run(uid, net, state, *, nudge=False):
+        calls.append((uid, net, nudge, bot_runtime.is_process_worker_mode()))
+        return True, None
+
+    monkeypatch.setattr(bot_runtime, "_load_state", lambda _uid, _net: {"running": True})
+    monkeypatch.setattr(bot_runtime, "_run_cycle", _fake_run)
+    try:
+        result = asyncio.run(bot_runtime.run_cycle_job(_job(8, nudge=True)))
+        assert result["ok"] is True and result["worker_pid"] == os.getpid()
+        assert calls == [(8, "mainnet", True, True)]
+        assert bot_runtime.is_process_worker_mode() is True
+        assert bot_runtime.run_cycle_job_sync(_job(8))["ok"] is True
+        assert bot_runtime.is_process_worker_mode() is False
+    finally:
+        bot_runtime.set_process_worker_mode(False)
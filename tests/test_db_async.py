@@ -0,0 +1,239 @@
+"""Async-native DB layer (src/nadobro/db_async.py).
+
+Pins the same disconnect-hygiene contract as tests/test_db_resilience.py:
+- reads retry ONCE on a fresh connection after a disconnect-class error;
+- writes are NEVER auto-retried;
+- a connection that raised a disconnect error is closed so the pool drops it;
+- a pool timeout is not a disconnect: no retry, no discard;
+- ``NADO_ASYNC_DB=0`` routes through the psycopg2 path on the DB thread pool.
+
+The DB-backed cases round-trip bot_state and a transaction against a real
+Postgres, and 500 concurrent reads on the native pool return what the
+thread-pool path does.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+import psycopg
+import pytest
+from psycopg_pool import PoolTimeout
+
+from src.nadobro import db_async
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+        if self.conn.fail_with is not None:
+            raise self.conn.fail_with
+
+    async def fetchone(self):
+        return {"ok": 1}
+
+    async def fetchall(self):
+        return [{"ok": 1}]
+
+
+class FakeConn:
+    def __init__(self, fail_with=None):
+        self.fail_with = fail_with
+        self.executed: list[str] = []
+        self.closed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    async def close(self):
+        self.closed = True
+
+
+class FakePool:
+    def __init__(self, conns):
+        self.conns = list(conns)
+        self.handed_out: list[FakeConn] = []
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = self.conns.pop(0)
+        if isinstance(conn, Exception):
+            raise conn
+        self.handed_out.append(conn)
+        yield conn
+
+
+def _with_pool(pool):
+    async def _get():
+        return pool
+
+    return patch.object(db_async, "get_async_pool", _get)
+
+
+def test_read_retries_once_on_a_fresh_connection_after_disconnect():
+    dead = FakeConn(fail_with=psycopg.OperationalError("server closed the connection unexpectedly"))
+    fresh = FakeConn()
+    pool = FakePool([dead, fresh])
+    with _with_pool(pool):
+        assert asyncio.run(db_async.aquery_one("SELECT 1")) == {"ok": 1}
+    assert dead.closed is True
+    assert fresh.closed is False and fresh.executed == ["SELECT 1"]
+
+
+def test_read_gives_up_after_one_retry():
+    err = psycopg.InterfaceError("connection already closed")
+    pool = FakePool([FakeConn(fail_with=err), FakeConn(fail_with=err), FakeConn()])
+    with _with_pool(pool), pytest.raises(psycopg.InterfaceError):
+        asyncio.run(db_async.aquery_all("SELECT 1"))
+    assert len(pool.conns) == 1
+    assert all(c.closed for c in pool.handed_out)
+
+
+def test_write_is_never_retried():
+    dead = FakeConn(fail_with=psycopg.OperationalError("SSL SYSCALL error: EOF detected"))
+    pool = FakePool([dead, FakeConn()])
+    with _with_pool(pool), pytest.raises(psycopg.OperationalError):
+        asyncio.run(db_async.aexecute("UPDATE t SET x = 1"))
+    assert dead.closed is True
+    assert len(pool.conns) == 1
+
+
+def test_pool_timeout_is_not_treated_as_a_disconnect():
+    pool = FakePool([PoolTimeout("couldn't get a connection after 15.00 sec"), FakeConn()])
+    with _with_pool(pool), pytest.raises(PoolTimeout):
+        asyncio.run(db_async.aquery_one("SELECT 1"))
+    assert len(pool.conns) == 1
+
+
+def test_non_disconnect_errors_keep_the_connection():
+    conn = FakeConn(fail_with=psycopg.errors.UniqueViolation("duplicate key"))
+    pool = FakePool([conn, FakeConn()])
+    with _with_pool(pool), pytest.raises(psycopg.errors.UniqueViolation):
+        asyncio.run(db_async.aquery_one("SELECT 1"))
+    assert conn.closed is False
+    assert len(pool.conns) == 1
+
+
+def test_flag_off_routes_through_the_thread_pool_path(monkeypatch):
+    monkeypatch.setenv("NADO_ASYNC_DB", "0")
+    calls = []
+
+    def _query_one(sql, params=None):
+        calls.append((sql, params))
+        return {"v": 7}
+
+    async def _no_pool():
+        raise AssertionError("native pool must not be used when NADO_ASYNC_DB=0")
+
+    with patch("src.nadobro.db.query_one", _query_one), \
+         patch.object(db_async, "get_async_pool", _no_pool):
+        assert asyncio.run(db_async.aquery_one("SELECT %s", (7,))) == {"v": 7}
+    assert calls == [("SELECT %s", (7,))]
+
+
+# -- real Postgres -------------------------------------------------------------
+
+
+def _db_reachable() -> bool:
+    if not (os.environ.get("DATABASE_URL") or os.environ.get("SUPABASE_DATABASE_URL")):
+        return False
+    try:
+        import psycopg2
+
+        url = os.environ.get("SUPABASE_DATABASE_URL") or os.environ["DATABASE_URL"]
+        psycopg2.connect(url).close()
+        return True
+    except Exception:
+        return False
+
+
+needs_db = pytest.mark.skipif(not _db_reachable(), reason="no reachable Postgres (DATABASE_URL)")
+
+_KEY = "test_db_async:probe"
+
+
+@pytest.fixture
+def _bot_state_row():
+    from src.nadobro.db import execute, init_db
+
+    init_db()
+    execute("DELETE FROM bot_state WHERE key LIKE %s", ("test_db_async:%",))
+    yield
+    execute("DELETE FROM bot_state WHERE key LIKE %s", ("test_db_async:%",))
+
+
+async def _closing(coro):
+    try:
+        return await coro
+    finally:
+        await db_async.close_async_pool()
+
+
+@needs_db
+def test_bot_state_round_trip_matches_the_sync_path(_bot_state_row):
+    from src.nadobro.models import database
+
+    asyncio.run(_closing(database.aset_bot_state(_KEY, {"notified_at": "2026-10-17T00:00:00+00:00"})))
+    assert database.get_bot_state(_KEY) == {"notified_at": "2026-10-17T00:00:00+00:00"}
+    database.set_bot_state(_KEY, {"n": 2})
+    assert asyncio.run(_closing(database.aget_bot_state(_KEY))) == {"n": 2}
+    assert asyncio.run(_closing(database.aget_bot_state("test_db_async:missing"))) is None
+
+
+@needs_db
+@pytest.mark.parametrize("native", ["1", "0"])
+def test_atransaction_commits_on_return_and_rolls_back_on_error(_bot_state_row, monkeypatch, native):
+    from src.nadobro.models import database
+
+    monkeypatch.setenv("NADO_ASYNC_DB", native)
+
+    async def _write(cur, value):
+        await cur.execute(database._BOT_STATE_UPSERT, database._bot_state_params(_KEY, value))
+        await cur.execute(database._BOT_STATE_SELECT, (_KEY,))
+        return await cur.fetchone()
+
+    async def _failing(cur):
+        await _write(cur, {"n": 2})
+        raise RuntimeError("abort")
+
+    async def _scenario():
+        row = await db_async.atransaction(lambda cur: _write(cur, {"n": 1}))
+        assert row["value"] == '{"n": 1}'
+        with pytest.raises(RuntimeError):
+            await db_async.atransaction(_failing)
+
+    asyncio.run(_closing(_scenario()))
+    assert database.get_bot_state(_KEY) == {"n": 1}
+
+
+@needs_db
+def test_concurrent_callers_match_the_thread_pool_path(_bot_state_row):
+    """500 concurrent bot_state reads: native pool vs ``run_blocking_db``."""
+    from src.nadobro.core.async_utils import run_blocking_db
+    from src.nadobro.models import database
+
+    database.set_bot_state(_KEY, {"n": 1})
+    callers = 500
+
+    async def _native():
+        return await asyncio.gather(*(database.aget_bot_state(_KEY) for _ in range(callers)))
+
+    async def _threaded():
+        return await asyncio.gather(
+            *(run_blocking_db(database.get_bot_state, _KEY) for _ in range(callers))
+        )
+
+    native_rows = asyncio.run(_closing(_native()))
+    threaded_rows = asyncio.run(_threaded())
+    assert native_rows == threaded_rows == [{"n": 1}] * callers
@@ -66,10 +66,10 @@ def test_sync_pending_fills_does_not_cancel_recorded_fill_when_archive_missing()
 
     with (
         patch.object(database, "claim_pending_fill_syncs", return_value=[entry]),
-        patch.object(database, "get_trade_by_id", return_value=trade_row),
-        patch.object(database, "release_fill_sync", side_effect=lambda sync_id: releases.append(sync_id)),
-        patch.object(database, "resolve_fill_sync") as resolve_fill_sync,
-        patch.object(database, "expire_fill_sync"),
+        patch.object(database, "aget_trade_by_id", new=AsyncMock(return_value=trade_row)),
+        patch.object(database, "arelease_fill_sync", new=AsyncMock(side_effect=lambda sync_id: releases.append(sync_id))),
+        patch.object(database, "aresolve_fill_sync", new_callable=AsyncMock) as resolve_fill_sync,
+        patch.object(database, "aexpire_fill_sync", new_callable=AsyncMock),
         patch.object(database, "update_trade", side_effect=lambda *args, **kwargs: updates.append((args, kwargs))),
         patch.object(database, "increment_session_metrics"),
         patch.object(nado_archive, "is_archive_rate_limited", return_value=False),
@@ -108,10 +108,10 @@ def test_sync_pending_fills_does_not_cancel_after_digest_poll_hits_rate_limit():
 
     with (
         patch.object(database, "claim_pending_fill_syncs", return_value=[entry]),
-        patch.object(database, "get_trade_by_id", return_value=trade_row),
-        patch.object(database, "release_fill_sync", side_effect=lambda sync_id: releases.append(sync_id)),
-        patch.object(database, "resolve_fill_sync") as resolve_fill_sync,
-        patch.object(database, "expire_fill_sync"),
+        patch.object(database, "aget_trade_by_id", new=AsyncMock(return_value=trade_row)),
+        patch.object(database, "arelease_fill_sync", new=AsyncMock(side_effect=lambda sync_id: releases.append(sync_id))),
+        patch.object(database, "aresolve_fill_sync", new_callable=AsyncMock) as resolve_fill_sync,
+        patch.object(database, "aexpire_fill_sync", new_callable=AsyncMock),
         patch.object(database, "update_trade") as update_trade,
         patch.object(database, "increment_session_metrics"),
         patch.object(nado_archive, "is_archive_rate_limited", side_effect=[False, False, False, True]),
@@ -162,3 +162,20 @@ def test_get_market_snapshot_returns_cached_prices_without_nameerror():
         result = asyncio.run(scheduler._get_market_snapshot())
 
     assert result == cached
+
+
+def test_limit_order_notifiers_mark_a_trade_only_after_the_message_is_accepted():
+    from src.nadobro.runtime import scheduler
+
+    trade = {"id": 9, "user_id": 5, "side": "buy", "product_name": "BTC-PERP", "size": 1, "price": 100}
+    for notify in (scheduler._notify_limit_order_filled_once, scheduler._notify_limit_order_cancelled_once):
+        for accepted in (False, True):
+            set_state = AsyncMock()
+            with (
+                patch.object(scheduler, "_bot_app", MagicMock()),
+                patch.object(scheduler, "deliver", AsyncMock(return_value=accepted)),
+                patch("src.nadobro.models.database.aget_bot_state", AsyncMock(return_value=None)),
+                patch("src.nadobro.models.database.aset_bot_state", set_state),
+            ):
+                asyncio.run(notify(trade, "mainnet"))
+            assert set_state.await_count == (1 if accepted else 0)
@@ -0,0 +1,253 @@
+"""Async HTTP/2 read path (core/http_async.py, NadoClient async variants).
+
+Pins that the async variants send the same requests and parse the same
+payloads as the sync ``requests`` path, that gateway admission and archive
+backoff wait on the event loop instead of blocking it, and that 200
+concurrent ``subaccount_info`` reads return what the SDK thread-pool path does.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from src.nadobro.core import http_async
+from src.nadobro.venue import gateway_budget, nado_archive
+from src.nadobro.venue import nado_client as nc
+from src.nadobro.venue.nado_client import NadoClient
+
+_SUBACCOUNT_INFO = {
+    "status": "success",
+    "data": {
+        "exists": True,
+        "spot_balances": [{"product_id": 0, "balance": {"amount": str(1500 * 10**18)}}],
+    },
+}
+
+
+@pytest.fixture(autouse=True)
+def _isolate(monkeypatch):
+    """Fresh clients per test, no shared bucket starvation, no leaked circuits."""
+    monkeypatch.setattr("src.nadobro.core.http_session.throttle_host", lambda *_a, **_k: True)
+    monkeypatch.setattr(nc, "_REST_RETRY_BASE_SECONDS", 0.0)
+    monkeypatch.setattr(nc, "_REST_RETRY_JITTER_SECONDS", 0.0)
+    monkeypatch.setattr(nc, "_shared_cache_set", lambda *_a, **_k: None)
+    monkeypatch.setattr(nc, "_shared_cache_get", lambda *_a, **_k: None)
+    yield
+    http_async._transport_override = None
+    with gateway_budget._lock:
+        gateway_budget._gateway_rl.clear()
+        gateway_budget._user_inflight.clear()
+    with nado_archive._rate_lock:
+        nado_archive._rate_limited_until = 0.0
+        nado_archive._consecutive_429s = 0
+
+
+def _mock(handler) -> list[httpx.Request]:
+    seen: list[httpx.Request] = []
+
+    async def _handle(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return await handler(request)
+
+    http_async._transport_override = httpx.MockTransport(_handle)
+    return seen
+
+
+async def _closing(coro):
+    try:
+        return await coro
+    finally:
+        await http_async.close_async_clients()
+
+
+def _client() -> NadoClient:
+    return NadoClient.from_address("0x" + "1" * 40, network="testnet")
+
+
+def test_aquery_rest_sends_the_sync_request_shape_and_retries_non_json():
+    calls = {"n": 0}
+
+    async def handler(request):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return httpx.Response(502, text="<html>bad gateway</html>", headers={"content-type": "text/html"})
+        return httpx.Response(200, json=_SUBACCOUNT_INFO)
+
+    seen = _mock(handler)
+    client = _client()
+    data = asyncio.run(_closing(client._aquery_rest("subaccount_info", {"subaccount": client.subaccount_hex})))
+
+    assert data == _SUBACCOUNT_INFO
+    assert len(seen) == 2
+    assert seen[0].method == "GET"
+    assert seen[0].url.params["type"] == "subaccount_info"
+    assert seen[0].url.params["subaccount"] == client.subaccount_hex
+
+
+def test_orders_query_is_a_post_and_parses_like_the_sdk():
+    client = _client()
+    payload = {
+        "status": "success",
+        "data": {
+            "sender": client.subaccount_hex,
+            "product_orders": [
+                {
+                    "product_id": 2,
+                    "orders": [
+                        {
+                            "product_id": 2,
+                            "sender": client.subaccount_hex,
+                            "price_x18": str(100 * 10**18),
+                            "amount": str(-3 * 10**18),
+                            "expiration": "0",
+                            "nonce": "1",
+                            "unfilled_amount": str(-3 * 10**18),
+                            "digest": "0xd1",
+                            "placed_at": 1,
+                            "order_type": "default",
+                            "appendix": "0",
+                        }
+                    ],
+                }
+            ],
+        },
+    }
+
+    async def handler(request):
+        return httpx.Response(200, json=payload)
+
+    seen = _mock(handler)
+    with patch.object(nc, "get_product_name", return_value="ETH-PERP"):
+        rows = asyncio.run(_closing(client.aget_open_orders_batched([2])))
+
+    assert seen[0].method == "POST"
+    assert json.loads(seen[0].content) == {
+        "type": "orders", "sender": client.subaccount_hex, "product_ids": [2],
+    }
+    assert rows == [{
+        "digest": "0xd1", "amount": -3.0, "price": 100.0, "side": "SHORT",
+        "product_id": 2, "product_name": "ETH-PERP",
+    }]
+
+
+def test_aget_balance_matches_the_sync_rest_path():
+    client = _client()
+
+    async def handler(request):
+        return httpx.Response(200, json=_SUBACCOUNT_INFO)
+
+    _mock(handler)
+    native = asyncio.run(_closing(client.aget_balance(force=True)))
+    sync_resp = SimpleNamespace(json=lambda: _SUBACCOUNT_INFO)
+    with patch.object(nc._rest_session, "get", return_value=sync_resp):
+        threaded = client.get_balance(force=True)
+    assert native == threaded == {"exists": True, "balances": {0: 1500.0}}
+
+
+def test_flag_off_uses_the_sdk_pool(monkeypatch):
+    monkeypatch.setenv("NADO_ASYNC_HTTP", "0")
+
+    async def handler(request):
+        raise AssertionError("async client must not be used when NADO_ASYNC_HTTP=0")
+
+    _mock(handler)
+    client = _client()
+    with patch.object(NadoClient, "get_balance", return_value={"exists": True, "balances": {}}) as sync_get:
+        assert asyncio.run(client.aget_balance()) == {"exists": True, "balances": {}}
+    sync_get.assert_called_once()
+
+
+def test_try_acquire_async_waits_without_blocking_the_loop(monkeypatch):
+    grants = iter([False, False, False, True])
+    monkeypatch.setattr(gateway_budget, "try_acquire", lambda *_a, **_k: next(grants))
+    ticks = []
+
+    async def _ticker():
+        for _ in range(20):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def _scenario():
+        ticker = asyncio.create_task(_ticker())
+        allowed = await gateway_budget.try_acquire_async("https://gateway.test.nado.xyz/v1", max_wait=1.0)
+        ticker.cancel()
+        return allowed
+
+    assert asyncio.run(_scenario()) is True
+    # The ticker kept running while admission was pending.
+    assert len(ticks) >= 5
+
+
+def test_try_acquire_async_fails_fast_when_the_gateway_is_blocked(monkeypatch):
+    monkeypatch.setattr(gateway_budget, "is_gateway_blocked", lambda _url: True)
+    started = time.monotonic()
+    assert asyncio.run(gateway_budget.try_acquire_async("https://gateway.test.nado.xyz/v1", max_wait=2.0)) is False
+    assert time.monotonic() - started < 0.1
+
+
+def test_archive_apost_marks_rate_limited_on_429():
+    async def handler(request):
+        return httpx.Response(429, text="slow down", headers={"retry-after": "3"})
+
+    seen = _mock(handler)
+    result = asyncio.run(_closing(nado_archive._apost("https://archive.example/v1", {"matches": {"limit": 1}})))
+
+    assert result is None
+    assert len(seen) == 1
+    assert nado_archive.is_archive_rate_limited()
+    assert nado_archive.archive_rate_limit_remaining() > 0
+
+
+def test_archive_aquery_matches_parses_like_the_sync_path():
+    match = {
+        "digest": "0xm1",
+        "submission_idx": "9",
+        "base_filled": str(2 * 10**18),
+        "quote_filled": str(-200 * 10**18),
+        "fee": str(10**17),
+        "order": {"sender": "0x" + "2" * 64, "priceX18": str(100 * 10**18), "amount": str(2 * 10**18)},
+    }
+
+    async def handler(request):
+        return httpx.Response(200, json={"matches": [match]})
+
+    seen = _mock(handler)
+    with patch.object(nado_archive, "_MIN_INTERVAL_SECONDS", 0.0):
+        rows = asyncio.run(_closing(nado_archive.aquery_matches_by_subaccount("testnet", "0xabc", limit=10)))
+
+    assert json.loads(seen[0].content) == {"matches": {"subaccounts": ["0xabc"], "limit": 10}}
+    assert rows == [nado_archive._parse_match(match)]
+
+
+def test_concurrent_reads_match_the_sdk_pool_path():
+    """200 concurrent ``subaccount_info`` reads at 50ms latency: HTTP/2 vs SDK pool."""
+    from src.nadobro.core.async_utils import run_blocking_sdk
+
+    readers = 200
+    latency = 0.05
+    client = _client()
+
+    async def handler(request):
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=_SUBACCOUNT_INFO)
+
+    def _slow_get(*_a, **_k):
+        time.sleep(latency)
+        return SimpleNamespace(json=lambda: _SUBACCOUNT_INFO)
+
+    async def _concurrently(factory):
+        return await asyncio.gather(*(factory() for _ in range(readers)))
+
+    _mock(handler)
+    native_rows = asyncio.run(_closing(_concurrently(lambda: client.aget_balance(force=True))))
+    with patch.object(nc._rest_session, "get", _slow_get):
+        threaded_rows = asyncio.run(_concurrently(lambda: run_blocking_sdk(client.get_balance, True)))
+
+    assert len(native_rows) == readers
+    assert native_rows == threaded_rows
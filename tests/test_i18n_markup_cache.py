@@ -0,0 +1,175 @@
+"""Compiled i18n tables, memoized keyboard localization, cached user language.
+
+Pins: the flat per-language tables answer exactly like the nested catalog; a
+localized keyboard is built once per (content, language) and handed out again
+on the next render; distinct content never collides; the memo is bounded; the
+user's language is read from the DB once per TTL and re-read after a
+settings change. The benchmark prints the per-keyboard render cost.
+"""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.nadobro import i18n
+
+
+# PTB-shaped keyboard classes. Whether the real ``telegram`` package or the
+# ``_stubs`` shim got imported first depends on test order, so the module under
+# test is pointed at these instead of either.
+class InlineKeyboardButton:
+    def __init__(self, text, callback_data=None, url=None, switch_inline_query=None,
+                 switch_inline_query_current_chat=None, callback_game=None, pay=None,
+                 login_url=None, web_app=None, switch_inline_query_chosen_chat=None,
+                 copy_text=None):
+        self.text = text
+        self.callback_data = callback_data
+        self.url = url
+        self.switch_inline_query = switch_inline_query
+        self.switch_inline_query_current_chat = switch_inline_query_current_chat
+        self.callback_game = callback_game
+        self.pay = pay
+        self.login_url = login_url
+        self.web_app = web_app
+        self.switch_inline_query_chosen_chat = switch_inline_query_chosen_chat
+        self.copy_text = copy_text
+
+
+class InlineKeyboardMarkup:
+    def __init__(self, inline_keyboard):
+        self.inline_keyboard = tuple(tuple(row) for row in inline_keyboard)
+
+
+class KeyboardButton:
+    def __init__(self, text):
+        self.text = text
+
+
+class ReplyKeyboardMarkup:
+    def __init__(self, keyboard, resize_keyboard=None, one_time_keyboard=None, selective=None,
+                 input_field_placeholder=None, is_persistent=None):
+        self.keyboard = tuple(tuple(row) for row in keyboard)
+        self.resize_keyboard = resize_keyboard
+        self.one_time_keyboard = one_time_keyboard
+        self.selective = selective
+        self.input_field_placeholder = input_field_placeholder
+        self.is_persistent = is_persistent
+
+
+def _home_kb(callback_suffix: str = "") -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("🏠 Home", callback_data=f"nav:home{callback_suffix}"),
+         InlineKeyboardButton("🔔 Alerts", callback_data="nav:alerts")],
+        [InlineKeyboardButton("⚙️ Settings", callback_data="nav:settings"),
+         InlineKeyboardButton("💼 Wallet Vault", callback_data="nav:wallet")],
+        [InlineKeyboardButton("🔗 Official Links", url="https://nado.xyz")],
+    ])
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches(monkeypatch):
+    for cls in (InlineKeyboardButton, InlineKeyboardMarkup, KeyboardButton, ReplyKeyboardMarkup):
+        monkeypatch.setattr(i18n, cls.__name__, cls)
+    i18n.clear_localized_markup_cache()
+    i18n.invalidate_user_language()
+    yield
+    i18n.clear_localized_markup_cache()
+    i18n.invalidate_user_language()
+
+
+def test_compiled_tables_match_the_nested_catalog():
+    for base, entry in i18n._LABELS.items():
+        for lang, translated in entry.items():
+            if lang in i18n.SUPPORTED_LANGS and lang != "en":
+                assert i18n.localize_label(base, lang) == translated
+                assert i18n.localize_label(f"{base} ✅", lang) == f"{translated} ✅"
+
+
+def test_equal_keyboards_share_one_localized_markup():
+    first = i18n.localize_markup(_home_kb(), "ko")
+    second = i18n.localize_markup(_home_kb(), "ko")
+    assert second is first
+    assert first.inline_keyboard[0][0].text == i18n.localize_label("🏠 Home", "ko")
+    assert first.inline_keyboard[2][0].url == "https://nado.xyz"
+    stats = i18n.get_localized_markup_cache_stats()
+    assert (stats["hits"], stats["size"]) >= (1, 1)
+
+    other = i18n.localize_markup(_home_kb(":1"), "ko")
+    assert other is not first and other.inline_keyboard[0][0].callback_data == "nav:home:1"
+    assert i18n.localize_markup(_home_kb(), "fr") is not first
+
+
+def test_reply_keyboard_flags_are_part_of_the_key():
+    rows = [[KeyboardButton("🔔 Alerts")]]
+    resized = i18n.localize_markup(ReplyKeyboardMarkup(rows, resize_keyboard=True), "ru")
+    plain = i18n.localize_markup(ReplyKeyboardMarkup(rows, resize_keyboard=False), "ru")
+    assert resized.resize_keyboard is True and plain.resize_keyboard is False
+
+
+def test_dict_callback_data_bypasses_the_memo():
+    kb = InlineKeyboardMarkup([[InlineKeyboardButton("🔔 Alerts", callback_data={"k": 1})]])
+    out = i18n.localize_markup(kb, "zh")
+    assert out.inline_keyboard[0][0].callback_data == {"k": 1}
+    assert i18n.get_localized_markup_cache_stats()["size"] == 0
+
+
+def test_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(i18n, "_MARKUP_MEMO_MAX", 8)
+    for n in range(20):
+        i18n.localize_markup(_home_kb(f":{n}"), "ar")
+    assert i18n.get_localized_markup_cache_stats()["size"] == 8
+
+
+def test_user_language_is_cached_until_the_settings_change():
+    reads = []
+
+    def _get_user(telegram_id):
+        reads.append(telegram_id)
+        return SimpleNamespace(language=current["lang"])
+
+    current = {"lang": "ko"}
+    with patch("src.nadobro.users.user_service.get_user", _get_user), \
+         patch("src.nadobro.users.user_service.query_one", return_value={"language": "ko"}), \
+         patch("src.nadobro.users.user_service.execute"):
+        assert [i18n.get_user_language(77) for _ in range(5)] == ["ko"] * 5
+        assert reads == [77]
+        current["lang"] = "fr"
+        from src.nadobro.users.user_service import update_user_language
+
+        update_user_language(77, "fr")
+        assert i18n.get_user_language(77) == "fr"
+    assert reads == [77, 77]
+
+
+def test_user_language_expires_so_other_processes_see_a_switch(monkeypatch):
+    reads = []
+
+    def _get_user(telegram_id):
+        reads.append(telegram_id)
+        return SimpleNamespace(language="ko")
+
+    with patch("src.nadobro.users.user_service.get_user", _get_user):
+        assert i18n.get_user_language(78) == "ko"
+        monkeypatch.setattr(i18n, "_USER_LANG_TTL_SECONDS", 0.0)
+        assert i18n.get_user_language(78) == "ko"
+    assert reads == [78, 78]
+
+
+def test_keyboard_render_benchmark():
+    kb = _home_kb()
+    i18n._localize_markup(kb, "ko")  # warm
+
+    def _per_kb_us(fn, n=500):
+        started = time.perf_counter()
+        for _ in range(n):
+            fn()
+        return (time.perf_counter() - started) * 1e6 / n
+
+    rebuild = _per_kb_us(lambda: i18n._localize_markup(_home_kb(), "ko"))
+    memoized = _per_kb_us(lambda: i18n.localize_markup(_home_kb(), "ko"))
+    print(f"\nlocalize_markup per keyboard: rebuild {rebuild:.1f}us, memoized {memoized:.1f}us")
+    assert i18n.localize_markup(_home_kb(), "ko") is i18n.localize_markup(_home_kb(), "ko")
+    assert i18n.get_localized_markup_cache_stats()["size"] == 1
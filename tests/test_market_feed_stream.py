@@ -0,0 +1,186 @@
+"""Streamed quotes into ``market_feed`` (venue/market_ws.py, venue/market_feed.py).
+
+Pins the sequencing contract (versions only grow, a stale ``seq`` never rolls
+a price back), change notification, and that REST is read only once the
+stream has gone quiet.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from src.nadobro.venue import market_feed, market_ws
+
+X18 = 10**18
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    market_feed.reset()
+    yield
+    market_feed.reset()
+    market_feed.bind_fetcher(None)
+
+
+def _bbo(pid, bid, ask, ts):
+    return json.dumps({
+        "type": "best_bid_offer", "timestamp": str(ts), "product_id": pid,
+        "bid_price": str(int(bid * X18)), "bid_qty": str(X18),
+        "ask_price": str(int(ask * X18)), "ask_qty": str(X18),
+    })
+
+
+def _stream(network="testnet"):
+    ws = market_ws.MarketDataWs(network)
+    ws.names = {2: "BTC-PERP", 4: "ETH-PERP"}
+    return ws
+
+
+def test_frames_update_prices_and_stale_sequences_are_dropped():
+    ws = _stream()
+    assert ws.handle_frame(_bbo(2, 100.0, 101.0, ts=10)) is True
+    assert ws.handle_frame(_bbo(2, 90.0, 91.0, ts=9)) is False  # late frame
+    assert ws.handle_frame(_bbo(2, 102.0, 103.0, ts=11)) is True
+    assert ws.handle_frame(_bbo(99, 1.0, 1.0, ts=12)) is False  # unknown product
+    assert ws.handle_frame(json.dumps({"result": None, "id": 1})) is False  # ack
+
+    assert market_feed.live_price("testnet", 2) == {"bid": 102.0, "ask": 103.0, "mid": 102.5}
+    assert market_feed.version("testnet") == 2
+    assert ws.stats()["quotes"] == 2 and ws.stats()["dropped"] == 1
+
+
+def test_wait_for_update_and_listeners_fire_on_each_accepted_quote():
+    seen = []
+    market_feed.register_listener(lambda net, ver: seen.append((net, ver)))
+    ws = _stream()
+
+    async def _scenario():
+        waiter = asyncio.create_task(market_feed.wait_for_update("testnet", timeout=1.0))
+        await asyncio.sleep(0)
+        ws.handle_frame(_bbo(4, 2000.0, 2001.0, ts=1))
+        got = await waiter
+        timed_out = await market_feed.wait_for_update("testnet", timeout=0.01)
+        already = await market_feed.wait_for_update("testnet", after=0, timeout=0.01)
+        return got, timed_out, already
+
+    try:
+        assert asyncio.run(_scenario()) == (1, 1, 1)
+    finally:
+        market_feed._listeners.clear()
+    assert seen == [("testnet", 1)]
+
+
+def test_rest_is_read_only_when_the_stream_is_stale(monkeypatch):
+    calls = []
+
+    def _fetch():
+        calls.append(1)
+        return {"BTC": {"bid": 1.0, "ask": 1.0, "mid": 1.0}}
+
+    market_feed.bind_fetcher(_fetch)
+    monkeypatch.setattr(market_feed, "_TTL", 0.0)
+    _stream().handle_frame(_bbo(2, 100.0, 101.0, ts=1))
+
+    live = asyncio.run(market_feed.get_prices("testnet"))
+    assert live == {"BTC": {"bid": 100.0, "ask": 101.0, "mid": 100.5}}
+    assert calls == []
+
+    monkeypatch.setattr(market_feed, "_STREAM_STALE_SECONDS", 0.0)
+    assert market_feed.live_price("testnet", 2) is None
+    assert asyncio.run(market_feed.get_prices("testnet")) == {"BTC": {"bid": 1.0, "ask": 1.0, "mid": 1.0}}
+    assert calls == [1]
+    assert market_feed.snapshot()["testnet"]["rest_fetches"] == 1
+
+
+def test_a_product_without_a_fresh_quote_falls_back_to_rest(monkeypatch):
+    calls = []
+
+    def _fetch():
+        calls.append(1)
+        return {"BTC": {"bid": 1.0, "ask": 1.0, "mid": 1.0}, "ETH": {"bid": 2.0, "ask": 2.0, "mid": 2.0}}
+
+    market_feed.bind_fetcher(_fetch)
+    monkeypatch.setattr(market_feed, "_TTL", 0.0)
+    ws = _stream()
+    # ETH's subscription was rejected: only BTC ever quotes, acks keep the stream live.
+    market_feed.expect_products("testnet", ["BTC-PERP", "ETH-PERP"])
+    ws.handle_frame(_bbo(2, 100.0, 101.0, ts=1))
+    ws.handle_frame(json.dumps({"error": "unknown product", "id": 2}))
+
+    prices = asyncio.run(market_feed.get_prices("testnet"))
+    assert prices == {"BTC": {"bid": 100.0, "ask": 101.0, "mid": 100.5}, "ETH": {"bid": 2.0, "ask": 2.0, "mid": 2.0}}
+    assert calls == [1]
+
+    # BTC stops quoting while other frames keep the network live.
+    monkeypatch.setattr(market_feed, "_QUOTE_STALE_SECONDS", 0.0)
+    ws.handle_frame(json.dumps({"result": None, "id": 3}))
+    assert market_feed.stream_live("testnet")
+    assert market_feed.live_price("testnet", 2) is None
+    assert asyncio.run(market_feed.get_prices("testnet"))["BTC"] == {"bid": 1.0, "ask": 1.0, "mid": 1.0}
+    assert calls == [1, 1]
+
+
+class _FakeSocket:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.sent: list[dict] = []
+
+    async def send(self, raw):
+        self.sent.append(json.loads(raw))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.frames:
+            raise StopAsyncIteration
+        await asyncio.sleep(0)
+        return self.frames.pop(0)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+def test_connect_subscribes_every_perp_and_serves_streamed_prices(monkeypatch):
+    """200 quotes through a fake socket: every read is served from memory."""
+    frames = [_bbo(2 if i % 2 else 4, 100.0 + i, 101.0 + i, ts=i + 1) for i in range(200)]
+    sock = _FakeSocket(frames)
+    monkeypatch.setitem(sys.modules, "websockets", SimpleNamespace(connect=lambda *a, **k: sock))
+    monkeypatch.setattr(market_ws, "_perp_products", lambda _net: [("BTC-PERP", 2), ("ETH-PERP", 4)])
+    fetches = []
+    market_feed.bind_fetcher(lambda: fetches.append(1) or {})
+    ws = market_ws.MarketDataWs("mainnet")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(ws._connect_once())
+
+    assert [m["stream"] for m in sock.sent] == [
+        {"type": "best_bid_offer", "product_id": 2},
+        {"type": "best_bid_offer", "product_id": 4},
+    ]
+    prices = asyncio.run(market_feed.get_prices("mainnet"))
+    assert prices["BTC"]["mid"] == pytest.approx(299.5)
+    assert prices["ETH"]["mid"] == pytest.approx(298.5)
+    assert market_feed.version("mainnet") == 200
+    assert fetches == []
+
+
+def test_scheduler_snapshot_prefers_the_live_stream(monkeypatch):
+    from src.nadobro.runtime import scheduler
+
+    class _Client:
+        network = "testnet"
+
+        def get_all_market_prices(self):
+            raise AssertionError("REST must not be read while the stream is live")
+
+    monkeypatch.setattr(scheduler, "_check_client", _Client())
+    _stream().handle_frame(_bbo(2, 100.0, 101.0, ts=1))
+    assert asyncio.run(scheduler._get_market_snapshot()) == {"BTC": {"bid": 100.0, "ask": 101.0, "mid": 100.5}}
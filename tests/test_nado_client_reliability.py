@@ -1,3 +1,4 @@
+import os
 import unittest
 import sys
 from types import ModuleType, SimpleNamespace
@@ -546,6 +547,7 @@ class NadoClientPortfolioWrapperTests(unittest.IsolatedAsyncioTestCase):
             market=SimpleNamespace(),
         )
 
+    @patch.dict(os.environ, {"NADO_ASYNC_HTTP": "0"})
     async def test_get_matches_uses_indexer_params_and_returns_dicts(self):
         captured = {}
 
@@ -0,0 +1,96 @@
+"""PnL card render service — cached static layers, bounded off-loop rendering.
+
+Pins: the static layer is built once per (card type, sign) and never mutated by
+a render; the service encodes JPEG by default (PNG on request); a full queue
+rejects with ``CardRenderBusy`` instead of queueing; the process pool renders
+the same card as the in-thread path; latency metrics land in the parent.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+
+import pytest
+from PIL import Image, ImageChops
+
+from _stubs import install_test_stubs
+
+install_test_stubs()
+
+from src.nadobro.core import perf
+from src.nadobro.portfolio import pnl_card_renderer as svc
+from src.nadobro.portfolio import pnl_card_type_a, pnl_card_type_b
+
+TYPE_A = {
+    "badge": "COPY TRADE", "product": "ETH:PERP-USDC", "base_symbol": "ETH",
+    "side": "LONG", "leverage": 10, "pnl": 428.32,
+    "entry_price": 2412.35, "exit_price": 2456.78, "size": 1.25,
+    "referral_code": "NADO8RO",
+}
+TYPE_B = {
+    "strategy": "dgrid", "product": "BTC:PERP-USDC", "base_symbol": "BTC",
+    "volume": 35076.68, "net_fees": 3.51, "pnl": -52.07, "referral_code": "3UOEDJUW",
+}
+
+
+@pytest.fixture
+def in_thread(monkeypatch):
+    monkeypatch.setenv("NADO_PNL_CARD_WORKERS", "0")
+    monkeypatch.setattr(svc, "_inflight", 0)
+    yield
+    svc.shutdown_card_renderer()
+
+
+def test_static_layer_is_cached_and_untouched_by_renders():
+    layer = pnl_card_type_a._static_layer(True)
+    before = layer.copy()
+    pnl_card_type_a.render_type_a(TYPE_A)
+    pnl_card_type_a.render_type_a({**TYPE_A, "product": "BTC:PERP-USDC", "base_symbol": "BTC"})
+    assert pnl_card_type_a._static_layer(True) is layer
+    assert ImageChops.difference(layer, before).getbbox() is None
+    assert pnl_card_type_b._static_layer(False) is pnl_card_type_b._static_layer(False)
+
+
+def test_in_thread_render_encodes_jpeg_by_default_and_png_on_request(in_thread, monkeypatch):
+    jpeg = asyncio.run(svc.render_card_async("a", TYPE_A))
+    assert jpeg[:3] == b"\xff\xd8\xff"
+    assert Image.open(io.BytesIO(jpeg)).size == Image.open(pnl_card_type_a._BG[True]).size
+
+    monkeypatch.setenv("NADO_PNL_CARD_FORMAT", "png")
+    png = asyncio.run(svc.render_card_async("b", TYPE_B))
+    assert png[:8] == b"\x89PNG\r\n\x1a\n"
+    with pytest.raises(ValueError):
+        asyncio.run(svc.render_card_async("c", TYPE_A))
+
+
+def test_full_queue_rejects_instead_of_waiting(in_thread, monkeypatch):
+    monkeypatch.setenv("NADO_PNL_CARD_QUEUE", "0")
+    before = perf.counters_snapshot().get("pnl_card.rejected", 0)
+    monkeypatch.setattr(svc, "_inflight", 1)  # the single in-thread slot is taken
+    with pytest.raises(svc.CardRenderBusy):
+        asyncio.run(svc.render_card_async("a", TYPE_A))
+    assert perf.counters_snapshot()["pnl_card.rejected"] == before + 1
+    assert svc.card_renderer_stats()["inflight"] == 1
+
+
+def test_render_latency_metrics_are_recorded_in_the_parent(in_thread):
+    asyncio.run(svc.render_card_async("b", TYPE_B))
+    snap = perf.snapshot()
+    for metric in ("pnl_card.render", "pnl_card.render.type_b", "pnl_card.queue_wait"):
+        assert snap[metric]["count"] >= 1
+    assert svc.card_renderer_stats()["inflight"] == 0
+
+
+def test_process_pool_renders_the_same_card(monkeypatch):
+    monkeypatch.setenv("NADO_PNL_CARD_WORKERS", "1")
+    monkeypatch.setenv("NADO_PNL_CARD_FORMAT", "png")
+    try:
+        pooled = asyncio.run(svc.render_card_async("a", TYPE_A))
+        assert svc.card_renderer_stats()["pool_running"] is True
+    finally:
+        svc.shutdown_card_renderer()
+    local = pnl_card_type_a.generate_type_a_card(TYPE_A)
+    diff = ImageChops.difference(
+        Image.open(io.BytesIO(pooled)).convert("RGB"), Image.open(io.BytesIO(local)).convert("RGB")
+    )
+    assert diff.getbbox() is None
@@ -0,0 +1,344 @@
+"""Relay batch long-poll: one held request for every pending LOWIQPTS session.
+
+Relay side: ``poll_events_batch`` covers N sessions with one set-based liveness
+``UPDATE ... RETURNING`` plus one events ``SELECT`` per wake-up, and a NOTIFY
+from ``store_event`` wakes a held poll. Bot side: ``poll_lowiqpts_relay_events``
+sends one batch call instead of N ``/events/poll`` calls (chunked to the
+relay's session cap), fetches photos by reference, and cuts a held poll short
+when a new session starts. A dropped LISTEN connection is re-established.
+"""
+import asyncio
+import sys
+import time
+import types
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from _stubs import install_test_stubs
+
+install_test_stubs()
+
+if "asyncpg" not in sys.modules:
+    asyncpg_mod = types.ModuleType("asyncpg")
+
+    class _AsyncpgPool:
+        pass
+
+    class _UniqueViolationError(Exception):
+        pass
+
+    asyncpg_mod.Pool = _AsyncpgPool
+    asyncpg_mod.UniqueViolationError = _UniqueViolationError
+    sys.modules["asyncpg"] = asyncpg_mod
+
+
+class _Acquire:
+    def __init__(self, conn):
+        self.conn = conn
+
+    async def __aenter__(self):
+        return self.conn
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class _Pool:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def acquire(self):
+        return _Acquire(self.conn)
+
+
+class _RelayConn:
+    """Answers the liveness UPDATE from ``statuses`` and each SELECT from ``batches``."""
+
+    def __init__(self, statuses, batches):
+        self.statuses = statuses
+        self.batches = list(batches)
+        self.statements: list[tuple[str, tuple]] = []
+
+    async def fetch(self, sql, *params):
+        self.statements.append((sql, params))
+        if "UPDATE relay_sessions" in sql:
+            return [{"id": sid, "status": self.statuses[sid]} for sid in params[0] if sid in self.statuses]
+        return self.batches.pop(0) if self.batches else []
+
+
+def _row(cursor_id, session_id, *, has_photo=False):
+    return {
+        "cursor_id": cursor_id,
+        "session_id": session_id,
+        "text": f"msg {cursor_id}",
+        "options_json": None,
+        "source_message_id": None,
+        "has_photo": has_photo,
+        "photo_mime": "image/png" if has_photo else None,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def test_batch_poll_is_two_statements_for_many_sessions(monkeypatch):
+    from relay import event_store
+
+    conn = _RelayConn(
+        {"sess_a": "active", "sess_b": "active", "sess_c": "active"},
+        [[_row(11, "sess_a"), _row(12, "sess_c", has_photo=True)]],
+    )
+    monkeypatch.setattr(event_store, "get_pool", lambda: _Pool(conn))
+
+    result = asyncio.run(event_store.poll_events_batch(
+        [("sess_a", "10"), ("sess_b", None), ("sess_c", "bogus"), ("sess_a", "3"), ("sess_x", None)],
+        limit=5,
+    ))
+
+    assert len(conn.statements) == 2
+    update_sql, update_params = conn.statements[0]
+    assert "last_polled_at = now()" in update_sql and "ANY($1::text[])" in update_sql
+    assert update_params == (["sess_a", "sess_b", "sess_c", "sess_x"],)
+    _select_sql, select_params = conn.statements[1]
+    assert select_params == (["sess_a", "sess_b", "sess_c", "sess_x"], [10, 0, 0, 0], 5)
+
+    sessions = result["sessions"]
+    assert [e["id"] for e in sessions["sess_a"]["events"]] == [11]
+    assert sessions["sess_a"]["next_cursor"] == "11"
+    assert sessions["sess_b"] == {"ok": True, "events": [], "next_cursor": None, "session_status": "active"}
+    photo_event = sessions["sess_c"]["events"][0]
+    assert photo_event["photo_ref"] == 12 and "photo_base64" not in photo_event
+    assert sessions["sess_x"]["session_status"] == "not_found"
+
+
+def test_held_batch_poll_wakes_on_notify(monkeypatch):
+    from relay import event_store
+
+    conn = _RelayConn({"sess_a": "active", "sess_b": "active"}, [[], [_row(21, "sess_b")]])
+    monkeypatch.setattr(event_store, "get_pool", lambda: _Pool(conn))
+    listener = event_store._EventListener()
+    listener._conn = SimpleNamespace(is_closed=lambda: False)
+    monkeypatch.setattr(event_store, "_listener", listener)
+
+    async def body():
+        poll = asyncio.create_task(event_store.poll_events_batch(
+            [("sess_a", None), ("sess_b", "20")], wait_seconds=10,
+        ))
+        await asyncio.sleep(0.05)
+        assert not poll.done()
+        listener._on_notify(None, 0, event_store.EVENTS_CHANNEL, "sess_b")
+        return await asyncio.wait_for(poll, timeout=1.0)
+
+    started = time.perf_counter()
+    result = asyncio.run(body())
+    assert time.perf_counter() - started < 1.0
+    assert [e["id"] for e in result["sessions"]["sess_b"]["events"]] == [21]
+    # One liveness UPDATE for the whole request, one SELECT per wake-up.
+    assert sum("UPDATE relay_sessions" in sql for sql, _ in conn.statements) == 1
+    assert len(conn.statements) == 3
+    assert listener._waiters == {}
+
+
+def test_batch_poll_returns_at_once_for_a_dead_session(monkeypatch):
+    from relay import event_store
+
+    conn = _RelayConn({"sess_a": "active", "sess_b": "expired"}, [[]])
+    monkeypatch.setattr(event_store, "get_pool", lambda: _Pool(conn))
+
+    result = asyncio.run(asyncio.wait_for(
+        event_store.poll_events_batch([("sess_a", None), ("sess_b", None)], wait_seconds=10),
+        timeout=1.0,
+    ))
+    assert result["sessions"]["sess_b"]["session_status"] == "expired"
+
+
+def test_dropped_listen_connection_is_re_established(monkeypatch):
+    from relay import event_store
+
+    class _ListenConn:
+        def __init__(self):
+            self.closed = False
+            self.on_terminate = None
+
+        def is_closed(self):
+            return self.closed
+
+        async def add_listener(self, _channel, _callback):
+            return None
+
+        def add_termination_listener(self, callback):
+            self.on_terminate = callback
+
+    conns: list[_ListenConn] = []
+
+    async def _connect():
+        if len(conns) == 1 and not conns[0].closed:
+            raise AssertionError("reconnected while the first connection was alive")
+        conns.append(_ListenConn())
+        if len(conns) == 2:
+            raise OSError("relay db restarting")
+        return conns[-1]
+
+    monkeypatch.setattr(event_store, "connect_listener", _connect)
+    monkeypatch.setattr(event_store, "_LISTEN_RECONNECT_SECONDS", 0.01)
+    listener = event_store._EventListener()
+
+    async def body():
+        await listener.start()
+        waiter = listener.register(["sess_a"])
+        conns[0].closed = True
+        conns[0].on_terminate(conns[0])
+        assert waiter.is_set()  # held polls fall back to re-checking
+        for _ in range(100):
+            if listener.running:
+                break
+            await asyncio.sleep(0.01)
+        listener.unregister(["sess_a"], waiter)
+
+    asyncio.run(body())
+    assert listener.running
+    assert len(conns) == 3  # one failed attempt, then back
+
+
+async def _noop_async(*_args, **_kwargs):
+    return None
+
+
+def test_bot_chunks_large_session_sets_and_splits_rejected_batches(monkeypatch):
+    from src.nadobro.users import points_service
+
+    sizes: list[int] = []
+
+    async def _batch(*, cursors, wait_seconds):
+        sizes.append(len(cursors))
+        if len(cursors) > 100:  # a relay with a lower cap
+            return {"ok": False, "error": "relay_http_error", "status_code": 422}
+        return {"ok": True, "sessions": {
+            sid: {"ok": True, "events": [], "next_cursor": None, "session_status": "active"}
+            for sid in cursors
+        }}
+
+    monkeypatch.setattr(points_service, "relay_poll_events_batch", _batch)
+    monkeypatch.setattr(points_service, "_batch_poll_unsupported_until", 0.0)
+    cursors = {f"sess_{i}": None for i in range(450)}
+
+    sessions = asyncio.run(points_service._poll_relay_batch(cursors, 0.0))
+
+    assert set(sessions) == set(cursors)
+    assert sizes[:3] == [200, 200, 50]
+    assert sorted(sizes[3:]) == [100, 100, 100, 100]
+    assert points_service._batch_poll_unsupported_until == 0.0
+
+
+def test_new_session_cuts_a_held_batch_poll_short(monkeypatch):
+    from src.nadobro.users import points_service
+
+    calls: list[dict] = []
+
+    async def _batch(*, cursors, wait_seconds):
+        calls.append(dict(cursors))
+        if len(calls) == 1:
+            await asyncio.sleep(30)
+        return {"ok": True, "sessions": {
+            sid: {"ok": True, "events": [], "next_cursor": None, "session_status": "active"}
+            for sid in cursors
+        }}
+
+    monkeypatch.setattr(points_service, "relay_is_configured", lambda: True)
+    monkeypatch.setattr(points_service, "relay_poll_events_batch", _batch)
+    monkeypatch.setattr(points_service, "_persist_relay_state", _noop_async)
+    monkeypatch.setattr(points_service, "_batch_poll_unsupported_until", 0.0)
+    queue = [{"relay_session_id": "sess_a"}]
+    bot_app = SimpleNamespace(bot_data={"lowiqpts_pending_queue": queue})
+
+    async def body():
+        held = asyncio.create_task(points_service.poll_lowiqpts_relay_events(bot_app, wait_seconds=20.0))
+        await asyncio.sleep(0.05)
+        assert not held.done()
+        queue.append({"relay_session_id": "sess_b"})
+        points_service._wake_relay_long_poll()
+        assert await asyncio.wait_for(held, timeout=1.0) is True
+        assert await points_service.poll_lowiqpts_relay_events(bot_app, wait_seconds=20.0) is True
+
+    asyncio.run(body())
+    assert calls == [{"sess_a": None}, {"sess_a": None, "sess_b": None}]
+
+
+def test_bot_polls_all_sessions_with_one_batch_call(monkeypatch):
+    from src.nadobro.users import points_service
+
+    batch_calls: list[tuple[dict, float]] = []
+
+    async def _batch(*, cursors, wait_seconds):
+        batch_calls.append((dict(cursors), wait_seconds))
+        return {"ok": True, "sessions": {
+            "sess_a": {"ok": True, "events": [], "next_cursor": "12", "session_status": "active"},
+            "sess_b": {"ok": True, "events": [], "next_cursor": None, "session_status": "active"},
+        }}
+
+    single = AsyncMock()
+    monkeypatch.setattr(points_service, "relay_is_configured", lambda: True)
+    monkeypatch.setattr(points_service, "relay_poll_events_batch", _batch)
+    monkeypatch.setattr(points_service, "relay_poll_events", single)
+    monkeypatch.setattr(points_service, "_persist_relay_state", _noop_async)
+    monkeypatch.setattr(points_service, "_batch_poll_unsupported_until", 0.0)
+    bot_app = SimpleNamespace(bot_data={
+        "lowiqpts_pending_queue": [{"relay_session_id": "sess_a"}, {"relay_session_id": "sess_b"}],
+        "lowiqpts_relay_cursor:sess_a": "11",
+    })
+
+    batched = asyncio.run(points_service.poll_lowiqpts_relay_events(bot_app, wait_seconds=20.0))
+
+    assert batched is True
+    assert batch_calls == [({"sess_a": "11", "sess_b": None}, 20.0)]
+    assert single.await_count == 0
+    assert bot_app.bot_data["lowiqpts_relay_cursor:sess_a"] == "12"
+
+
+def test_bot_falls_back_to_per_session_polls_without_batch_endpoint(monkeypatch):
+    from src.nadobro.users import points_service
+
+    batch = AsyncMock(return_value={"ok": False, "error": "relay_http_error", "status_code": 404})
+    calls: list[str] = []
+
+    async def _poll_events(*, session_id, cursor):
+        calls.append(session_id)
+        return {"ok": True, "events": [], "next_cursor": None}
+
+    monkeypatch.setattr(points_service, "relay_is_configured", lambda: True)
+    monkeypatch.setattr(points_service, "relay_poll_events_batch", batch)
+    monkeypatch.setattr(points_service, "relay_poll_events", _poll_events)
+    monkeypatch.setattr(points_service, "_persist_relay_state", _noop_async)
+    monkeypatch.setattr(points_service, "_batch_poll_unsupported_until", 0.0)
+    bot_app = SimpleNamespace(bot_data={"lowiqpts_pending_queue": [{"relay_session_id": "sess_a"}]})
+
+    assert asyncio.run(points_service.poll_lowiqpts_relay_events(bot_app)) is False
+    assert asyncio.run(points_service.poll_lowiqpts_relay_events(bot_app)) is False
+    assert batch.await_count == 1  # remembered as unsupported
+    assert calls == ["sess_a", "sess_a"]
+
+
+def test_photo_ref_is_fetched_and_sent(monkeypatch):
+    from src.nadobro.users import points_service
+
+    fetched: list[tuple[str, int]] = []
+
+    async def _fetch(*, session_id, event_id):
+        fetched.append((session_id, event_id))
+        return b"\x89PNG", "image/png"
+
+    monkeypatch.setattr(points_service, "relay_fetch_event_photo", _fetch)
+    monkeypatch.setattr(points_service, "_persist_relay_state", _noop_async)
+    req = {
+        "req_id": "r1", "chat_id": 77, "telegram_id": 7,
+        "wallet": "0x" + "ab" * 20, "ts": time.time(), "relay_session_id": "sess_p",
+    }
+    bot_data = {points_service._PENDING_QUEUE_KEY: [req]}
+    send_photo = AsyncMock()
+    bot_app = SimpleNamespace(bot_data=bot_data, bot=SimpleNamespace(send_photo=send_photo, send_message=AsyncMock()))
+
+    event = {"id": 31, "session_id": "sess_p", "text": "", "photo_ref": 31, "photo_mime": "image/png"}
+    asyncio.run(points_service._process_relay_event(bot_app, bot_data, event))
+
+    assert fetched == [("sess_p", 31)]
+    assert send_photo.await_count == 1
+    assert send_photo.await_args.kwargs["photo"].getvalue() == b"\x89PNG"
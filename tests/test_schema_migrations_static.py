@@ -100,3 +100,62 @@ def test_startup_trade_column_migrations_are_idempotent():
     assert "ALTER TABLE trades ADD COLUMN IF NOT EXISTS {col} {col_type}" in ddl
     assert "ALTER TABLE trades ADD COLUMN {col} {col_type}" not in ddl
     assert "ALTER TABLE {table} ADD COLUMN {col} {col_type}" not in ddl
+
+
+def test_session_pnl_accumulator_migration_and_startup_ddl():
+    sql = Path("src/nadobro/migrations/0019_session_pnl_accumulators.sql").read_text()
+    assert "CREATE TABLE IF NOT EXISTS session_pnl_accumulators" in sql
+    for column in ("positions", "realized", "fees", "last_fill_id", "fill_revision", "base_traded"):
+        assert column in sql
+    ddl = Path("src/nadobro/db.py").read_text()
+    assert "CREATE TABLE IF NOT EXISTS session_pnl_accumulators" in ddl
+    assert "ADD COLUMN IF NOT EXISTS fill_revision BIGINT" in ddl
+
+
+def test_fill_revision_migration_and_startup_ddl():
+    sql = Path("src/nadobro/migrations/0024_fill_revisions.sql").read_text()
+    ddl = Path("src/nadobro/db.py").read_text()
+    assert "CREATE TABLE IF NOT EXISTS fill_revisions" in sql
+    assert "CREATE TABLE IF NOT EXISTS fill_revisions" in ddl
+    assert "CREATE OR REPLACE FUNCTION stamp_fill_revision()" in sql
+    assert "CREATE OR REPLACE FUNCTION stamp_fill_revision()" in ddl
+    for net in ("mainnet", "testnet"):
+        assert f"trades_{net}_fill_revision_ins" in sql
+        assert f"trades_{net}_fill_revision_upd" in sql
+        assert f"idx_trades_{net}_user_fill_revision" in sql
+    assert "reshaped_revision" in sql
+
+
+def test_fill_rollup_migration_and_startup_ddl():
+    sql = Path("src/nadobro/migrations/0021_user_fill_rollups.sql").read_text()
+    ddl = Path("src/nadobro/db.py").read_text()
+    for table in ("user_fill_rollups", "fill_rollup_state"):
+        assert f"CREATE TABLE IF NOT EXISTS {table}" in sql
+        assert f"CREATE TABLE IF NOT EXISTS {table}" in ddl
+    for column in ("eod_positions", "last_submission_idx", "last_funding_id", "fill_revision"):
+        assert column in sql
+    alter = "ALTER TABLE fill_rollup_state ADD COLUMN IF NOT EXISTS fill_revision BIGINT"
+    assert alter in sql and alter in ddl
+    assert "PRIMARY KEY (user_id, network, product_id, day)" in sql
+
+
+def test_round_trip_ledger_migration_and_startup_ddl():
+    sql = Path("src/nadobro/migrations/0022_round_trip_ledger.sql").read_text()
+    ddl = Path("src/nadobro/db.py").read_text()
+    for table in ("round_trips", "round_trip_state"):
+        assert f"CREATE TABLE IF NOT EXISTS {table}" in sql
+        assert f"CREATE TABLE IF NOT EXISTS {table}" in ddl
+    for column in ("inventory", "last_submission_idx", "epoch", "fill_revision", "close_trade_id"):
+        assert column in sql
+    alter = "ALTER TABLE round_trip_state ADD COLUMN IF NOT EXISTS fill_revision BIGINT"
+    assert alter in sql and alter in ddl
+    assert "PRIMARY KEY (user_id, network, trip_key)" in sql
+
+
+def test_portfolio_history_rollup_migration_and_startup_ddl():
+    sql = Path("src/nadobro/migrations/0023_portfolio_history_rollups.sql").read_text()
+    ddl = Path("src/nadobro/db.py").read_text()
+    for table in ("engine_portfolio_history_1h", "engine_portfolio_history_1d"):
+        assert f"CREATE TABLE IF NOT EXISTS {table}" in sql
+        assert f"CREATE TABLE IF NOT EXISTS {table}" in ddl
+    assert "PRIMARY KEY (user_id, network, bucket)" in sql
@@ -0,0 +1,164 @@
+"""Keyed single-flight for Nado reads (venue/single_flight.py).
+
+Concurrent identical reads run once and share the result (or the exception);
+joiners get their own copies; different subaccounts never share; retention is
+opt-in; ``NADO_SINGLE_FLIGHT=0`` restores one call per caller.
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from src.nadobro.venue import single_flight as sf
+from src.nadobro.venue.nado_client import NadoClient, get_nado_client_cache_stats
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    sf.clear_single_flight()
+    yield
+    sf.clear_single_flight()
+
+
+def _fan_in(n, fn):
+    barrier = threading.Barrier(n)
+
+    def _one():
+        barrier.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(_one) for _ in range(n)]
+        return [f.result() for f in futures]
+
+
+def test_concurrent_callers_share_one_call_and_get_their_own_copies():
+    calls = []
+
+    def _read():
+        calls.append(1)
+        time.sleep(0.05)
+        return [{"digest": "0x1"}]
+
+    results = _fan_in(16, lambda: sf.single_flight("k", _read))
+
+    assert len(calls) == 1
+    assert all(r == [{"digest": "0x1"}] for r in results)
+    assert len({id(r) for r in results}) == 16
+    stats = sf.single_flight_stats()
+    assert stats["misses"] == 1 and stats["joins"] == 15 and stats["inflight"] == 0
+
+
+def test_joiners_receive_the_leaders_exception():
+    def _read():
+        time.sleep(0.05)
+        raise RuntimeError("gateway 503")
+
+    errors = []
+
+    def _call():
+        try:
+            sf.single_flight("k", _read)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    _fan_in(4, _call)
+    assert errors == ["gateway 503"] * 4
+    assert sf.single_flight_stats()["errors"] == 1
+
+
+def test_reentrant_leader_runs_directly_instead_of_deadlocking():
+    def _outer():
+        return sf.single_flight("k", lambda: "inner") + "+outer"
+
+    assert sf.single_flight("k", _outer) == "inner+outer"
+
+
+def test_retention_serves_hits_until_expiry():
+    calls = []
+
+    def _read():
+        calls.append(1)
+        return {"mid": 100.0}
+
+    assert sf.single_flight("p", _read, retain_seconds=0.2) == {"mid": 100.0}
+    assert sf.single_flight("p", _read, retain_seconds=0.2) == {"mid": 100.0}
+    assert len(calls) == 1 and sf.single_flight_stats()["hits"] == 1
+    time.sleep(0.25)
+    sf.single_flight("p", _read, retain_seconds=0.2)
+    assert len(calls) == 2
+
+
+def test_async_callers_share_one_task_and_survive_a_cancelled_joiner():
+    calls = []
+
+    async def _read():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"exists": True}
+
+    async def _scenario():
+        tasks = [asyncio.create_task(sf.asingle_flight("a", _read)) for _ in range(50)]
+        await asyncio.sleep(0)
+        tasks[1].cancel()
+        done = await asyncio.gather(*tasks, return_exceptions=True)
+        return done
+
+    done = asyncio.run(_scenario())
+    assert len(calls) == 1
+    assert isinstance(done[1], asyncio.CancelledError)
+    assert [d for i, d in enumerate(done) if i != 1] == [{"exists": True}] * 49
+
+
+def _slow_positions(counter):
+    def _read(self, subaccount_hex, *, allow_empty_cache_fallback):
+        counter.append(subaccount_hex)
+        time.sleep(0.05)
+        return [{"product_id": 2, "amount": 1.0}]
+
+    return _read
+
+
+def test_nado_client_fan_in_drops_duplicate_gateway_reads():
+    client = NadoClient.from_address("0x" + "1" * 40, network="testnet")
+    reads: list[str] = []
+    with patch.object(NadoClient, "_positions_for_subaccount_hex", _slow_positions(reads)), \
+         patch.object(NadoClient, "_isolated_subaccount_hexes", return_value=[]):
+        rows = _fan_in(12, client.get_all_positions)
+
+    assert len(reads) == 1
+    assert rows == [[{"product_id": 2, "amount": 1.0}]] * 12
+    assert get_nado_client_cache_stats()["single_flight"]["joins"] == 11
+
+
+def test_different_subaccounts_never_share_a_read():
+    a = NadoClient.from_address("0x" + "1" * 40, network="testnet")
+    b = NadoClient.from_address("0x" + "2" * 40, network="testnet")
+    reads: list[str] = []
+    with patch.object(NadoClient, "_positions_for_subaccount_hex", _slow_positions(reads)), \
+         patch.object(NadoClient, "_isolated_subaccount_hexes", return_value=[]):
+        barrier = threading.Barrier(2)
+
+        def _read(c):
+            barrier.wait()
+            return c.get_all_positions()
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            list(pool.map(_read, [a, b]))
+
+    assert sorted(reads) == sorted([a.subaccount_hex, b.subaccount_hex])
+
+
+def test_flag_off_issues_one_read_per_caller(monkeypatch):
+    monkeypatch.setenv("NADO_SINGLE_FLIGHT", "0")
+    client = NadoClient.from_address("0x" + "1" * 40, network="testnet")
+    reads: list[str] = []
+    with patch.object(NadoClient, "_positions_for_subaccount_hex", _slow_positions(reads)), \
+         patch.object(NadoClient, "_isolated_subaccount_hexes", return_value=[]):
+        _fan_in(4, client.get_all_positions)
+    assert len(reads) == 4
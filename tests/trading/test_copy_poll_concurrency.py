@@ -0,0 +1,158 @@
+"""Copy poll fan-out: leaders load in parallel, followers never overlap.
+
+``_poll_all_mirrors`` runs every leader group concurrently (bounded) and fans a
+leader's mirrors out in parallel. These tests pin that a slow leader no longer
+stalls the others, that a follower copying two leaders is never synced twice
+at once, and that a low gateway budget serializes leader reads instead of
+dropping them.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import src.nadobro.trading.copy_service as copy_service
+
+
+def _mirror(mirror_id: int, trader_id: int, user_id: int) -> dict:
+    return {
+        "id": mirror_id, "user_id": user_id, "trader_id": trader_id,
+        "network": "mainnet", "wallet_address": f"0xleader{trader_id}",
+        "stop_requested": False,
+    }
+
+
+async def _poll(mirrors, load, sync, *, leaders=4, followers=8, headroom=True):
+    has_headroom = headroom if callable(headroom) else (lambda network: headroom)
+
+    async def _inline(fn, *args, **kwargs):
+        if fn.__name__ == "get_all_active_mirrors_v2":
+            return mirrors
+        if fn.__name__ == "_load_leader_position_map":
+            return await asyncio.to_thread(load, *args)
+        return fn(*args, **kwargs)
+
+    with patch.object(copy_service, "run_blocking", side_effect=_inline), \
+         patch.object(copy_service, "_load_leader_position_map", load), \
+         patch.object(copy_service, "_sync_mirror_positions", sync), \
+         patch.object(copy_service, "_leader_has_headroom", has_headroom), \
+         patch.object(copy_service, "copy_poll_leader_concurrency", lambda: leaders), \
+         patch.object(copy_service, "copy_poll_follower_concurrency", lambda: followers):
+        await copy_service._poll_all_mirrors()
+
+
+def _named(fn):
+    fn.__name__ = "_load_leader_position_map"
+    return fn
+
+
+def test_slow_leader_does_not_stall_the_others():
+    done: dict[int, float] = {}
+    t0 = time.perf_counter()
+
+    @_named
+    def load(trader_id, wallet, network):
+        time.sleep(0.3 if trader_id == 1 else 0.01)
+        return {}
+
+    async def sync(mirror, leader_pos_map):
+        done[mirror["id"]] = time.perf_counter() - t0
+
+    mirrors = [_mirror(i, i, 100 + i) for i in range(1, 6)]
+    asyncio.run(_poll(mirrors, load, sync))
+    assert set(done) == {1, 2, 3, 4, 5}
+    assert max(done[i] for i in (2, 3, 4, 5)) < 0.25
+    stats = copy_service.get_copy_polling_diagnostics()["last_tick"]
+    assert stats["leaders"] == 5 and stats["mirrors"] == 5
+
+
+def test_follower_on_two_leaders_is_never_synced_concurrently():
+    active: dict[int, int] = {}
+    overlaps: list[int] = []
+    order: list[int] = []
+
+    @_named
+    def load(trader_id, wallet, network):
+        return {}
+
+    async def sync(mirror, leader_pos_map):
+        user = mirror["user_id"]
+        active[user] = active.get(user, 0) + 1
+        if active[user] > 1:
+            overlaps.append(user)
+        await asyncio.sleep(0.02)
+        order.append(mirror["id"])
+        active[user] -= 1
+
+    mirrors = [_mirror(1, 1, 7), _mirror(2, 2, 7), _mirror(3, 1, 8), _mirror(4, 2, 9)]
+    asyncio.run(_poll(mirrors, load, sync))
+    assert overlaps == []
+    assert sorted(order) == [1, 2, 3, 4]
+
+
+def test_low_budget_serializes_leader_reads_instead_of_skipping():
+    inflight = {"now": 0, "max": 0}
+
+    @_named
+    def load(trader_id, wallet, network):
+        inflight["now"] += 1
+        inflight["max"] = max(inflight["max"], inflight["now"])
+        time.sleep(0.02)
+        inflight["now"] -= 1
+        return {}
+
+    synced: list[int] = []
+
+    async def sync(mirror, leader_pos_map):
+        synced.append(mirror["id"])
+
+    mirrors = [_mirror(i, i, 100 + i) for i in range(1, 5)]
+    asyncio.run(_poll(mirrors, load, sync, headroom=False))
+    assert inflight["max"] == 1
+    assert sorted(synced) == [1, 2, 3, 4]
+    assert copy_service.get_copy_polling_diagnostics()["last_tick"]["budget_serialized"] == 4
+
+
+def test_starved_leader_reads_stay_inside_the_leader_bound():
+    inflight = {"now": 0, "max": 0}
+    budget = iter([True, False, True, False])
+
+    @_named
+    def load(trader_id, wallet, network):
+        inflight["now"] += 1
+        inflight["max"] = max(inflight["max"], inflight["now"])
+        time.sleep(0.02)
+        inflight["now"] -= 1
+        return {}
+
+    async def sync(mirror, leader_pos_map):
+        return None
+
+    mirrors = [_mirror(i, i, 100 + i) for i in range(1, 5)]
+    asyncio.run(_poll(mirrors, load, sync, leaders=1, headroom=lambda network: next(budget)))
+    assert inflight["max"] == 1
+    assert copy_service.get_copy_polling_diagnostics()["last_tick"]["budget_serialized"] == 2
+
+
+def test_leader_change_records_follow_latency(monkeypatch, caplog):
+    recorded: list[str] = []
+    monkeypatch.setattr(copy_service, "record_metric", lambda name, ms: recorded.append(name))
+    monkeypatch.setattr(copy_service, "_SLOW_FOLLOW_MS", 0.0)
+    copy_service._LEADER_SIGNATURES.clear()
+    maps = iter([{}, {2: {"side": "LONG", "size": 1.0}}])
+
+    @_named
+    def load(trader_id, wallet, network):
+        return next(maps)
+
+    async def sync(mirror, leader_pos_map):
+        return None
+
+    mirrors = [_mirror(1, 3, 7)]
+    asyncio.run(_poll(mirrors, load, sync))
+    assert "copy.follow_latency" not in recorded  # first sight is not a change
+    asyncio.run(_poll(mirrors, load, sync))
+    assert [n for n in recorded if n.startswith("copy.follow_latency")] == ["copy.follow_latency"]
+    assert "copy follow slow: trader 3" in caplog.text
+    copy_service._LEADER_SIGNATURES.clear()